@@ -7,6 +7,12 @@ This tool runs KDE-level scoring on existing client data to:
 2. Identify critical KDEs with issues  
 3. Generate actionable improvement recommendations
 4. Build business case for full DQSI implementation
+
+Extracts too large for memory can be scored in chunked mode: each chunk is
+reduced to mergeable per-KDE counts, so memory is bounded by the chunk size
+rather than by the record count. Distinct values are counted exactly; with
+approximate distinct counting each KDE switches to a fixed-size HyperLogLog
+sketch past a limit, bounding memory at the cost of estimated uniqueness.
 """
 
 import pandas as pd
@@ -14,16 +20,364 @@ import numpy as np
 import re
 import json
 import yaml
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
 import argparse
 import os
+import sys
+
+# Add src to path for the shared DQ sketches
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.dq_sketches import HyperLogLog
+
+
+TIMESTAMP_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d',
+                     '%m/%d/%Y %H:%M:%S', '%d/%m/%Y %H:%M:%S']
+
+# Freshness bucket upper bounds and the score each bucket contributes
+FRESHNESS_BUCKETS = [
+    (timedelta(minutes=30), 1.0),   # Very fresh
+    (timedelta(hours=4), 0.9),      # Fresh
+    (timedelta(hours=24), 0.7),     # Acceptable
+    (timedelta(days=7), 0.4),       # Stale
+    (timedelta(days=30), 0.2),      # Very stale
+    (None, 0.1)                     # Ancient
+]
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+# With approximate distinct counting, hashes kept exactly per KDE (8 bytes
+# each) before switching to a HyperLogLog sketch of 2**DISTINCT_SKETCH_PRECISION one-byte registers
+DISTINCT_EXACT_LIMIT = 1 << 16
+DISTINCT_SKETCH_PRECISION = 14
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a timestamp with the known formats, falling back to pandas"""
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt)
+        except ValueError:
+            continue
+    
+    ts = pd.to_datetime(value, errors='coerce')
+    return None if pd.isna(ts) else ts
+
+
+def _freshness_bucket(age: timedelta) -> int:
+    """Index of the FRESHNESS_BUCKETS entry an age falls into"""
+    for index, (max_age, _) in enumerate(FRESHNESS_BUCKETS[:-1]):
+        if age <= max_age:
+            return index
+    return len(FRESHNESS_BUCKETS) - 1
+
+
+def _hash_values(values: pd.Series) -> np.ndarray:
+    """64-bit hashes of non-null values for distinct counting across chunks"""
+    array = values.to_numpy()
+    if array.dtype.kind in 'iu':
+        # A column that is integer in one chunk may be float (NaN) in another
+        array = array.astype(np.float64)
+    elif array.dtype.kind not in 'fbmM':
+        array = np.asarray(array, dtype=object)
+    try:
+        return pd.util.hash_array(array, categorize=False)
+    except TypeError:
+        return pd.util.hash_array(np.asarray([str(v) for v in array], dtype=object), categorize=False)
+
+
+class KDEColumnAggregate:
+    """
+    Mergeable partial aggregates for one KDE column
+    
+    Holds only counts, integer age sums and either a set of 64-bit value
+    hashes or, when approximate and past ``distinct_limit`` distinct values,
+    a HyperLogLog sketch of them, so aggregates of any split of a column merge to the same totals
+    as aggregating the whole column at once.
+    
+    Args:
+        kde_config: KDE configuration
+        approximate_distinct: Switch to the sketch past ``distinct_limit``
+            (bounded memory, estimated distinct count); otherwise every
+            distinct hash is kept
+        distinct_limit: Distinct hashes kept exactly before switching
+    """
+    
+    def __init__(self, kde_config: Dict[str, Any], approximate_distinct: bool = False,
+                 distinct_limit: int = DISTINCT_EXACT_LIMIT):
+        self.kde_config = kde_config
+        self.approximate_distinct = approximate_distinct
+        self.distinct_limit = distinct_limit
+        self.total_count = 0
+        self.null_count = 0
+        
+        self.format_valid = 0
+        self.format_error = False
+        self.range_valid = 0
+        self.range_violations = 0
+        
+        self.freshness_counts = [0] * len(FRESHNESS_BUCKETS)
+        self.age_total_ns = 0
+        self.age_count = 0
+        
+        self.precision_full = 0
+        self.precision_excessive = 0
+        self.decimal_places_sum = 0
+        self.decimal_places_count = 0
+        self.decimal_places_max = None
+        self.decimal_places_min = None
+        
+        self.reference_valid = 0
+        self.business_rule_valid = {}
+        
+        self._distinct = np.empty(0, dtype=np.uint64)
+        self._pending = []
+        self._pending_size = 0
+        self._sketch: Optional[HyperLogLog] = None
+    
+    @property
+    def non_null_count(self) -> int:
+        return self.total_count - self.null_count
+    
+    @property
+    def distinct_estimated(self) -> bool:
+        """Whether ``distinct_count`` comes from the HyperLogLog sketch"""
+        self._compact()
+        return self._sketch is not None
+    
+    @property
+    def distinct_count(self) -> int:
+        self._compact()
+        if self._sketch is not None:
+            return min(int(round(self._sketch.count())), self.non_null_count)
+        return len(self._distinct)
+    
+    def update(self, data: pd.Series, current_time: datetime) -> 'KDEColumnAggregate':
+        """Add one chunk of the column"""
+        kde_config = self.kde_config
+        null_mask = data.isnull()
+        non_null = data[~null_mask]
+        
+        self.total_count += len(data)
+        self.null_count += int(null_mask.sum())
+        if len(non_null) == 0:
+            return self
+        
+        self._add_hashes(_hash_values(non_null))
+        
+        if 'format_pattern' in kde_config and not self.format_error:
+            try:
+                self.format_valid += int(non_null.astype(str).str.match(kde_config['format_pattern'], na=False).sum())
+            except Exception:
+                self.format_error = True
+        
+        # Per-value rules are evaluated once per distinct value
+        counts = non_null.value_counts(dropna=True)
+        data_type = kde_config.get('data_type', 'string')
+        
+        if 'valid_range' in kde_config:
+            self._update_range(counts, kde_config['valid_range'])
+        
+        if data_type == 'timestamp':
+            self._update_timestamps(counts, current_time)
+        elif data_type == 'numeric':
+            self._update_precision(counts)
+        elif data_type == 'categorical' and 'valid_values' in kde_config:
+            valid_set = set(kde_config['valid_values'])
+            self.reference_valid += int(sum(count for value, count in counts.items() if str(value) in valid_set))
+        
+        for rule_name, rule_config in kde_config.get('business_rules', {}).items():
+            if rule_config.get('type', 'custom') == 'not_negative':
+                valid = 0
+                for value, count in counts.items():
+                    try:
+                        if float(value) >= 0:
+                            valid += count
+                    except (ValueError, TypeError):
+                        continue
+                self.business_rule_valid[rule_name] = self.business_rule_valid.get(rule_name, 0) + int(valid)
+        
+        return self
+    
+    def merge(self, other: 'KDEColumnAggregate') -> 'KDEColumnAggregate':
+        """Fold another partial aggregate of the same KDE into this one"""
+        self.total_count += other.total_count
+        self.null_count += other.null_count
+        self.format_valid += other.format_valid
+        self.format_error = self.format_error or other.format_error
+        self.range_valid += other.range_valid
+        self.range_violations += other.range_violations
+        self.freshness_counts = [a + b for a, b in zip(self.freshness_counts, other.freshness_counts)]
+        self.age_total_ns += other.age_total_ns
+        self.age_count += other.age_count
+        self.precision_full += other.precision_full
+        self.precision_excessive += other.precision_excessive
+        self.decimal_places_sum += other.decimal_places_sum
+        self.decimal_places_count += other.decimal_places_count
+        self.decimal_places_max = self._combine(max, self.decimal_places_max, other.decimal_places_max)
+        self.decimal_places_min = self._combine(min, self.decimal_places_min, other.decimal_places_min)
+        self.reference_valid += other.reference_valid
+        for rule_name, valid in other.business_rule_valid.items():
+            self.business_rule_valid[rule_name] = self.business_rule_valid.get(rule_name, 0) + valid
+        
+        other._compact()
+        if other._sketch is not None:
+            self._compact()
+            if self._sketch is None:
+                self._to_sketch()
+            self._sketch.merge(other._sketch)
+        else:
+            self._add_hashes(other._distinct)
+        return self
+    
+    @staticmethod
+    def _combine(func, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return func(a, b)
+    
+    def _add_hashes(self, hashes: np.ndarray):
+        if self._sketch is not None:
+            self._sketch.add_hashes(hashes)
+            return
+        self._pending.append(hashes)
+        self._pending_size += len(hashes)
+        # Amortised: deduplicate once pending hashes outgrow the distinct set
+        if self._pending_size > max(len(self._distinct), 1 << 16):
+            self._compact()
+    
+    def _compact(self):
+        if self._pending:
+            self._distinct = np.unique(np.concatenate([self._distinct] + self._pending))
+            self._pending = []
+            self._pending_size = 0
+        if self.approximate_distinct and self._sketch is None and len(self._distinct) > self.distinct_limit:
+            self._to_sketch()
+    
+    def _to_sketch(self):
+        self._sketch = HyperLogLog(DISTINCT_SKETCH_PRECISION)
+        self._sketch.add_hashes(self._distinct)
+        self._distinct = np.empty(0, dtype=np.uint64)
+    
+    def _update_range(self, counts: pd.Series, valid_range: Dict):
+        min_val = valid_range.get('min')
+        max_val = valid_range.get('max')
+        
+        for value, count in counts.items():
+            try:
+                # Convert to numeric if possible
+                if isinstance(value, str) and value.replace('.', '').replace('-', '').isdigit():
+                    value = float(value)
+                
+                if min_val is not None and value < min_val:
+                    self.range_violations += int(count)
+                elif max_val is not None and value > max_val:
+                    self.range_violations += int(count)
+                else:
+                    self.range_valid += int(count)
+            except (ValueError, TypeError):
+                self.range_violations += int(count)
+    
+    def _update_timestamps(self, counts: pd.Series, current_time: datetime):
+        for value, count in counts.items():
+            try:
+                ts = _parse_timestamp(value)
+                if ts is not None:
+                    self.freshness_counts[_freshness_bucket(current_time - ts)] += int(count)
+            except Exception:
+                pass
+            
+            try:
+                ts = pd.to_datetime(value, errors='coerce')
+                if pd.notna(ts):
+                    # Whole nanoseconds, so sums merge exactly
+                    self.age_total_ns += pd.Timedelta(current_time - ts).value * int(count)
+                    self.age_count += int(count)
+            except Exception:
+                continue
+    
+    def _update_precision(self, counts: pd.Series):
+        for value, count in counts.items():
+            str_val = str(value)
+            places = len(str_val.split('.')[1]) if '.' in str_val else 0
+            self.decimal_places_sum += places * int(count)
+            self.decimal_places_count += int(count)
+            self.decimal_places_max = self._combine(max, self.decimal_places_max, places)
+            self.decimal_places_min = self._combine(min, self.decimal_places_min, places)
+            
+            try:
+                # Check if it's a valid number
+                float(value)
+            except (ValueError, TypeError):
+                continue
+            if places <= 6:  # Reasonable precision
+                self.precision_full += int(count)
+            else:
+                self.precision_excessive += int(count)  # Excessive precision
+
+
+def aggregate_chunk(kde_configs: Dict[str, Any], chunk: pd.DataFrame, current_time: datetime,
+                    approximate_distinct: bool = False) -> Tuple[int, Dict[str, KDEColumnAggregate]]:
+    """Record count and per-KDE aggregates of one chunk (process pool entry point)"""
+    aggregates = {
+        kde_name: KDEColumnAggregate(kde_config, approximate_distinct).update(chunk[kde_name], current_time)
+        for kde_name, kde_config in kde_configs.items()
+        if kde_name in chunk.columns
+    }
+    for aggregate in aggregates.values():
+        aggregate._compact()
+    return len(chunk), aggregates
+
+
+def iter_data_chunks(file_path: str, chunk_size: int = 100_000,
+                     columns: Optional[List[str]] = None, **read_kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV or Parquet file as DataFrames of at most ``chunk_size`` rows
+    
+    Args:
+        file_path: CSV (optionally compressed) or Parquet file
+        chunk_size: Rows per chunk
+        columns: Only these columns are read (others are skipped at parse time)
+        read_kwargs: Extra ``pd.read_csv`` arguments, e.g. ``dtype`` to pin column types
+    """
+    if file_path.lower().endswith(PARQUET_EXTENSIONS):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Chunked Parquet scoring requires pyarrow")
+        
+        parquet_file = pq.ParquetFile(file_path)
+        available = parquet_file.schema_arrow.names
+        selected = [c for c in available if columns is None or c in columns] or available[:1]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=selected):
+            yield batch.to_pandas()
+        return
+    
+    if columns is not None and 'usecols' not in read_kwargs:
+        header = pd.read_csv(file_path, nrows=0, **read_kwargs).columns
+        # Keep one column when no KDE is present so records are still counted
+        read_kwargs['usecols'] = [c for c in header if c in columns] or list(header[:1])
+    
+    yield from pd.read_csv(file_path, chunksize=chunk_size, **read_kwargs)
 
 
 class StandaloneKDEScorer:
-    """Standalone KDE scorer for existing data assessment"""
+    """
+    Standalone KDE scorer for existing data assessment
     
-    def __init__(self):
+    Args:
+        approximate_distinct: Estimate distinct values with a HyperLogLog
+            sketch past ``DISTINCT_EXACT_LIMIT`` per KDE instead of counting
+            them exactly (bounded memory, approximate uniqueness scores)
+    """
+    
+    def __init__(self, approximate_distinct: bool = False):
+        self.approximate_distinct = approximate_distinct
         self.kde_configs = {}
         self.scoring_results = {}
         self.assessment_timestamp = datetime.now()
@@ -40,16 +394,80 @@ class StandaloneKDEScorer:
         print(f"   Columns: {len(df.columns)}")
         print()
         
+        record_count, aggregates = aggregate_chunk(self.kde_configs, df, datetime.now(), self.approximate_distinct)
+        return self._build_result(aggregates, record_count, data_flow_name)
+    
+    def score_chunks(self, chunks: Iterable[pd.DataFrame], data_flow_name: str = "default",
+                     max_workers: int = 1) -> Dict[str, Any]:
+        """
+        Score KDEs from a stream of DataFrame chunks
+        
+        Gives the same result as ``score_dataframe`` on the concatenated
+        chunks, provided each column has the same dtype in every chunk.
+        
+        Args:
+            chunks: DataFrames sharing one set of columns
+            data_flow_name: Name of data flow
+            max_workers: Processes aggregating chunks in parallel (1 = in-process)
+        """
+        print(f"📊 Scoring data flow: {data_flow_name} (chunked)")
+        
+        current_time = datetime.now()
+        record_count = 0
+        chunk_count = 0
+        aggregates: Dict[str, KDEColumnAggregate] = {}
+        
+        for chunk_records, chunk_aggregates in self._aggregate_chunks(chunks, current_time, max_workers):
+            record_count += chunk_records
+            chunk_count += 1
+            for kde_name, aggregate in chunk_aggregates.items():
+                if kde_name in aggregates:
+                    aggregates[kde_name].merge(aggregate)
+                else:
+                    aggregates[kde_name] = aggregate
+        
+        print(f"   Records: {record_count:,} in {chunk_count:,} chunks")
+        print()
+        
+        return self._build_result(aggregates, record_count, data_flow_name)
+    
+    def score_file(self, file_path: str, data_flow_name: str = "default", chunk_size: int = 100_000,
+                   max_workers: int = 1, **read_kwargs) -> Dict[str, Any]:
+        """Score a CSV or Parquet file in chunks of ``chunk_size`` rows"""
+        chunks = iter_data_chunks(file_path, chunk_size, columns=list(self.kde_configs), **read_kwargs)
+        return self.score_chunks(chunks, data_flow_name, max_workers)
+    
+    def _aggregate_chunks(self, chunks: Iterable[pd.DataFrame], current_time: datetime,
+                          max_workers: int) -> Iterator[Tuple[int, Dict[str, KDEColumnAggregate]]]:
+        if max_workers <= 1:
+            for chunk in chunks:
+                yield aggregate_chunk(self.kde_configs, chunk, current_time, self.approximate_distinct)
+            return
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # At most two chunks per worker are held in memory at once
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(aggregate_chunk, self.kde_configs, chunk, current_time,
+                                               self.approximate_distinct))
+                if len(pending) >= max_workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def _build_result(self, aggregates: Dict[str, KDEColumnAggregate], record_count: int,
+                      data_flow_name: str) -> Dict[str, Any]:
+        """Score merged KDE aggregates and assemble the flow result"""
         kde_scores = {}
         kde_details = {}
         
         for kde_name, kde_config in self.kde_configs.items():
-            if kde_name not in df.columns:
+            if kde_name not in aggregates:
                 print(f"   ⚠️  KDE '{kde_name}' not found in data - skipping")
                 continue
             
             # Score this KDE
-            score, details = self._score_kde_column(df[kde_name], kde_config, kde_name)
+            score, details = self._score_aggregate(aggregates[kde_name], kde_config)
             kde_scores[kde_name] = score
             kde_details[kde_name] = details
             
@@ -63,7 +481,7 @@ class StandaloneKDEScorer:
         result = {
             'data_flow': data_flow_name,
             'assessment_timestamp': self.assessment_timestamp.isoformat(),
-            'record_count': len(df),
+            'record_count': record_count,
             'kde_scores': kde_scores,
             'kde_details': kde_details,
             'overall_dqsi_score': overall_score,
@@ -80,62 +498,80 @@ class StandaloneKDEScorer:
     
     def _score_kde_column(self, data: pd.Series, kde_config: Dict, kde_name: str) -> tuple:
         """Score individual KDE column with detailed breakdown"""
+        aggregate = KDEColumnAggregate(kde_config, self.approximate_distinct).update(data, datetime.now())
+        return self._score_aggregate(aggregate, kde_config)
+    
+    def _score_aggregate(self, aggregate: KDEColumnAggregate, kde_config: Dict) -> tuple:
+        """Score a KDE from its (merged) aggregate with detailed breakdown"""
         
         scores = {}
+        total = aggregate.total_count
+        non_null = aggregate.non_null_count
         details = {
-            'total_records': len(data),
-            'null_count': data.isnull().sum(),
-            'unique_count': data.nunique(),
+            'total_records': total,
+            'null_count': aggregate.null_count,
+            'unique_count': aggregate.distinct_count,
+            'unique_count_estimated': aggregate.distinct_estimated,
             'data_type': kde_config.get('data_type', 'string'),
             'validations_applied': []
         }
         
         # 1. Null Presence (always checked)
-        scores['null_presence'] = self._score_null_presence(data)
+        null_rate = aggregate.null_count / total if total else float('nan')
+        scores['null_presence'] = self._score_null_presence(null_rate)
         details['validations_applied'].append('null_presence')
-        details['null_rate'] = data.isnull().sum() / len(data)
+        details['null_rate'] = null_rate
         
         # 2. Format Validation
         if 'format_pattern' in kde_config:
-            scores['format'] = self._score_format(data, kde_config['format_pattern'])
+            if non_null == 0:
+                scores['format'] = 0.0
+                details['format_violations'] = 0
+            elif aggregate.format_error:
+                scores['format'] = 0.5  # Default if pattern matching fails
+                details['format_violations'] = non_null  # Assume all invalid if pattern fails
+            else:
+                scores['format'] = self._score_valid_rate(aggregate.format_valid / non_null)
+                details['format_violations'] = non_null - aggregate.format_valid
             details['validations_applied'].append('format')
-            details['format_violations'] = self._count_format_violations(data, kde_config['format_pattern'])
         
         # 3. Range Validation
         if 'valid_range' in kde_config:
-            scores['range'] = self._score_range(data, kde_config['valid_range'])
+            scores['range'] = self._score_valid_rate(aggregate.range_valid / non_null) if non_null else 0.0
             details['validations_applied'].append('range')
-            details['range_violations'] = self._count_range_violations(data, kde_config['valid_range'])
+            details['range_violations'] = aggregate.range_violations
         
         # 4. Data Type Specific Validations
         data_type = kde_config.get('data_type', 'string')
         
         if data_type == 'timestamp':
-            scores['freshness'] = self._score_timestamp_freshness(data)
+            scores['freshness'] = self._score_timestamp_freshness(aggregate)
             details['validations_applied'].append('freshness')
-            details['avg_age_hours'] = self._calculate_avg_age_hours(data)
+            details['avg_age_hours'] = (aggregate.age_total_ns / 3.6e12 / aggregate.age_count
+                                        if aggregate.age_count > 0 else 0.0)
             
         elif data_type == 'numeric':
-            scores['precision'] = self._score_numeric_precision(data)
+            scores['precision'] = self._score_numeric_precision(aggregate)
             details['validations_applied'].append('precision')
-            details['decimal_places'] = self._analyze_decimal_places(data)
+            details['decimal_places'] = self._analyze_decimal_places(aggregate)
             
         elif data_type == 'categorical':
             if 'valid_values' in kde_config:
-                scores['reference'] = self._score_categorical_reference(data, kde_config['valid_values'])
+                scores['reference'] = (self._score_categorical_reference(aggregate.reference_valid / non_null)
+                                       if non_null else 0.0)
                 details['validations_applied'].append('reference')
-                details['invalid_categories'] = self._count_invalid_categories(data, kde_config['valid_values'])
+                details['invalid_categories'] = non_null - aggregate.reference_valid
         
         # 5. Uniqueness (if required)
         if kde_config.get('unique_required', False):
-            scores['uniqueness'] = self._score_uniqueness(data)
+            scores['uniqueness'] = self._score_uniqueness(aggregate.distinct_count / non_null) if non_null else 0.0
             details['validations_applied'].append('uniqueness')
-            details['duplicate_count'] = len(data) - data.nunique()
+            details['duplicate_count'] = total - aggregate.distinct_count
         
         # 6. Business Rule Validations
         if 'business_rules' in kde_config:
             for rule_name, rule_config in kde_config['business_rules'].items():
-                rule_score = self._apply_business_rule(data, rule_config)
+                rule_score = self._apply_business_rule(aggregate, rule_name, rule_config)
                 scores[f'business_rule_{rule_name}'] = rule_score
                 details['validations_applied'].append(f'business_rule_{rule_name}')
         
@@ -172,10 +608,8 @@ class StandaloneKDEScorer:
         
         return final_score, details
     
-    def _score_null_presence(self, data: pd.Series) -> float:
+    def _score_null_presence(self, null_rate: float) -> float:
         """Score null presence"""
-        null_rate = data.isnull().sum() / len(data)
-        
         if null_rate == 0.0:
             return 1.0
         elif null_rate <= 0.02:
@@ -191,137 +625,35 @@ class StandaloneKDEScorer:
         else:
             return 0.1
     
-    def _score_format(self, data: pd.Series, pattern: str) -> float:
-        """Score format validation"""
-        non_null_data = data.dropna()
-        if len(non_null_data) == 0:
-            return 0.0
-        
-        try:
-            valid_count = non_null_data.astype(str).str.match(pattern, na=False).sum()
-            valid_rate = valid_count / len(non_null_data)
-            
-            if valid_rate >= 0.98:
-                return 1.0
-            elif valid_rate >= 0.95:
-                return 0.9
-            elif valid_rate >= 0.85:
-                return 0.8
-            elif valid_rate >= 0.75:
-                return 0.7
-            elif valid_rate >= 0.60:
-                return 0.5
-            elif valid_rate >= 0.40:
-                return 0.3
-            else:
-                return 0.1
-        except Exception:
-            return 0.5  # Default if pattern matching fails
-    
-    def _score_range(self, data: pd.Series, valid_range: Dict) -> float:
-        """Score range validation"""
-        non_null_data = data.dropna()
-        if len(non_null_data) == 0:
-            return 0.0
-        
-        min_val = valid_range.get('min')
-        max_val = valid_range.get('max')
-        
-        in_range_count = 0
-        for value in non_null_data:
-            try:
-                # Convert to numeric if possible
-                if isinstance(value, str) and value.replace('.', '').replace('-', '').isdigit():
-                    value = float(value)
-                
-                in_range = True
-                if min_val is not None and value < min_val:
-                    in_range = False
-                if max_val is not None and value > max_val:
-                    in_range = False
-                
-                if in_range:
-                    in_range_count += 1
-                    
-            except (ValueError, TypeError):
-                continue
-        
-        range_rate = in_range_count / len(non_null_data)
-        
-        if range_rate >= 0.98:
+    def _score_valid_rate(self, valid_rate: float) -> float:
+        """Score format and range validation pass rates"""
+        if valid_rate >= 0.98:
             return 1.0
-        elif range_rate >= 0.95:
+        elif valid_rate >= 0.95:
             return 0.9
-        elif range_rate >= 0.85:
+        elif valid_rate >= 0.85:
             return 0.8
-        elif range_rate >= 0.75:
+        elif valid_rate >= 0.75:
             return 0.7
-        elif range_rate >= 0.60:
+        elif valid_rate >= 0.60:
             return 0.5
-        elif range_rate >= 0.40:
+        elif valid_rate >= 0.40:
             return 0.3
         else:
             return 0.1
     
-    def _score_timestamp_freshness(self, data: pd.Series) -> float:
+    def _score_timestamp_freshness(self, aggregate: KDEColumnAggregate) -> float:
         """Score timestamp freshness"""
-        non_null_data = data.dropna()
-        if len(non_null_data) == 0:
+        if aggregate.non_null_count == 0:
             return 0.0
         
-        current_time = datetime.now()
-        fresh_score = 0
-        
-        for timestamp_str in non_null_data:
-            try:
-                # Try multiple timestamp formats
-                ts = None
-                for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d', 
-                           '%m/%d/%Y %H:%M:%S', '%d/%m/%Y %H:%M:%S']:
-                    try:
-                        ts = datetime.strptime(str(timestamp_str).strip(), fmt)
-                        break
-                    except ValueError:
-                        continue
-                
-                if ts is None:
-                    # Try pandas parsing as fallback
-                    ts = pd.to_datetime(timestamp_str, errors='coerce')
-                    if pd.isna(ts):
-                        continue
-                
-                age = current_time - ts
-                
-                if age <= timedelta(minutes=30):
-                    fresh_score += 1.0  # Very fresh
-                elif age <= timedelta(hours=4):
-                    fresh_score += 0.9  # Fresh
-                elif age <= timedelta(hours=24):
-                    fresh_score += 0.7  # Acceptable
-                elif age <= timedelta(days=7):
-                    fresh_score += 0.4  # Stale
-                elif age <= timedelta(days=30):
-                    fresh_score += 0.2  # Very stale
-                else:
-                    fresh_score += 0.1  # Ancient
-                    
-            except Exception:
-                continue
-        
-        if len(non_null_data) > 0:
-            freshness_rate = fresh_score / len(non_null_data)
-            return max(0.0, min(1.0, freshness_rate))
-        else:
-            return 0.0
+        fresh_score = sum(count * score for count, (_, score)
+                          in zip(aggregate.freshness_counts, FRESHNESS_BUCKETS))
+        freshness_rate = fresh_score / aggregate.non_null_count
+        return max(0.0, min(1.0, freshness_rate))
     
-    def _score_uniqueness(self, data: pd.Series) -> float:
+    def _score_uniqueness(self, unique_rate: float) -> float:
         """Score uniqueness"""
-        non_null_data = data.dropna()
-        if len(non_null_data) == 0:
-            return 0.0
-        
-        unique_rate = len(non_null_data.unique()) / len(non_null_data)
-        
         if unique_rate >= 0.99:
             return 1.0
         elif unique_rate >= 0.98:
@@ -384,90 +716,13 @@ class StandaloneKDEScorer:
         
         return max(0.0, min(1.0, adjusted_score))
     
-    def _count_format_violations(self, data: pd.Series, pattern: str) -> int:
-        """Count format violations"""
-        non_null_data = data.dropna()
-        if len(non_null_data) == 0:
-            return 0
-        
-        try:
-            valid_count = non_null_data.astype(str).str.match(pattern, na=False).sum()
-            return len(non_null_data) - valid_count
-        except Exception:
-            return len(non_null_data)  # Assume all invalid if pattern fails
-
-    def _count_range_violations(self, data: pd.Series, valid_range: Dict) -> int:
-        """Count range violations"""
-        non_null_data = data.dropna()
-        if len(non_null_data) == 0:
-            return 0
-        
-        min_val = valid_range.get('min')
-        max_val = valid_range.get('max')
-        
-        violations = 0
-        for value in non_null_data:
-            try:
-                if isinstance(value, str) and value.replace('.', '').replace('-', '').isdigit():
-                    value = float(value)
-                
-                if min_val is not None and value < min_val:
-                    violations += 1
-                elif max_val is not None and value > max_val:
-                    violations += 1
-                    
-            except (ValueError, TypeError):
-                violations += 1
-        
-        return violations
-    
-    def _calculate_avg_age_hours(self, data: pd.Series) -> float:
-        """Calculate average age of timestamps in hours"""
-        non_null_data = data.dropna()
-        if len(non_null_data) == 0:
-            return 0.0
-        
-        current_time = datetime.now()
-        total_age_hours = 0
-        valid_timestamps = 0
-        
-        for timestamp_str in non_null_data:
-            try:
-                ts = pd.to_datetime(timestamp_str, errors='coerce')
-                if pd.notna(ts):
-                    age = current_time - ts
-                    total_age_hours += age.total_seconds() / 3600
-                    valid_timestamps += 1
-            except:
-                continue
-        
-        return total_age_hours / valid_timestamps if valid_timestamps > 0 else 0.0
-    
-    def _score_numeric_precision(self, data: pd.Series) -> float:
+    def _score_numeric_precision(self, aggregate: KDEColumnAggregate) -> float:
         """Score numeric precision"""
-        non_null_data = data.dropna()
-        if len(non_null_data) == 0:
+        if aggregate.non_null_count == 0:
             return 0.0
         
-        precision_count = 0
-        for value in non_null_data:
-            try:
-                # Check if it's a valid number
-                float_val = float(value)
-                # Check for reasonable precision (not too many decimal places)
-                str_val = str(value)
-                if '.' in str_val:
-                    decimal_places = len(str_val.split('.')[1])
-                    if decimal_places <= 6:  # Reasonable precision
-                        precision_count += 1
-                    else:
-                        precision_count += 0.5  # Excessive precision
-                else:
-                    precision_count += 1  # Integer is fine
-            except (ValueError, TypeError):
-                continue
-        
-        precision_rate = precision_count / len(non_null_data)
+        precision_count = aggregate.precision_full + 0.5 * aggregate.precision_excessive
+        precision_rate = precision_count / aggregate.non_null_count
         
         if precision_rate >= 0.95:
             return 1.0
@@ -480,41 +735,19 @@ class StandaloneKDEScorer:
         else:
             return 0.3
     
-    def _analyze_decimal_places(self, data: pd.Series) -> Dict[str, Any]:
+    def _analyze_decimal_places(self, aggregate: KDEColumnAggregate) -> Dict[str, Any]:
         """Analyze decimal places in numeric data"""
-        non_null_data = data.dropna()
-        decimal_places = []
-        
-        for value in non_null_data:
-            try:
-                str_val = str(value)
-                if '.' in str_val:
-                    places = len(str_val.split('.')[1])
-                    decimal_places.append(places)
-                else:
-                    decimal_places.append(0)
-            except:
-                continue
-        
-        if decimal_places:
+        if aggregate.decimal_places_count:
             return {
-                'avg_decimal_places': sum(decimal_places) / len(decimal_places),
-                'max_decimal_places': max(decimal_places),
-                'min_decimal_places': min(decimal_places)
+                'avg_decimal_places': aggregate.decimal_places_sum / aggregate.decimal_places_count,
+                'max_decimal_places': aggregate.decimal_places_max,
+                'min_decimal_places': aggregate.decimal_places_min
             }
         else:
             return {'avg_decimal_places': 0, 'max_decimal_places': 0, 'min_decimal_places': 0}
     
-    def _score_categorical_reference(self, data: pd.Series, valid_values: List[str]) -> float:
+    def _score_categorical_reference(self, valid_rate: float) -> float:
         """Score categorical reference validation"""
-        non_null_data = data.dropna()
-        if len(non_null_data) == 0:
-            return 0.0
-        
-        valid_set = set(valid_values)
-        valid_count = sum(1 for value in non_null_data if str(value) in valid_set)
-        valid_rate = valid_count / len(non_null_data)
-        
         if valid_rate >= 0.98:
             return 1.0
         elif valid_rate >= 0.95:
@@ -528,17 +761,7 @@ class StandaloneKDEScorer:
         else:
             return 0.3
     
-    def _count_invalid_categories(self, data: pd.Series, valid_values: List[str]) -> int:
-        """Count invalid categories"""
-        non_null_data = data.dropna()
-        if len(non_null_data) == 0:
-            return 0
-        
-        valid_set = set(valid_values)
-        invalid_count = sum(1 for value in non_null_data if str(value) not in valid_set)
-        return invalid_count
-    
-    def _apply_business_rule(self, data: pd.Series, rule_config: Dict) -> float:
+    def _apply_business_rule(self, aggregate: KDEColumnAggregate, rule_name: str, rule_config: Dict) -> float:
         """Apply business rule validation"""
         # This is a placeholder for business rule validation
         # In practice, this would implement specific business logic
@@ -546,19 +769,9 @@ class StandaloneKDEScorer:
         rule_type = rule_config.get('type', 'custom')
         
         if rule_type == 'not_negative':
-            non_null_data = data.dropna()
-            if len(non_null_data) == 0:
+            if aggregate.non_null_count == 0:
                 return 0.0
-            
-            valid_count = 0
-            for value in non_null_data:
-                try:
-                    if float(value) >= 0:
-                        valid_count += 1
-                except (ValueError, TypeError):
-                    continue
-            
-            return valid_count / len(non_null_data) if len(non_null_data) > 0 else 0.0
+            return aggregate.business_rule_valid.get(rule_name, 0) / aggregate.non_null_count
         
         # Default business rule score
         return 0.8
@@ -738,11 +951,17 @@ def main():
     parser.add_argument('--config', help='Path to KDE configuration YAML file')
     parser.add_argument('--output', help='Output file for results (JSON)')
     parser.add_argument('--flow-name', default='trading_data', help='Name of data flow')
+    parser.add_argument('--chunk-size', type=int,
+                        help='Stream the file in chunks of this many rows instead of loading it whole')
+    parser.add_argument('--workers', type=int, default=1, help='Processes scoring chunks in parallel')
+    parser.add_argument('--approximate-distinct', action='store_true',
+                        help='Estimate distinct KDE values with a fixed-size sketch (bounded memory, '
+                             'approximate uniqueness scores)')
     
     args = parser.parse_args()
     
     # Initialize scorer
-    scorer = StandaloneKDEScorer()
+    scorer = StandaloneKDEScorer(approximate_distinct=args.approximate_distinct)
     
     # Load configuration
     if args.config and os.path.exists(args.config):
@@ -757,12 +976,18 @@ def main():
     print(f"📂 Loading data from: {args.file_path}")
     
     try:
-        df = pd.read_csv(args.file_path)
-        print(f"✅ Loaded {len(df):,} records with {len(df.columns)} columns")
-        print()
-        
-        # Score the data
-        results = scorer.score_dataframe(df, args.flow_name)
+        if args.chunk_size:
+            # Only one chunk per worker is resident at a time; distinct hashes are
+            # also bounded with --approximate-distinct
+            results = scorer.score_file(args.file_path, args.flow_name,
+                                        chunk_size=args.chunk_size, max_workers=args.workers)
+        else:
+            df = pd.read_csv(args.file_path)
+            print(f"✅ Loaded {len(df):,} records with {len(df.columns)} columns")
+            print()
+            
+            # Score the data
+            results = scorer.score_dataframe(df, args.flow_name)
         
         # Generate report
         report = scorer.generate_assessment_report(results)
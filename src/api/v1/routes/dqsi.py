@@ -8,11 +8,20 @@ and providing data quality assessments using the DQSI framework.
 from flask import request, jsonify
 from datetime import datetime
 import logging
+import os
 import pandas as pd
 from typing import Dict, Any, List
 import json
 
 from ....core.dqsi_score import DataQualitySufficiencyIndex, DQSIConfig
+from ....core.dqsi_batch_executor import (
+    DQSIBatchExecutor,
+    calculator_pool,
+    config_fingerprint,
+    process_input_data
+)
+from ....core.dqsi_result_cache import ConfigVersion, DQSIResultCache
+from ....core.dqsi_trend_monitor import DQSITrendMonitor, dataset_digest
 from ....utils.logger import setup_logger
 from ..schemas.request_schemas import DQSIRequestSchema
 from ..schemas.response_schemas import DQSIResponseSchema
@@ -25,6 +34,38 @@ logger = setup_logger()
 # Initialize DQSI service
 dqsi_service = DataQualitySufficiencyIndex()
 
+# Process pool shared by batch requests
+dqsi_batch_executor = DQSIBatchExecutor()
+
+# Per-feed DQSI points for /dqsi/monitor, persisted when a state directory is configured
+dqsi_trend_monitor = DQSITrendMonitor(state_dir=os.getenv('DQSI_MONITOR_STATE_DIR'))
+
+
+def _build_result_cache() -> DQSIResultCache:
+    """Result cache for resubmitted datasets, with a Redis tier when one is configured"""
+    redis_client = None
+    redis_url = os.getenv('DQSI_RESULT_CACHE_REDIS_URL')
+    if redis_url:
+        try:
+            import redis
+            redis_client = redis.Redis.from_url(redis_url)
+        except Exception as e:
+            logger.warning(f"DQSI result cache Redis tier disabled: {e}")
+    
+    # Code-level defaults and the DQ config file both version cached results
+    config_version = ConfigVersion(
+        paths=[os.getenv('DQ_CONFIG_PATH', 'config/dq_config.yaml')],
+        static=vars(DQSIConfig())
+    )
+    return DQSIResultCache(
+        config_version=config_version,
+        max_bytes=int(os.getenv('DQSI_RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+        redis_client=redis_client
+    )
+
+
+dqsi_result_cache = _build_result_cache()
+
 
 @api_v1.route('/dqsi/calculate', methods=['POST'])
 @handle_api_errors
@@ -53,6 +94,24 @@ def calculate_dqsi_score():
         enabled_dimensions = data.get('enabled_dimensions', [])
         include_recommendations = data.get('include_recommendations', True)
         
+        # Identical resubmissions are answered from the result cache
+        cache_key = dqsi_result_cache.result_key(
+            'calculate', dataset,
+            role=data.get('role'),
+            strategy='enhanced' if data.get('role_aware') else 'traditional',
+            options={
+                'dimension_configs': dimension_configs,
+                'custom_weights': custom_weights,
+                'enabled_dimensions': enabled_dimensions,
+                'include_recommendations': include_recommendations,
+                'quality_level': data.get('quality_level'),
+                'comparison_types': data.get('comparison_types')
+            }
+        )
+        cached_response = dqsi_result_cache.get(cache_key)
+        if cached_response is not None:
+            return jsonify({**cached_response, 'timestamp': datetime.utcnow().isoformat(), 'cached': True})
+        
         # Create DQSI configuration with role-aware support
         config = DQSIConfig()
         if custom_weights:
@@ -114,6 +173,8 @@ def calculate_dqsi_score():
             )
             response['calculation_type'] = 'traditional'
         
+        dqsi_result_cache.put(cache_key, response)
+        
         # Log results
         overall_score = enhanced_results.get('overall_score', 0.0) if config.role_aware else metrics.overall_score
         logger.info(f"DQSI calculated: {overall_score:.3f} for dataset with {_get_data_size(processed_data)} records")
@@ -149,34 +210,10 @@ def calculate_batch_dqsi():
         custom_weights = data.get('custom_weights', {})
         include_comparison = data.get('include_comparison', True)
         
-        # Create DQSI configuration
-        config = DQSIConfig()
-        if custom_weights:
-            config.weights.update(custom_weights)
-        
-        dqsi_calculator = DataQualitySufficiencyIndex(config)
-        
-        # Process batch analysis
-        batch_results = []
-        for i, dataset_info in enumerate(batch_data):
-            dataset_id = dataset_info.get('id', f'dataset_{i}')
-            dataset = dataset_info.get('dataset', {})
-            
-            # Process data
-            processed_data = _process_input_data(dataset)
-            
-            # Calculate DQSI metrics
-            metrics = dqsi_calculator.calculate_dqsi(processed_data, dimension_configs)
-            
-            # Generate report
-            report = dqsi_calculator.generate_report(metrics)
-            
-            batch_results.append({
-                'dataset_id': dataset_id,
-                'dqsi_score': metrics.overall_score,
-                'dimension_scores': metrics.dimension_scores,
-                'report': report
-            })
+        # Score datasets across the worker pool; results keep batch order
+        results = dqsi_batch_executor.run(batch_data, dimension_configs, custom_weights)
+        batch_results = [r for r in results if 'error' not in r]
+        failed_results = [r for r in results if 'error' in r]
         
         # Generate comparison analysis if requested
         comparison_analysis = {}
@@ -187,11 +224,14 @@ def calculate_batch_dqsi():
             'timestamp': datetime.utcnow().isoformat(),
             'batch_id': f"dqsi_batch_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
             'results': batch_results,
+            'failed_datasets': failed_results,
             'summary': {
-                'total_datasets': len(batch_results),
-                'average_dqsi': sum(r['dqsi_score'] for r in batch_results) / len(batch_results),
-                'best_performer': max(batch_results, key=lambda x: x['dqsi_score'])['dataset_id'],
-                'worst_performer': min(batch_results, key=lambda x: x['dqsi_score'])['dataset_id']
+                'total_datasets': len(results),
+                'successful_datasets': len(batch_results),
+                'failed_datasets': len(failed_results),
+                'average_dqsi': sum(r['dqsi_score'] for r in batch_results) / len(batch_results) if batch_results else 0.0,
+                'best_performer': max(batch_results, key=lambda x: x['dqsi_score'])['dataset_id'] if batch_results else None,
+                'worst_performer': min(batch_results, key=lambda x: x['dqsi_score'])['dataset_id'] if batch_results else None
             },
             'comparison_analysis': comparison_analysis
         }
@@ -232,41 +272,38 @@ def monitor_dqsi_trends():
         })
         trend_analysis_window = data.get('trend_analysis_window', 7)  # days
         
-        # Create DQSI configuration
-        config = DQSIConfig()
-        if data.get('custom_weights'):
-            config.weights.update(data['custom_weights'])
-        
-        dqsi_calculator = DataQualitySufficiencyIndex(config)
+        # Reuse the pre-built calculator for this configuration
+        dqsi_calculator = calculator_pool.get(data.get('custom_weights'))
+        dimension_configs = data.get('dimension_configs', {})
         
-        # Process time series analysis
-        time_series_results = []
-        for entry in time_series_data:
-            timestamp = entry.get('timestamp', datetime.utcnow().isoformat())
-            dataset = entry.get('dataset', {})
-            
-            # Process data
-            processed_data = _process_input_data(dataset)
-            
-            # Calculate DQSI metrics
-            metrics = dqsi_calculator.calculate_dqsi(processed_data, data.get('dimension_configs', {}))
-            
-            time_series_results.append({
-                'timestamp': timestamp,
+        def score_entry(dataset: Dict[str, Any]) -> Dict[str, Any]:
+            metrics = dqsi_calculator.calculate_dqsi(_process_input_data(dataset), dimension_configs)
+            return {
                 'dqsi_score': metrics.overall_score,
                 'dimension_scores': metrics.dimension_scores,
                 'status': dqsi_calculator._get_overall_status(metrics.overall_score)
-            })
-        
-        # Generate trend analysis
-        trend_analysis = _generate_trend_analysis(time_series_results, trend_analysis_window)
+            }
         
-        # Generate alerts
-        alerts = _generate_dqsi_alerts(time_series_results, alerting_thresholds)
+        # Named feeds keep their scored points between polls; anonymous
+        # requests are scored on a throwaway monitor
+        feed_id = data.get('feed_id')
+        monitor = dqsi_trend_monitor if feed_id else DQSITrendMonitor()
+        monitoring = monitor.observe(
+            feed_id or 'request',
+            time_series_data,
+            score_entry,
+            config_key=f"{config_fingerprint(data.get('custom_weights'))}:{dataset_digest(dimension_configs)}",
+            window=trend_analysis_window,
+            thresholds=alerting_thresholds
+        )
+        time_series_results = monitoring['time_series_results']
+        trend_analysis = monitoring['trend_analysis']
+        alerts = monitoring['alerts']
         
         response = {
             'timestamp': datetime.utcnow().isoformat(),
             'monitoring_id': f"dqsi_monitor_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
+            'feed_id': feed_id,
             'time_series_results': time_series_results,
             'trend_analysis': trend_analysis,
             'alerts': alerts,
@@ -304,6 +341,7 @@ def get_dqsi_configuration():
                 'thresholds': config.thresholds,
                 'enabled_dimensions': config.enabled_dimensions
             },
+            'result_cache': dqsi_result_cache.get_metrics(),
             'available_dimensions': [
                 {
                     'name': 'completeness',
@@ -378,12 +416,29 @@ def validate_data_quality():
             }
         })
         
-        # Create DQSI configuration
-        config = DQSIConfig()
-        if data.get('custom_weights'):
-            config.weights.update(data['custom_weights'])
+        # Identical resubmissions are answered from the result cache
+        cache_key = dqsi_result_cache.result_key(
+            'validate', dataset,
+            role=data.get('role'),
+            strategy='traditional',
+            options={
+                'dimension_configs': data.get('dimension_configs', {}),
+                'custom_weights': data.get('custom_weights'),
+                'validation_thresholds': validation_thresholds
+            }
+        )
+        cached_response = dqsi_result_cache.get(cache_key)
+        if cached_response is not None:
+            now = datetime.utcnow()
+            return jsonify({
+                **cached_response,
+                'timestamp': now.isoformat(),
+                'validation_id': f"dqsi_validation_{now.strftime('%Y%m%d_%H%M%S')}",
+                'cached': True
+            })
         
-        dqsi_calculator = DataQualitySufficiencyIndex(config)
+        # Reuse the pre-built calculator for this configuration
+        dqsi_calculator = calculator_pool.get(data.get('custom_weights'))
         
         # Process data
         processed_data = _process_input_data(dataset)
@@ -411,6 +466,7 @@ def validate_data_quality():
             'thresholds_used': validation_thresholds
         }
         
+        dqsi_result_cache.put(cache_key, response)
         return jsonify(response)
         
     except Exception as e:
@@ -422,27 +478,7 @@ def validate_data_quality():
 
 def _process_input_data(dataset: Dict[str, Any]) -> Any:
     """Process input data into appropriate format for DQSI calculation"""
-    try:
-        # If dataset contains 'format' field, process accordingly
-        data_format = dataset.get('format', 'dict')
-        
-        if data_format == 'dataframe' and 'data' in dataset:
-            # Convert to pandas DataFrame
-            return pd.DataFrame(dataset['data'])
-        elif data_format == 'csv' and 'csv_data' in dataset:
-            # Process CSV data
-            import io
-            return pd.read_csv(io.StringIO(dataset['csv_data']))
-        elif data_format == 'json' and 'json_data' in dataset:
-            # Process JSON data
-            return dataset['json_data']
-        else:
-            # Return as-is for dict format
-            return dataset.get('data', dataset)
-    
-    except Exception as e:
-        logger.error(f"Error processing input data: {e}")
-        return dataset
+    return process_input_data(dataset)
 
 
 def _get_data_size(data: Any) -> int:
@@ -502,93 +538,6 @@ def _generate_comparison_analysis(batch_results: List[Dict[str, Any]]) -> Dict[s
         return {}
 
 
-def _generate_trend_analysis(time_series_results: List[Dict[str, Any]], window: int) -> Dict[str, Any]:
-    """Generate trend analysis for time series data"""
-    try:
-        if len(time_series_results) < 2:
-            return {'trend_direction': 'insufficient_data'}
-        
-        # Calculate trend over the window
-        recent_scores = [r['dqsi_score'] for r in time_series_results[-window:]]
-        
-        if len(recent_scores) < 2:
-            return {'trend_direction': 'insufficient_data'}
-        
-        # Simple linear trend calculation
-        x = list(range(len(recent_scores)))
-        n = len(recent_scores)
-        
-        # Calculate slope
-        sum_x = sum(x)
-        sum_y = sum(recent_scores)
-        sum_xy = sum(x[i] * recent_scores[i] for i in range(n))
-        sum_x2 = sum(xi ** 2 for xi in x)
-        
-        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x ** 2)
-        
-        # Determine trend direction
-        if slope > 0.01:
-            trend_direction = 'improving'
-        elif slope < -0.01:
-            trend_direction = 'declining'
-        else:
-            trend_direction = 'stable'
-        
-        return {
-            'trend_direction': trend_direction,
-            'trend_slope': slope,
-            'window_size': window,
-            'recent_average': sum(recent_scores) / len(recent_scores),
-            'volatility': (sum((x - sum(recent_scores) / len(recent_scores)) ** 2 for x in recent_scores) / len(recent_scores)) ** 0.5
-        }
-    
-    except Exception as e:
-        logger.error(f"Error generating trend analysis: {e}")
-        return {'trend_direction': 'error'}
-
-
-def _generate_dqsi_alerts(time_series_results: List[Dict[str, Any]], thresholds: Dict[str, float]) -> List[Dict[str, Any]]:
-    """Generate alerts based on DQSI scores and thresholds"""
-    alerts = []
-    
-    try:
-        for i, result in enumerate(time_series_results):
-            score = result['dqsi_score']
-            timestamp = result['timestamp']
-            
-            # Check for threshold violations
-            if score <= thresholds.get('critical', 0.4):
-                alerts.append({
-                    'timestamp': timestamp,
-                    'severity': 'critical',
-                    'message': f'DQSI score ({score:.3f}) below critical threshold ({thresholds.get("critical", 0.4)})',
-                    'dimension_details': result['dimension_scores']
-                })
-            elif score <= thresholds.get('warning', 0.6):
-                alerts.append({
-                    'timestamp': timestamp,
-                    'severity': 'warning',
-                    'message': f'DQSI score ({score:.3f}) below warning threshold ({thresholds.get("warning", 0.6)})',
-                    'dimension_details': result['dimension_scores']
-                })
-            
-            # Check for sudden drops
-            if i > 0:
-                prev_score = time_series_results[i-1]['dqsi_score']
-                if score < prev_score - 0.1:  # 10% drop
-                    alerts.append({
-                        'timestamp': timestamp,
-                        'severity': 'warning',
-                        'message': f'Sudden DQSI drop detected: {prev_score:.3f} → {score:.3f}',
-                        'dimension_details': result['dimension_scores']
-                    })
-    
-    except Exception as e:
-        logger.error(f"Error generating DQSI alerts: {e}")
-    
-    return alerts
-
-
 def _perform_validation(metrics: Any, thresholds: Dict[str, Any]) -> Dict[str, Any]:
     """Perform data quality validation against thresholds"""
     try:
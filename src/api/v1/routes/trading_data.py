@@ -7,6 +7,7 @@ for analyst investigations of market abuse alerts.
 
 from flask import Blueprint, request, jsonify, send_file
 from datetime import datetime
+from dataclasses import asdict
 import logging
 import io
 import csv
@@ -288,29 +289,10 @@ def analyze_raw_data_with_context(alert_id):
                     else:
                         risk_scores = {'overall_score': overall_risk}
                     
-                    rationale = alert_generator.generate_regulatory_rationale(
+                    rationale = alert_generator.regulatory_rationale_handle(
                         alert, risk_scores, processed_data
                     )
-                    regulatory_rationales.append({
-                        'alert_id': alert['id'],
-                        'deterministic_narrative': rationale.deterministic_narrative,
-                        'inference_paths': [
-                            {
-                                'node_name': path.node_name,
-                                'evidence_value': path.evidence_value,
-                                'probability': path.probability,
-                                'contribution': path.contribution,
-                                'rationale': path.rationale,
-                                'confidence': path.confidence,
-                                'regulatory_relevance': path.regulatory_relevance
-                            }
-                            for path in rationale.inference_paths
-                        ],
-                        'voi_analysis': rationale.voi_analysis,
-                        'sensitivity_report': rationale.sensitivity_report,
-                        'regulatory_frameworks': rationale.regulatory_frameworks,
-                        'audit_trail': rationale.audit_trail
-                    })
+                    regulatory_rationales.append(asdict(rationale.get()))
                 except Exception as e:
                     logger.error(f"Error generating regulatory rationale for alert {alert['id']}: {str(e)}")
         
@@ -359,30 +341,10 @@ def search_raw_trading_data():
         if not search_criteria:
             return jsonify({'error': 'No search criteria provided'}), 400
         
-        # Extract search parameters
-        trader_id = search_criteria.get('trader_id')
-        instrument = search_criteria.get('instrument')
-        start_date = search_criteria.get('start_date')
-        end_date = search_criteria.get('end_date')
-        direction = search_criteria.get('direction')
-        min_quantity = search_criteria.get('min_quantity')
-        max_quantity = search_criteria.get('max_quantity')
-        min_price = search_criteria.get('min_price')
-        max_price = search_criteria.get('max_price')
-        
-        # Search through cached data
-        matching_trades = []
-        matching_orders = []
-        
-        for alert_id, trades in trading_data_service.raw_trades_cache.items():
-            for trade in trades:
-                if _matches_criteria(trade, search_criteria):
-                    matching_trades.append(trade.to_dict())
-        
-        for alert_id, orders in trading_data_service.raw_orders_cache.items():
-            for order in orders:
-                if _matches_order_criteria(order, search_criteria):
-                    matching_orders.append(order.to_dict())
+        # Search cached data through the service's secondary indexes
+        results = trading_data_service.search_raw_trading_data(search_criteria)
+        matching_trades = [trade.to_dict() for trade in results['trades']]
+        matching_orders = [order.to_dict() for order in results['orders']]
         
         response = {
             'status': 'success',
@@ -434,60 +396,3 @@ def _create_csv_content(raw_data):
     
     return output.getvalue()
 
-
-def _matches_criteria(trade, criteria):
-    """Check if trade matches search criteria"""
-    if criteria.get('trader_id') and trade.trader_id != criteria['trader_id']:
-        return False
-    
-    if criteria.get('instrument') and trade.instrument != criteria['instrument']:
-        return False
-    
-    if criteria.get('start_date') and trade.execution_timestamp < criteria['start_date']:
-        return False
-    
-    if criteria.get('end_date') and trade.execution_timestamp > criteria['end_date']:
-        return False
-    
-    if criteria.get('direction') and trade.direction.value != criteria['direction']:
-        return False
-    
-    if criteria.get('min_quantity') and trade.quantity < criteria['min_quantity']:
-        return False
-    
-    if criteria.get('max_quantity') and trade.quantity > criteria['max_quantity']:
-        return False
-    
-    if criteria.get('min_price') and trade.executed_price < criteria['min_price']:
-        return False
-    
-    if criteria.get('max_price') and trade.executed_price > criteria['max_price']:
-        return False
-    
-    return True
-
-
-def _matches_order_criteria(order, criteria):
-    """Check if order matches search criteria"""
-    if criteria.get('trader_id') and order.trader_id != criteria['trader_id']:
-        return False
-    
-    if criteria.get('instrument') and order.instrument != criteria['instrument']:
-        return False
-    
-    if criteria.get('start_date') and order.order_timestamp < criteria['start_date']:
-        return False
-    
-    if criteria.get('end_date') and order.order_timestamp > criteria['end_date']:
-        return False
-    
-    if criteria.get('direction') and order.side.value != criteria['direction']:
-        return False
-    
-    if criteria.get('min_quantity') and order.quantity < criteria['min_quantity']:
-        return False
-    
-    if criteria.get('max_quantity') and order.quantity > criteria['max_quantity']:
-        return False
-    
-    return True
\ No newline at end of file
@@ -1,13 +1,15 @@
 import os
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import logging
 from datetime import datetime
+from dataclasses import asdict
 import traceback
 
 from core.bayesian_engine import BayesianEngine
 from core.data_processor import DataProcessor
 from core.alert_generator import AlertGenerator
+from core.regulatory_bulk_export import RegulatoryBulkExporter, EXPORT_FORMATS
 from core.risk_calculator import RiskCalculator
 from core.trading_data_service import TradingDataService
 from utils.config import Config
@@ -29,6 +31,7 @@ logger = setup_logger()
 bayesian_engine = BayesianEngine()
 data_processor = DataProcessor()
 alert_generator = AlertGenerator()
+bulk_exporter = RegulatoryBulkExporter(alert_generator)
 risk_calculator = RiskCalculator()
 trading_data_service = TradingDataService()
 
@@ -92,29 +95,10 @@ def analyze_trading_data():
                     else:
                         risk_scores = {'overall_score': overall_risk}
                     
-                    rationale = alert_generator.generate_regulatory_rationale(
+                    rationale = alert_generator.regulatory_rationale_handle(
                         alert, risk_scores, processed_data
                     )
-                    regulatory_rationales.append({
-                        'alert_id': alert['id'],
-                        'deterministic_narrative': rationale.deterministic_narrative,
-                        'inference_paths': [
-                            {
-                                'node_name': path.node_name,
-                                'evidence_value': path.evidence_value,
-                                'probability': path.probability,
-                                'contribution': path.contribution,
-                                'rationale': path.rationale,
-                                'confidence': path.confidence,
-                                'regulatory_relevance': path.regulatory_relevance
-                            }
-                            for path in rationale.inference_paths
-                        ],
-                        'voi_analysis': rationale.voi_analysis,
-                        'sensitivity_report': rationale.sensitivity_report,
-                        'regulatory_frameworks': rationale.regulatory_frameworks,
-                        'audit_trail': rationale.audit_trail
-                    })
+                    regulatory_rationales.append(asdict(rationale.get()))
                 except Exception as e:
                     logger.error(f"Error generating regulatory rationale for alert {alert['id']}: {str(e)}")
         
@@ -326,6 +310,40 @@ def export_regulatory_csv(alert_id):
         logger.error(f"Error exporting regulatory CSV: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/v1/export/bulk', methods=['POST'])
+def export_regulatory_pack():
+    """Stream STOR records or CSV rows for a date range as one gzip file"""
+    try:
+        data = request.get_json() or {}
+        
+        export_format = data.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': f'format must be one of {list(EXPORT_FORMATS)}'}), 400
+        
+        try:
+            start = datetime.fromisoformat(data['start']) if data.get('start') else None
+            end = datetime.fromisoformat(data['end']) if data.get('end') else None
+        except ValueError as e:
+            return jsonify({'error': f'Invalid date range: {str(e)}'}), 400
+        
+        alerts = bulk_exporter.select_alerts(start, end, data.get('filters'))
+        # Clients resume an interrupted download by passing the records already received
+        skip = int(data.get('skip', 0))
+        extension = 'csv' if export_format == 'csv' else 'jsonl'
+        
+        return Response(
+            stream_with_context(bulk_exporter.iter_gzip(alerts, export_format, skip=skip)),
+            mimetype='application/gzip',
+            headers={
+                'Content-Disposition': f'attachment; filename=regulatory_export.{extension}.gz',
+                'X-Record-Count': str(len(alerts))
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"Error exporting regulatory pack: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
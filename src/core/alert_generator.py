@@ -3,7 +3,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import logging
 
-from .regulatory_explainability import RegulatoryExplainability, RegulatoryRationale, STORRecord
+from .regulatory_explainability import (
+    RegulatoryExplainability, RegulatoryRationale, STORRecord, LazyRegulatoryRationale,
+    build_regulatory_explainability
+)
+from .regulatory_bulk_export import RegulatoryBulkExporter
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +34,14 @@ class AlertGenerator:
         }
         
         self.alert_history = []
-        self.regulatory_explainability = RegulatoryExplainability()
+        self.regulatory_explainability = build_regulatory_explainability()
+        
+        # Alert type -> regulatory explainability model type
+        self.rationale_model_types = {
+            'INSIDER_DEALING': 'insider_dealing',
+            'SPOOFING': 'spoofing',
+            'OVERALL_RISK': 'market_manipulation'
+        }
     
     def generate_alerts(self, processed_data: Dict, insider_score: Dict, 
                        spoofing_score: Dict, overall_risk: float) -> List[Dict]:
@@ -384,13 +395,19 @@ class AlertGenerator:
                                     processed_data: Dict) -> RegulatoryRationale:
         """Generate regulatory rationale for an alert"""
         try:
-            return self.regulatory_explainability.generate_regulatory_rationale(
-                alert, risk_scores, processed_data
-            )
+            return self.regulatory_rationale_handle(alert, risk_scores, processed_data).get()
         except Exception as e:
             logger.error(f"Error generating regulatory rationale: {str(e)}")
             raise
     
+    def regulatory_rationale_handle(self, alert: Dict, risk_scores: Dict, 
+                                    processed_data: Dict) -> LazyRegulatoryRationale:
+        """Deferred regulatory rationale for an alert, generated on first access"""
+        model_type = self.rationale_model_types.get(alert.get('type'), 'market_manipulation')
+        return self.regulatory_explainability.lazy_rationale(
+            alert.get('id'), risk_scores, processed_data, model_type
+        )
+    
     def export_stor_report(self, alert: Dict, risk_scores: Dict, 
                           processed_data: Dict) -> STORRecord:
         """Export alert in STOR format"""
@@ -409,4 +426,21 @@ class AlertGenerator:
             return self.regulatory_explainability.export_csv_report(rationale, filename)
         except Exception as e:
             logger.error(f"Error exporting regulatory CSV: {str(e)}")
+            raise
+    
+    def export_regulatory_pack(self, path: str, start: Optional[datetime] = None,
+                               end: Optional[datetime] = None, filters: Optional[Dict] = None,
+                               export_format: str = 'csv', progress=None, resume: bool = True) -> Dict:
+        """Export all stored alerts in a date range into one resumable gzip file"""
+        try:
+            exporter = RegulatoryBulkExporter(self)
+            alerts = exporter.select_alerts(start, end, filters)
+            job = {
+                'start': start.isoformat() if start else None,
+                'end': end.isoformat() if end else None,
+                'filters': filters or {}
+            }
+            return exporter.export(path, alerts, export_format, progress=progress, resume=resume, job=job)
+        except Exception as e:
+            logger.error(f"Error exporting regulatory pack: {str(e)}")
             raise
\ No newline at end of file
@@ -0,0 +1,321 @@
+"""
+Coverage Baseline Store
+
+Daily per-feed volume/value aggregates for the coverage synthetic KDE.
+Records are folded into day totals as they are scored, and rolling
+baselines (e.g. the last ``coverage_baseline_days`` days) are answered in
+constant time from prefix sums, so callers no longer have to ship history
+with each request. Feed state is persisted to local disk and reloaded on
+restart.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from datetime import date, datetime
+from typing import Dict, List, Optional, Any, Iterable, Union
+
+logger = logging.getLogger(__name__)
+
+RECORDS = 'records'
+VOLUME = 'volume'
+VALUE = 'value'
+
+
+def evidence_totals(evidence: Dict[str, Any]) -> Dict[str, float]:
+    """Volume/value contributions of one record, measured as coverage scoring does"""
+    totals = {RECORDS: 1, VOLUME: len(evidence), VALUE: 0.0}
+    for kde_name, value in evidence.items():
+        # Missing values (None/NaN) count towards neither presence nor value
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            continue
+        totals[f"kde:{kde_name}:count"] = 1
+        if isinstance(value, (int, float)):
+            totals[VALUE] += float(value)
+            totals[f"kde:{kde_name}:value"] = float(value)
+    return totals
+
+
+def _day_number(day: Union[date, datetime, str, None]) -> int:
+    if day is None:
+        day = date.today()
+    elif isinstance(day, str):
+        day = datetime.fromisoformat(day)
+    if isinstance(day, datetime):
+        day = day.date()
+    return day.toordinal()
+
+
+class FeedBaseline:
+    """
+    Dense day-indexed totals of one feed with lazily rebuilt prefix sums
+
+    ``prefix[metric][i]`` is the sum of the first ``i`` days, so any window
+    sum is a single subtraction. Appending to the latest day keeps the
+    prefix valid up to that day; late data for an earlier day marks the
+    prefix dirty from that day and it is rebuilt on the next query.
+    """
+
+    def __init__(self, feed_id: str, first_day: int):
+        self.feed_id = feed_id
+        self.first_day = first_day
+        self.daily: Dict[str, List[float]] = {}
+        self.n_days = 0
+        self._prefix: Dict[str, List[float]] = {}
+        self._dirty_from: Optional[int] = 0
+
+    @property
+    def last_day(self) -> int:
+        return self.first_day + self.n_days - 1
+
+    def add(self, day: int, totals: Dict[str, float]) -> None:
+        """Add one day's contributions"""
+        if day < self.first_day:
+            # Late data before the first stored day: shift the series right
+            shift = self.first_day - day
+            for series in self.daily.values():
+                series[:0] = [0.0] * shift
+            self.first_day = day
+            self.n_days += shift
+            self._dirty_from = 0
+
+        index = day - self.first_day
+        if index >= self.n_days:
+            grow = index + 1 - self.n_days
+            for series in self.daily.values():
+                series.extend([0.0] * grow)
+            self.n_days = index + 1
+
+        for metric, amount in totals.items():
+            series = self.daily.get(metric)
+            if series is None:
+                series = self.daily[metric] = [0.0] * self.n_days
+                self._mark_dirty(0)
+            series[index] += amount
+        self._mark_dirty(index)
+
+    def window_sum(self, metric: str, start_day: int, end_day: int) -> float:
+        """Sum of ``metric`` over days ``start_day``..``end_day`` inclusive"""
+        start = max(start_day - self.first_day, 0)
+        end = min(end_day - self.first_day, self.n_days - 1)
+        if end < start or metric not in self.daily:
+            return 0.0
+        self._rebuild_prefix()
+        prefix = self._prefix[metric]
+        return prefix[end + 1] - prefix[start]
+
+    def trim(self, keep_from_day: int) -> None:
+        """Drop days before ``keep_from_day``"""
+        drop = keep_from_day - self.first_day
+        if drop <= 0:
+            return
+        drop = min(drop, self.n_days)
+        for series in self.daily.values():
+            del series[:drop]
+        self.first_day += drop
+        self.n_days -= drop
+        self._dirty_from = 0
+
+    def metrics(self) -> List[str]:
+        return list(self.daily)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'feed_id': self.feed_id, 'first_day': self.first_day, 'n_days': self.n_days, 'daily': self.daily}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> 'FeedBaseline':
+        feed = cls(payload['feed_id'], payload['first_day'])
+        feed.n_days = payload['n_days']
+        feed.daily = {metric: [float(v) for v in series] for metric, series in payload['daily'].items()}
+        return feed
+
+    def _mark_dirty(self, index: int) -> None:
+        if self._dirty_from is None or index < self._dirty_from:
+            self._dirty_from = index
+
+    def _rebuild_prefix(self) -> None:
+        if self._dirty_from is None:
+            return
+        for metric, series in self.daily.items():
+            prefix = self._prefix.get(metric)
+            # Days appended after a gap leave the prefix short of the dirty
+            # index, so resume from the last day it actually covers
+            start = self._dirty_from if prefix is None else min(self._dirty_from, len(prefix) - 1)
+            if prefix is None or start == 0:
+                prefix = [0.0]
+                begin = 0
+            else:
+                del prefix[start + 1:]
+                begin = start
+            running = prefix[-1]
+            for amount in series[begin:]:
+                running += amount
+                prefix.append(running)
+            self._prefix[metric] = prefix
+        self._dirty_from = None
+
+
+class CoverageBaselineStore:
+    """
+    Rolling per-feed coverage baselines
+
+    Args:
+        state_dir: Directory for per-feed snapshots; in-memory only when None
+        baseline_days: Default length of the baseline window in days
+        retention_days: Days of history kept per feed
+        autosave_every: Records between snapshots of a feed (flush() saves immediately)
+    """
+
+    def __init__(self, state_dir: Optional[str] = None, baseline_days: int = 30,
+                 retention_days: int = 120, autosave_every: int = 1000):
+        self.state_dir = state_dir
+        self.baseline_days = baseline_days
+        self.retention_days = max(retention_days, baseline_days + 1)
+        self.autosave_every = autosave_every
+
+        self._feeds: Dict[str, FeedBaseline] = {}
+        self._unsaved: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    def record(self, feed_id: str, evidence: Dict[str, Any],
+               day: Union[date, datetime, str, None] = None) -> None:
+        """Fold one scored record into the feed's daily aggregates"""
+        self.add_totals(feed_id, evidence_totals(evidence), day)
+
+    def record_batch(self, feed_id: str, records: Iterable[Dict[str, Any]],
+                     day: Union[date, datetime, str, None] = None) -> None:
+        """Fold a batch of records observed on the same day"""
+        totals: Dict[str, float] = {}
+        for evidence in records:
+            for metric, amount in evidence_totals(evidence).items():
+                totals[metric] = totals.get(metric, 0.0) + amount
+        if totals:
+            self.add_totals(feed_id, totals, day)
+
+    def add_totals(self, feed_id: str, totals: Dict[str, float],
+                   day: Union[date, datetime, str, None] = None) -> None:
+        """
+        Add pre-aggregated contributions for one day
+
+        Args:
+            feed_id: Feed identifier
+            totals: ``records``, ``volume``, ``value`` and ``kde:<name>:count|value`` sums
+            day: Day the records belong to (defaults to today)
+        """
+        day_number = _day_number(day)
+        with self._lock:
+            feed = self._get_feed(feed_id, day_number)
+            feed.add(day_number, totals)
+            if day_number - feed.first_day >= self.retention_days * 2:
+                feed.trim(feed.last_day - self.retention_days + 1)
+
+            self._unsaved[feed_id] = self._unsaved.get(feed_id, 0) + int(totals.get(RECORDS, 0))
+            if self.state_dir and self._unsaved[feed_id] >= self.autosave_every:
+                self._save_feed(feed)
+
+    def get_baseline(self, feed_id: str, as_of: Union[date, datetime, str, None] = None,
+                     days: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Per-record averages over the ``days`` days before ``as_of``
+
+        The ``as_of`` day itself is excluded so a day's records never
+        dilute their own baseline.
+
+        Returns:
+            ``volume``/``value`` baseline for coverage scoring plus per-KDE
+            presence rates and average values, or None without history
+        """
+        days = days or self.baseline_days
+        end_day = _day_number(as_of) - 1
+        start_day = end_day - days + 1
+
+        with self._lock:
+            feed = self._get_feed(feed_id)
+            if feed is None:
+                return None
+
+            records = feed.window_sum(RECORDS, start_day, end_day)
+            if records <= 0:
+                return None
+
+            kde_baselines = {}
+            for metric in feed.metrics():
+                if metric.startswith('kde:') and metric.endswith(':count'):
+                    kde_name = metric[4:-6]
+                    present = feed.window_sum(metric, start_day, end_day)
+                    kde_baselines[kde_name] = {
+                        'presence_rate': present / records,
+                        'value': feed.window_sum(f"kde:{kde_name}:value", start_day, end_day) / records
+                    }
+
+            return {
+                'volume': feed.window_sum(VOLUME, start_day, end_day) / records,
+                'value': feed.window_sum(VALUE, start_day, end_day) / records,
+                'records': int(records),
+                'window_days': days,
+                'window_start': date.fromordinal(start_day).isoformat(),
+                'window_end': date.fromordinal(end_day).isoformat(),
+                'kde': kde_baselines
+            }
+
+    def flush(self) -> None:
+        """Persist every feed with unsaved records"""
+        if not self.state_dir:
+            return
+        with self._lock:
+            for feed_id, unsaved in list(self._unsaved.items()):
+                if unsaved and feed_id in self._feeds:
+                    self._save_feed(self._feeds[feed_id])
+
+    def reset_feed(self, feed_id: str) -> None:
+        """Forget a feed's history"""
+        with self._lock:
+            self._feeds.pop(feed_id, None)
+            self._unsaved.pop(feed_id, None)
+            path = self._snapshot_path(feed_id)
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    def _get_feed(self, feed_id: str, create_day: Optional[int] = None) -> Optional[FeedBaseline]:
+        feed = self._feeds.get(feed_id)
+        if feed is None:
+            feed = self._load_feed(feed_id)
+            if feed is None and create_day is not None:
+                feed = FeedBaseline(feed_id, create_day)
+            if feed is not None:
+                self._feeds[feed_id] = feed
+        return feed
+
+    def _snapshot_path(self, feed_id: str) -> Optional[str]:
+        if not self.state_dir:
+            return None
+        digest = hashlib.sha1(feed_id.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.state_dir, f"coverage_baseline_{digest}.json")
+
+    def _save_feed(self, feed: FeedBaseline) -> None:
+        path = self._snapshot_path(feed.feed_id)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(feed.to_dict(), f)
+            os.replace(tmp_path, path)
+            self._unsaved[feed.feed_id] = 0
+        except OSError as e:
+            logger.error(f"Error saving coverage baseline for feed {feed.feed_id}: {str(e)}")
+
+    def _load_feed(self, feed_id: str) -> Optional[FeedBaseline]:
+        path = self._snapshot_path(feed_id)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                return FeedBaseline.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Error loading coverage baseline for feed {feed_id}: {str(e)}")
+            return None
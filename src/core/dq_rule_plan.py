@@ -0,0 +1,257 @@
+"""
+DQ Rule Plan
+
+Compiles dq_config.yaml into an executable rule plan: precompiled regexes,
+frozensets of reference values, numeric bounds and per-KDE weights, so
+per-record scoring never walks nested config dicts. Plans are cached by
+file mtime/content hash and swapped atomically when the file changes.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional, Any, Callable, FrozenSet, Pattern, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+NULL_TOKENS: FrozenSet[str] = frozenset(('', 'null', 'none', 'unknown', 'n/a'))
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Content hash of a parsed configuration"""
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class KDEPlan:
+    """Compiled rules for one KDE"""
+
+    __slots__ = (
+        'name', 'risk_weight', 'has_conformity_rules', 'min_length', 'max_length',
+        'min_value', 'max_value', 'pattern', 'max_decimals', 'validity_source',
+        'reference_values', 'golden_sources'
+    )
+
+    def __init__(self, name: str, config: Dict[str, Any]):
+        self.name = name
+        self.risk_weight = config['risk_weights'][config['kde_risk'].get(name, 'medium')]
+
+        conformity_rules = config.get('conformity_rules', {}).get(name, {})
+        self.has_conformity_rules = bool(conformity_rules)
+        length_rule = conformity_rules.get('length')
+        self.min_length = length_rule.get('min', 0) if length_rule is not None else None
+        self.max_length = length_rule.get('max', float('inf')) if length_rule is not None else None
+        range_rule = conformity_rules.get('range')
+        self.min_value = range_rule.get('min', float('-inf')) if range_rule is not None else None
+        self.max_value = range_rule.get('max', float('inf')) if range_rule is not None else None
+        pattern = conformity_rules.get('pattern')
+        self.pattern: Optional[Pattern] = re.compile(pattern) if pattern is not None else None
+
+        accuracy_rules = config.get('accuracy_rules', {})
+        self.max_decimals = accuracy_rules.get('precision_rules', {}).get(name)
+
+        validity_rule = accuracy_rules.get('validity_rules', {}).get(name)
+        golden_sources = config.get('golden_sources', {})
+        self.validity_source = validity_rule['reference_source'] if validity_rule else None
+        self.reference_values: Optional[FrozenSet[Any]] = None
+        if self.validity_source:
+            source_config = golden_sources.get(self.validity_source, {})
+            if source_config.get('source_type') == 'static' and source_config.get('values'):
+                self.reference_values = frozenset(source_config['values'])
+
+        # Golden sources holding this KDE, in config order
+        self.golden_sources: Tuple[str, ...] = tuple(
+            source_name for source_name, source_config in golden_sources.items()
+            if name in source_config.get('fields', [])
+        )
+
+    def score_completeness(self, value: Any) -> float:
+        if value is None:
+            return 0.0
+        if isinstance(value, str):
+            return 0.0 if value.lower() in NULL_TOKENS else 1.0
+        if isinstance(value, (int, float)) and math.isnan(value):
+            return 0.0
+        return 1.0
+
+    def score_conformity(self, value: Any) -> float:
+        if value is None:
+            return 0.0
+        if not self.has_conformity_rules:
+            return 1.0  # No rules = assume conformant
+
+        if isinstance(value, str):
+            if self.min_length is not None and not (self.min_length <= len(value) <= self.max_length):
+                return 0.0
+            if self.pattern is not None and not self.pattern.match(value):
+                return 0.0
+        elif isinstance(value, (int, float)):
+            if self.min_value is not None and not (self.min_value <= value <= self.max_value):
+                return 0.0
+        return 1.0
+
+    def score_precision(self, value: Any) -> float:
+        if self.max_decimals is None:
+            return 1.0  # No rules = assume precise
+        if isinstance(value, float):
+            text = str(value)
+            decimal_places = len(text.split('.')[-1]) if '.' in text else 0
+            return 1.0 if decimal_places <= self.max_decimals else 0.0
+        return 1.0
+
+    def check_reference(self, value: Any) -> Optional[bool]:
+        """Static reference membership, or None when there is no static list"""
+        if self.reference_values is None:
+            return None
+        try:
+            return value in self.reference_values
+        except TypeError:
+            return False  # Unhashable values cannot be reference codes
+
+
+class DQRulePlan:
+    """
+    Executable form of a DQ configuration
+
+    ``config`` is the parsed YAML the plan was compiled from; KDE plans are
+    compiled on first use so undeclared KDEs get default rules too.
+    """
+
+    def __init__(self, config: Dict[str, Any], source_hash: Optional[str] = None):
+        self.config = config
+        self.source_hash = source_hash or config_hash(config)
+        self.compiled_at = time.time()
+
+        self.tier_weights = dict(config['tier_weights'])
+        self.dimension_tiers = dict(config['dimension_tiers'])
+        # dimension -> (tier, tier weight)
+        self.dimension_weights = {
+            dimension: (tier, self.tier_weights[tier]) for dimension, tier in self.dimension_tiers.items()
+        }
+        self.synthetic_weight = config['synthetic_kde_weight']
+        self.timeliness_buckets = tuple(
+            (bucket['max_hours'], bucket['score']) for bucket in config.get('timeliness_buckets', [])
+        )
+        self.coverage_buckets = tuple(
+            (bucket['max_drop_percent'], bucket['score']) for bucket in config.get('coverage_scoring', [])
+        )
+        self.trust_thresholds = config.get('trust_bucket_thresholds', {'high': 0.85, 'moderate': 0.65})
+
+        self._kde_plans: Dict[str, KDEPlan] = {}
+        for kde_name in config.get('kde_risk', {}):
+            self.kde(kde_name)
+
+    def kde(self, kde_name: str) -> KDEPlan:
+        """Compiled rules for a KDE"""
+        kde_plan = self._kde_plans.get(kde_name)
+        if kde_plan is None:
+            kde_plan = KDEPlan(kde_name, self.config)
+            self._kde_plans[kde_name] = kde_plan
+        return kde_plan
+
+
+class DQRulePlanLoader:
+    """
+    Loads and hot-reloads a compiled rule plan for one config file
+
+    The file is stat-ed at most every ``check_interval`` seconds; a new
+    mtime/size triggers a content hash and, if the content changed, a
+    recompile. The new plan replaces the old one in a single reference
+    swap, so concurrent scorers always see one complete plan. A config
+    that fails to load or validate leaves the current plan in place.
+
+    Args:
+        config_path: Path to dq_config.yaml
+        default_config: Builds the config used when the file cannot be read at startup
+        validate: Raises for configs that must not be activated
+        check_interval: Minimum seconds between file checks (0 checks on every call)
+    """
+
+    def __init__(self, config_path: str,
+                 default_config: Optional[Callable[[], Dict[str, Any]]] = None,
+                 validate: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 check_interval: float = 1.0):
+        self.config_path = config_path
+        self.default_config = default_config
+        self.validate = validate
+        self.check_interval = check_interval
+        self.reload_count = 0
+
+        self._lock = threading.Lock()
+        self._file_signature: Optional[Tuple[float, int]] = None
+        self._content_hash: Optional[str] = None
+        self._last_check = 0.0
+        self._plan: Optional[DQRulePlan] = None
+
+        self._plan = self._initial_plan()
+
+    @property
+    def plan(self) -> DQRulePlan:
+        """Current plan, reloading first if the file changed"""
+        if self.check_interval == 0 or time.monotonic() - self._last_check >= self.check_interval:
+            self.reload_if_changed()
+        return self._plan
+
+    def reload_if_changed(self) -> bool:
+        """Recompile the plan if the config file changed; returns True on swap"""
+        with self._lock:
+            self._last_check = time.monotonic()
+            signature = self._stat()
+            if signature is None or signature == self._file_signature:
+                return False
+
+            try:
+                with open(self.config_path, 'rb') as f:
+                    raw = f.read()
+                content_hash = hashlib.sha256(raw).hexdigest()
+                self._file_signature = signature
+                if content_hash == self._content_hash:
+                    return False  # Touched but unchanged
+
+                config = yaml.safe_load(raw)
+                if self.validate:
+                    self.validate(config)
+                plan = DQRulePlan(config, content_hash)
+            except Exception as e:
+                logger.error(f"Failed to reload DQ config from {self.config_path}, keeping current plan: {e}")
+                return False
+
+            self._content_hash = content_hash
+            self._plan = plan
+            self.reload_count += 1
+            logger.info(f"DQ rule plan recompiled from {self.config_path} ({content_hash[:12]})")
+            return True
+
+    def _stat(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = os.stat(self.config_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _initial_plan(self) -> DQRulePlan:
+        signature = self._stat()
+        try:
+            with open(self.config_path, 'rb') as f:
+                raw = f.read()
+            config = yaml.safe_load(raw)
+            content_hash = hashlib.sha256(raw).hexdigest()
+        except Exception as e:
+            if self.default_config is None:
+                raise
+            logger.error(f"Failed to load config from {self.config_path}: {e}")
+            config, content_hash = self.default_config(), None
+
+        if self.validate:
+            self.validate(config)
+        self._file_signature = signature
+        self._content_hash = content_hash
+        self._last_check = time.monotonic()
+        return DQRulePlan(config, content_hash)
@@ -0,0 +1,458 @@
+"""
+DQ Sketches
+
+Constant-memory probabilistic sketches for streaming duplicate detection
+in the uniqueness dimension: Bloom filters for membership, HyperLogLog for
+distinct counts, rolled over a fixed number of generations and persisted
+between runs. Sketches serialise to snapshots that parallel workers can
+merge.
+"""
+
+import hashlib
+import io
+import logging
+import math
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_UINT64_MASK = (1 << 64) - 1
+
+# Salts the record-verdict hash of a duplicate so both verdicts of one
+# (record, value) pair land on different Bloom bits
+_DUPLICATE_SALT = np.uint64(0x9E3779B97F4A7C15)
+
+
+def hash_values(values: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Two independent 64-bit hashes per value
+
+    Values are hashed by type and string form so ``1`` and ``'1'`` differ.
+    """
+    h1, h2 = [], []
+    for value in values:
+        digest = hashlib.blake2b(f"{type(value).__name__}:{value}".encode('utf-8'), digest_size=16).digest()
+        h1.append(int.from_bytes(digest[:8], 'little'))
+        h2.append(int.from_bytes(digest[8:], 'little'))
+    return np.array(h1, dtype=np.uint64), np.array(h2, dtype=np.uint64)
+
+
+class BloomFilter:
+    """
+    Bloom filter over 64-bit hash pairs (Kirsch-Mitzenmacher double hashing)
+
+    Args:
+        capacity: Expected number of distinct items
+        error_rate: Target false positive rate at capacity
+    """
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.001, bits: Optional[np.ndarray] = None):
+        self.capacity = int(capacity)
+        self.error_rate = float(error_rate)
+        self.num_bits = max(8, int(math.ceil(-self.capacity * math.log(self.error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self.bits = bits if bits is not None else np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, h1: np.ndarray, h2: np.ndarray) -> np.ndarray:
+        rounds = np.arange(self.num_hashes, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            combined = h1[:, None] + rounds[None, :] * (h2[:, None] | np.uint64(1))
+        return combined % np.uint64(self.num_bits)
+
+    def contains_hashes(self, h1: np.ndarray, h2: np.ndarray) -> np.ndarray:
+        """Membership flags for hashed values (false positives possible)"""
+        if len(h1) == 0:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(h1, h2)
+        bytes_ = self.bits[(positions >> np.uint64(3)).astype(np.int64)]
+        masks = (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8))
+        return np.all(bytes_ & masks, axis=1)
+
+    def add_hashes(self, h1: np.ndarray, h2: np.ndarray) -> None:
+        """Insert hashed values"""
+        if len(h1) == 0:
+            return
+        positions = self._positions(h1, h2).ravel()
+        masks = (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8))
+        np.bitwise_or.at(self.bits, (positions >> np.uint64(3)).astype(np.int64), masks)
+
+    def merge(self, other: 'BloomFilter') -> None:
+        """Union with a filter of the same size"""
+        if other.num_bits != self.num_bits or other.num_hashes != self.num_hashes:
+            raise ValueError("Cannot merge Bloom filters with different parameters")
+        np.bitwise_or(self.bits, other.bits, out=self.bits)
+
+    def clear(self) -> None:
+        self.bits[:] = 0
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter
+
+    Args:
+        precision: Register index bits; 2**precision one-byte registers
+    """
+
+    def __init__(self, precision: int = 14, registers: Optional[np.ndarray] = None):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = registers if registers is not None else np.zeros(self.num_registers, dtype=np.uint8)
+
+    def add_hashes(self, h: np.ndarray) -> None:
+        """Count hashed values"""
+        if len(h) == 0:
+            return
+        index = (h >> np.uint64(64 - self.precision)).astype(np.int64)
+        remainder = (h << np.uint64(self.precision)) & np.uint64(_UINT64_MASK)
+        width = 64 - self.precision
+        # Rank = leading zeros + 1 of the remaining bits, by binary search
+        leading_zeros = np.zeros(len(h), dtype=np.int64)
+        x = remainder.copy()
+        for shift in (32, 16, 8, 4, 2, 1):
+            empty = (x >> np.uint64(64 - shift)) == 0
+            leading_zeros[empty] += shift
+            x[empty] <<= np.uint64(shift)
+        leading_zeros[remainder == 0] = width
+        rank = np.minimum(leading_zeros + 1, width + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self) -> float:
+        """Estimated number of distinct values"""
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return float(estimate)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Union with a counter of the same precision"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog counters with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def clear(self) -> None:
+        self.registers[:] = 0
+
+
+class RollingUniquenessSketch:
+    """
+    Duplicate detector over a rolling history of generations
+
+    Each generation holds a Bloom filter and a HyperLogLog counter for up to
+    ``generation_size`` observations; once full a new generation starts and
+    the oldest beyond ``generations`` is dropped. A value is a duplicate when
+    any live generation (or an earlier occurrence in the same batch) has it.
+
+    Observations keyed by record identity also store the verdict of each
+    (record, value) pair, so observing the same record again returns its
+    original verdict instead of counting the record against itself.
+
+    Args:
+        generation_size: Observations per generation (also Bloom capacity)
+        generations: Live generations kept (history = generations * generation_size)
+        error_rate: Bloom false positive rate per generation
+        hll_precision: HyperLogLog precision
+    """
+
+    def __init__(self, generation_size: int = 1000000, generations: int = 4,
+                 error_rate: float = 0.001, hll_precision: int = 14):
+        self.generation_size = int(generation_size)
+        self.generations = max(1, int(generations))
+        self.error_rate = error_rate
+        self.hll_precision = hll_precision
+        # Newest generation last: (bloom, hll, observation count, record verdicts)
+        self._generations: List[List[Any]] = [self._new_generation()]
+        self.duplicates_seen = 0
+
+    def _new_generation(self) -> List[Any]:
+        # The record-verdict filter is created on the first keyed observation
+        return [BloomFilter(self.generation_size, self.error_rate), HyperLogLog(self.hll_precision), 0, None]
+
+    def observe(self, values: Iterable[Any], record_keys: Optional[Iterable[Any]] = None) -> np.ndarray:
+        """
+        Record values, returning which ones were already seen
+
+        Args:
+            values: Values to check and record
+            record_keys: Identity of the record each value came from; a
+                (record, value) pair already observed is not recorded again
+                and keeps the verdict it got the first time
+
+        Returns:
+            Boolean array, True where the value is a (probable) duplicate
+        """
+        values = list(values)
+        if not values:
+            return np.zeros(0, dtype=bool)
+        if record_keys is None:
+            return self._observe_hashes(*hash_values(values))
+
+        p1, p2 = hash_values(list(zip(record_keys, values)))
+        known_duplicate = np.zeros(len(values), dtype=bool)
+        known_unique = np.zeros(len(values), dtype=bool)
+        for _, _, _, records in self._generations:
+            if records is not None:
+                known_duplicate |= records.contains_hashes(p1 ^ _DUPLICATE_SALT, p2)
+                known_unique |= records.contains_hashes(p1, p2)
+        duplicates = known_duplicate
+
+        # Only the first occurrence of each unseen pair is a new observation
+        _, first_index, inverse = np.unique(np.stack([p1, p2], axis=1), axis=0,
+                                            return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        new_groups = np.flatnonzero(~(known_duplicate | known_unique)[first_index])
+        if len(new_groups):
+            # Observed in row order, so earlier records in the batch come first
+            new_groups = new_groups[np.argsort(first_index[new_groups])]
+            new = first_index[new_groups]
+            new_duplicates = self._observe_hashes(*hash_values([values[i] for i in new]))
+            verdicts = np.zeros(len(first_index), dtype=bool)
+            is_new = np.zeros(len(first_index), dtype=bool)
+            verdicts[new_groups] = new_duplicates
+            is_new[new_groups] = True
+            duplicates = np.where(is_new[inverse], verdicts[inverse], duplicates)
+
+            current = self._generations[-1]
+            if current[3] is None:
+                current[3] = BloomFilter(self.generation_size, self.error_rate)
+            salt = np.where(new_duplicates, _DUPLICATE_SALT, np.uint64(0))
+            current[3].add_hashes(p1[new] ^ salt, p2[new])
+        return duplicates
+
+    def _observe_hashes(self, h1: np.ndarray, h2: np.ndarray) -> np.ndarray:
+        duplicates = np.zeros(len(h1), dtype=bool)
+        for bloom, _, _, _ in self._generations:
+            duplicates |= bloom.contains_hashes(h1, h2)
+
+        # Earlier occurrences within the batch
+        _, first_index = np.unique(np.stack([h1, h2], axis=1), axis=0, return_index=True)
+        repeated = np.ones(len(h1), dtype=bool)
+        repeated[first_index] = False
+        duplicates |= repeated
+
+        start = 0
+        while start < len(h1):
+            current = self._generations[-1]
+            room = self.generation_size - current[2]
+            if room <= 0:
+                self._rotate()
+                continue
+            end = min(len(h1), start + room)
+            current[0].add_hashes(h1[start:end], h2[start:end])
+            current[1].add_hashes(h1[start:end])
+            current[2] += end - start
+            start = end
+
+        self.duplicates_seen += int(duplicates.sum())
+        return duplicates
+
+    def _rotate(self) -> None:
+        self._generations.append(self._new_generation())
+        if len(self._generations) > self.generations:
+            self._generations.pop(0)
+
+    @property
+    def observed(self) -> int:
+        """Observations in the live history"""
+        return sum(generation[2] for generation in self._generations)
+
+    def distinct_count(self) -> float:
+        """Estimated distinct values in the live history"""
+        merged = HyperLogLog(self.hll_precision)
+        for _, hll, _, _ in self._generations:
+            merged.merge(hll)
+        return merged.count()
+
+    def duplicate_rate(self) -> float:
+        """Estimated share of observations in the live history that are repeats"""
+        observed = self.observed
+        if observed == 0:
+            return 0.0
+        return max(0.0, 1.0 - min(self.distinct_count(), observed) / observed)
+
+    def merge(self, other: 'RollingUniquenessSketch') -> None:
+        """Union another worker's sketch, aligning generations newest-first"""
+        if (other.generation_size, other.error_rate, other.hll_precision) != \
+                (self.generation_size, self.error_rate, self.hll_precision):
+            raise ValueError("Cannot merge uniqueness sketches with different parameters")
+        while len(self._generations) < min(len(other._generations), self.generations):
+            self._generations.insert(0, self._new_generation())
+        for mine, theirs in zip(reversed(self._generations), reversed(other._generations)):
+            mine[0].merge(theirs[0])
+            mine[1].merge(theirs[1])
+            mine[2] = min(self.generation_size, mine[2] + theirs[2])
+            if theirs[3] is not None:
+                if mine[3] is None:
+                    mine[3] = BloomFilter(self.generation_size, self.error_rate)
+                mine[3].merge(theirs[3])
+        self.duplicates_seen += other.duplicates_seen
+
+    def snapshot(self) -> bytes:
+        """Serialise the sketch"""
+        buffer = io.BytesIO()
+        arrays = {
+            'params': np.array([self.generation_size, self.generations, self.hll_precision, self.duplicates_seen],
+                               dtype=np.int64),
+            'error_rate': np.array([self.error_rate], dtype=np.float64),
+            'counts': np.array([generation[2] for generation in self._generations], dtype=np.int64)
+        }
+        for i, (bloom, hll, _, records) in enumerate(self._generations):
+            arrays[f'bloom_{i}'] = bloom.bits
+            arrays[f'hll_{i}'] = hll.registers
+            if records is not None:
+                arrays[f'records_{i}'] = records.bits
+        np.savez_compressed(buffer, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_snapshot(cls, data: bytes) -> 'RollingUniquenessSketch':
+        """Restore a sketch from ``snapshot()`` output"""
+        with np.load(io.BytesIO(data)) as arrays:
+            generation_size, generations, hll_precision, duplicates_seen = (int(v) for v in arrays['params'])
+            sketch = cls(generation_size, generations, float(arrays['error_rate'][0]), hll_precision)
+            sketch._generations = []
+            for i, count in enumerate(arrays['counts']):
+                bloom = BloomFilter(generation_size, sketch.error_rate, bits=arrays[f'bloom_{i}'].copy())
+                hll = HyperLogLog(hll_precision, registers=arrays[f'hll_{i}'].copy())
+                records = None
+                if f'records_{i}' in arrays:
+                    records = BloomFilter(generation_size, sketch.error_rate, bits=arrays[f'records_{i}'].copy())
+                sketch._generations.append([bloom, hll, int(count), records])
+            sketch.duplicates_seen = duplicates_seen
+        return sketch
+
+
+class UniquenessTracker:
+    """
+    Per-KDE rolling duplicate detection, persisted between runs
+
+    Args:
+        kdes: KDE names to track (others are not checked)
+        state_dir: Directory for sketch snapshots; in-memory only when None
+        autosave_every: Save after this many observations (0 disables)
+        **sketch_options: RollingUniquenessSketch parameters
+    """
+
+    def __init__(self, kdes: Iterable[str], state_dir: Optional[str] = None,
+                 autosave_every: int = 0, **sketch_options):
+        self.kdes = set(kdes)
+        self.state_dir = state_dir
+        self.autosave_every = autosave_every
+        self.sketch_options = sketch_options
+        self._sketches: Dict[str, RollingUniquenessSketch] = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    def tracks(self, kde_name: str) -> bool:
+        return kde_name in self.kdes
+
+    def observe(self, kde_name: str, values: Iterable[Any],
+                record_keys: Optional[Iterable[Any]] = None) -> np.ndarray:
+        """
+        Record values for a KDE, returning per-value duplicate flags
+
+        With ``record_keys`` a record observed again (e.g. re-scored) keeps
+        its first verdict and is not recorded twice.
+        """
+        with self._lock:
+            duplicates = self._get_sketch(kde_name).observe(values, record_keys)
+            self._unsaved += len(duplicates)
+            if self.autosave_every and self._unsaved >= self.autosave_every:
+                self._save_locked()
+        return duplicates
+
+    def duplicate_rate(self, kde_name: str) -> float:
+        with self._lock:
+            return self._get_sketch(kde_name).duplicate_rate()
+
+    def summary(self, max_duplicate_rate: float = 0.02) -> Dict[str, Dict[str, Any]]:
+        """Rolling duplicate statistics per tracked KDE"""
+        with self._lock:
+            result = {}
+            for kde_name, sketch in self._sketches.items():
+                rate = sketch.duplicate_rate()
+                result[kde_name] = {
+                    'observed': sketch.observed,
+                    'distinct_estimate': round(sketch.distinct_count()),
+                    'duplicates_seen': sketch.duplicates_seen,
+                    'duplicate_rate': rate,
+                    'within_tolerance': rate <= max_duplicate_rate
+                }
+            return result
+
+    def snapshot(self) -> Dict[str, bytes]:
+        """Serialised sketches per KDE"""
+        with self._lock:
+            return {kde_name: sketch.snapshot() for kde_name, sketch in self._sketches.items()}
+
+    def merge_snapshot(self, snapshots: Dict[str, bytes]) -> None:
+        """Fold another worker's snapshots into this tracker"""
+        with self._lock:
+            for kde_name, data in snapshots.items():
+                other = RollingUniquenessSketch.from_snapshot(data)
+                if kde_name in self._sketches or self._load(kde_name) is not None:
+                    self._get_sketch(kde_name).merge(other)
+                else:
+                    self._sketches[kde_name] = other
+
+    def save(self) -> None:
+        """Persist every sketch to ``state_dir``"""
+        with self._lock:
+            self._save_locked()
+
+    # ---- internals ----
+
+    def _get_sketch(self, kde_name: str) -> RollingUniquenessSketch:
+        sketch = self._sketches.get(kde_name)
+        if sketch is None:
+            sketch = self._load(kde_name) or RollingUniquenessSketch(**self.sketch_options)
+            self._sketches[kde_name] = sketch
+        return sketch
+
+    def _path(self, kde_name: str) -> Optional[str]:
+        if not self.state_dir:
+            return None
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', kde_name)
+        return os.path.join(self.state_dir, f"uniqueness_{safe_name}.npz")
+
+    def _load(self, kde_name: str) -> Optional[RollingUniquenessSketch]:
+        if kde_name in self._sketches:
+            return self._sketches[kde_name]
+        path = self._path(kde_name)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                sketch = RollingUniquenessSketch.from_snapshot(f.read())
+            self._sketches[kde_name] = sketch
+            return sketch
+        except Exception as e:
+            logger.error(f"Error loading uniqueness sketch for {kde_name}: {str(e)}")
+            return None
+
+    def _save_locked(self) -> None:
+        self._unsaved = 0
+        for kde_name, sketch in self._sketches.items():
+            path = self._path(kde_name)
+            if not path:
+                continue
+            try:
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(sketch.snapshot())
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.error(f"Error saving uniqueness sketch for {kde_name}: {str(e)}")
@@ -0,0 +1,229 @@
+"""
+DQSI Batch Executor
+
+Scores batches of datasets for the /dqsi/batch endpoint. Calculators are
+built once per distinct configuration and reused, and large batches are
+spread across a process pool with results returned in submission order.
+
+The calculator is built by an injectable factory; by default it is the
+DataQualitySufficiencyIndex from ``dqsi_score``, imported on first use.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Any, Tuple, Callable
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Builds a calculator from (custom_weights, enabled_dimensions). Factories
+# used with a process pool must be picklable (module-level functions or classes)
+CalculatorFactory = Callable[[Optional[Dict[str, float]], Optional[List[str]]], Any]
+
+
+def process_input_data(dataset: Dict[str, Any]) -> Any:
+    """Process input data into appropriate format for DQSI calculation"""
+    try:
+        # If dataset contains 'format' field, process accordingly
+        data_format = dataset.get('format', 'dict')
+
+        if data_format == 'dataframe' and 'data' in dataset:
+            # Convert to pandas DataFrame
+            return pd.DataFrame(dataset['data'])
+        elif data_format == 'csv' and 'csv_data' in dataset:
+            # Process CSV data
+            return pd.read_csv(io.StringIO(dataset['csv_data']))
+        elif data_format == 'json' and 'json_data' in dataset:
+            # Process JSON data
+            return dataset['json_data']
+        else:
+            # Return as-is for dict format
+            return dataset.get('data', dataset)
+
+    except Exception as e:
+        logger.error(f"Error processing input data: {e}")
+        return dataset
+
+
+def config_fingerprint(custom_weights: Optional[Dict[str, float]] = None,
+                       enabled_dimensions: Optional[List[str]] = None) -> str:
+    """Stable hash of the request options that shape a DQSIConfig"""
+    payload = json.dumps(
+        {'weights': custom_weights or {}, 'enabled_dimensions': enabled_dimensions or []},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def build_dqsi_calculator(custom_weights: Optional[Dict[str, float]] = None,
+                          enabled_dimensions: Optional[List[str]] = None) -> Any:
+    """Default calculator factory: a DataQualitySufficiencyIndex for the request options"""
+    from .dqsi_score import DataQualitySufficiencyIndex, DQSIConfig
+
+    config = DQSIConfig()
+    if custom_weights:
+        config.weights.update(custom_weights)
+    if enabled_dimensions:
+        config.enabled_dimensions = list(enabled_dimensions)
+    return DataQualitySufficiencyIndex(config)
+
+
+class DQSICalculatorPool:
+    """
+    Pre-built calculator instances keyed by config hash
+
+    The least recently used calculator is dropped once ``max_size``
+    distinct configurations are held.
+
+    Args:
+        max_size: Distinct configurations kept
+        calculator_factory: Builds a calculator for a configuration
+            (defaults to ``build_dqsi_calculator``)
+    """
+
+    def __init__(self, max_size: int = 32, calculator_factory: Optional[CalculatorFactory] = None):
+        self.max_size = max_size
+        self.calculator_factory = calculator_factory or build_dqsi_calculator
+        self._calculators: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics = {'hits': 0, 'builds': 0}
+
+    def __len__(self) -> int:
+        return len(self._calculators)
+
+    def get(self, custom_weights: Optional[Dict[str, float]] = None,
+            enabled_dimensions: Optional[List[str]] = None) -> Any:
+        """Get the calculator for a configuration, building it on first use"""
+        key = config_fingerprint(custom_weights, enabled_dimensions)
+        with self._lock:
+            calculator = self._calculators.get(key)
+            if calculator is not None:
+                self._calculators.move_to_end(key)
+                self.metrics['hits'] += 1
+                return calculator
+
+        calculator = self.calculator_factory(custom_weights, enabled_dimensions)
+        with self._lock:
+            self._calculators[key] = calculator
+            self._calculators.move_to_end(key)
+            self.metrics['builds'] += 1
+            while len(self._calculators) > self.max_size:
+                self._calculators.popitem(last=False)
+        return calculator
+
+
+# One pool per process: the API process and every batch worker keep their own
+calculator_pool = DQSICalculatorPool()
+
+# Pools for injected factories, also one set per process
+_factory_pools: Dict[CalculatorFactory, DQSICalculatorPool] = {}
+_factory_pools_lock = threading.Lock()
+
+
+def get_calculator_pool(calculator_factory: Optional[CalculatorFactory] = None) -> DQSICalculatorPool:
+    """This process's calculator pool for a factory (the shared pool by default)"""
+    if calculator_factory is None or calculator_factory is build_dqsi_calculator:
+        return calculator_pool
+    with _factory_pools_lock:
+        pool = _factory_pools.get(calculator_factory)
+        if pool is None:
+            pool = _factory_pools[calculator_factory] = DQSICalculatorPool(calculator_factory=calculator_factory)
+        return pool
+
+
+def score_dataset(task: Tuple[int, Dict[str, Any], Dict[str, Any], Dict[str, float],
+                              Optional[CalculatorFactory]]) -> Dict[str, Any]:
+    """
+    Score a single batch entry
+
+    Failures are returned as an ``error`` entry for that dataset only, so
+    one malformed dataset never fails the rest of the batch.
+    """
+    index, dataset_info, dimension_configs, custom_weights, calculator_factory = task
+    dataset_id = dataset_info.get('id', f'dataset_{index}')
+    try:
+        calculator = get_calculator_pool(calculator_factory).get(custom_weights)
+        processed_data = process_input_data(dataset_info.get('dataset', {}))
+
+        # Calculate DQSI metrics
+        metrics = calculator.calculate_dqsi(processed_data, dimension_configs)
+
+        return {
+            'dataset_id': dataset_id,
+            'dqsi_score': metrics.overall_score,
+            'dimension_scores': metrics.dimension_scores,
+            'report': calculator.generate_report(metrics)
+        }
+    except Exception as e:
+        logger.error(f"Error scoring batch dataset {dataset_id}: {str(e)}")
+        return {'dataset_id': dataset_id, 'error': str(e)}
+
+
+class DQSIBatchExecutor:
+    """
+    Runs batch DQSI scoring in-process or across a process pool
+
+    Batches smaller than ``min_parallel_datasets`` are scored in the calling
+    process, where pickling datasets would cost more than it saves.
+
+    Args:
+        max_workers: Worker processes (defaults to the CPU count)
+        min_parallel_datasets: Smallest batch sent to the process pool
+        calculator_factory: Builds calculators in each process (defaults to
+            ``build_dqsi_calculator``); must be picklable
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, min_parallel_datasets: int = 8,
+                 calculator_factory: Optional[CalculatorFactory] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_parallel_datasets = min_parallel_datasets
+        self.calculator_factory = calculator_factory
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def run(self, batch_data: List[Dict[str, Any]], dimension_configs: Dict[str, Any] = None,
+            custom_weights: Dict[str, float] = None) -> List[Dict[str, Any]]:
+        """
+        Score every dataset in the batch
+
+        Returns:
+            One result per dataset, in the order of ``batch_data``
+        """
+        tasks = [(i, dataset_info, dimension_configs or {}, custom_weights or {}, self.calculator_factory)
+                 for i, dataset_info in enumerate(batch_data)]
+
+        if self.max_workers <= 1 or len(tasks) < self.min_parallel_datasets:
+            return [score_dataset(task) for task in tasks]
+
+        # Several datasets per round trip keeps IPC overhead flat for large batches
+        chunksize = max(1, len(tasks) // (self.max_workers * 4))
+        try:
+            return list(self._get_executor().map(score_dataset, tasks, chunksize=chunksize))
+        except BrokenProcessPool as e:
+            logger.error(f"DQSI batch process pool failed, scoring in-process: {str(e)}")
+            self._reset_executor()
+            return [score_dataset(task) for task in tasks]
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        self._reset_executor()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _reset_executor(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
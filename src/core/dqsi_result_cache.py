@@ -0,0 +1,229 @@
+"""
+DQSI Result Cache
+
+Content-addressed cache of DQSI responses for /dqsi/calculate and
+/dqsi/validate. Resubmitted datasets (e.g. reconciliation retries) are
+answered from a bounded in-memory tier or an optional Redis tier instead
+of being rescored. Keys hash the canonical dataset content together with
+the DQ configuration version, role, strategy and request options, so a
+configuration change can never serve a stale result.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Any, Iterable
+
+from .trading_data_cache import BoundedRecordCache
+
+logger = logging.getLogger(__name__)
+
+_missing = object()
+
+
+def canonical_digest(payload: Any) -> str:
+    """SHA-256 of a JSON payload serialized with sorted keys and no whitespace"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ConfigVersion:
+    """
+    Version string of the DQ configuration in effect
+
+    Combines a static component (e.g. code-level config defaults) with the
+    content of the watched config files. Files are stat-ed at most every
+    ``check_interval`` seconds and only re-hashed when their mtime/size
+    changes.
+
+    Args:
+        paths: Config files whose content is part of the version
+        static: JSON-serializable settings that are part of the version
+        check_interval: Minimum seconds between file checks
+    """
+
+    def __init__(self, paths: Iterable[str] = (), static: Any = None, check_interval: float = 1.0):
+        self.paths = [path for path in paths if path]
+        self.static_digest = canonical_digest(static)
+        self.check_interval = check_interval
+
+        self._signatures: Dict[str, Optional[tuple]] = {}
+        self._file_digests: Dict[str, Optional[str]] = {}
+        self._version: Optional[str] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> str:
+        now = time.monotonic()
+        if self._version is None or now - self._last_check >= self.check_interval:
+            with self._lock:
+                self._last_check = now
+                self._refresh()
+        return self._version
+
+    def _refresh(self) -> None:
+        changed = self._version is None
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signature = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                signature = None
+            if signature == self._signatures.get(path, _missing):
+                continue
+
+            self._signatures[path] = signature
+            digest = None
+            if signature is not None:
+                try:
+                    with open(path, 'rb') as f:
+                        digest = hashlib.sha256(f.read()).hexdigest()
+                except OSError:
+                    digest = None
+            if digest != self._file_digests.get(path, _missing):
+                self._file_digests[path] = digest
+                changed = True
+
+        if changed:
+            self._version = canonical_digest({
+                'static': self.static_digest,
+                'files': [self._file_digests.get(path) for path in self.paths]
+            })[:16]
+
+
+class DQSIResultCache:
+    """
+    Two-tier cache of DQSI responses keyed by request content
+
+    The memory tier is a ``BoundedRecordCache`` (LRU within a byte budget,
+    TTL expiry). The optional Redis tier stores JSON responses under
+    ``<key_prefix><config version>:<digest>`` with its own TTL, so it can be
+    shared by API workers and survives restarts. When the configuration
+    version changes the memory tier is cleared; Redis entries of the old
+    version become unreachable and expire on their own.
+
+    Args:
+        config_version: Returns the current DQ configuration version
+        max_bytes: Memory budget of the in-process tier
+        ttl_seconds: Lifetime of in-process entries
+        redis_client: redis-py compatible client for the shared tier
+        redis_ttl_seconds: Lifetime of Redis entries
+        key_prefix: Namespace of Redis keys
+    """
+
+    def __init__(self, config_version=None, max_bytes: int = 64 * 1024 * 1024,
+                 ttl_seconds: Optional[float] = 3600, redis_client=None,
+                 redis_ttl_seconds: int = 24 * 3600, key_prefix: str = 'dqsi:result:'):
+        self.config_version = config_version or (lambda: 'static')
+        self.memory = BoundedRecordCache(max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+        self.redis_client = redis_client
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.key_prefix = key_prefix
+
+        self.metrics = {'memory_hits': 0, 'redis_hits': 0, 'misses': 0, 'stores': 0,
+                        'invalidations': 0, 'redis_errors': 0}
+        self._active_version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def result_key(self, endpoint: str, dataset: Any, role: Optional[str] = None,
+                   strategy: Optional[str] = None, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Cache key of a request
+
+        Args:
+            endpoint: Endpoint name, so different response shapes never collide
+            dataset: Raw dataset payload as submitted
+            role: Role the score is computed for
+            strategy: Calculation strategy (e.g. enhanced/traditional)
+            options: Remaining request options that affect the response
+        """
+        digest = canonical_digest({
+            'endpoint': endpoint,
+            'dataset': dataset,
+            'role': role,
+            'strategy': strategy,
+            'options': options or {}
+        })
+        return f"{self._current_version()}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached response for a key, or None"""
+        if not key.startswith(f"{self._current_version()}:"):
+            # Key was built under an older configuration
+            self.metrics['misses'] += 1
+            return None
+
+        value = self.memory.get(key, _missing)
+        if value is not _missing:
+            self.metrics['memory_hits'] += 1
+            return value
+
+        value = self._redis_get(key)
+        if value is not None:
+            self.metrics['redis_hits'] += 1
+            self.memory[key] = value
+            return value
+
+        self.metrics['misses'] += 1
+        return None
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response (must be JSON-serializable for the Redis tier)"""
+        if not key.startswith(f"{self._current_version()}:"):
+            return
+        self.memory[key] = response
+        self.metrics['stores'] += 1
+        self._redis_set(key, response)
+
+    def clear(self) -> None:
+        """Drop the in-process tier"""
+        self.memory.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit/miss counts, hit rate and memory tier metrics"""
+        lookups = self.metrics['memory_hits'] + self.metrics['redis_hits'] + self.metrics['misses']
+        hits = self.metrics['memory_hits'] + self.metrics['redis_hits']
+        return {
+            **self.metrics,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'config_version': self._active_version,
+            'redis_enabled': self.redis_client is not None,
+            'memory': self.memory.get_metrics()
+        }
+
+    def _current_version(self) -> str:
+        version = self.config_version()
+        if version != self._active_version:
+            with self._lock:
+                if version != self._active_version:
+                    if self._active_version is not None:
+                        self.metrics['invalidations'] += 1
+                        logger.info(f"DQ configuration changed ({self._active_version} -> {version}), "
+                                    f"dropping cached DQSI results")
+                    self.memory.clear()
+                    self._active_version = version
+        return version
+
+    def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.redis_client is None:
+            return None
+        try:
+            raw = self.redis_client.get(self.key_prefix + key)
+            return json.loads(raw) if raw is not None else None
+        except Exception as e:
+            self.metrics['redis_errors'] += 1
+            logger.warning(f"DQSI result cache Redis read failed: {e}")
+            return None
+
+    def _redis_set(self, key: str, response: Dict[str, Any]) -> None:
+        if self.redis_client is None:
+            return
+        try:
+            self.redis_client.set(self.key_prefix + key, json.dumps(response, default=str),
+                                  ex=self.redis_ttl_seconds)
+        except Exception as e:
+            self.metrics['redis_errors'] += 1
+            logger.warning(f"DQSI result cache Redis write failed: {e}")
@@ -0,0 +1,421 @@
+"""
+DQSI Trend Monitor
+
+Stateful per-feed DQSI monitoring for the /dqsi/monitor endpoint. Scored
+points are kept (and optionally persisted) per feed so repeated polls only
+score points not seen before, and rolling trend statistics are updated in
+constant time per point. Points are ordered by timestamp; a point older
+than the newest one seen rebuilds the feed's statistics in time order.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALERTING_THRESHOLDS = {'critical': 0.4, 'warning': 0.6, 'target': 0.8}
+SUDDEN_DROP = 0.1
+
+
+def dataset_digest(dataset: Any) -> str:
+    """Content hash used to detect revised points"""
+    payload = json.dumps(dataset, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def timestamp_sort_key(timestamp: str) -> tuple:
+    """Chronological sort key for a point timestamp (ISO 8601, else as text)"""
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except ValueError:
+        return (1, datetime.min, timestamp)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return (0, parsed, timestamp)
+
+
+class RollingTrendStats:
+    """
+    Incremental trend statistics over a feed's DQSI scores
+
+    The last ``window`` scores are held in a deque together with running
+    sums of y, x*y and y^2 (x = position in the window), so the least
+    squares slope, average and volatility are O(1) per point. EWMA and
+    breach counters cover the whole retained history; evicting the oldest
+    point is O(1) as well.
+    """
+
+    def __init__(self, window: int = 7, ewma_alpha: float = 0.3,
+                 thresholds: Optional[Dict[str, float]] = None):
+        self.window = max(1, int(window))
+        self.ewma_alpha = ewma_alpha
+        self.thresholds = dict(thresholds or DEFAULT_ALERTING_THRESHOLDS)
+
+        self._scores: deque = deque()
+        self._sum_y = 0.0
+        self._sum_xy = 0.0
+        self._sum_y2 = 0.0
+
+        self.count = 0
+        self.ewma: Optional[float] = None
+        self.last_score: Optional[float] = None
+        self.consecutive_breaches = 0
+        self.breach_counts = {'critical': 0, 'warning': 0, 'sudden_drop': 0}
+
+    def add(self, score: float) -> None:
+        """Fold one new score into the statistics"""
+        if len(self._scores) == self.window:
+            self._drop_oldest_in_window()
+
+        self._sum_xy += len(self._scores) * score
+        self._scores.append(score)
+        self._sum_y += score
+        self._sum_y2 += score * score
+
+        self.ewma = score if self.ewma is None else self.ewma_alpha * score + (1 - self.ewma_alpha) * self.ewma
+
+        severity = breach_severity(score, self.thresholds)
+        if severity:
+            self.breach_counts[severity] += 1
+            self.consecutive_breaches += 1
+        else:
+            self.consecutive_breaches = 0
+        if self.last_score is not None and score < self.last_score - SUDDEN_DROP:
+            self.breach_counts['sudden_drop'] += 1
+
+        self.last_score = score
+        self.count += 1
+
+    def evict(self, score: float, next_score: Optional[float] = None) -> None:
+        """
+        Forget the oldest point of the history
+
+        Breach counters lose the point's breach and the sudden drop into
+        ``next_score`` (the following point), if any. The EWMA keeps the
+        point's weight, which has decayed by (1 - alpha) per later point.
+        """
+        if self.count <= len(self._scores):
+            # The window still reaches back to the evicted point
+            self._drop_oldest_in_window()
+        severity = breach_severity(score, self.thresholds)
+        if severity:
+            self.breach_counts[severity] -= 1
+        if next_score is not None and next_score < score - SUDDEN_DROP:
+            self.breach_counts['sudden_drop'] -= 1
+        self.count -= 1
+        self.consecutive_breaches = min(self.consecutive_breaches, self.count)
+
+    def _drop_oldest_in_window(self) -> None:
+        oldest = self._scores.popleft()
+        self._sum_y -= oldest
+        self._sum_y2 -= oldest * oldest
+        # Every remaining x shifts down by one
+        self._sum_xy -= self._sum_y
+
+    def trend_analysis(self) -> Dict[str, Any]:
+        """Trend over the current window, shaped like the route's trend analysis"""
+        n = len(self._scores)
+        if self.count < 2 or n < 2:
+            return {'trend_direction': 'insufficient_data'}
+
+        sum_x = n * (n - 1) / 2
+        sum_x2 = (n - 1) * n * (2 * n - 1) / 6
+        slope = (n * self._sum_xy - sum_x * self._sum_y) / (n * sum_x2 - sum_x ** 2)
+
+        if slope > 0.01:
+            trend_direction = 'improving'
+        elif slope < -0.01:
+            trend_direction = 'declining'
+        else:
+            trend_direction = 'stable'
+
+        mean = self._sum_y / n
+        return {
+            'trend_direction': trend_direction,
+            'trend_slope': slope,
+            'window_size': self.window,
+            'recent_average': mean,
+            'volatility': math.sqrt(max(0.0, self._sum_y2 / n - mean ** 2)),
+            'ewma': self.ewma,
+            'points_observed': self.count,
+            'breach_counts': dict(self.breach_counts),
+            'consecutive_breaches': self.consecutive_breaches
+        }
+
+
+def breach_severity(score: float, thresholds: Dict[str, float]) -> Optional[str]:
+    """Threshold breach level for a score, if any"""
+    if score <= thresholds.get('critical', 0.4):
+        return 'critical'
+    if score <= thresholds.get('warning', 0.6):
+        return 'warning'
+    return None
+
+
+class FeedState:
+    """Scored points and rolling statistics for one monitored feed"""
+
+    def __init__(self, feed_id: str, config_key: str, window: int, thresholds: Dict[str, float],
+                 ewma_alpha: float = 0.3):
+        self.feed_id = feed_id
+        self.config_key = config_key
+        self.ewma_alpha = ewma_alpha
+        # timestamp -> point, in timestamp order
+        self.points: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.newest_key: Optional[tuple] = None
+        self.stats = RollingTrendStats(window, ewma_alpha, thresholds)
+        # Point records in the persisted log, including superseded ones
+        self.log_records = 0
+        self.lock = threading.Lock()
+
+    def rebuild_stats(self, window: int, thresholds: Dict[str, float]) -> None:
+        """Re-sort stored points by timestamp and recompute statistics (no re-scoring)"""
+        self.points = OrderedDict(sorted(self.points.items(), key=lambda item: timestamp_sort_key(item[0])))
+        self.newest_key = timestamp_sort_key(next(reversed(self.points))) if self.points else None
+        self.stats = RollingTrendStats(window, self.ewma_alpha, thresholds)
+        for point in self.points.values():
+            self.stats.add(point['dqsi_score'])
+
+
+class DQSITrendMonitor:
+    """
+    Per-feed incremental DQSI monitor
+
+    Args:
+        state_dir: Directory for append-only point logs; in-memory only when None
+        max_points: Points retained per feed (oldest are dropped)
+        ewma_alpha: Smoothing factor for the EWMA score
+        compact_ratio: A feed's log is compacted once it holds this many
+            records per retained point (dropped and revised points leave
+            stale records behind)
+    """
+
+    def __init__(self, state_dir: Optional[str] = None, max_points: int = 200000, ewma_alpha: float = 0.3,
+                 compact_ratio: float = 2.0):
+        self.state_dir = state_dir
+        self.max_points = max_points
+        self.ewma_alpha = ewma_alpha
+        self.compact_ratio = max(1.0, compact_ratio)
+        self._feeds: Dict[str, FeedState] = {}
+        self._lock = threading.Lock()
+        self.metrics = {'points_scored': 0, 'points_reused': 0, 'points_out_of_order': 0}
+
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    def observe(self, feed_id: str, entries: Iterable[Dict[str, Any]],
+                score_fn: Callable[[Dict[str, Any]], Dict[str, Any]],
+                config_key: str = '',
+                window: int = 7,
+                thresholds: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Score any unseen entries for a feed and return its monitoring view
+
+        Statistics follow timestamp order, not arrival order: a new point
+        older than the newest stored one is inserted in place and the
+        feed's statistics are rebuilt once for the call.
+
+        Args:
+            feed_id: Identifier of the monitored data feed
+            entries: Time series entries with ``timestamp`` and ``dataset``
+            score_fn: Scores a dataset, returning ``dqsi_score``, ``dimension_scores`` and ``status``
+            config_key: Hash of the scoring configuration; a change discards stored scores
+            window: Trend analysis window (points)
+            thresholds: Alerting thresholds
+
+        Returns:
+            Dictionary with ``time_series_results`` for the requested entries,
+            ``trend_analysis`` and ``alerts``
+        """
+        thresholds = dict(thresholds or DEFAULT_ALERTING_THRESHOLDS)
+        state = self._get_feed(feed_id, config_key, window, thresholds)
+
+        with state.lock:
+            if state.stats.window != max(1, int(window)) or state.stats.thresholds != thresholds:
+                state.rebuild_stats(window, thresholds)
+
+            requested = []
+            new_points = []
+            revised = False
+            late = False
+            for entry in entries:
+                timestamp = str(entry.get('timestamp', datetime.utcnow().isoformat()))
+                dataset = entry.get('dataset', {})
+                digest = dataset_digest(dataset)
+
+                point = state.points.get(timestamp)
+                if point is not None and point['digest'] == digest:
+                    self.metrics['points_reused'] += 1
+                else:
+                    point = {'timestamp': timestamp, 'digest': digest, **score_fn(dataset)}
+                    self.metrics['points_scored'] += 1
+                    if timestamp in state.points:
+                        revised = True
+                    else:
+                        key = timestamp_sort_key(timestamp)
+                        if state.newest_key is not None and key < state.newest_key:
+                            late = True
+                            self.metrics['points_out_of_order'] += 1
+                        elif not (revised or late):
+                            state.stats.add(point['dqsi_score'])
+                        if state.newest_key is None or key > state.newest_key:
+                            state.newest_key = key
+                    state.points[timestamp] = point
+                    new_points.append(point)
+                requested.append(point)
+
+            if revised or late:
+                state.rebuild_stats(window, thresholds)
+            self._trim(state)
+            if new_points:
+                self._append_points(state, new_points)
+                if state.log_records > self.compact_ratio * max(len(state.points), 1):
+                    self._rewrite_log(state)
+
+            trend_analysis = state.stats.trend_analysis()
+
+        time_series_results = [
+            {key: point[key] for key in ('timestamp', 'dqsi_score', 'dimension_scores', 'status')}
+            for point in requested
+        ]
+        # Sudden drops compare chronologically adjacent points
+        chronological = sorted(time_series_results, key=lambda result: timestamp_sort_key(result['timestamp']))
+        return {
+            'time_series_results': time_series_results,
+            'trend_analysis': trend_analysis,
+            'alerts': self.generate_alerts(chronological, thresholds)
+        }
+
+    @staticmethod
+    def generate_alerts(time_series_results: List[Dict[str, Any]], thresholds: Dict[str, float]) -> List[Dict[str, Any]]:
+        """Threshold and sudden-drop alerts over already scored points"""
+        alerts = []
+        previous_score = None
+        for result in time_series_results:
+            score = result['dqsi_score']
+            severity = breach_severity(score, thresholds)
+            if severity:
+                threshold = thresholds.get(severity, DEFAULT_ALERTING_THRESHOLDS[severity])
+                alerts.append({
+                    'timestamp': result['timestamp'],
+                    'severity': severity,
+                    'message': f'DQSI score ({score:.3f}) below {severity} threshold ({threshold})',
+                    'dimension_details': result['dimension_scores']
+                })
+            if previous_score is not None and score < previous_score - SUDDEN_DROP:
+                alerts.append({
+                    'timestamp': result['timestamp'],
+                    'severity': 'warning',
+                    'message': f'Sudden DQSI drop detected: {previous_score:.3f} → {score:.3f}',
+                    'dimension_details': result['dimension_scores']
+                })
+            previous_score = score
+        return alerts
+
+    def get_feed_trend(self, feed_id: str) -> Optional[Dict[str, Any]]:
+        """Current trend analysis for a feed without scoring anything"""
+        state = self._feeds.get(feed_id)
+        if state is None:
+            return None
+        with state.lock:
+            return state.stats.trend_analysis()
+
+    def reset_feed(self, feed_id: str) -> None:
+        """Forget a feed's points, including its persisted log"""
+        with self._lock:
+            self._feeds.pop(feed_id, None)
+        path = self._log_path(feed_id)
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    # ---- internals ----
+
+    def _get_feed(self, feed_id: str, config_key: str, window: int, thresholds: Dict[str, float]) -> FeedState:
+        with self._lock:
+            state = self._feeds.get(feed_id)
+            if state is None:
+                state = self._load_feed(feed_id, window, thresholds)
+            if state is None or state.config_key != config_key:
+                if state is not None:
+                    logger.info(f"DQSI config changed for feed {feed_id}; discarding stored points")
+                    self._truncate_log(feed_id)
+                state = FeedState(feed_id, config_key, window, thresholds, self.ewma_alpha)
+            self._feeds[feed_id] = state
+            return state
+
+    def _trim(self, state: FeedState) -> None:
+        # Points are kept in timestamp order, so the first keys are the oldest;
+        # the log keeps their records until it is next compacted
+        for _ in range(len(state.points) - self.max_points):
+            _, oldest = state.points.popitem(last=False)
+            following = next(iter(state.points.values()), None)
+            state.stats.evict(oldest['dqsi_score'], following['dqsi_score'] if following else None)
+
+    def _log_path(self, feed_id: str) -> Optional[str]:
+        if not self.state_dir:
+            return None
+        digest = hashlib.sha1(feed_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.state_dir, f"dqsi_feed_{digest}.jsonl")
+
+    def _append_points(self, state: FeedState, points: List[Dict[str, Any]]) -> None:
+        path = self._log_path(state.feed_id)
+        if not path:
+            return
+        try:
+            new_file = not os.path.exists(path)
+            with open(path, 'a') as f:
+                if new_file:
+                    f.write(json.dumps({'feed_id': state.feed_id, 'config_key': state.config_key}) + '\n')
+                for point in points:
+                    f.write(json.dumps(point, default=str) + '\n')
+            state.log_records = (0 if new_file else state.log_records) + len(points)
+        except Exception as e:
+            logger.error(f"Error persisting DQSI points for feed {state.feed_id}: {str(e)}")
+
+    def _rewrite_log(self, state: FeedState) -> None:
+        path = self._log_path(state.feed_id)
+        if not path:
+            return
+        try:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(json.dumps({'feed_id': state.feed_id, 'config_key': state.config_key}) + '\n')
+                for point in state.points.values():
+                    f.write(json.dumps(point, default=str) + '\n')
+            os.replace(tmp_path, path)
+            state.log_records = len(state.points)
+        except Exception as e:
+            logger.error(f"Error compacting DQSI point log for feed {state.feed_id}: {str(e)}")
+
+    def _truncate_log(self, feed_id: str) -> None:
+        path = self._log_path(feed_id)
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def _load_feed(self, feed_id: str, window: int, thresholds: Dict[str, float]) -> Optional[FeedState]:
+        path = self._log_path(feed_id)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                header = json.loads(f.readline())
+                state = FeedState(feed_id, header.get('config_key', ''), window, thresholds, self.ewma_alpha)
+                for line in f:
+                    if line.strip():
+                        point = json.loads(line)
+                        # Later (revised) records replace earlier ones in place
+                        state.points[point['timestamp']] = point
+                        state.log_records += 1
+            state.rebuild_stats(window, thresholds)
+            logger.info(f"Loaded {len(state.points)} DQSI points for feed {feed_id}")
+            return state
+        except Exception as e:
+            logger.error(f"Error loading DQSI point log for feed {feed_id}: {str(e)}")
+            return None
@@ -523,6 +523,20 @@ def map_evidence(raw_data: Dict[str, Any]) -> Dict[str, int]:
     
     return evidence
 
+def map_insider_dealing_evidence(raw_data: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Map raw input data to the insider dealing model's evidence node states.
+    Returns a dict: {node_name: state_index} for trade_pattern, comms_intent,
+    pnl_drift, news_timing and state_information_access.
+    """
+    return {
+        "trade_pattern": map_trade_pattern(raw_data.get("trade", {})),
+        "comms_intent": map_comms_intent(raw_data.get("comms", {})),
+        "pnl_drift": map_pnl_drift(raw_data.get("pnl", {})),
+        "news_timing": map_timing_proximity(raw_data.get("trade", {}), raw_data.get("market", {})),
+        "state_information_access": map_mnpi_access(raw_data.get("hr", {}), raw_data.get("market", {})),
+    }
+
 def map_wash_trade_evidence(wash_trade_data: Dict[str, Any]) -> Dict[str, int]:
     """
     Map wash trade specific evidence from raw data.
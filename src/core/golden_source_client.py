@@ -0,0 +1,246 @@
+"""
+Golden Source Client
+
+Batched, pipelined Redis lookups of golden-source reference data for DQ
+consistency and validity scoring, with a bounded TTL cache in front so
+repeated KDE values never leave the process.
+"""
+
+import json
+import logging
+import string
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+from .trading_data_cache import BoundedRecordCache
+
+logger = logging.getLogger(__name__)
+
+_missing = object()
+
+
+def key_fields(key_pattern: str) -> List[str]:
+    """Placeholder names in a golden-source key pattern"""
+    return [name for _, name, _, _ in string.Formatter().parse(key_pattern) if name]
+
+
+class GoldenSourceClient:
+    """
+    Redis-backed golden sources with one network round trip per batch
+
+    Record sources (``key_pattern`` + ``fields``) hold a JSON document per
+    key and are fetched with ``MGET``; membership sources (``set_key``) are
+    Redis sets checked with ``SMISMEMBER``. All commands needed for a batch
+    of records go out in a single non-transactional pipeline.
+
+    Args:
+        redis_client: redis-py compatible client
+        golden_sources: ``golden_sources`` section of the DQ config
+        cache_max_bytes: Memory budget of the local cache
+        ttl_seconds: How long looked-up values (including misses) are trusted
+        mget_chunk_size: Maximum keys per ``MGET``/``SMISMEMBER`` command
+    """
+
+    def __init__(self, redis_client, golden_sources: Dict[str, Any],
+                 cache_max_bytes: int = 16 * 1024 * 1024,
+                 ttl_seconds: Optional[float] = 300,
+                 mget_chunk_size: int = 500):
+        self.redis_client = redis_client
+        self.golden_sources = golden_sources or {}
+        self.mget_chunk_size = mget_chunk_size
+        self.cache = BoundedRecordCache(max_bytes=cache_max_bytes, ttl_seconds=ttl_seconds)
+        self.metrics = {'round_trips': 0, 'keys_fetched': 0, 'members_checked': 0, 'errors': 0}
+
+        self._key_fields = {
+            name: key_fields(config['key_pattern'])
+            for name, config in self.golden_sources.items()
+            if config.get('source_type') == 'redis' and config.get('key_pattern')
+        }
+
+    # ---- record sources ----
+
+    def record_key(self, source_name: str, evidence: Dict[str, Any]) -> Optional[str]:
+        """Redis key of the golden record for an evidence record, if it can be built"""
+        fields = self._key_fields.get(source_name)
+        if fields is None:
+            return None
+        values = {}
+        for field in fields:
+            value = evidence.get(field)
+            if value is None or value == '':
+                return None
+            values[field] = value
+        return self.golden_sources[source_name]['key_pattern'].format(**values)
+
+    def get_record(self, source_name: str, evidence: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Golden record for one evidence record (served from cache after prefetch)"""
+        key = self.record_key(source_name, evidence)
+        if key is None:
+            return None
+        return self.get_records([key]).get(key)
+
+    def get_records(self, keys: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Golden records by Redis key; misses are fetched in one pipeline"""
+        return self._resolve(record_keys=keys)[0]
+
+    def prefetch(self, records: Iterable[Dict[str, Any]],
+                 membership: Optional[Dict[str, Iterable[Any]]] = None,
+                 source_names: Optional[Iterable[str]] = None) -> int:
+        """
+        Warm the cache with everything a batch will look up, in one round trip
+
+        Args:
+            records: Evidence records whose golden records are needed
+            membership: Reference source -> values that will be membership-checked
+            source_names: Record sources to fetch (defaults to all Redis sources)
+
+        Returns:
+            Number of distinct golden keys and reference values referenced
+        """
+        names = list(source_names) if source_names is not None else list(self._key_fields)
+        keys = set()
+        for evidence in records:
+            for source_name in names:
+                key = self.record_key(source_name, evidence)
+                if key is not None:
+                    keys.add(key)
+
+        set_values = {}
+        for source_name, values in (membership or {}).items():
+            if self._is_set_source(source_name):
+                set_values[source_name] = list(values)
+            elif self.supports_membership(source_name):
+                keys.update(self._member_record_key(source_name, value) for value in values)
+
+        self._resolve(record_keys=keys, membership=set_values)
+        return len(keys) + sum(len(values) for values in set_values.values())
+
+    # ---- membership sources ----
+
+    def supports_membership(self, source_name: str) -> bool:
+        """Whether values can be validated against this source"""
+        return self._is_set_source(source_name) or len(self._key_fields.get(source_name, ())) == 1
+
+    def check_membership(self, source_name: str, values: Iterable[Any]) -> Optional[List[bool]]:
+        """
+        Whether each value is a known member of a reference source
+
+        Sources with a ``set_key`` are Redis sets; sources keyed by a single
+        placeholder (e.g. ``venue:{venue_code}``) count a value as valid when
+        its golden record exists.
+
+        Returns:
+            One flag per value, or None when the source cannot be checked
+        """
+        values = list(values)
+        if self._is_set_source(source_name):
+            members = self._resolve(membership={source_name: values})[1]
+            if members is None:
+                return None
+            return [members[(source_name, self._member_token(value))] for value in values]
+
+        if self.supports_membership(source_name):
+            keys = [self._member_record_key(source_name, value) for value in values]
+            records, members = self._resolve(record_keys=keys)
+            if any(key not in records for key in keys):
+                return None
+            return [records[key] is not None for key in keys]
+
+        return None
+
+    # ---- internals ----
+
+    def _is_set_source(self, source_name: str) -> bool:
+        config = self.golden_sources.get(source_name, {})
+        return config.get('source_type') == 'redis' and bool(config.get('set_key'))
+
+    def _member_record_key(self, source_name: str, value: Any) -> str:
+        field = self._key_fields[source_name][0]
+        return self.golden_sources[source_name]['key_pattern'].format(**{field: value})
+
+    @staticmethod
+    def _member_token(value: Any) -> str:
+        return value if isinstance(value, str) else json.dumps(value, default=str)
+
+    @staticmethod
+    def _record_cache_key(key: str) -> str:
+        return f"record|{key}"
+
+    @staticmethod
+    def _member_cache_key(source_name: str, token: str) -> str:
+        return f"member|{source_name}|{token}"
+
+    def _resolve(self, record_keys: Iterable[str] = (),
+                 membership: Optional[Dict[str, List[Any]]] = None
+                 ) -> Tuple[Dict[str, Optional[Dict[str, Any]]], Optional[Dict[Tuple[str, str], bool]]]:
+        records: Dict[str, Optional[Dict[str, Any]]] = {}
+        members: Dict[Tuple[str, str], bool] = {}
+
+        missing_keys = []
+        for key in dict.fromkeys(record_keys):
+            cached = self.cache.get(self._record_cache_key(key), _missing)
+            if cached is _missing:
+                missing_keys.append(key)
+            else:
+                records[key] = cached
+
+        missing_members: Dict[str, List[str]] = {}
+        for source_name, values in (membership or {}).items():
+            for token in dict.fromkeys(self._member_token(value) for value in values):
+                cached = self.cache.get(self._member_cache_key(source_name, token), _missing)
+                if cached is _missing:
+                    missing_members.setdefault(source_name, []).append(token)
+                else:
+                    members[(source_name, token)] = cached
+
+        if not missing_keys and not missing_members:
+            return records, members
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            key_chunks = [missing_keys[i:i + self.mget_chunk_size]
+                          for i in range(0, len(missing_keys), self.mget_chunk_size)]
+            for chunk in key_chunks:
+                pipe.mget(chunk)
+            member_chunks = []
+            for source_name, tokens in missing_members.items():
+                set_key = self.golden_sources[source_name]['set_key']
+                for i in range(0, len(tokens), self.mget_chunk_size):
+                    chunk = tokens[i:i + self.mget_chunk_size]
+                    pipe.smismember(set_key, chunk)
+                    member_chunks.append((source_name, chunk))
+            replies = pipe.execute()
+            self.metrics['round_trips'] += 1
+        except Exception as e:
+            # Unreachable golden sources leave these values unchecked
+            self.metrics['errors'] += 1
+            logger.error(f"Error fetching golden source data: {str(e)}")
+            return records, (None if missing_members else members)
+
+        for chunk, values in zip(key_chunks, replies[:len(key_chunks)]):
+            for key, raw in zip(chunk, values):
+                record = self._decode_record(key, raw)
+                records[key] = record
+                self.cache[self._record_cache_key(key)] = record
+            self.metrics['keys_fetched'] += len(chunk)
+
+        for (source_name, chunk), flags in zip(member_chunks, replies[len(key_chunks):]):
+            for token, flag in zip(chunk, flags):
+                members[(source_name, token)] = bool(flag)
+                self.cache[self._member_cache_key(source_name, token)] = bool(flag)
+            self.metrics['members_checked'] += len(chunk)
+
+        return records, members
+
+    @staticmethod
+    def _decode_record(key: str, raw: Any) -> Optional[Dict[str, Any]]:
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid golden record at {key}: {e}")
+            return None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Round trip counts and local cache metrics"""
+        return {**self.metrics, 'cache': self.cache.get_metrics()}
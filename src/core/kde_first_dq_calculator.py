@@ -12,18 +12,68 @@ Framework:
 - Synthetic KDEs: always weight=3
 """
 
-import yaml
 import numpy as np
+import pandas as pd
 import logging
-import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 import redis
 import json
 
+from .coverage_baseline_store import CoverageBaselineStore
+from .dq_rule_plan import NULL_TOKENS, DQRulePlan, DQRulePlanLoader
+from .dq_sketches import UniquenessTracker
+from .golden_source_client import GoldenSourceClient
+
 logger = logging.getLogger(__name__)
 
+TIMESTAMP_FIELDS = ('trade_date', 'timestamp', 'event_timestamp', 'created_at')
+
+# Python's round() on each element, so frame scores round exactly like calculate_dqsi
+_round_elements = np.frompyfunc(round, 2, 1)
+
+_FNV_PRIME = np.uint64(0x100000001b3)
+
+
+def _record_hashes(columns: Dict[Any, np.ndarray], n_rows: int) -> np.ndarray:
+    """
+    64-bit identity hash per row of a set of object columns.
+    
+    Field names and the string form of each value are hashed with
+    ``pd.util.hash_array`` and combined in sorted field order, so a record
+    dict and the same row of a DataFrame get the same hash.
+    """
+    names = sorted(columns, key=str)
+    name_hash = pd.util.hash_array(np.array(['\x1f'.join(map(str, names))], dtype=object))[0]
+    hashes = np.full(n_rows, name_hash, dtype=np.uint64)
+    for name in names:
+        hashes = (hashes * _FNV_PRIME) ^ pd.util.hash_array(columns[name])
+    return hashes
+
+
+class _FrameRows:
+    """Row views of a scored frame, built at most once and shared by every KDE column."""
+    
+    def __init__(self, calculator: 'KDEFirstDQCalculator', data: pd.DataFrame):
+        self._calculator = calculator
+        self.data = data
+        self._records = None
+        self._keys = None
+    
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        if self._records is None:
+            self._records = self.data.to_dict('records')
+        return self._records
+    
+    @property
+    def keys(self) -> np.ndarray:
+        if self._keys is None:
+            self._keys = self._calculator._record_keys(self.data)
+        return self._keys
+
+
 class KDEFirstDQCalculator:
     """
     KDE-First Data Quality calculator implementing 2-tier, 7-dimension framework.
@@ -32,45 +82,73 @@ class KDEFirstDQCalculator:
     that respects both risk levels and dimension tiers.
     """
     
-    def __init__(self, config_path: str = "config/dq_config.yaml", redis_client=None):
+    def __init__(self, config_path: str = "config/dq_config.yaml", redis_client=None,
+                 uniqueness_tracker: UniquenessTracker = None, reload_interval: float = 1.0,
+                 coverage_baseline_store: CoverageBaselineStore = None):
         """
         Initialize KDE-First DQ calculator.
         
         Args:
             config_path: Path to DQ configuration YAML
             redis_client: Redis client for golden source lookups
+            uniqueness_tracker: Duplicate detector for the uniqueness dimension
+                (built from ``uniqueness_tracking`` config when enabled)
+            reload_interval: Seconds between config file change checks
+            coverage_baseline_store: Daily per-feed baselines for coverage scoring
+                (built from ``coverage_baselines`` config when enabled)
         """
-        self.config = self._load_config(config_path)
+        # Compiled rule plan, hot-swapped when the config file changes
+        self._plan_loader = DQRulePlanLoader(
+            config_path,
+            default_config=self._get_default_config,
+            validate=self._validate_config,
+            check_interval=reload_interval
+        )
         self.redis_client = redis_client
-        self._validate_config()
+        
+        cache_config = self.config.get('golden_source_cache', {})
+        self.golden_source_client = GoldenSourceClient(
+            redis_client,
+            self.config.get('golden_sources', {}),
+            cache_max_bytes=cache_config.get('max_bytes', 16 * 1024 * 1024),
+            ttl_seconds=cache_config.get('ttl_seconds', 300)
+        ) if redis_client is not None else None
+        
+        self.uniqueness_tracker = uniqueness_tracker or self._build_uniqueness_tracker()
+        self.coverage_baseline_store = coverage_baseline_store or self._build_coverage_baseline_store()
         
         logger.info("KDE-First DQ calculator initialized with 2-tier framework")
     
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
-        """Load configuration from YAML file."""
-        try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
-        except Exception as e:
-            logger.error(f"Failed to load config from {config_path}: {e}")
-            return self._get_default_config()
+    @property
+    def rule_plan(self) -> DQRulePlan:
+        """Current compiled rule plan."""
+        return self._plan_loader.plan
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configuration the current rule plan was compiled from."""
+        return self._plan_loader.plan.config
     
-    def _validate_config(self):
+    @staticmethod
+    def _validate_config(config: Dict[str, Any]):
         """Validate configuration structure."""
         required_sections = [
             'tier_weights', 'risk_weights', 'kde_risk', 'dimension_tiers',
             'timeliness_buckets', 'coverage_scoring', 'role_kde_scope'
         ]
         
+        if not isinstance(config, dict):
+            raise ValueError("DQ config must be a mapping")
         for section in required_sections:
-            if section not in self.config:
+            if section not in config:
                 raise ValueError(f"Missing required config section: {section}")
     
     def calculate_dqsi(self, 
                       evidence: Dict[str, Any],
                       baseline_data: Dict[str, Any] = None,
                       user_role: str = "analyst",
-                      alert_timestamp: datetime = None) -> Dict[str, Any]:
+                      alert_timestamp: datetime = None,
+                      feed_id: str = None) -> Dict[str, Any]:
         """
         Calculate DQSI score using KDE-first approach.
         
@@ -79,34 +157,45 @@ class KDEFirstDQCalculator:
             baseline_data: Historical baseline for coverage calculations
             user_role: User role for KDE scope filtering
             alert_timestamp: Alert timestamp for timeliness calculations
+            feed_id: Source feed; its stored baseline is used when baseline_data
+                is not given, and the record is added to that baseline
             
         Returns:
             Dictionary containing DQSI score, trust bucket, and detailed breakdown
         """
         try:
+            if baseline_data is None:
+                baseline_data = self._get_stored_baseline(feed_id, alert_timestamp)
+            
+            # One plan for the whole record, even if a reload lands mid-way
+            plan = self.rule_plan
+            
             # Filter KDEs based on user role
             applicable_kdes = self._get_applicable_kdes(evidence, user_role)
             
+            # One pipelined round trip for every golden-source value this record needs
+            self._prefetch_golden_sources([evidence], applicable_kdes)
+            
             # Calculate scores for each KDE across all applicable dimensions
             kde_scores = {}
             synthetic_scores = {}
             
             for kde_name in applicable_kdes:
                 kde_value = evidence.get(kde_name)
-                kde_scores[kde_name] = self._calculate_kde_scores(kde_name, kde_value, evidence)
+                kde_scores[kde_name] = self._calculate_kde_scores(kde_name, kde_value, evidence, plan)
             
             # Calculate synthetic KDE scores (timeliness, coverage)
-            synthetic_scores['timeliness'] = self._calculate_timeliness_score(evidence, alert_timestamp)
-            synthetic_scores['coverage'] = self._calculate_coverage_score(evidence, baseline_data)
+            synthetic_scores['timeliness'] = self._calculate_timeliness_score(evidence, alert_timestamp, plan)
+            synthetic_scores['coverage'] = self._calculate_coverage_score(evidence, baseline_data, plan)
             
             # Aggregate final DQSI score using weighted average
-            dqsi_score, score_breakdown = self._aggregate_dqsi_score(kde_scores, synthetic_scores)
+            dqsi_score, score_breakdown = self._aggregate_dqsi_score(kde_scores, synthetic_scores, plan)
             
             # Determine trust bucket
-            trust_bucket = self._get_trust_bucket(dqsi_score)
+            trust_bucket = self._get_trust_bucket(dqsi_score, plan)
             
             # Include legacy score for backward compatibility
-            legacy_score = self._calculate_legacy_score(kde_scores, synthetic_scores) if self.config.get('legacy_support', {}).get('enabled', False) else None
+            legacy_score = self._calculate_legacy_score(kde_scores, synthetic_scores, plan)
             
             result = {
                 'dqsi_score': round(dqsi_score, 3),
@@ -129,6 +218,9 @@ class KDEFirstDQCalculator:
             if legacy_score is not None:
                 result['legacy_dq_score'] = round(legacy_score, 3)
             
+            if feed_id and self.coverage_baseline_store is not None:
+                self.coverage_baseline_store.record(feed_id, evidence, alert_timestamp)
+            
             logger.info(f"KDE-First DQSI calculated: score={dqsi_score:.3f}, "
                        f"trust_bucket={trust_bucket}, kdes_assessed={len(applicable_kdes)}")
             
@@ -138,6 +230,358 @@ class KDEFirstDQCalculator:
             logger.error(f"Error in KDE-First DQSI calculation: {e}")
             return self._get_default_result(user_role)
     
+    def calculate_dqsi_frame(self,
+                             data: pd.DataFrame,
+                             baseline_data: Dict[str, Any] = None,
+                             user_role: str = "analyst",
+                             alert_timestamp: datetime = None,
+                             feed_id: str = None) -> pd.DataFrame:
+        """
+        Calculate DQSI for every record of a DataFrame in one pass per KDE column.
+        
+        Each row is scored exactly as ``calculate_dqsi(record)`` would score
+        ``record`` from ``data.to_dict('records')``, but completeness,
+        conformity, accuracy and the synthetic KDEs are evaluated as column
+        operations (null masks, pandas string methods, ``isin``).
+        
+        Args:
+            data: One record per row, KDEs as columns
+            baseline_data: Historical baseline for coverage calculations
+            user_role: User role for KDE scope filtering
+            alert_timestamp: Alert timestamp for timeliness calculations
+            feed_id: Source feed; its stored baseline is used when baseline_data
+                is not given, and the rows are added to that baseline
+            
+        Returns:
+            DataFrame indexed like ``data`` with ``dqsi_score``, ``dqsi_trust_bucket``,
+            ``foundational_score``, ``enhanced_score``, optional ``legacy_dq_score``,
+            ``<kde>.<dimension>`` and ``synthetic.<name>`` score columns
+        """
+        plan = self.rule_plan
+        applicable_kdes = [kde for kde in plan.config['role_kde_scope'].get(user_role, []) if kde in data.columns]
+        n_rows = len(data)
+        
+        if baseline_data is None:
+            baseline_data = self._get_stored_baseline(feed_id, alert_timestamp)
+        
+        rows = _FrameRows(self, data)
+        if self.golden_source_client is not None:
+            self._prefetch_golden_sources(rows.records, applicable_kdes)
+        
+        kde_scores = {
+            kde_name: self.score_kde_column(kde_name, data[kde_name], data, plan, rows)
+            for kde_name in applicable_kdes
+        }
+        synthetic_scores = {
+            'timeliness': self._timeliness_column(data, alert_timestamp, plan),
+            'coverage': self._coverage_column(data, baseline_data, plan)
+        }
+        
+        # Same accumulation order as _aggregate_dqsi_score, one array op per term
+        total_weighted = np.zeros(n_rows)
+        total_weights = 0.0
+        foundational_weighted = np.zeros(n_rows)
+        foundational_weights = 0.0
+        enhanced_weighted = np.zeros(n_rows)
+        enhanced_weights = 0.0
+        
+        for kde_name, dimension_scores in kde_scores.items():
+            risk_weight = plan.kde(kde_name).risk_weight
+            for dimension, scores in dimension_scores.items():
+                tier, tier_weight = plan.dimension_weights[dimension]
+                weighted = scores * risk_weight * tier_weight
+                weight = risk_weight * tier_weight
+                
+                total_weighted = total_weighted + weighted
+                total_weights += weight
+                if tier == 'foundational':
+                    foundational_weighted = foundational_weighted + weighted
+                    foundational_weights += weight
+                else:
+                    enhanced_weighted = enhanced_weighted + weighted
+                    enhanced_weights += weight
+        
+        synthetic_weight = plan.synthetic_weight
+        foundational_tier_weight = plan.tier_weights['foundational']
+        for scores in synthetic_scores.values():
+            weighted = scores * synthetic_weight * foundational_tier_weight
+            weight = synthetic_weight * foundational_tier_weight
+            total_weighted = total_weighted + weighted
+            total_weights += weight
+            foundational_weighted = foundational_weighted + weighted
+            foundational_weights += weight
+        
+        dqsi_scores = total_weighted / total_weights if total_weights > 0 else np.zeros(n_rows)
+        
+        thresholds = plan.trust_thresholds
+        trust_buckets = np.select(
+            [dqsi_scores >= thresholds['high'], dqsi_scores >= thresholds['moderate']],
+            ['High', 'Moderate'], default='Low'
+        )
+        
+        result = {
+            'dqsi_score': self._round3(dqsi_scores),
+            'dqsi_trust_bucket': trust_buckets,
+            'foundational_score': (foundational_weighted / foundational_weights
+                                   if foundational_weights > 0 else np.zeros(n_rows)),
+            'enhanced_score': (enhanced_weighted / enhanced_weights
+                               if enhanced_weights > 0 else np.zeros(n_rows))
+        }
+        
+        if plan.config.get('legacy_support', {}).get('enabled', False):
+            columns = [scores for dims in kde_scores.values() for scores in dims.values()]
+            columns.extend(synthetic_scores.values())
+            result['legacy_dq_score'] = self._round3(np.mean(np.column_stack(columns), axis=1))
+        
+        for kde_name, dimension_scores in kde_scores.items():
+            for dimension, scores in dimension_scores.items():
+                result[f"{kde_name}.{dimension}"] = self._round3(scores)
+        for name, scores in synthetic_scores.items():
+            result[f"synthetic.{name}"] = self._round3(scores)
+        
+        if feed_id and self.coverage_baseline_store is not None and n_rows:
+            self.coverage_baseline_store.add_totals(feed_id, self._frame_baseline_totals(data), alert_timestamp)
+        
+        logger.info(f"KDE-First DQSI frame calculated: rows={n_rows}, kdes_assessed={len(applicable_kdes)}")
+        return pd.DataFrame(result, index=data.index)
+    
+    def score_kde_column(self, kde_name: str, values: Any, data: pd.DataFrame = None,
+                         plan: DQRulePlan = None, rows: _FrameRows = None) -> Dict[str, np.ndarray]:
+        """
+        Score a whole column of KDE values across all KDE dimensions.
+        
+        Args:
+            kde_name: Name of the KDE
+            values: pandas Series, NumPy array or list of values
+            data: Full frame, used for row context by golden-source consistency
+                and record identity by uniqueness checks
+            plan: Rule plan to score with (defaults to the current plan)
+            rows: Row views of ``data`` shared across the KDEs of one frame
+            
+        Returns:
+            Dictionary mapping dimension names to score arrays (0.0 to 1.0)
+        """
+        values = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object if isinstance(values, list) else None)
+        masks = self._classify_column(values)
+        kde_plan = (plan or self.rule_plan).kde(kde_name)
+        if rows is None and data is not None:
+            rows = _FrameRows(self, data)
+        
+        return {
+            'completeness': self._completeness_column(values, masks),
+            'conformity': self._conformity_column(kde_plan, values, masks),
+            'accuracy': self._accuracy_column(kde_plan, values, masks),
+            'uniqueness': self._uniqueness_column(kde_name, values, masks, rows),
+            'consistency': self._consistency_column(kde_plan, values, masks, rows)
+        }
+    
+    @staticmethod
+    def _round3(scores: np.ndarray) -> np.ndarray:
+        return _round_elements(scores, 3).astype(float)
+    
+    @staticmethod
+    def _classify_column(values: pd.Series) -> Dict[str, np.ndarray]:
+        """Per-element type masks matching the isinstance checks of the scalar scorers."""
+        n_rows = len(values)
+        kind = values.dtype.kind
+        
+        if kind in 'fiub':
+            array = values.to_numpy()
+            is_float = np.full(n_rows, kind == 'f')
+            return {
+                'none': np.zeros(n_rows, dtype=bool),
+                'str': np.zeros(n_rows, dtype=bool),
+                'numeric': np.ones(n_rows, dtype=bool),
+                'float': is_float,
+                'nan': np.isnan(array) if kind == 'f' else np.zeros(n_rows, dtype=bool)
+            }
+        
+        objects = values.to_numpy(dtype=object)
+        is_float = np.fromiter((isinstance(v, float) for v in objects), dtype=bool, count=n_rows)
+        is_nan = np.zeros(n_rows, dtype=bool)
+        if is_float.any():
+            is_nan[is_float] = np.isnan(objects[is_float].astype(float))
+        return {
+            'none': np.fromiter((v is None for v in objects), dtype=bool, count=n_rows),
+            'str': np.fromiter((isinstance(v, str) for v in objects), dtype=bool, count=n_rows),
+            'numeric': np.fromiter((isinstance(v, (int, float)) for v in objects), dtype=bool, count=n_rows),
+            'float': is_float,
+            'nan': is_nan
+        }
+    
+    def _completeness_column(self, values: pd.Series, masks: Dict[str, np.ndarray]) -> np.ndarray:
+        scores = np.ones(len(values))
+        scores[masks['none'] | masks['nan']] = 0.0
+        if masks['str'].any():
+            null_tokens = values[masks['str']].str.lower().isin(NULL_TOKENS).to_numpy()
+            scores[np.flatnonzero(masks['str'])[null_tokens]] = 0.0
+        return scores
+    
+    def _conformity_column(self, kde_plan, values: pd.Series, masks: Dict[str, np.ndarray]) -> np.ndarray:
+        scores = np.ones(len(values))
+        
+        if kde_plan.has_conformity_rules:
+            string_rows = np.flatnonzero(masks['str'])
+            strings = values[masks['str']] if len(string_rows) else None
+            
+            if kde_plan.min_length is not None and strings is not None:
+                lengths = strings.str.len().to_numpy()
+                valid = (kde_plan.min_length <= lengths) & (lengths <= kde_plan.max_length)
+                scores[string_rows[~valid]] = 0.0
+            
+            if kde_plan.min_value is not None and masks['numeric'].any():
+                numbers = values[masks['numeric']].to_numpy(dtype=float)
+                with np.errstate(invalid='ignore'):
+                    valid = (kde_plan.min_value <= numbers) & (numbers <= kde_plan.max_value)
+                scores[np.flatnonzero(masks['numeric'])[~valid]] = 0.0
+            
+            if kde_plan.pattern is not None and strings is not None:
+                valid = strings.str.match(kde_plan.pattern).to_numpy(dtype=bool)
+                scores[string_rows[~valid]] = 0.0
+        
+        scores[masks['none']] = 0.0
+        return scores
+    
+    def _accuracy_column(self, kde_plan, values: pd.Series, masks: Dict[str, np.ndarray]) -> np.ndarray:
+        n_rows = len(values)
+        
+        precision = np.ones(n_rows)
+        if kde_plan.max_decimals is not None and masks['float'].any():
+            # Decimal places of str(value), as in KDEPlan.score_precision
+            text = values[masks['float']].map(str)
+            decimals = text.str.split('.').str[-1].str.len().where(text.str.contains('.', regex=False), 0)
+            valid = decimals.to_numpy() <= kde_plan.max_decimals
+            precision[np.flatnonzero(masks['float'])[~valid]] = 0.0
+        
+        validity = np.ones(n_rows)
+        if kde_plan.validity_source is not None:
+            reference_source = kde_plan.validity_source
+            if kde_plan.reference_values is not None:
+                validity = values.isin(kde_plan.reference_values).to_numpy().astype(float)
+            else:
+                # Each distinct value is checked once against the Redis reference
+                distinct = pd.unique(values.to_numpy(dtype=object))
+                membership = self._check_reference_membership(reference_source, list(distinct))
+                if membership is None:
+                    validity[:] = 0.5
+                else:
+                    valid_values = {value: flag for value, flag in zip(distinct, membership)}
+                    validity = np.fromiter((valid_values.get(v, False) for v in values.to_numpy(dtype=object)),
+                                           dtype=float, count=n_rows)
+        
+        scores = (precision + validity) / 2.0
+        scores[masks['none']] = 0.0
+        return scores
+    
+    def _uniqueness_column(self, kde_name: str, values: pd.Series, masks: Dict[str, np.ndarray],
+                           rows: _FrameRows = None) -> np.ndarray:
+        scores = np.ones(len(values))
+        if self.uniqueness_tracker is not None and self.uniqueness_tracker.tracks(kde_name):
+            # Observed in row order, so earlier rows of the frame count as history;
+            # without the frame rows have no identity and every row is a new observation
+            present = ~(masks['none'] | masks['nan'])
+            record_keys = rows.keys[present].tolist() if rows is not None else None
+            duplicates = self.uniqueness_tracker.observe(kde_name, values.to_numpy(dtype=object)[present],
+                                                         record_keys)
+            scores[np.flatnonzero(present)[duplicates]] = 0.0
+        scores[masks['none']] = 0.0
+        return scores
+    
+    def _consistency_column(self, kde_plan, values: pd.Series, masks: Dict[str, np.ndarray],
+                            rows: _FrameRows = None) -> np.ndarray:
+        if kde_plan.golden_sources:
+            # Golden-source checks need the full record for key lookups
+            kde_name = kde_plan.name
+            records = rows.records if rows is not None else [{kde_name: v} for v in values]
+            return np.array([
+                self._score_consistency(kde_name, value, record, kde_plan)
+                for value, record in zip(values.to_numpy(dtype=object), records)
+            ], dtype=float)
+        
+        scores = np.ones(len(values))
+        scores[masks['none']] = 0.0
+        return scores
+    
+    def _timeliness_column(self, data: pd.DataFrame, alert_timestamp: datetime = None,
+                           plan: DQRulePlan = None) -> np.ndarray:
+        if alert_timestamp is None:
+            alert_timestamp = datetime.now()
+        
+        most_delayed_hours = np.zeros(len(data))
+        for field in TIMESTAMP_FIELDS:
+            if field not in data.columns:
+                continue
+            
+            # Each distinct timestamp is parsed once
+            delays = {}
+            for value in pd.unique(data[field].to_numpy(dtype=object)):
+                try:
+                    delays[value] = self._timestamp_delay_hours(value, alert_timestamp)
+                except Exception:
+                    delays[value] = np.nan
+            field_delays = np.fromiter((delays.get(v, np.nan) for v in data[field].to_numpy(dtype=object)),
+                                       dtype=float, count=len(data))
+            most_delayed_hours = np.fmax(most_delayed_hours, field_delays)
+        
+        # First bucket whose max_hours covers the delay wins
+        scores = np.full(len(data), 0.3)
+        for max_hours, score in reversed((plan or self.rule_plan).timeliness_buckets):
+            scores[most_delayed_hours <= max_hours] = score
+        return scores
+    
+    def _coverage_column(self, data: pd.DataFrame, baseline_data: Dict[str, Any] = None,
+                         plan: DQRulePlan = None) -> np.ndarray:
+        n_rows = len(data)
+        if not baseline_data:
+            return np.zeros(n_rows)
+        
+        baseline_volume = baseline_data.get('volume', 0)
+        baseline_value = baseline_data.get('value', 0)
+        if baseline_volume == 0 and baseline_value == 0:
+            return np.zeros(n_rows)
+        
+        current_volume = len(data.columns)
+        current_value = np.zeros(n_rows)
+        for column in data.columns:
+            values = data[column]
+            if values.dtype.kind in 'fiub':
+                current_value = current_value + values.to_numpy(dtype=float)
+            else:
+                numeric = self._classify_column(values)['numeric']
+                if numeric.any():
+                    column_values = np.zeros(n_rows)
+                    column_values[numeric] = values[numeric].to_numpy(dtype=float)
+                    current_value = current_value + column_values
+        
+        volume_drop = max(0, (baseline_volume - current_volume) / baseline_volume * 100) if baseline_volume > 0 else 0
+        if baseline_value > 0:
+            value_drop = (baseline_value - current_value) / baseline_value * 100
+            value_drop = np.where(value_drop > 0, value_drop, 0.0)
+        else:
+            value_drop = np.zeros(n_rows)
+        max_drop = np.maximum(volume_drop, value_drop)
+        
+        scores = np.full(n_rows, 0.25)
+        for max_drop_percent, score in reversed((plan or self.rule_plan).coverage_buckets):
+            scores[max_drop <= max_drop_percent] = score
+        return scores
+    
+    def _frame_baseline_totals(self, data: pd.DataFrame) -> Dict[str, float]:
+        """Coverage baseline contributions of all rows, as evidence_totals would sum them."""
+        totals = {'records': len(data), 'volume': len(data) * len(data.columns), 'value': 0.0}
+        for column in data.columns:
+            values = data[column]
+            masks = self._classify_column(values)
+            present = ~(masks['none'] | masks['nan'])
+            if present.any():
+                totals[f"kde:{column}:count"] = int(present.sum())
+            numeric = masks['numeric'] & present
+            if numeric.any():
+                column_value = float(values[numeric].to_numpy(dtype=float).sum())
+                totals['value'] += column_value
+                totals[f"kde:{column}:value"] = column_value
+        return totals
+    
     def _get_applicable_kdes(self, evidence: Dict[str, Any], user_role: str) -> List[str]:
         """Get list of KDEs applicable for the given user role."""
         role_scope = self.config['role_kde_scope'].get(user_role, [])
@@ -148,7 +592,8 @@ class KDEFirstDQCalculator:
         logger.debug(f"Role {user_role}: {len(applicable)} applicable KDEs out of {len(role_scope)} in scope")
         return applicable
     
-    def _calculate_kde_scores(self, kde_name: str, kde_value: Any, evidence: Dict[str, Any]) -> Dict[str, float]:
+    def _calculate_kde_scores(self, kde_name: str, kde_value: Any, evidence: Dict[str, Any],
+                              plan: DQRulePlan = None) -> Dict[str, float]:
         """
         Calculate quality scores for a single KDE across all applicable dimensions.
         
@@ -156,28 +601,28 @@ class KDEFirstDQCalculator:
             kde_name: Name of the KDE
             kde_value: Value of the KDE
             evidence: Full evidence dictionary for context
+            plan: Rule plan to score with (defaults to the current plan)
             
         Returns:
             Dictionary mapping dimension names to scores (0.0 to 1.0)
         """
-        scores = {}
-        
-        # Foundational dimensions
-        scores['completeness'] = self._score_completeness(kde_value)
-        scores['conformity'] = self._score_conformity(kde_name, kde_value)
+        kde_plan = (plan or self.rule_plan).kde(kde_name)
         
-        # Enhanced dimensions
-        scores['accuracy'] = self._score_accuracy(kde_name, kde_value)
-        scores['uniqueness'] = self._score_uniqueness(kde_name, kde_value, evidence)
-        scores['consistency'] = self._score_consistency(kde_name, kde_value, evidence)
-        
-        return scores
+        return {
+            # Foundational dimensions
+            'completeness': kde_plan.score_completeness(kde_value),
+            'conformity': kde_plan.score_conformity(kde_value),
+            # Enhanced dimensions
+            'accuracy': self._score_accuracy(kde_name, kde_value, kde_plan),
+            'uniqueness': self._score_uniqueness(kde_name, kde_value, evidence),
+            'consistency': self._score_consistency(kde_name, kde_value, evidence, kde_plan)
+        }
     
     def _score_completeness(self, value: Any) -> float:
         """Score completeness dimension (null values, empty indicators)."""
         if value is None:
             return 0.0
-        if isinstance(value, str) and (value == '' or value.lower() in ['null', 'none', 'unknown', 'n/a']):
+        if isinstance(value, str) and value.lower() in NULL_TOKENS:
             return 0.0
         if isinstance(value, (int, float)) and np.isnan(value):
             return 0.0
@@ -185,150 +630,182 @@ class KDEFirstDQCalculator:
     
     def _score_conformity(self, kde_name: str, value: Any) -> float:
         """Score conformity dimension (length, range, min/max)."""
-        if value is None:
-            return 0.0
-        
-        conformity_rules = self.config.get('conformity_rules', {}).get(kde_name, {})
-        if not conformity_rules:
-            return 1.0  # No rules = assume conformant
-        
-        score = 1.0
-        
-        # Length check
-        if 'length' in conformity_rules and isinstance(value, str):
-            length_rule = conformity_rules['length']
-            min_len = length_rule.get('min', 0)
-            max_len = length_rule.get('max', float('inf'))
-            if not (min_len <= len(value) <= max_len):
-                score = 0.0
-        
-        # Range check
-        if 'range' in conformity_rules and isinstance(value, (int, float)):
-            range_rule = conformity_rules['range']
-            min_val = range_rule.get('min', float('-inf'))
-            max_val = range_rule.get('max', float('inf'))
-            if not (min_val <= value <= max_val):
-                score = 0.0
-        
-        # Pattern check
-        if 'pattern' in conformity_rules and isinstance(value, str):
-            pattern = conformity_rules['pattern']
-            if not re.match(pattern, value):
-                score = 0.0
-        
-        return score
-    
-    def _score_accuracy(self, kde_name: str, value: Any) -> float:
+        return self.rule_plan.kde(kde_name).score_conformity(value)
+    
+    def _score_accuracy(self, kde_name: str, value: Any, kde_plan=None) -> float:
         """Score accuracy dimension (precision, validity)."""
         if value is None:
             return 0.0
         
-        accuracy_rules = self.config.get('accuracy_rules', {})
-        precision_score = self._score_precision(kde_name, value, accuracy_rules.get('precision_rules', {}))
-        validity_score = self._score_validity(kde_name, value, accuracy_rules.get('validity_rules', {}))
+        kde_plan = kde_plan or self.rule_plan.kde(kde_name)
+        precision_score = kde_plan.score_precision(value)
+        validity_score = self._score_validity(kde_plan, value)
         
         # Combined score: (precision + validity) / 2
         return (precision_score + validity_score) / 2.0
     
-    def _score_precision(self, kde_name: str, value: Any, precision_rules: Dict[str, Any]) -> float:
-        """Score precision subdimension."""
-        if kde_name not in precision_rules:
-            return 1.0  # No rules = assume precise
-        
-        expected_precision = precision_rules[kde_name]
-        
-        if isinstance(value, float):
-            # Check decimal places
-            decimal_places = len(str(value).split('.')[-1]) if '.' in str(value) else 0
-            return 1.0 if decimal_places <= expected_precision else 0.0
-        
-        return 1.0  # Non-numeric values pass precision check
-    
-    def _score_validity(self, kde_name: str, value: Any, validity_rules: Dict[str, Any]) -> float:
+    def _score_validity(self, kde_plan, value: Any) -> float:
         """Score validity subdimension."""
-        if kde_name not in validity_rules:
+        if kde_plan.validity_source is None:
             return 1.0  # No rules = assume valid
         
-        validity_rule = validity_rules[kde_name]
-        reference_source = validity_rule['reference_source']
+        # Static reference data
+        is_valid = kde_plan.check_reference(value)
+        if is_valid is not None:
+            return 1.0 if is_valid else 0.0
         
-        # Get reference data
-        reference_data = self._get_reference_data(reference_source)
-        if not reference_data:
+        membership = self._check_reference_membership(kde_plan.validity_source, [value])
+        if membership is None:
             return 0.5  # Can't validate = moderate score
         
-        return 1.0 if value in reference_data else 0.0
+        return 1.0 if membership[0] else 0.0
     
     def _score_uniqueness(self, kde_name: str, value: Any, evidence: Dict[str, Any]) -> float:
-        """Score uniqueness dimension (duplicate detection, key violations)."""
+        """
+        Score uniqueness dimension (duplicate detection, key violations).
+        
+        Tracked identifier KDEs are checked against their rolling history and
+        recorded in it, keyed by the record's identity (see ``_record_key``):
+        a value is a duplicate only when another record carried it first, so
+        re-scoring a record returns its original score and records nothing.
+        """
         if value is None:
             return 0.0
         
-        # Simple uniqueness check within current evidence
-        # In practice, this would check against historical data or within batch
-        max_duplicate_rate = self.config.get('max_duplicate_rate', 0.02)
+        if self.uniqueness_tracker is not None and self.uniqueness_tracker.tracks(kde_name):
+            if isinstance(value, float) and np.isnan(value):
+                return 1.0  # Missing values are not identifiers
+            is_duplicate = self.uniqueness_tracker.observe(kde_name, [value], [self._record_key(evidence)])[0]
+            return 0.0 if is_duplicate else 1.0
         
-        # For now, return 1.0 (unique) unless we implement historical duplicate checking
-        # This would be enhanced with actual duplicate detection logic
         return 1.0
     
-    def _score_consistency(self, kde_name: str, value: Any, evidence: Dict[str, Any]) -> float:
+    def _record_key(self, evidence: Dict[str, Any]) -> int:
+        """
+        Identity of a record for uniqueness tracking.
+        
+        Hash of the ``uniqueness_tracking.record_key_fields`` values (e.g. a
+        message ID), or of the whole record when none are configured, in
+        which case an identical resubmission counts as the same record.
+        Equal to the key ``_record_keys`` gives the same row of a frame.
+        """
+        key_fields = self.config.get('uniqueness_tracking', {}).get('record_key_fields')
+        columns = {}
+        for field, value in evidence.items():
+            if not key_fields or field in key_fields:
+                columns[field] = np.empty(1, dtype=object)
+                columns[field][0] = value
+        return int(_record_hashes(columns, 1)[0])
+    
+    def _record_keys(self, data: pd.DataFrame) -> np.ndarray:
+        """Record identity of every row of a frame, hashed column-wise (see ``_record_key``)."""
+        key_fields = self.config.get('uniqueness_tracking', {}).get('record_key_fields')
+        columns = {
+            field: data[field].to_numpy(dtype=object)
+            for field in data.columns if not key_fields or field in key_fields
+        }
+        return _record_hashes(columns, len(data))
+    
+    def get_uniqueness_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Rolling duplicate rates per tracked KDE against max_duplicate_rate."""
+        if self.uniqueness_tracker is None:
+            return {}
+        return self.uniqueness_tracker.summary(self.config.get('max_duplicate_rate', 0.02))
+    
+    def _get_stored_baseline(self, feed_id: str, alert_timestamp: datetime = None) -> Optional[Dict[str, Any]]:
+        """Rolling coverage baseline of a feed up to the alert day, if one is stored."""
+        if not feed_id or self.coverage_baseline_store is None:
+            return None
+        return self.coverage_baseline_store.get_baseline(
+            feed_id, as_of=alert_timestamp, days=self.config.get('coverage_baseline_days', 30)
+        )
+    
+    def _build_coverage_baseline_store(self) -> Optional[CoverageBaselineStore]:
+        """Create the coverage baseline store from config, if enabled."""
+        baseline_config = self.config.get('coverage_baselines', {})
+        if not baseline_config.get('enabled', False):
+            return None
+        
+        return CoverageBaselineStore(
+            state_dir=baseline_config.get('state_dir'),
+            baseline_days=self.config.get('coverage_baseline_days', 30),
+            retention_days=baseline_config.get('retention_days', 120),
+            autosave_every=baseline_config.get('autosave_every', 1000)
+        )
+    
+    def _build_uniqueness_tracker(self) -> Optional[UniquenessTracker]:
+        """Create the uniqueness tracker from config, if enabled."""
+        tracking_config = self.config.get('uniqueness_tracking', {})
+        if not tracking_config.get('enabled', False):
+            return None
+        
+        return UniquenessTracker(
+            tracking_config.get('kdes', []),
+            state_dir=tracking_config.get('state_dir'),
+            autosave_every=tracking_config.get('autosave_every', 0),
+            generation_size=tracking_config.get('generation_size', 1000000),
+            generations=tracking_config.get('generations', 4),
+            error_rate=tracking_config.get('error_rate', 0.001)
+        )
+    
+    def _score_consistency(self, kde_name: str, value: Any, evidence: Dict[str, Any], kde_plan=None) -> float:
         """Score consistency dimension (golden source matching)."""
         if value is None:
             return 0.0
         
-        # Find applicable golden source mappings
+        # Golden sources holding this KDE were resolved when the plan was compiled
         consistency_score = 1.0
-        golden_sources = self.config.get('golden_sources', {})
+        kde_plan = kde_plan or self.rule_plan.kde(kde_name)
         
-        for source_name, source_config in golden_sources.items():
-            if kde_name in source_config.get('fields', []):
-                # Perform consistency check against golden source
-                reference_value = self._lookup_golden_source(source_name, kde_name, value, evidence)
-                if reference_value is not None:
-                    consistency_score = 1.0 if value == reference_value else 0.0
-                    break
+        for source_name in kde_plan.golden_sources:
+            # Perform consistency check against golden source
+            reference_value = self._lookup_golden_source(source_name, kde_name, value, evidence)
+            if reference_value is not None:
+                consistency_score = 1.0 if value == reference_value else 0.0
+                break
         
         return consistency_score
     
-    def _calculate_timeliness_score(self, evidence: Dict[str, Any], alert_timestamp: datetime = None) -> float:
+    def _calculate_timeliness_score(self, evidence: Dict[str, Any], alert_timestamp: datetime = None,
+                                    plan: DQRulePlan = None) -> float:
         """Calculate timeliness synthetic KDE score."""
         if alert_timestamp is None:
             alert_timestamp = datetime.now()
         
         # Find the most critical timestamp field
-        timestamp_fields = ['trade_date', 'timestamp', 'event_timestamp', 'created_at']
         most_delayed_hours = 0
         
-        for field in timestamp_fields:
+        for field in TIMESTAMP_FIELDS:
             if field in evidence:
                 try:
-                    field_timestamp = evidence[field]
-                    if isinstance(field_timestamp, str):
-                        field_timestamp = datetime.fromisoformat(field_timestamp)
-                    elif isinstance(field_timestamp, (int, float)):
-                        field_timestamp = datetime.fromtimestamp(field_timestamp)
-                    
-                    delay_hours = (alert_timestamp - field_timestamp).total_seconds() / 3600
+                    delay_hours = self._timestamp_delay_hours(evidence[field], alert_timestamp)
                     most_delayed_hours = max(most_delayed_hours, delay_hours)
                 except Exception as e:
                     logger.warning(f"Error parsing timestamp field {field}: {e}")
                     continue
         
         # Map delay to score using configured buckets
-        return self._map_delay_to_score(most_delayed_hours)
+        return self._map_delay_to_score(most_delayed_hours, plan)
     
-    def _map_delay_to_score(self, delay_hours: float) -> float:
-        """Map delay in hours to timeliness score using configured buckets."""
-        buckets = self.config.get('timeliness_buckets', [])
+    def _timestamp_delay_hours(self, field_timestamp: Any, alert_timestamp: datetime) -> float:
+        """Hours between a timestamp field value and the alert timestamp."""
+        if isinstance(field_timestamp, str):
+            field_timestamp = datetime.fromisoformat(field_timestamp)
+        elif isinstance(field_timestamp, (int, float)):
+            field_timestamp = datetime.fromtimestamp(field_timestamp)
         
-        for bucket in buckets:
-            if delay_hours <= bucket['max_hours']:
-                return bucket['score']
+        return (alert_timestamp - field_timestamp).total_seconds() / 3600
+    
+    def _map_delay_to_score(self, delay_hours: float, plan: DQRulePlan = None) -> float:
+        """Map delay in hours to timeliness score using configured buckets."""
+        for max_hours, score in (plan or self.rule_plan).timeliness_buckets:
+            if delay_hours <= max_hours:
+                return score
         
         return 0.3  # Default for delays beyond all buckets
     
-    def _calculate_coverage_score(self, evidence: Dict[str, Any], baseline_data: Dict[str, Any] = None) -> float:
+    def _calculate_coverage_score(self, evidence: Dict[str, Any], baseline_data: Dict[str, Any] = None,
+                                  plan: DQRulePlan = None) -> float:
         """Calculate coverage synthetic KDE score based on volume/value vs baseline."""
         if not baseline_data:
             return 0.0  # No baseline = score 0.0
@@ -352,24 +829,24 @@ class KDEFirstDQCalculator:
         max_drop = max(volume_drop, value_drop)
         
         # Map drop to score using configured buckets
-        return self._map_coverage_drop_to_score(max_drop)
+        return self._map_coverage_drop_to_score(max_drop, plan)
     
-    def _map_coverage_drop_to_score(self, drop_percent: float) -> float:
+    def _map_coverage_drop_to_score(self, drop_percent: float, plan: DQRulePlan = None) -> float:
         """Map coverage drop percentage to score using configured buckets."""
-        coverage_scoring = self.config.get('coverage_scoring', [])
-        
-        for bucket in coverage_scoring:
-            if drop_percent <= bucket['max_drop_percent']:
-                return bucket['score']
+        for max_drop_percent, score in (plan or self.rule_plan).coverage_buckets:
+            if drop_percent <= max_drop_percent:
+                return score
         
         return 0.25  # Default for drops beyond all buckets
     
     def _aggregate_dqsi_score(self, kde_scores: Dict[str, Dict[str, float]], 
-                             synthetic_scores: Dict[str, float]) -> Tuple[float, Dict[str, Any]]:
+                             synthetic_scores: Dict[str, float],
+                             plan: DQRulePlan = None) -> Tuple[float, Dict[str, Any]]:
         """
         Aggregate final DQSI score using weighted average formula:
         dqsi_score = sum(kde_score * risk_weight * tier_weight) / sum(risk_weight * tier_weight)
         """
+        plan = plan or self.rule_plan
         total_weighted_score = 0.0
         total_weights = 0.0
         
@@ -381,12 +858,10 @@ class KDEFirstDQCalculator:
         
         # Process real KDEs
         for kde_name, dimension_scores in kde_scores.items():
-            kde_risk = self.config['kde_risk'].get(kde_name, 'medium')
-            risk_weight = self.config['risk_weights'][kde_risk]
+            risk_weight = plan.kde(kde_name).risk_weight
             
             for dimension, score in dimension_scores.items():
-                tier = self.config['dimension_tiers'][dimension]
-                tier_weight = self.config['tier_weights'][tier]
+                tier, tier_weight = plan.dimension_weights[dimension]
                 
                 weighted_score = score * risk_weight * tier_weight
                 weight = risk_weight * tier_weight
@@ -403,10 +878,10 @@ class KDEFirstDQCalculator:
                     enhanced_weights += weight
         
         # Process synthetic KDEs (always high risk weight)
-        synthetic_weight = self.config['synthetic_kde_weight']
+        synthetic_weight = plan.synthetic_weight
         for synthetic_name, score in synthetic_scores.items():
             # Synthetic KDEs are foundational tier
-            tier_weight = self.config['tier_weights']['foundational']
+            tier_weight = plan.tier_weights['foundational']
             
             weighted_score = score * synthetic_weight * tier_weight
             weight = synthetic_weight * tier_weight
@@ -432,9 +907,9 @@ class KDEFirstDQCalculator:
         
         return final_score, breakdown
     
-    def _get_trust_bucket(self, dqsi_score: float) -> str:
+    def _get_trust_bucket(self, dqsi_score: float, plan: DQRulePlan = None) -> str:
         """Map DQSI score to trust bucket."""
-        thresholds = self.config.get('trust_bucket_thresholds', {'high': 0.85, 'moderate': 0.65})
+        thresholds = (plan or self.rule_plan).trust_thresholds
         
         if dqsi_score >= thresholds['high']:
             return "High"
@@ -469,29 +944,55 @@ class KDEFirstDQCalculator:
         
         return summary
     
-    def _get_reference_data(self, reference_source: str) -> List[Any]:
-        """Get reference data for validity checks."""
-        golden_sources = self.config.get('golden_sources', {})
-        
-        if reference_source in golden_sources:
-            source_config = golden_sources[reference_source]
-            if source_config['source_type'] == 'static':
-                return source_config.get('values', [])
-            # For Redis/DB sources, would implement lookup here
+    def _check_reference_membership(self, reference_source: str, values: List[Any]) -> Optional[List[bool]]:
+        """Check values against a Redis reference source; None if it cannot be checked."""
+        if self.golden_source_client is None:
+            return None
+        return self.golden_source_client.check_membership(reference_source, values)
+    
+    def _prefetch_golden_sources(self, records: List[Dict[str, Any]], kde_names: List[str]) -> None:
+        """Batch-load golden records and reference memberships for a set of records."""
+        if self.golden_source_client is None:
+            return
         
-        return []
+        try:
+            plan = self.rule_plan
+            membership = defaultdict(set)
+            for kde_name in kde_names:
+                source = plan.kde(kde_name).validity_source
+                if source is not None:
+                    if self.golden_source_client.supports_membership(source):
+                        membership[source].update(
+                            record[kde_name] for record in records if record.get(kde_name) is not None
+                        )
+            
+            # Only sources holding fields of the scored KDEs are fetched
+            source_names = list(dict.fromkeys(
+                name for kde_name in kde_names for name in plan.kde(kde_name).golden_sources
+            ))
+            self.golden_source_client.prefetch(records, membership, source_names)
+        except Exception as e:
+            logger.warning(f"Golden source prefetch failed: {e}")
     
     def _lookup_golden_source(self, source_name: str, kde_name: str, value: Any, 
                              evidence: Dict[str, Any]) -> Any:
         """Lookup value in golden source for consistency checking."""
-        # This would implement actual golden source lookups
-        # For now, return None (no reference data available)
-        return None
+        if self.golden_source_client is None:
+            return None
+        
+        source_config = self.config.get('golden_sources', {}).get(source_name, {})
+        if source_config.get('source_type') != 'redis':
+            return None
+        
+        # Served from the local cache when the record was prefetched
+        golden_record = self.golden_source_client.get_record(source_name, evidence)
+        return golden_record.get(kde_name) if golden_record else None
     
     def _calculate_legacy_score(self, kde_scores: Dict[str, Dict[str, float]], 
-                               synthetic_scores: Dict[str, float]) -> float:
+                               synthetic_scores: Dict[str, float],
+                               plan: DQRulePlan = None) -> float:
         """Calculate legacy DQ score for backward compatibility."""
-        if not self.config.get('legacy_support', {}).get('enabled', False):
+        if not (plan or self.rule_plan).config.get('legacy_support', {}).get('enabled', False):
             return None
         
         # Simple average of all dimension scores (old method)
@@ -33,15 +33,20 @@ class KDEFirstRoleAwareStrategy:
             redis_client: Redis client for golden source lookups
         """
         self.dq_calculator = KDEFirstDQCalculator(config_path, redis_client)
-        self.config = self.dq_calculator.config
         logger.info("KDE-First role-aware DQ strategy initialized")
     
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current DQ configuration (follows calculator hot reloads)."""
+        return self.dq_calculator.config
+    
     def calculate_dq_score(self, 
                           evidence: Dict[str, Any],
                           baseline_data: Dict[str, Any] = None,
                           user_role: str = "analyst",
                           alert_timestamp: datetime = None,
-                          desk_id: str = None) -> Dict[str, Any]:
+                          desk_id: str = None,
+                          feed_id: str = None) -> Dict[str, Any]:
         """
         Calculate DQ score with role-aware KDE scope filtering.
         
@@ -51,6 +56,7 @@ class KDEFirstRoleAwareStrategy:
             user_role: User role determining KDE scope
             alert_timestamp: Alert timestamp for timeliness calculations
             desk_id: Desk identifier for desk-specific baselines
+            feed_id: Source feed whose stored baseline backs coverage scoring
             
         Returns:
             Dictionary containing DQSI score with role-aware metadata
@@ -64,7 +70,8 @@ class KDEFirstRoleAwareStrategy:
                 evidence=evidence,
                 baseline_data=role_baseline,
                 user_role=user_role,
-                alert_timestamp=alert_timestamp
+                alert_timestamp=alert_timestamp,
+                feed_id=feed_id
             )
             
             # Add role-aware metadata
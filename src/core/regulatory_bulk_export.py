@@ -0,0 +1,210 @@
+"""
+Regulatory Bulk Export
+
+Streams STOR records (JSON lines) or CSV rows for many alerts - e.g. the
+month-end regulatory pack - into one gzip output instead of one file per
+alert. Rationales are generated in parallel and emitted in alert order.
+Each batch is written as a complete gzip member, so a file export that is
+interrupted resumes from its last checkpoint and the result is still a
+single valid gzip stream.
+"""
+
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, fields, replace
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Callable, Tuple
+
+from .regulatory_explainability import STORRecord
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('csv', 'stor')
+STOR_FIELDS = [f.name for f in fields(STORRecord)]
+
+
+class RegulatoryBulkExporter:
+    """
+    Bulk STOR/CSV export of alerts held by an ``AlertGenerator``
+
+    Args:
+        alert_generator: Source of alerts and of the regulatory explainability module
+        max_workers: Threads generating rationales (they share the rationale template cache)
+        batch_size: Alerts per batch; one gzip member and one checkpoint per batch
+        compresslevel: gzip compression level
+    """
+
+    def __init__(self, alert_generator, max_workers: int = 4, batch_size: int = 500,
+                 compresslevel: int = 6):
+        self.alert_generator = alert_generator
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.compresslevel = compresslevel
+
+    def select_alerts(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                      filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """
+        Alerts in [start, end) matching ``filters``, oldest first
+
+        Args:
+            start: Earliest alert timestamp (inclusive)
+            end: Latest alert timestamp (exclusive)
+            filters: Alert field -> required value, or list of accepted values
+        """
+        filters = filters or {}
+        selected = []
+        for alert in self.alert_generator.alert_history:
+            timestamp = datetime.fromisoformat(alert['timestamp'])
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp >= end:
+                continue
+            if all(
+                alert.get(field) in accepted if isinstance(accepted, (list, tuple, set))
+                else alert.get(field) == accepted
+                for field, accepted in filters.items()
+            ):
+                selected.append(alert)
+
+        # Stable order, required for resuming by record count
+        selected.sort(key=lambda alert: (alert['timestamp'], str(alert.get('id'))))
+        return selected
+
+    def iter_gzip(self, alerts: Iterable[Dict], export_format: str = 'csv',
+                  progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                  skip: int = 0) -> Iterator[bytes]:
+        """
+        Gzip-compressed export, one gzip member per batch
+
+        Args:
+            alerts: Alerts in export order
+            export_format: 'csv' (STOR columns) or 'stor' (JSON lines)
+            progress: Called with (records done, total or None) after each batch
+            skip: Records already exported (resume); no header is written when > 0
+        """
+        for chunk, _ in self._iter_batches(alerts, export_format, progress, skip):
+            yield gzip.compress(chunk.encode('utf-8'), compresslevel=self.compresslevel)
+
+    def export(self, path: str, alerts: Iterable[Dict], export_format: str = 'csv',
+               progress: Optional[Callable[[int, Optional[int]], None]] = None,
+               resume: bool = True, job: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Write the export to a gzip file with a checkpoint after every batch
+
+        An existing checkpoint for the same path, format and ``job``
+        description is resumed: the file is truncated to the last complete
+        batch and the records already written are skipped.
+
+        Args:
+            path: Output file (``.csv.gz`` / ``.jsonl.gz``)
+            alerts: Alerts in a stable export order (see ``select_alerts``)
+            export_format: 'csv' or 'stor'
+            progress: Called with (records done, total or None) after each batch
+            resume: Continue from an existing checkpoint
+            job: JSON-serializable description of the selection (date range, filters)
+
+        Returns:
+            Summary with record count, file size and the resume position
+        """
+        checkpoint_path = f"{path}.checkpoint"
+        job_key = {'format': export_format, 'job': job or {}}
+        checkpoint = self._load_checkpoint(checkpoint_path) if resume else None
+        if checkpoint and (checkpoint.get('job') != job_key or not os.path.exists(path)):
+            logger.info(f"Ignoring checkpoint for a different export job: {checkpoint_path}")
+            checkpoint = None
+
+        records = checkpoint['records'] if checkpoint else 0
+        offset = checkpoint['offset'] if checkpoint else 0
+        resumed_from = records
+
+        with open(path, 'r+b' if checkpoint else 'wb') as f:
+            f.truncate(offset)
+            f.seek(offset)
+            for text, records in self._iter_batches(alerts, export_format, progress, skip=records):
+                f.write(gzip.compress(text.encode('utf-8'), compresslevel=self.compresslevel))
+                f.flush()
+                os.fsync(f.fileno())
+                offset = f.tell()
+                self._save_checkpoint(checkpoint_path, {'job': job_key, 'records': records, 'offset': offset})
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+        logger.info(f"Regulatory export {path}: {records} records ({offset} bytes)")
+        return {'path': path, 'format': export_format, 'records': records, 'bytes': offset,
+                'resumed_from': resumed_from}
+
+    def _iter_batches(self, alerts: Iterable[Dict], export_format: str,
+                      progress: Optional[Callable[[int, Optional[int]], None]],
+                      skip: int = 0) -> Iterator[Tuple[str, int]]:
+        """Text of each batch with the running record count"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {export_format}; expected one of {EXPORT_FORMATS}")
+
+        total = len(alerts) if hasattr(alerts, '__len__') else None
+        done = skip
+        header = self._csv_line(STOR_FIELDS) if export_format == 'csv' and skip == 0 else ''
+
+        iterator = iter(alerts)
+        for _ in range(skip):
+            if next(iterator, None) is None:
+                break
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                batch = [alert for _, alert in zip(range(self.batch_size), iterator)]
+                if not batch and not header:
+                    break
+                # map() returns results in submission order
+                lines = list(executor.map(lambda alert: self._format_record(alert, export_format), batch))
+                text = header + ''.join(lines)
+                header = ''
+                done += len(batch)
+                if progress:
+                    progress(done, total)
+                yield text, done
+                if not batch:
+                    break
+
+    def _format_record(self, alert: Dict, export_format: str) -> str:
+        record = self.stor_record(alert)
+        if export_format == 'stor':
+            return json.dumps(asdict(record), default=str) + '\n'
+        return self._csv_line([getattr(record, name) for name in STOR_FIELDS])
+
+    def stor_record(self, alert: Dict) -> STORRecord:
+        """STOR record of a stored alert, from its cached rationale template"""
+        explainability = self.alert_generator.regulatory_explainability
+        evidence = alert.get('evidence') or {}
+        risk_scores = {
+            'overall_score': alert.get('risk_score', 0.0),
+            'risk_level': str(alert.get('severity', 'low')).lower(),
+            **(evidence.get('risk_scores') or {})
+        }
+        model_type = self.alert_generator.rationale_model_types.get(alert.get('type'), 'market_manipulation')
+        rationale = explainability.generate_regulatory_rationale(alert.get('id'), risk_scores, evidence, model_type)
+        record = explainability.export_stor_format(rationale)
+        return replace(record, entity_id=alert.get('trader_id') or record.entity_id)
+
+    def _csv_line(self, values: List[Any]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerow(values)
+        return buffer.getvalue()
+
+    def _load_checkpoint(self, checkpoint_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(checkpoint_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_checkpoint(self, checkpoint_path: str, checkpoint: Dict[str, Any]) -> None:
+        temp_path = f"{checkpoint_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_path, checkpoint_path)
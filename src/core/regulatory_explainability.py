@@ -7,9 +7,11 @@ Provides structured inference paths, rationale attachment, STOR-ready exports, a
 
 import json
 import csv
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Tuple, Callable
+from dataclasses import dataclass, asdict, field
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,6 +38,49 @@ class RegulatoryRationale:
     key_evidence: Dict[str, Any]
     regulatory_basis: str
     audit_trail: List[str]
+    voi_analysis: Dict[str, Any] = field(default_factory=dict)
+    sensitivity_report: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class RationaleTemplate:
+    """Evidence-dependent parts of a rationale, shared by alerts with the same evidence profile"""
+    deterministic_narrative: Optional[str]  # None when the narrative depends on the score
+    inference_paths: List[InferencePath]
+    key_evidence: Dict[str, Any]
+    regulatory_basis: str
+    voi_analysis: Dict[str, Any]
+    sensitivity_report: Dict[str, Any]
+
+class LazyRegulatoryRationale:
+    """
+    Handle to a regulatory rationale that is generated on first access
+    
+    Attribute access is forwarded to the generated ``RegulatoryRationale``,
+    so the handle can be used wherever a rationale is read.
+    """
+    
+    def __init__(self, factory: Callable[[], RegulatoryRationale]):
+        self._factory = factory
+        self._rationale: Optional[RegulatoryRationale] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def resolved(self) -> bool:
+        return self._rationale is not None
+    
+    def get(self) -> RegulatoryRationale:
+        """Generate the rationale if needed and return it"""
+        if self._rationale is None:
+            with self._lock:
+                if self._rationale is None:
+                    self._rationale = self._factory()
+                    self._factory = None
+        return self._rationale
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
 
 @dataclass
 class STORRecord:
@@ -53,9 +98,33 @@ class STORRecord:
 class RegulatoryExplainability:
     """
     Converts probabilistic Bayesian outputs into deterministic regulatory narratives
+    
+    Narratives, inference paths, key evidence and VOI/sensitivity reports only
+    depend on the model and the evidence profile, so they are built once per
+    (model type, model version, evidence profile) and shared between alerts.
+    
+    Args:
+        sensitivity_engines: Optional ``EvidenceSensitivityEngine`` per model type;
+            when present, VOI and sensitivity reports are computed from the network
+            instead of the heuristic evidence weights
+        evidence_mappers: Optional function per model type mapping processed
+            trading data to the network's evidence node states
+        template_cache_size: Evidence profiles whose rationale templates are kept
     """
     
-    def __init__(self):
+    # Model types whose narrative only depends on the evidence
+    EVIDENCE_NARRATIVE_MODELS = ('insider_dealing', 'spoofing', 'wash_trade_detection')
+    
+    def __init__(self, sensitivity_engines: Optional[Dict[str, Any]] = None,
+                 evidence_mappers: Optional[Dict[str, Callable[[Dict[str, Any]], Dict[str, int]]]] = None,
+                 template_cache_size: int = 1024):
+        self.sensitivity_engines = dict(sensitivity_engines or {})
+        self.evidence_mappers = dict(evidence_mappers or {})
+        self.template_cache_size = template_cache_size
+        self._templates: "OrderedDict[Tuple, RationaleTemplate]" = OrderedDict()
+        self._template_lock = threading.Lock()
+        self.template_metrics = {'hits': 0, 'misses': 0}
+        
         self.risk_thresholds = {
             'low': 0.3,
             'medium': 0.6,
@@ -69,6 +138,17 @@ class RegulatoryExplainability:
             'wash_trade_detection': 'MiFID II Article 48 - Wash trades and matched orders'
         }
     
+    def register_sensitivity_engine(
+        self,
+        model_type: str,
+        engine: Any,
+        evidence_mapper: Optional[Callable[[Dict[str, Any]], Dict[str, int]]] = None
+    ) -> None:
+        """Use a compiled sensitivity engine (and processed data mapper) for rationales of a model type"""
+        self.sensitivity_engines[model_type] = engine
+        if evidence_mapper is not None:
+            self.evidence_mappers[model_type] = evidence_mapper
+    
     def generate_regulatory_rationale(
         self, 
         alert_id: str,
@@ -80,21 +160,14 @@ class RegulatoryExplainability:
         try:
             # Extract key information
             overall_score = risk_result.get('overall_score', 0.0)
-            risk_level = risk_result.get('risk_level', 'low')
-            
-            # Generate deterministic narrative
-            narrative = self._generate_deterministic_narrative(
-                risk_result, evidence_factors, model_type
-            )
-            
-            # Build inference paths
-            inference_paths = self._build_inference_paths(evidence_factors, risk_result)
             
-            # Identify key evidence
-            key_evidence = self._identify_key_evidence(evidence_factors, risk_result)
+            # Shared narrative, inference paths, key evidence and VOI/sensitivity
+            template = self.get_rationale_template(evidence_factors, model_type)
             
-            # Get regulatory basis
-            regulatory_basis = self.regulatory_basis_map.get(model_type, 'General market abuse regulations')
+            # Generate deterministic narrative
+            narrative = template.deterministic_narrative
+            if narrative is None:
+                narrative = self._generate_general_narrative(risk_result, evidence_factors)
             
             # Create audit trail
             audit_trail = self._create_audit_trail(risk_result, evidence_factors)
@@ -105,16 +178,93 @@ class RegulatoryExplainability:
                 risk_level=risk_result.get('risk_level', 'low'),
                 overall_score=overall_score,
                 deterministic_narrative=narrative,
-                inference_paths=inference_paths,
-                key_evidence=key_evidence,
-                regulatory_basis=regulatory_basis,
-                audit_trail=audit_trail
+                inference_paths=template.inference_paths,
+                key_evidence=template.key_evidence,
+                regulatory_basis=template.regulatory_basis,
+                audit_trail=audit_trail,
+                voi_analysis=template.voi_analysis,
+                sensitivity_report=template.sensitivity_report
             )
             
         except Exception as e:
             logger.error(f"Error generating regulatory rationale: {str(e)}")
             return self._create_fallback_rationale(alert_id, risk_result, model_type)
     
+    def lazy_rationale(
+        self, 
+        alert_id: str,
+        risk_result: Dict[str, Any],
+        evidence_factors: Dict[str, Any],
+        model_type: str = 'insider_dealing'
+    ) -> LazyRegulatoryRationale:
+        """Handle that generates the rationale on first access"""
+        risk_result = dict(risk_result)
+        evidence_factors = dict(evidence_factors)
+        return LazyRegulatoryRationale(
+            lambda: self.generate_regulatory_rationale(alert_id, risk_result, evidence_factors, model_type)
+        )
+    
+    def get_rationale_template(self, evidence_factors: Dict[str, Any], model_type: str) -> RationaleTemplate:
+        """Cached evidence-dependent rationale parts for an evidence profile"""
+        engine = self.sensitivity_engines.get(model_type)
+        profile = self._evidence_profile(self._node_states(evidence_factors, model_type))
+        key = (model_type, getattr(engine, 'model_version', None), profile)
+        
+        with self._template_lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.template_metrics['hits'] += 1
+                return template
+        
+        self.template_metrics['misses'] += 1
+        template = self._build_rationale_template(dict(profile), model_type)
+        with self._template_lock:
+            self._templates[key] = template
+            while len(self._templates) > self.template_cache_size:
+                self._templates.popitem(last=False)
+        return template
+    
+    def clear_template_cache(self) -> None:
+        with self._template_lock:
+            self._templates.clear()
+    
+    def _node_states(self, evidence_factors: Dict[str, Any], model_type: str) -> Dict[str, Any]:
+        """Evidence with processed data mapped to node states; states given explicitly take precedence"""
+        mapper = self.evidence_mappers.get(model_type)
+        if mapper is None:
+            return evidence_factors
+        try:
+            return {**mapper(evidence_factors), **evidence_factors}
+        except Exception as e:
+            logger.warning(f"Evidence mapping failed for {model_type}, using evidence as given: {str(e)}")
+            return evidence_factors
+    
+    def _evidence_profile(self, evidence_factors: Dict[str, Any]) -> Tuple:
+        """Discrete evidence states (index or state name) that the rationale is built from"""
+        return tuple(sorted(
+            (factor, state) for factor, state in evidence_factors.items()
+            if isinstance(state, (int, str))
+        ))
+    
+    def _build_rationale_template(self, evidence: Dict[str, Any], model_type: str) -> RationaleTemplate:
+        states = {factor: state for factor, state in evidence.items() if isinstance(state, int)}
+        narrative = None
+        if model_type in self.EVIDENCE_NARRATIVE_MODELS:
+            narrative = self._generate_deterministic_narrative({}, states, model_type)
+        
+        # Value of information and parameter sensitivity
+        voi_analysis, sensitivity_report = self._analyze_sensitivity(evidence, model_type)
+        
+        return RationaleTemplate(
+            deterministic_narrative=narrative,
+            inference_paths=self._build_inference_paths(states, {}),
+            key_evidence=self._identify_key_evidence(states, {}),
+            regulatory_basis=self.regulatory_basis_map.get(model_type, 'General market abuse regulations'),
+            voi_analysis=voi_analysis,
+            sensitivity_report=sensitivity_report
+        )
+    
     def _generate_deterministic_narrative(
         self, 
         risk_result: Dict[str, Any], 
@@ -328,6 +478,41 @@ class RegulatoryExplainability:
         weights = base_weights.get(factor, [0.1, 0.3, 0.5])
         return weights[min(state, len(weights) - 1)]
     
+    def _analyze_sensitivity(
+        self, 
+        evidence_factors: Dict[str, Any], 
+        model_type: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build VOI analysis and sensitivity report for the rationale"""
+        
+        engine = self.sensitivity_engines.get(model_type)
+        if engine is not None:
+            try:
+                evidence = {
+                    node: state for node, state in evidence_factors.items()
+                    if node in engine.axis and node != engine.target and isinstance(state, (int, str))
+                }
+                analysis = engine.analyze(evidence)
+                return analysis.voi_report(), analysis.sensitivity_report()
+            except Exception as e:
+                logger.warning(f"Sensitivity engine failed for {model_type}, using evidence weights: {str(e)}")
+        
+        # Heuristic fallback: static evidence weights of the observed factors
+        weights = {
+            factor: self._calculate_evidence_weight(factor, state)
+            for factor, state in evidence_factors.items()
+            if isinstance(state, int) and state > 0
+        }
+        voi_analysis = {
+            'method': 'evidence_weight',
+            'nodes': [
+                {'node': factor, 'evidence_weight': weight}
+                for factor, weight in sorted(weights.items(), key=lambda item: item[1], reverse=True)
+            ]
+        }
+        sensitivity_report = {'method': 'evidence_weight', 'parameters': []}
+        return voi_analysis, sensitivity_report
+    
     def _get_inference_rule(self, factor: str, state: int) -> str:
         """Get the inference rule applied to this evidence"""
         rules = {
@@ -404,7 +589,7 @@ class RegulatoryExplainability:
         trail.append(f"Evidence factors processed: {len(evidence_factors)}")
         
         for factor, state in evidence_factors.items():
-            if state > 0:
+            if isinstance(state, int) and state > 0:
                 trail.append(f"Factor {factor}: State {state} - {self._get_inference_rule(factor, state)}")
         
         trail.append(f"Overall risk score: {risk_result.get('overall_score', 0.0):.3f}")
@@ -432,13 +617,15 @@ class RegulatoryExplainability:
             audit_trail=["Fallback rationale generated due to processing error"]
         )
     
-    def export_stor_format(self, rationale: RegulatoryRationale) -> STORRecord:
+    def export_stor_format(self, rationale: RegulatoryRationale,
+                           processed_data: Optional[Dict[str, Any]] = None) -> STORRecord:
         """Export rationale in STOR format"""
         
+        entity_id = ((processed_data or {}).get('trader_info') or {}).get('id') or "ENTITY_ID"
         return STORRecord(
             record_id=rationale.alert_id,
             timestamp=rationale.timestamp,
-            entity_id="ENTITY_ID",
+            entity_id=entity_id,
             transaction_type="SUSPICIOUS_ACTIVITY",
             risk_score=rationale.overall_score,
             risk_level=rationale.risk_level,
@@ -454,4 +641,48 @@ class RegulatoryExplainability:
         csv_lines.append("Alert ID,Timestamp,Risk Level,Overall Score,Narrative,Regulatory Basis")
         csv_lines.append(f"{rationale.alert_id},{rationale.timestamp},{rationale.risk_level},{rationale.overall_score:.3f},\"{rationale.deterministic_narrative}\",{rationale.regulatory_basis}")
         
-        return "\n".join(csv_lines)
\ No newline at end of file
+        return "\n".join(csv_lines)
+    
+    def export_csv_report(self, rationale: RegulatoryRationale, filename: Optional[str] = None) -> str:
+        """
+        Write a single rationale as a STOR CSV file
+        
+        For date ranges and month-end packs use ``RegulatoryBulkExporter``,
+        which streams all records into one gzip file.
+        
+        Returns:
+            Name of the written file
+        """
+        
+        record = asdict(self.export_stor_format(rationale))
+        filename = filename or f"regulatory_report_{rationale.alert_id}.csv"
+        with open(filename, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(record))
+            writer.writeheader()
+            writer.writerow(record)
+        
+        return filename
+
+
+def build_regulatory_explainability(**kwargs) -> RegulatoryExplainability:
+    """
+    Regulatory explainability with the insider dealing network registered
+    
+    Insider dealing rationales get VOI and sensitivity reports from the
+    model's compiled sensitivity engine, with processed trading data mapped
+    to its evidence node states. Falls back to evidence weights when the
+    model cannot be built.
+    """
+    explainability = RegulatoryExplainability(**kwargs)
+    try:
+        from models.bayesian.insider_dealing.model import InsiderDealingModel
+        from .evidence_mapper import map_insider_dealing_evidence
+        
+        explainability.register_sensitivity_engine(
+            'insider_dealing',
+            InsiderDealingModel().get_sensitivity_engine(),
+            evidence_mapper=map_insider_dealing_evidence
+        )
+    except Exception as e:
+        logger.warning(f"Insider dealing sensitivity engine unavailable, using evidence weights: {str(e)}")
+    return explainability
@@ -3,7 +3,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import logging
 
-from .regulatory_explainability import RegulatoryExplainability, RegulatoryRationale, STORRecord
+from ..regulatory_explainability import (
+    RegulatoryExplainability, RegulatoryRationale, STORRecord, build_regulatory_explainability
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +32,14 @@ class AlertService:
         }
         
         self.alert_history = []
-        self.regulatory_explainability = RegulatoryExplainability()
+        self.regulatory_explainability = build_regulatory_explainability()
+        
+        # Alert type -> regulatory explainability model type
+        self.rationale_model_types = {
+            'INSIDER_DEALING': 'insider_dealing',
+            'SPOOFING': 'spoofing',
+            'OVERALL_RISK': 'market_manipulation'
+        }
     
     def generate_alerts(self, processed_data: Dict, insider_score: Dict, 
                        spoofing_score: Dict, overall_risk: float) -> List[Dict]:
@@ -372,8 +381,9 @@ class AlertService:
                                     processed_data: Dict) -> RegulatoryRationale:
         """Generate regulatory rationale for an alert"""
         try:
+            model_type = self.rationale_model_types.get(alert.get('type'), 'market_manipulation')
             return self.regulatory_explainability.generate_regulatory_rationale(
-                alert, risk_scores, processed_data
+                alert.get('id'), risk_scores, processed_data, model_type
             )
         except Exception as e:
             logger.error(f"Error generating regulatory rationale: {str(e)}")
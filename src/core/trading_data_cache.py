@@ -0,0 +1,309 @@
+"""
+Trading Data Cache
+
+Memory-bounded per-alert cache for raw trades and orders with LRU/TTL
+eviction, optional spill-to-disk and hit/miss metrics.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Dict, List, Optional, Any, Callable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+_missing = object()
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Estimate the deep memory footprint of a cached value in bytes
+
+    Follows lists, tuples, dicts and object ``__dict__``/``__slots__``; enum
+    members and objects already counted for the same entry are skipped.
+    """
+    if _seen is None:
+        _seen = set()
+    obj_id = id(obj)
+    if obj_id in _seen or isinstance(obj, Enum) or obj is None or isinstance(obj, bool):
+        return 0
+    _seen.add(obj_id)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float)):
+        return size
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_size(key, _seen) + estimate_size(value, _seen)
+        return size
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, _seen)
+        return size
+    if hasattr(obj, '__dict__'):
+        size += estimate_size(vars(obj), _seen)
+    for slot in getattr(type(obj), '__slots__', ()):
+        if hasattr(obj, slot):
+            size += estimate_size(getattr(obj, slot), _seen)
+    return size
+
+
+class BoundedRecordCache:
+    """
+    Dict-like cache of alert_id -> records bounded by a memory budget
+
+    Entries are evicted least-recently-used first once ``max_bytes`` is
+    exceeded, and expire ``ttl_seconds`` after they were written. Evicted
+    (not expired) entries are pickled to ``spill_dir`` when one is configured
+    and transparently reloaded on the next lookup; spill files are deleted
+    when the entry is reloaded, overwritten, deleted or expires.
+
+    Entries may be tagged with a ``source`` fingerprint of the data they were
+    built from, so a lookup for different source data counts as a miss.
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024,
+                 ttl_seconds: Optional[float] = None,
+                 spill_dir: Optional[str] = None,
+                 on_evict: Optional[Callable[[str, Any], None]] = None,
+                 on_load: Optional[Callable[[str, Any], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.spill_dir = spill_dir
+        self.on_evict = on_evict
+        self.on_load = on_load
+        self._clock = clock
+
+        # key -> (value, size in bytes, write time, source)
+        self._entries: "OrderedDict[str, Tuple[Any, int, float, Optional[str]]]" = OrderedDict()
+        self.current_bytes = 0
+        # Spilled key -> write time of the entry
+        self._spilled: Dict[str, float] = {}
+
+        self.metrics = {
+            'hits': 0,
+            'misses': 0,
+            'disk_hits': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'spills': 0
+        }
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    # ---- mapping interface ----
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.put(key, value)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._entries and not self._spill_exists(key):
+            raise KeyError(key)
+        if key in self._entries:
+            self._remove(key, notify=True)
+        self._delete_spill(key)
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._entries.get(key)
+        if entry is not None and not self._is_expired(entry[2]):
+            return True
+        return self._spill_exists(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def put(self, key: str, value: Any, source: Optional[str] = None) -> None:
+        """Cache an alert's records, tagged with the fingerprint of the data they were built from"""
+        self._delete_spill(key)
+        self._store(key, value, source, self._clock())
+        self._enforce_budget(protect=key)
+
+    def get(self, key: str, default: Any = None, source: Optional[str] = None) -> Any:
+        """
+        Look up an alert's records, counting hits/misses and refreshing LRU order
+
+        Spilled entries are reloaded into memory. With ``source``, an entry
+        built from different data is a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._is_expired(entry[2]):
+                self._expire(key)
+            elif source is not None and entry[3] != source:
+                self.metrics['misses'] += 1
+                return default
+            else:
+                self._entries.move_to_end(key)
+                self.metrics['hits'] += 1
+                return entry[0]
+
+        spilled = self._load_spill(key)
+        if spilled is not _missing:
+            value, written, stored_source = spilled
+            if self._is_expired(written):
+                self.metrics['expirations'] += 1
+            elif source is None or stored_source == source:
+                self.metrics['disk_hits'] += 1
+                self._store(key, value, stored_source, written)
+                if self.on_load:
+                    self.on_load(key, value)
+                self._enforce_budget(protect=key)
+                return value
+
+        self.metrics['misses'] += 1
+        return default
+
+    def keys(self) -> List[str]:
+        """In-memory keys, without touching LRU order or metrics"""
+        self.purge_expired()
+        return list(self._entries)
+
+    def values(self) -> List[Any]:
+        self.purge_expired()
+        return [entry[0] for entry in self._entries.values()]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        self.purge_expired()
+        return [(key, entry[0]) for key, entry in self._entries.items()]
+
+    def spilled_items(self) -> Iterator[Tuple[str, Any]]:
+        """Read spilled entries from disk without moving them back into memory"""
+        self.purge_expired()
+        for key in list(self._spilled):
+            spilled = self._read_spill(key)
+            if spilled is not _missing:
+                self.metrics['disk_hits'] += 1
+                yield key, spilled[0]
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._remove(key, notify=True)
+        for key in list(self._spilled):
+            self._delete_spill(key)
+
+    # ---- maintenance ----
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry and spill file; returns the number removed"""
+        if self.ttl_seconds is None:
+            return 0
+        expired = [key for key, entry in self._entries.items() if self._is_expired(entry[2])]
+        for key in expired:
+            self._expire(key)
+        expired_spills = [key for key, written in self._spilled.items() if self._is_expired(written)]
+        for key in expired_spills:
+            self._delete_spill(key)
+            self.metrics['expirations'] += 1
+        return len(expired) + len(expired_spills)
+
+    def entry_size(self, key: str) -> Optional[int]:
+        """Accounted size in bytes for an in-memory entry"""
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get hit/miss, eviction and memory metrics"""
+        lookups = self.metrics['hits'] + self.metrics['disk_hits'] + self.metrics['misses']
+        return {
+            **self.metrics,
+            'entries': len(self._entries),
+            'spilled_entries': len(self._spilled),
+            'current_bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hit_rate': (self.metrics['hits'] + self.metrics['disk_hits']) / lookups if lookups else 0.0
+        }
+
+    # ---- internals ----
+
+    def _store(self, key: str, value: Any, source: Optional[str], written: float) -> None:
+        if key in self._entries:
+            self._remove(key, notify=False)
+        size = estimate_size(value)
+        self._entries[key] = (value, size, written, source)
+        self.current_bytes += size
+
+    def _remove(self, key: str, notify: bool) -> Tuple[Any, int, float, Optional[str]]:
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry[1]
+        if notify and self.on_evict:
+            self.on_evict(key, entry[0])
+        return entry
+
+    def _is_expired(self, written: float) -> bool:
+        return self.ttl_seconds is not None and self._clock() - written > self.ttl_seconds
+
+    def _expire(self, key: str) -> None:
+        self._remove(key, notify=True)
+        self.metrics['expirations'] += 1
+
+    def _enforce_budget(self, protect: Optional[str] = None) -> None:
+        while self.current_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            if key == protect:
+                if len(self._entries) == 1:
+                    logger.warning(f"Cache entry {key} ({self.current_bytes} bytes) exceeds budget of {self.max_bytes}")
+                    return
+                self._entries.move_to_end(key)
+                continue
+            value, _, written, source = self._remove(key, notify=True)
+            self.metrics['evictions'] += 1
+            self._spill(key, value, written, source)
+
+    def _spill_path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.spill_dir, f"{digest}.pkl")
+
+    def _spill_exists(self, key: Any) -> bool:
+        return bool(self.spill_dir) and isinstance(key, str) and os.path.exists(self._spill_path(key))
+
+    def _spill(self, key: str, value: Any, written: float, source: Optional[str]) -> None:
+        if not self.spill_dir:
+            return
+        try:
+            with open(self._spill_path(key), 'wb') as f:
+                pickle.dump((key, value, written, source), f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._spilled[key] = written
+            self.metrics['spills'] += 1
+        except Exception as e:
+            logger.error(f"Error spilling cache entry {key} to disk: {str(e)}")
+
+    def _read_spill(self, key: str) -> Any:
+        """(value, write time, source) of a spilled entry, or ``_missing``"""
+        if not self._spill_exists(key):
+            return _missing
+        try:
+            with open(self._spill_path(key), 'rb') as f:
+                stored_key, value, written, source = pickle.load(f)
+        except Exception as e:
+            logger.error(f"Error loading spilled cache entry {key}: {str(e)}")
+            return _missing
+        return (value, written, source) if stored_key == key else _missing
+
+    def _load_spill(self, key: str) -> Any:
+        spilled = self._read_spill(key)
+        self._delete_spill(key)
+        return spilled
+
+    def _delete_spill(self, key: str) -> None:
+        self._spilled.pop(key, None)
+        if self._spill_exists(key):
+            try:
+                os.remove(self._spill_path(key))
+            except OSError:
+                pass
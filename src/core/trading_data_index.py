@@ -0,0 +1,192 @@
+"""
+Trading Data Index
+
+Secondary indexes over cached raw trades and orders so that analyst searches
+do not have to scan every cached record.
+"""
+
+import heapq
+import logging
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Any, Callable, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SortedColumn:
+    """
+    Sorted (key, record id) column for range predicates
+
+    New batches are sorted on their own and appended as a run; runs are
+    merged once there are more than ``max_runs`` of them, so inserts stay
+    cheap and range lookups are a handful of binary searches.
+    """
+
+    def __init__(self, max_runs: int = 8):
+        self.max_runs = max_runs
+        self._runs: List[Tuple[List[Any], List[int]]] = []
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys, _ in self._runs)
+
+    def add_batch(self, pairs: Iterable[Tuple[Any, int]]) -> None:
+        """Add (key, record id) pairs; None keys are not indexed"""
+        batch = sorted((key, rid) for key, rid in pairs if key is not None)
+        if not batch:
+            return
+        self._runs.append(([key for key, _ in batch], [rid for _, rid in batch]))
+        if len(self._runs) > self.max_runs:
+            self.compact()
+
+    def compact(self, dead_ids: Optional[set] = None) -> None:
+        """Merge all runs into one, dropping dead record ids"""
+        merged = heapq.merge(*(zip(keys, ids) for keys, ids in self._runs))
+        if dead_ids:
+            merged = ((key, rid) for key, rid in merged if rid not in dead_ids)
+        pairs = list(merged)
+        self._runs = [([key for key, _ in pairs], [rid for _, rid in pairs])] if pairs else []
+
+    def _bounds(self, keys: List[Any], low: Any, high: Any) -> Tuple[int, int]:
+        start = bisect_left(keys, low) if low is not None else 0
+        end = bisect_right(keys, high) if high is not None else len(keys)
+        return start, end
+
+    def count_range(self, low: Any = None, high: Any = None) -> int:
+        """Number of indexed entries in [low, high] (dead ids included)"""
+        total = 0
+        for keys, _ in self._runs:
+            start, end = self._bounds(keys, low, high)
+            total += max(0, end - start)
+        return total
+
+    def range_ids(self, low: Any = None, high: Any = None) -> List[int]:
+        """Record ids with keys in [low, high]"""
+        result = []
+        for keys, ids in self._runs:
+            start, end = self._bounds(keys, low, high)
+            if end > start:
+                result.extend(ids[start:end])
+        return result
+
+
+class RecordIndex:
+    """
+    Hash and sorted-column indexes over a set of records grouped by alert
+
+    Args:
+        hash_fields: criteria name -> record attribute for equality predicates
+        range_fields: column name -> (record attribute, low criteria name, high criteria name)
+    """
+
+    def __init__(self, hash_fields: Dict[str, str], range_fields: Dict[str, Tuple[str, str, str]],
+                 max_runs: int = 8):
+        self.hash_fields = hash_fields
+        self.range_fields = range_fields
+        self._records: Dict[int, Any] = {}
+        self._groups: Dict[str, List[int]] = {}
+        self._hash: Dict[str, Dict[Any, Dict[int, None]]] = {name: {} for name in hash_fields}
+        self._columns: Dict[str, SortedColumn] = {name: SortedColumn(max_runs) for name in range_fields}
+        self._dead_ids: set = set()
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def replace_group(self, group_key: str, records: List[Any]) -> None:
+        """Index the records for an alert, replacing any previously indexed ones"""
+        self.remove_group(group_key)
+
+        ids = []
+        for record in records:
+            rid = self._next_id
+            self._next_id += 1
+            self._records[rid] = record
+            ids.append(rid)
+            for criteria_name, attribute in self.hash_fields.items():
+                bucket = self._hash[criteria_name].setdefault(getattr(record, attribute, None), {})
+                bucket[rid] = None
+        self._groups[group_key] = ids
+
+        for column_name, (attribute, _, _) in self.range_fields.items():
+            self._columns[column_name].add_batch(
+                (getattr(self._records[rid], attribute, None), rid) for rid in ids
+            )
+
+    def remove_group(self, group_key: str) -> None:
+        """Drop the indexed records for an alert"""
+        ids = self._groups.pop(group_key, None)
+        if not ids:
+            return
+
+        for rid in ids:
+            record = self._records.pop(rid)
+            for criteria_name, attribute in self.hash_fields.items():
+                value = getattr(record, attribute, None)
+                bucket = self._hash[criteria_name].get(value)
+                if bucket is not None:
+                    bucket.pop(rid, None)
+                    if not bucket:
+                        del self._hash[criteria_name][value]
+        self._dead_ids.update(ids)
+
+        # Sorted columns are cleaned lazily once dead entries dominate
+        if len(self._dead_ids) > max(1024, len(self._records)):
+            for column in self._columns.values():
+                column.compact(self._dead_ids)
+            self._dead_ids = set()
+
+    def plan(self, criteria: Dict[str, Any]) -> Tuple[str, int]:
+        """
+        Pick the most selective index for the criteria
+
+        Returns:
+            Tuple of (index name or 'scan', estimated candidate count)
+        """
+        best_name, best_count = 'scan', len(self._records)
+
+        for criteria_name in self.hash_fields:
+            value = criteria.get(criteria_name)
+            if value:
+                count = len(self._hash[criteria_name].get(value, ()))
+                if count < best_count:
+                    best_name, best_count = criteria_name, count
+
+        for column_name, (_, low_name, high_name) in self.range_fields.items():
+            low = criteria.get(low_name) or None
+            high = criteria.get(high_name) or None
+            if low is None and high is None:
+                continue
+            count = self._columns[column_name].count_range(low, high)
+            if count < best_count:
+                best_name, best_count = column_name, count
+
+        return best_name, best_count
+
+    def query(self, criteria: Dict[str, Any], matcher: Callable[[Any, Dict[str, Any]], bool]) -> List[Any]:
+        """
+        Find records matching the criteria
+
+        The chosen index narrows the candidates; ``matcher`` is applied to
+        every candidate so results are identical to a full scan.
+        """
+        index_name, estimate = self.plan(criteria)
+
+        if index_name == 'scan':
+            candidate_ids = list(self._records)
+        elif index_name in self.hash_fields:
+            candidate_ids = sorted(self._hash[index_name].get(criteria[index_name], ()))
+        else:
+            _, low_name, high_name = self.range_fields[index_name]
+            candidate_ids = sorted(self._columns[index_name].range_ids(
+                criteria.get(low_name) or None, criteria.get(high_name) or None
+            ))
+
+        logger.debug(f"Index plan: {index_name} ({estimate} candidates)")
+
+        records = self._records
+        results = []
+        for rid in candidate_ids:
+            record = records.get(rid)
+            if record is not None and matcher(record, criteria):
+                results.append(record)
+        return results
@@ -5,9 +5,13 @@ This service provides comprehensive raw trading data extraction and aggregation
 capabilities for analyst investigations of market abuse alerts.
 """
 
+import hashlib
+import json
 import logging
+import os
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 from dataclasses import asdict
 import numpy as np
 
@@ -15,20 +19,77 @@ from models.trading_data import (
     RawTradeData, RawOrderData, TradingDataSummary, 
     TradeDirection, OrderStatus
 )
+from core.trading_data_index import RecordIndex
+from core.trading_data_cache import BoundedRecordCache
 
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _source_fingerprint(*parts: Any) -> str:
+    """Fingerprint of the processed data an alert's raw records are built from"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
 
 class TradingDataService:
     """
     Service for extracting and aggregating raw trading data for analyst investigations
     """
     
-    def __init__(self):
-        self.raw_trades_cache = {}
-        self.raw_orders_cache = {}
+    def __init__(self, cache_max_bytes: int = 256 * 1024 * 1024,
+                 cache_ttl_seconds: Optional[float] = None,
+                 spill_dir: Optional[str] = None):
+        """
+        Args:
+            cache_max_bytes: Memory budget shared equally by the raw trade and order caches
+            cache_ttl_seconds: Expire cached alerts this long after they were extracted
+            spill_dir: Directory to spill evicted alerts to (None disables spilling)
+        """
+        # Secondary indexes maintained as data is cached
+        self.trade_index = RecordIndex(
+            hash_fields={'trader_id': 'trader_id', 'instrument': 'instrument'},
+            range_fields={
+                'timestamp': ('execution_timestamp', 'start_date', 'end_date'),
+                'quantity': ('quantity', 'min_quantity', 'max_quantity'),
+                'price': ('executed_price', 'min_price', 'max_price')
+            }
+        )
+        self.order_index = RecordIndex(
+            hash_fields={'trader_id': 'trader_id', 'instrument': 'instrument'},
+            range_fields={
+                'timestamp': ('order_timestamp', 'start_date', 'end_date'),
+                'quantity': ('quantity', 'min_quantity', 'max_quantity')
+            }
+        )
+        
+        # Memory-bounded caches; evicted/expired alerts drop out of the indexes and
+        # spilled alerts rejoin them when reloaded
+        self.raw_trades_cache = BoundedRecordCache(
+            max_bytes=cache_max_bytes // 2,
+            ttl_seconds=cache_ttl_seconds,
+            spill_dir=os.path.join(spill_dir, 'trades') if spill_dir else None,
+            on_evict=lambda alert_id, _: self.trade_index.remove_group(alert_id),
+            on_load=self.trade_index.replace_group
+        )
+        self.raw_orders_cache = BoundedRecordCache(
+            max_bytes=cache_max_bytes // 2,
+            ttl_seconds=cache_ttl_seconds,
+            spill_dir=os.path.join(spill_dir, 'orders') if spill_dir else None,
+            on_evict=lambda alert_id, _: self.order_index.remove_group(alert_id),
+            on_load=self.order_index.replace_group
+        )
         self.data_summaries = {}
     
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """Get hit/miss, eviction and memory metrics for the raw data caches"""
+        return {
+            'raw_trades': self.raw_trades_cache.get_metrics(),
+            'raw_orders': self.raw_orders_cache.get_metrics()
+        }
+    
     def extract_raw_trades_for_alert(self, alert_id: str, processed_data: Dict[str, Any]) -> List[RawTradeData]:
         """
         Extract comprehensive raw trade data for a specific alert
@@ -41,11 +102,19 @@ class TradingDataService:
             List of comprehensive raw trade data
         """
         try:
-            raw_trades = []
             trades = processed_data.get('trades', [])
             trader_info = processed_data.get('trader_info', {})
             market_data = processed_data.get('market_data', {})
             
+            # Serve a previous extraction from the same data (reloading it if spilled)
+            source = _source_fingerprint(trades, trader_info, market_data)
+            cached = self.raw_trades_cache.get(alert_id, source=source)
+            if cached is not None:
+                logger.info(f"Using {len(cached)} cached raw trades for alert {alert_id}")
+                return cached
+            
+            raw_trades = []
+            
             for trade in trades:
                 # Calculate additional metrics
                 notional = trade.get('value', trade.get('volume', 0) * trade.get('price', 0))
@@ -90,8 +159,9 @@ class TradingDataService:
                 
                 raw_trades.append(raw_trade)
             
-            # Cache the results
-            self.raw_trades_cache[alert_id] = raw_trades
+            # Index and cache the results (the cache may evict older alerts)
+            self.trade_index.replace_group(alert_id, raw_trades)
+            self.raw_trades_cache.put(alert_id, raw_trades, source=source)
             
             logger.info(f"Extracted {len(raw_trades)} raw trades for alert {alert_id}")
             return raw_trades
@@ -112,11 +182,19 @@ class TradingDataService:
             List of comprehensive raw order data
         """
         try:
-            raw_orders = []
             orders = processed_data.get('orders', [])
             trader_info = processed_data.get('trader_info', {})
             market_data = processed_data.get('market_data', {})
             
+            # Serve a previous extraction from the same data (reloading it if spilled)
+            source = _source_fingerprint(orders, trader_info, market_data)
+            cached = self.raw_orders_cache.get(alert_id, source=source)
+            if cached is not None:
+                logger.info(f"Using {len(cached)} cached raw orders for alert {alert_id}")
+                return cached
+            
+            raw_orders = []
+            
             for order in orders:
                 # Calculate filled and remaining quantities
                 filled_qty = float(order.get('filled_quantity', 0))
@@ -167,8 +245,9 @@ class TradingDataService:
                 
                 raw_orders.append(raw_order)
             
-            # Cache the results
-            self.raw_orders_cache[alert_id] = raw_orders
+            # Index and cache the results (the cache may evict older alerts)
+            self.order_index.replace_group(alert_id, raw_orders)
+            self.raw_orders_cache.put(alert_id, raw_orders, source=source)
             
             logger.info(f"Extracted {len(raw_orders)} raw orders for alert {alert_id}")
             return raw_orders
@@ -211,38 +290,46 @@ class TradingDataService:
             start_date = min(all_timestamps) if all_timestamps else datetime.utcnow().isoformat()
             end_date = max(all_timestamps) if all_timestamps else datetime.utcnow().isoformat()
             
+            # Trade columns are extracted once and aggregated vectorized
+            quantities = np.fromiter((t.quantity for t in raw_trades), dtype=float, count=len(raw_trades))
+            notionals = np.fromiter((t.notional_value for t in raw_trades), dtype=float, count=len(raw_trades))
+            directions = [t.direction for t in raw_trades]
+            is_buy = np.fromiter((d == TradeDirection.BUY for d in directions), dtype=bool, count=len(raw_trades))
+            is_sell = np.fromiter((d == TradeDirection.SELL for d in directions), dtype=bool, count=len(raw_trades))
+            
             # Calculate trade metrics
-            total_volume = sum(trade.quantity for trade in raw_trades)
-            total_notional = sum(trade.notional_value for trade in raw_trades)
+            total_volume = float(quantities.sum())
+            total_notional = float(notionals.sum())
             
             # Direction analysis
-            buy_trades = len([t for t in raw_trades if t.direction == TradeDirection.BUY])
-            sell_trades = len([t for t in raw_trades if t.direction == TradeDirection.SELL])
-            buy_volume = sum(t.quantity for t in raw_trades if t.direction == TradeDirection.BUY)
-            sell_volume = sum(t.quantity for t in raw_trades if t.direction == TradeDirection.SELL)
+            buy_trades = int(is_buy.sum())
+            sell_trades = int(is_sell.sum())
+            buy_volume = float(quantities[is_buy].sum())
+            sell_volume = float(quantities[is_sell].sum())
             
             # Risk metrics
-            trade_sizes = [trade.quantity for trade in raw_trades]
-            avg_trade_size = np.mean(trade_sizes) if trade_sizes else 0
-            largest_trade = max(trade_sizes) if trade_sizes else 0
+            avg_trade_size = float(quantities.mean()) if len(quantities) else 0
+            largest_trade = float(quantities.max()) if len(quantities) else 0
             
             # Calculate price impact
             price_impact = self._calculate_aggregate_price_impact(raw_trades)
             
             # Order analysis
-            cancelled_orders = len([o for o in raw_orders if o.status == OrderStatus.CANCELLED])
+            cancelled_orders = sum(1 for o in raw_orders if o.status == OrderStatus.CANCELLED)
             order_cancel_rate = cancelled_orders / len(raw_orders) if raw_orders else 0
             
             # Execution time analysis
             execution_times = self._calculate_execution_times(raw_orders, raw_trades)
-            avg_execution_time = np.mean(execution_times) if execution_times else 0
+            avg_execution_time = float(np.mean(execution_times)) if len(execution_times) else 0
             
             # Session analysis
             trades_by_session = self._analyze_trades_by_session(raw_trades)
             
             # P&L calculation
-            total_pnl = sum(trade.pnl_realized or 0 for trade in raw_trades)
-            unrealized_pnl = sum(trade.pnl_unrealized or 0 for trade in raw_trades)
+            total_pnl = float(np.fromiter((t.pnl_realized or 0 for t in raw_trades), dtype=float,
+                                          count=len(raw_trades)).sum())
+            unrealized_pnl = float(np.fromiter((t.pnl_unrealized or 0 for t in raw_trades), dtype=float,
+                                               count=len(raw_trades)).sum())
             
             # Get unique values
             instruments = list(set(trade.instrument for trade in raw_trades))
@@ -331,21 +418,13 @@ class TradingDataService:
             Dictionary containing raw trades and orders for the trader
         """
         try:
-            # Filter cached data for the trader
-            trader_trades = []
-            trader_orders = []
-            
-            for alert_id, trades in self.raw_trades_cache.items():
-                for trade in trades:
-                    if (trade.trader_id == trader_id and 
-                        start_date <= trade.execution_timestamp <= end_date):
-                        trader_trades.append(trade)
-            
-            for alert_id, orders in self.raw_orders_cache.items():
-                for order in orders:
-                    if (order.trader_id == trader_id and 
-                        start_date <= order.order_timestamp <= end_date):
-                        trader_orders.append(order)
+            # Look up cached data for the trader via the secondary indexes
+            self._purge_expired_cache()
+            criteria = {'trader_id': trader_id, 'start_date': start_date, 'end_date': end_date}
+            trader_trades = self._query_cached(self.trade_index, self.raw_trades_cache, criteria,
+                                               self._matches_trade_criteria)
+            trader_orders = self._query_cached(self.order_index, self.raw_orders_cache, criteria,
+                                               self._matches_order_criteria)
             
             # Generate summary
             summary = self.generate_trading_data_summary(f"trader_{trader_id}", trader_trades, trader_orders)
@@ -363,6 +442,101 @@ class TradingDataService:
             logger.error(f"Error getting raw trading data for trader {trader_id}: {str(e)}")
             raise
     
+    def search_raw_trading_data(self, criteria: Dict[str, Any]) -> Dict[str, List[Any]]:
+        """
+        Search cached raw trades and orders
+        
+        The query planner picks the most selective index (trader, instrument,
+        timestamp, quantity or price) and the full criteria are then checked
+        on the remaining candidates.
+        
+        Args:
+            criteria: Search criteria (trader_id, instrument, start_date, end_date,
+                direction, min/max_quantity, min/max_price)
+            
+        Returns:
+            Dictionary with matching 'trades' and 'orders'
+        """
+        self._purge_expired_cache()
+        return {
+            'trades': self._query_cached(self.trade_index, self.raw_trades_cache, criteria,
+                                         self._matches_trade_criteria),
+            'orders': self._query_cached(self.order_index, self.raw_orders_cache, criteria,
+                                         self._matches_order_criteria)
+        }
+    
+    def _purge_expired_cache(self) -> None:
+        """Drop expired alerts (and their spill files) so they no longer appear in lookups"""
+        self.raw_trades_cache.purge_expired()
+        self.raw_orders_cache.purge_expired()
+    
+    @staticmethod
+    def _query_cached(index: RecordIndex, cache: BoundedRecordCache, criteria: Dict[str, Any],
+                      matcher) -> List[Any]:
+        """Index lookup over in-memory alerts plus a scan of alerts spilled to disk"""
+        results = index.query(criteria, matcher)
+        for _, records in cache.spilled_items():
+            results.extend(record for record in records if matcher(record, criteria))
+        return results
+    
+    @staticmethod
+    def _matches_trade_criteria(trade: RawTradeData, criteria: Dict[str, Any]) -> bool:
+        """Check if trade matches search criteria"""
+        if criteria.get('trader_id') and trade.trader_id != criteria['trader_id']:
+            return False
+        
+        if criteria.get('instrument') and trade.instrument != criteria['instrument']:
+            return False
+        
+        if criteria.get('start_date') and trade.execution_timestamp < criteria['start_date']:
+            return False
+        
+        if criteria.get('end_date') and trade.execution_timestamp > criteria['end_date']:
+            return False
+        
+        if criteria.get('direction') and trade.direction.value != criteria['direction']:
+            return False
+        
+        if criteria.get('min_quantity') and trade.quantity < criteria['min_quantity']:
+            return False
+        
+        if criteria.get('max_quantity') and trade.quantity > criteria['max_quantity']:
+            return False
+        
+        if criteria.get('min_price') and trade.executed_price < criteria['min_price']:
+            return False
+        
+        if criteria.get('max_price') and trade.executed_price > criteria['max_price']:
+            return False
+        
+        return True
+    
+    @staticmethod
+    def _matches_order_criteria(order: RawOrderData, criteria: Dict[str, Any]) -> bool:
+        """Check if order matches search criteria"""
+        if criteria.get('trader_id') and order.trader_id != criteria['trader_id']:
+            return False
+        
+        if criteria.get('instrument') and order.instrument != criteria['instrument']:
+            return False
+        
+        if criteria.get('start_date') and order.order_timestamp < criteria['start_date']:
+            return False
+        
+        if criteria.get('end_date') and order.order_timestamp > criteria['end_date']:
+            return False
+        
+        if criteria.get('direction') and order.side.value != criteria['direction']:
+            return False
+        
+        if criteria.get('min_quantity') and order.quantity < criteria['min_quantity']:
+            return False
+        
+        if criteria.get('max_quantity') and order.quantity > criteria['max_quantity']:
+            return False
+        
+        return True
+    
     def _determine_market_session(self, timestamp: str) -> str:
         """Determine market session based on timestamp"""
         try:
@@ -463,38 +637,75 @@ class TradingDataService:
         if not trades:
             return 0.0
         
-        total_impact = 0.0
-        for trade in trades:
-            if trade.price_deviation:
-                total_impact += abs(trade.price_deviation)
-        
-        return total_impact / len(trades)
+        deviations = np.fromiter((t.price_deviation or 0.0 for t in trades), dtype=float, count=len(trades))
+        return float(np.abs(deviations).sum() / len(trades))
     
     def _calculate_execution_times(self, orders: List[RawOrderData], trades: List[RawTradeData]) -> List[float]:
-        """Calculate execution times for orders that resulted in trades"""
-        execution_times = []
+        """
+        Calculate execution times for orders that resulted in trades
+        
+        Trades are hash-joined to filled orders on order_id, each timestamp is
+        parsed once, and the time differences are computed as one array
+        operation. Results keep order-then-trade ordering.
+        """
+        if not orders or not trades:
+            return []
+        
+        # order_id -> indices of its trades, built once
+        trades_by_order: Dict[str, List[int]] = {}
+        for index, trade in enumerate(trades):
+            if trade.order_id is not None:
+                trades_by_order.setdefault(trade.order_id, []).append(index)
         
+        order_positions = []
+        trade_positions = []
+        filled_orders = []
         for order in orders:
-            if order.status == OrderStatus.FILLED:
-                # Find corresponding trades
-                for trade in trades:
-                    if trade.order_id == order.order_id:
-                        try:
-                            order_time = datetime.fromisoformat(order.order_timestamp.replace('Z', '+00:00'))
-                            trade_time = datetime.fromisoformat(trade.execution_timestamp.replace('Z', '+00:00'))
-                            execution_time = (trade_time - order_time).total_seconds()
-                            execution_times.append(execution_time)
-                        except:
-                            continue
-        
-        return execution_times
+            if order.status != OrderStatus.FILLED:
+                continue
+            matched = trades_by_order.get(order.order_id)
+            if matched:
+                order_positions.extend([len(filled_orders)] * len(matched))
+                trade_positions.extend(matched)
+                filled_orders.append(order)
+        
+        if not trade_positions:
+            return []
+        
+        parsed: Dict[str, Any] = {}
+        order_epochs, order_aware = self._parse_epochs([o.order_timestamp for o in filled_orders], parsed)
+        trade_epochs, trade_aware = self._parse_epochs([t.execution_timestamp for t in trades], parsed)
+        
+        order_idx = np.asarray(order_positions)
+        trade_idx = np.asarray(trade_positions)
+        execution_times = trade_epochs[trade_idx] - order_epochs[order_idx]
+        
+        # Unparseable timestamps and naive/aware mixes are skipped, as before
+        valid = ~np.isnan(execution_times) & (trade_aware[trade_idx] == order_aware[order_idx])
+        return execution_times[valid].tolist()
     
-    def _analyze_trades_by_session(self, trades: List[RawTradeData]) -> Dict[str, int]:
-        """Analyze trades by market session"""
-        session_counts = {}
+    @staticmethod
+    def _parse_epochs(timestamps: List[Optional[str]], parsed: Dict[str, Any]) -> Any:
+        """Parse ISO timestamps to epoch seconds (NaN if unparseable) plus a tz-aware mask"""
+        epochs = np.empty(len(timestamps), dtype=float)
+        aware = np.zeros(len(timestamps), dtype=bool)
         
-        for trade in trades:
-            session = trade.market_session or 'unknown'
-            session_counts[session] = session_counts.get(session, 0) + 1
+        for i, timestamp in enumerate(timestamps):
+            result = parsed.get(timestamp)
+            if result is None:
+                try:
+                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                    if dt.tzinfo is not None:
+                        result = ((dt - _EPOCH_UTC).total_seconds(), True)
+                    else:
+                        result = ((dt - _EPOCH).total_seconds(), False)
+                except Exception:
+                    result = (np.nan, False)
+                parsed[timestamp] = result
+            epochs[i], aware[i] = result
         
-        return session_counts
\ No newline at end of file
+        return epochs, aware
+    
+    def _analyze_trades_by_session(self, trades: List[RawTradeData]) -> Dict[str, int]:
+        """Analyze trades by market session"""
+        return dict(Counter(trade.market_session or 'unknown' for trade in trades))
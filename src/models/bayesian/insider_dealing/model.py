@@ -13,6 +13,8 @@ from pgmpy.inference import VariableElimination
 from ..shared.model_builder import ModelBuilder, build_insider_dealing_bn, build_insider_dealing_bn_with_latent_intent
 from ..shared.fallback_logic import FallbackLogic
 from ..shared.esi import EvidenceSufficiencyIndex
+from ..shared.batched_inference import BatchedPosterior
+from ..shared.sensitivity_analysis import EvidenceSensitivityEngine
 from .nodes import InsiderDealingNodes
 from .config import InsiderDealingConfig
 
@@ -44,6 +46,8 @@ class InsiderDealingModel:
         # Build the Bayesian network
         self.model = self._build_model()
         self.inference_engine = VariableElimination(self.model)
+        self._batched_posterior = None
+        self._sensitivity_engine = None
         
         logger.info(f"Insider dealing model initialized (latent_intent={use_latent_intent})")
     
@@ -90,7 +94,8 @@ class InsiderDealingModel:
                 'model_metadata': {
                     'model_type': 'insider_dealing',
                     'use_latent_intent': self.use_latent_intent,
-                    'inference_method': 'variable_elimination'
+                    'inference_method': 'variable_elimination',
+                    'inference_evidence': processed_evidence
                 }
             }
             
@@ -264,6 +269,39 @@ class InsiderDealingModel:
         else:
             return 'Continue routine monitoring'
     
+    def get_batched_posterior(self) -> BatchedPosterior:
+        """
+        Get the compiled outcome posterior over the required evidence nodes.
+        
+        Returns:
+            BatchedPosterior for P(insider_dealing = yes | evidence), built on first use
+        """
+        if self._batched_posterior is None:
+            required_nodes = self.get_required_nodes()
+            state_names = {}
+            fallback_priors = {}
+            for node_name in required_nodes:
+                node = self.nodes.get_node(node_name)
+                if node:
+                    state_names[node_name] = node.states
+                    fallback_priors[node_name] = node.get_fallback_prior()
+            self._batched_posterior = BatchedPosterior(
+                self.model, 'insider_dealing', required_nodes,
+                state_names=state_names, fallback_priors=fallback_priors
+            )
+        return self._batched_posterior
+    
+    def get_sensitivity_engine(self) -> EvidenceSensitivityEngine:
+        """
+        Get the compiled VOI/CPD sensitivity engine for the outcome node.
+        
+        Returns:
+            EvidenceSensitivityEngine for P(insider_dealing = yes | evidence), built on first use
+        """
+        if self._sensitivity_engine is None:
+            self._sensitivity_engine = EvidenceSensitivityEngine(self.model, 'insider_dealing')
+        return self._sensitivity_engine
+    
     def get_required_nodes(self) -> List[str]:
         """
         Get list of required nodes for this model.
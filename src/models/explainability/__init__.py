@@ -9,6 +9,7 @@ transparent decision-making processes.
 from .explainability_engine import ModelExplainabilityEngine
 from .feature_attribution import FeatureAttributor
 from .counterfactual_generator import CounterfactualGenerator
+from .counterfactual_search import CounterfactualSearch, CounterfactualChangeSet
 from .decision_path_visualizer import DecisionPathVisualizer
 from .uncertainty_quantifier import UncertaintyQuantifier
 from .evidence_sufficiency_index import EvidenceSufficiencyIndex, ESIResult
@@ -20,6 +21,8 @@ __all__ = [
     "ModelExplainabilityEngine",
     "FeatureAttributor",
     "CounterfactualGenerator",
+    "CounterfactualSearch",
+    "CounterfactualChangeSet",
     "DecisionPathVisualizer",
     "UncertaintyQuantifier",
     "EvidenceSufficiencyIndex",
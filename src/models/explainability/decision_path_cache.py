@@ -0,0 +1,252 @@
+"""
+Decision Path Cache
+
+Decision paths are built once per (model version, evidence) and kept in an
+LRU cache. A background worker turns each new path into a graph,
+computes a layered layout and serializes it to JSON, so explanation
+requests only look results up and visualization cost stays off the
+scoring path.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Horizontal and vertical spacing of the layered layout
+LAYER_SPACING = 200
+NODE_SPACING = 80
+
+
+def evidence_key(evidence: Dict[str, Any]) -> Tuple:
+    """Hashable, order-independent form of an evidence dict"""
+    return tuple(sorted((str(node), _freeze(value)) for node, value in evidence.items()))
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def layout_graph(graph: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Layered left-to-right layout of a decision path graph.
+
+    Args:
+        graph: ``nodes`` (dicts with an ``id``) and ``edges`` (dicts with
+            ``source`` and ``target``)
+
+    Returns:
+        The graph with ``x``/``y`` on every node plus overall width and height
+    """
+    nodes = graph.get("nodes", [])
+    edges = graph.get("edges", [])
+    ids = [node["id"] for node in nodes]
+    successors: Dict[str, List[str]] = {node_id: [] for node_id in ids}
+    indegree = {node_id: 0 for node_id in ids}
+    for edge in edges:
+        if edge["source"] in successors and edge["target"] in indegree:
+            successors[edge["source"]].append(edge["target"])
+            indegree[edge["target"]] += 1
+
+    # Longest path from a source gives each node its layer
+    layer = {node_id: 0 for node_id in ids}
+    sources = [node_id for node_id in ids if indegree[node_id] == 0]
+    ready = list(sources)
+    while ready:
+        node_id = ready.pop(0)
+        for target in successors[node_id]:
+            layer[target] = max(layer[target], layer[node_id] + 1)
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                ready.append(target)
+
+    # Sources sit just before their first successor to keep edges short
+    for node_id in sources:
+        if successors[node_id]:
+            layer[node_id] = min(layer[target] for target in successors[node_id]) - 1
+
+    layers: Dict[int, List[str]] = {}
+    for node_id in ids:
+        layers.setdefault(layer[node_id], []).append(node_id)
+    height = max((len(members) for members in layers.values()), default=0)
+
+    positions = {}
+    for depth, members in layers.items():
+        offset = (height - len(members)) * NODE_SPACING / 2
+        for index, node_id in enumerate(members):
+            positions[node_id] = (depth * LAYER_SPACING, offset + index * NODE_SPACING)
+
+    return {
+        **graph,
+        "nodes": [{**node, "x": positions[node["id"]][0], "y": positions[node["id"]][1]} for node in nodes],
+        "edges": edges,
+        "width": len(layers) * LAYER_SPACING,
+        "height": height * NODE_SPACING,
+    }
+
+
+@dataclass
+class DecisionPathEntry:
+    """Cached decision path and its rendered layout."""
+
+    model_version: str
+    evidence_key: Tuple
+    path: Any
+    graph_builder: Optional[Callable[[Any], Dict[str, Any]]] = field(default=None, repr=False)
+    layout: Optional[str] = None  # serialized JSON layout once rendered
+    status: str = "pending"  # 'pending', 'rendered', 'failed', 'not_rendered'
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+
+class DecisionPathCache:
+    """
+    LRU cache of decision paths with background layout rendering.
+
+    Config keys:
+        cache_size: Decision paths kept (default 1024)
+        background_rendering: Start the render worker (default True); when
+            False, ``render_pending`` renders synchronously
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.cache_size = config.get("cache_size", 1024)
+
+        self._entries: "OrderedDict[Tuple, DecisionPathEntry]" = OrderedDict()
+        self._building: Dict[Tuple, threading.Event] = {}
+        self._pending: "OrderedDict[Tuple, DecisionPathEntry]" = OrderedDict()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.metrics = {"cache_hits": 0, "cache_misses": 0, "rendered": 0, "render_failures": 0}
+
+        self._worker: Optional[threading.Thread] = None
+        if config.get("background_rendering", True):
+            self._worker = threading.Thread(target=self._run, name="decision-path-renderer", daemon=True)
+            self._worker.start()
+
+    def get_or_build(
+        self,
+        model_version: str,
+        evidence: Dict[str, Any],
+        build: Callable[[], Any],
+        graph_builder: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    ) -> DecisionPathEntry:
+        """
+        Cached decision path, built on the first request for this key.
+
+        Concurrent requests for the same key wait for a single build. New
+        paths with a ``graph_builder`` are queued for background rendering.
+
+        Args:
+            model_version: Version of the model that produced the path
+            evidence: Evidence the path explains
+            build: Computes the decision path
+            graph_builder: Turns the path into a ``nodes``/``edges`` graph for rendering
+        """
+        key = (model_version, evidence_key(evidence))
+        while True:
+            with self._condition:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.metrics["cache_hits"] += 1
+                    return entry
+                building = self._building.get(key)
+                if building is None:
+                    self._building[key] = threading.Event()
+                    self.metrics["cache_misses"] += 1
+                    break
+            building.wait()
+
+        try:
+            entry = DecisionPathEntry(model_version, key[1], build(), graph_builder,
+                                      status="pending" if graph_builder else "not_rendered")
+            with self._condition:
+                self._entries[key] = entry
+                while len(self._entries) > self.cache_size:
+                    evicted_key, _ = self._entries.popitem(last=False)
+                    self._pending.pop(evicted_key, None)
+                if graph_builder is not None:
+                    self._pending[key] = entry
+                    self._condition.notify()
+            return entry
+        finally:
+            with self._condition:
+                self._building.pop(key).set()
+
+    def lookup(self, model_version: str, evidence: Dict[str, Any]) -> Optional[DecisionPathEntry]:
+        """Cached entry for this key, or None when the path was never built"""
+        key = (model_version, evidence_key(evidence))
+        with self._condition:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def render_pending(self) -> int:
+        """
+        Render every queued path in the calling thread.
+
+        Returns:
+            Number of paths rendered
+        """
+        rendered = 0
+        while True:
+            with self._condition:
+                if not self._pending:
+                    return rendered
+                _, entry = self._pending.popitem(last=False)
+            self._render(entry)
+            rendered += 1
+
+    @property
+    def queue_depth(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def clear(self) -> None:
+        with self._condition:
+            self._entries.clear()
+            self._pending.clear()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the render worker"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def _render(self, entry: DecisionPathEntry) -> None:
+        try:
+            layout = layout_graph(entry.graph_builder(entry.path))
+            layout["model_version"] = entry.model_version
+            entry.layout = json.dumps(layout, default=str, sort_keys=True)
+            entry.status = "rendered"
+            self.metrics["rendered"] += 1
+        except Exception as e:
+            logger.error(f"Error rendering decision path: {str(e)}")
+            entry.status = "failed"
+            self.metrics["render_failures"] += 1
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            self.render_pending()
@@ -1,22 +1,18 @@
 """
 Decision Path Visualizer Module
 
-This module provides decision path visualization capabilities.
+This module provides decision path visualization capabilities. Decision
+paths are cached per model version and evidence, and their graph layouts
+are rendered in the background (see decision_path_cache.py).
 """
 
-from typing import Dict, Any, List
-from .explainability_engine import DecisionPathNode
+from .explainability_engine import DecisionPathNode, DecisionPathVisualizer
+from .decision_path_cache import DecisionPathCache, DecisionPathEntry, layout_graph
 
-
-class DecisionPathVisualizer:
-    """Decision path visualizer - placeholder for now."""
-
-    def __init__(self, config: Dict[str, Any]):
-        self.config = config
-
-    def generate_decision_path(
-        self, model_result: Dict[str, Any], evidence: Dict[str, Any], model_type: str
-    ) -> List[DecisionPathNode]:
-        """Generate decision path."""
-        # Implementation moved to explainability_engine.py
-        return []
+__all__ = [
+    "DecisionPathNode",
+    "DecisionPathVisualizer",
+    "DecisionPathCache",
+    "DecisionPathEntry",
+    "layout_graph",
+]
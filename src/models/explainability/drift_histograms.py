@@ -0,0 +1,147 @@
+"""
+Streaming Drift Histograms
+
+Fixed-bin histograms for drift monitoring of live traffic. Observations
+are binned once on arrival into time buckets; the current and reference
+windows are sums of bucket counts, so PSI, KS and Jensen-Shannon drift
+cost O(buckets x bins) regardless of how many samples were seen.
+Histograms with the same edges merge by adding counts (e.g. across
+workers).
+"""
+
+from typing import Dict, Any, Optional, Sequence, Union
+from datetime import datetime
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Added to every bin before comparing distributions, so empty bins do not
+# make PSI infinite
+SMOOTHING = 0.5
+
+
+class StreamingHistogram:
+    """Counts of observations over fixed bin edges (out-of-range values go to the end bins)."""
+
+    def __init__(self, edges: Sequence[float], counts: Optional[np.ndarray] = None):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1) if counts is None else np.asarray(counts, dtype=float)
+
+    @classmethod
+    def for_scores(cls, bins: int = 20) -> "StreamingHistogram":
+        """Equal-width bins over [0, 1] for probabilities and risk scores"""
+        return cls(np.linspace(0.0, 1.0, bins + 1))
+
+    @classmethod
+    def for_states(cls, states: int) -> "StreamingHistogram":
+        """One bin per discrete state index 0..states-1"""
+        return cls(np.arange(states + 1) - 0.5)
+
+    @property
+    def total(self) -> float:
+        return float(self.counts.sum())
+
+    def update(self, values: Union[float, Sequence[float]]) -> None:
+        self.counts += self.bin_counts(values)
+
+    def bin_counts(self, values: Union[float, Sequence[float]]) -> np.ndarray:
+        """Counts of ``values`` per bin"""
+        values = np.atleast_1d(np.asarray(values, dtype=float))
+        values = values[np.isfinite(values)]
+        bins = np.clip(np.searchsorted(self.edges, values, side="right") - 1, 0, len(self.counts) - 1)
+        return np.bincount(bins, minlength=len(self.counts)).astype(float)
+
+    def merge(self, other: "StreamingHistogram") -> "StreamingHistogram":
+        """Histogram of both streams (edges must match)"""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bin edges")
+        return StreamingHistogram(self.edges, self.counts + other.counts)
+
+
+class WindowedHistogram:
+    """
+    Streaming histogram kept as time buckets for sliding-window comparisons.
+
+    Args:
+        edges: Bin edges shared by every bucket
+        bucket_seconds: Width of a time bucket
+        retention_buckets: Buckets kept before the oldest are dropped
+    """
+
+    def __init__(self, edges: Sequence[float], bucket_seconds: int = 3600, retention_buckets: int = 24 * 8):
+        self.edges = np.asarray(edges, dtype=float)
+        self.bucket_seconds = bucket_seconds
+        self.retention_buckets = retention_buckets
+        self._template = StreamingHistogram(self.edges)
+        self._buckets: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def update(self, values: Union[float, Sequence[float]], timestamp: Optional[datetime] = None) -> None:
+        counts = self._template.bin_counts(values)
+        bucket = self.bucket_index(timestamp)
+        with self._lock:
+            if bucket in self._buckets:
+                self._buckets[bucket] += counts
+            else:
+                self._buckets[bucket] = counts
+                oldest = bucket - self.retention_buckets
+                for expired in [b for b in self._buckets if b <= oldest]:
+                    del self._buckets[expired]
+
+    def window(self, end_bucket: int, buckets: int) -> StreamingHistogram:
+        """Histogram of the ``buckets`` buckets ending at ``end_bucket`` (inclusive)"""
+        counts = np.zeros(len(self.edges) - 1)
+        with self._lock:
+            for bucket in range(end_bucket - buckets + 1, end_bucket + 1):
+                if bucket in self._buckets:
+                    counts += self._buckets[bucket]
+        return StreamingHistogram(self.edges, counts)
+
+    def bucket_index(self, timestamp: Optional[datetime] = None) -> int:
+        timestamp = timestamp or datetime.utcnow()
+        return int(timestamp.timestamp() // self.bucket_seconds)
+
+
+def _distributions(reference: np.ndarray, current: np.ndarray, smoothing: float):
+    reference = np.asarray(reference, dtype=float) + smoothing
+    current = np.asarray(current, dtype=float) + smoothing
+    return reference / reference.sum(), current / current.sum()
+
+
+def population_stability_index(reference: np.ndarray, current: np.ndarray, smoothing: float = SMOOTHING) -> float:
+    """PSI = sum (c - r) ln(c / r) over bins"""
+    r, c = _distributions(reference, current, smoothing)
+    return float(((c - r) * np.log(c / r)).sum())
+
+
+def ks_statistic(reference: np.ndarray, current: np.ndarray) -> float:
+    """Largest CDF difference at the bin edges (binned two-sample KS statistic)"""
+    r, c = _distributions(reference, current, 0.0)
+    return float(np.abs(np.cumsum(c) - np.cumsum(r)).max())
+
+
+def jensen_shannon_divergence(reference: np.ndarray, current: np.ndarray, smoothing: float = SMOOTHING) -> float:
+    """Jensen-Shannon divergence in bits (0 = identical, 1 = disjoint)"""
+    r, c = _distributions(reference, current, smoothing)
+    m = (r + c) / 2
+    # Empty bins contribute nothing (0 log 0 = 0)
+    r_terms = r * np.log2(np.where(r > 0, r, 1.0) / np.where(r > 0, m, 1.0))
+    c_terms = c * np.log2(np.where(c > 0, c, 1.0) / np.where(c > 0, m, 1.0))
+    return float(0.5 * r_terms.sum() + 0.5 * c_terms.sum())
+
+
+def drift_metrics(reference: StreamingHistogram, current: StreamingHistogram) -> Dict[str, Any]:
+    """PSI, KS and Jensen-Shannon drift between two histograms"""
+    if reference.total == 0 or current.total == 0:
+        return {"psi": 0.0, "ks": 0.0, "js": 0.0,
+                "reference_count": reference.total, "current_count": current.total}
+    return {
+        "psi": population_stability_index(reference.counts, current.counts),
+        "ks": ks_statistic(reference.counts, current.counts),
+        "js": jensen_shannon_divergence(reference.counts, current.counts),
+        "reference_count": reference.total,
+        "current_count": current.total,
+    }
@@ -7,10 +7,19 @@ visualization for regulatory compliance.
 """
 
 from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
+import copy
 import logging
+import threading
 from dataclasses import dataclass, asdict
 
+from .counterfactual_search import CounterfactualSearch, reachable_alert_threshold
+from .decision_path_cache import DecisionPathCache, evidence_key
+from .explanation_cache import ExplanationCache, SignatureFrequencyTracker
+from .parameter_uncertainty import ParameterUncertaintySampler
+from .shapley_attribution import ShapleyAttributor
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,6 +70,9 @@ class UncertaintyAnalysis:
     epistemic_uncertainty: float
     aleatoric_uncertainty: float
     reliability_score: float
+    method: str = "evidence_coverage"  # or 'parameter_monte_carlo'
+    credible_level: Optional[float] = None
+    n_samples: int = 0
 
 
 class ModelExplainabilityEngine:
@@ -82,82 +94,89 @@ class ModelExplainabilityEngine:
             config: Optional configuration dictionary
         """
         self.config = config or {}
-        self.feature_attributor = FeatureAttributor(self.config.get("feature_attribution", {}))
-        self.counterfactual_generator = CounterfactualGenerator(
-            self.config.get("counterfactual", {})
-        )
+        # Each component reads its own section ("shapley", "counterfactual", "uncertainty")
+        self.feature_attributor = FeatureAttributor(self.config)
+        self.counterfactual_generator = CounterfactualGenerator(self.config)
         self.decision_visualizer = DecisionPathVisualizer(self.config.get("decision_path", {}))
-        self.uncertainty_quantifier = UncertaintyQuantifier(self.config.get("uncertainty", {}))
+        self.uncertainty_quantifier = UncertaintyQuantifier(self.config)
+
+        # Component results per evidence signature, and signature frequencies for precomputing
+        cache_config = self.config.get("explanation_cache", {})
+        self.component_cache = ExplanationCache(cache_config)
+        self.signature_tracker = SignatureFrequencyTracker(
+            window_seconds=cache_config.get("precompute_window_seconds", 86400),
+            max_signatures=cache_config.get("max_tracked_signatures", 10000),
+        )
+        self.precompute_top_n = cache_config.get("precompute_top_n", 100)
+        self._precompute_stop = threading.Event()
+        if cache_config.get("precompute_interval_seconds"):
+            self.start_precompute(cache_config["precompute_interval_seconds"])
 
-        # Explanation cache
-        self.explanation_cache = {}
+        # Generated explanations by ID (most recent kept)
+        self.explanation_cache = OrderedDict()
+        self.explanation_history_size = cache_config.get("explanation_history_size", 1024)
 
         logger.info("Model explainability engine initialized")
 
     def generate_comprehensive_explanation(
-        self, model_result: Dict[str, Any], evidence: Dict[str, Any], model_type: str = "unknown"
+        self,
+        model_result: Dict[str, Any],
+        evidence: Dict[str, Any],
+        model_type: str = "unknown",
+        posterior=None,
+        alert_threshold: Optional[float] = None,
+        sensitivity_engine=None,
     ) -> Dict[str, Any]:
         """
         Generate comprehensive explanation for model result.
 
+        Components are cached per evidence signature (model version and
+        evidence), so repeated signatures only get a new ID and timestamp.
+
         Args:
             model_result: Model prediction result
             evidence: Input evidence
             model_type: Type of model
+            posterior: Optional BatchedPosterior of the model for Shapley attribution
+                and counterfactual search
+            alert_threshold: Alert threshold the counterfactuals must fall below
+            sensitivity_engine: Optional EvidenceSensitivityEngine of the model for
+                Monte Carlo parameter uncertainty
 
         Returns:
             Comprehensive explanation dictionary
         """
         try:
-            explanation_id = self._generate_explanation_id()
-
-            # Feature attribution
-            feature_attributions = self.feature_attributor.calculate_attributions(
-                model_result, evidence, model_type
-            )
-
-            # Counterfactual scenarios
-            counterfactuals = self.counterfactual_generator.generate_scenarios(
-                model_result, evidence, model_type
-            )
-
-            # Decision path
-            decision_path = self.decision_visualizer.generate_decision_path(
-                model_result, evidence, model_type
-            )
-
-            # Uncertainty analysis
-            uncertainty_analysis = self.uncertainty_quantifier.analyze_uncertainty(
-                model_result, evidence, model_type
+            signature = self._evidence_signature(
+                model_result, evidence, model_type, posterior, alert_threshold, sensitivity_engine
             )
+            self.signature_tracker.record(signature, {
+                "model_result": model_result,
+                "evidence": evidence,
+                "model_type": model_type,
+                "posterior": posterior,
+                "alert_threshold": alert_threshold,
+                "sensitivity_engine": sensitivity_engine,
+            })
+
+            body = self.component_cache.get("explanation", signature)
+            if body is None:
+                body = self._build_explanation(
+                    signature, model_result, evidence, model_type, posterior, alert_threshold, sensitivity_engine
+                )
+                self.component_cache.put("explanation", signature, body)
 
-            # Comprehensive explanation
+            explanation_id = self._generate_explanation_id()
             comprehensive_explanation = {
                 "explanation_id": explanation_id,
                 "timestamp": datetime.utcnow().isoformat(),
-                "model_type": model_type,
-                "feature_attributions": [asdict(fa) for fa in feature_attributions],
-                "counterfactual_scenarios": [asdict(cs) for cs in counterfactuals],
-                "decision_path": [asdict(dp) for dp in decision_path],
-                "uncertainty_analysis": asdict(uncertainty_analysis),
-                "regulatory_summary": self._generate_regulatory_summary(
-                    feature_attributions, counterfactuals, decision_path, uncertainty_analysis
-                ),
-                "explanation_metadata": {
-                    "explanation_quality": self._assess_explanation_quality(
-                        feature_attributions, counterfactuals, decision_path
-                    ),
-                    "completeness_score": self._calculate_completeness_score(
-                        feature_attributions, counterfactuals, decision_path
-                    ),
-                    "regulatory_compliance": self._check_regulatory_compliance(
-                        feature_attributions, decision_path
-                    ),
-                },
+                **copy.deepcopy(body),
             }
 
             # Cache explanation
             self.explanation_cache[explanation_id] = comprehensive_explanation
+            while len(self.explanation_cache) > self.explanation_history_size:
+                self.explanation_cache.popitem(last=False)
 
             return comprehensive_explanation
 
@@ -165,6 +184,159 @@ class ModelExplainabilityEngine:
             logger.error(f"Error generating comprehensive explanation: {str(e)}")
             return self._generate_fallback_explanation(model_result, evidence, model_type)
 
+    def precompute(self, top_n: Optional[int] = None) -> int:
+        """
+        Warm the cache for the most frequent evidence signatures of the last day.
+
+        Args:
+            top_n: Signatures to warm (defaults to the ``precompute_top_n`` config)
+
+        Returns:
+            Number of explanations computed
+        """
+        computed = 0
+        for signature, _, inputs in self.signature_tracker.most_frequent(top_n or self.precompute_top_n):
+            if self.component_cache.contains("explanation", signature):
+                continue
+            try:
+                body = self._build_explanation(signature, **inputs)
+                self.component_cache.put("explanation", signature, body)
+                computed += 1
+            except Exception as e:
+                logger.error(f"Error precomputing explanation: {str(e)}")
+        return computed
+
+    def start_precompute(self, interval_seconds: float) -> threading.Thread:
+        """Precompute in a background thread every ``interval_seconds``"""
+
+        def run():
+            while not self._precompute_stop.wait(interval_seconds):
+                computed = self.precompute()
+                if computed:
+                    logger.info(f"Precomputed {computed} explanations")
+
+        self._precompute_stop.clear()
+        thread = threading.Thread(target=run, name="explanation-precompute", daemon=True)
+        thread.start()
+        return thread
+
+    def stop_precompute(self) -> None:
+        self._precompute_stop.set()
+
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """Hit/miss statistics and sizes of every explanation cache."""
+        return {
+            "components": self.component_cache.statistics(),
+            "decision_path": dict(self.decision_visualizer.cache.metrics),
+            "tracked_signatures": self.signature_tracker.tracked_signatures,
+        }
+
+    def _evidence_signature(
+        self,
+        model_result: Dict[str, Any],
+        evidence: Dict[str, Any],
+        model_type: str,
+        posterior=None,
+        alert_threshold: Optional[float] = None,
+        sensitivity_engine=None,
+    ) -> Tuple:
+        """Model version and evidence the explanation components depend on."""
+
+        metadata = model_result.get("model_metadata", {})
+        version = getattr(sensitivity_engine, "model_version", None)
+        if version is None and posterior is not None:
+            # Kept alive by the cache key, so its identity stays unique
+            version = posterior
+        if version is None:
+            version = metadata.get("model_version", "unversioned")
+
+        # Without a posterior or engine the components are derived from the
+        # result itself, so the whole result is part of the key
+        result_key = None
+        if posterior is None and sensitivity_engine is None:
+            result_key = evidence_key(model_result)
+
+        inference_evidence = metadata.get("inference_evidence")
+        return (
+            model_type,
+            version,
+            posterior is not None,
+            sensitivity_engine is not None,
+            alert_threshold,
+            evidence_key(evidence),
+            evidence_key(inference_evidence) if inference_evidence else None,
+            result_key,
+        )
+
+    def _build_explanation(
+        self,
+        signature: Tuple,
+        model_result: Dict[str, Any],
+        evidence: Dict[str, Any],
+        model_type: str,
+        posterior=None,
+        alert_threshold: Optional[float] = None,
+        sensitivity_engine=None,
+    ) -> Dict[str, Any]:
+        """Explanation body (everything but ID and timestamp) from cached components."""
+
+        # Feature attribution
+        feature_attributions = self.component_cache.get_or_compute(
+            "attribution",
+            signature,
+            lambda: self.feature_attributor.calculate_attributions(
+                model_result, evidence, model_type, posterior=posterior
+            ),
+        )
+
+        # Counterfactual scenarios
+        counterfactuals = self.component_cache.get_or_compute(
+            "counterfactuals",
+            signature,
+            lambda: self.counterfactual_generator.generate_scenarios(
+                model_result, evidence, model_type, posterior=posterior, alert_threshold=alert_threshold
+            ),
+        )
+
+        # Decision path (cached by the visualizer)
+        decision_path = self.decision_visualizer.generate_decision_path(
+            model_result,
+            evidence,
+            model_type,
+            model_version=getattr(sensitivity_engine, "model_version", None),
+        )
+
+        # Uncertainty analysis
+        uncertainty_analysis = self.component_cache.get_or_compute(
+            "uncertainty",
+            signature,
+            lambda: self.uncertainty_quantifier.analyze_uncertainty(
+                model_result, evidence, model_type, sensitivity_engine=sensitivity_engine
+            ),
+        )
+
+        return {
+            "model_type": model_type,
+            "feature_attributions": [asdict(fa) for fa in feature_attributions],
+            "counterfactual_scenarios": [asdict(cs) for cs in counterfactuals],
+            "decision_path": [asdict(dp) for dp in decision_path],
+            "uncertainty_analysis": asdict(uncertainty_analysis),
+            "regulatory_summary": self._generate_regulatory_summary(
+                feature_attributions, counterfactuals, decision_path, uncertainty_analysis
+            ),
+            "explanation_metadata": {
+                "explanation_quality": self._assess_explanation_quality(
+                    feature_attributions, counterfactuals, decision_path
+                ),
+                "completeness_score": self._calculate_completeness_score(
+                    feature_attributions, counterfactuals, decision_path
+                ),
+                "regulatory_compliance": self._check_regulatory_compliance(
+                    feature_attributions, decision_path
+                ),
+            },
+        }
+
     def _generate_explanation_id(self) -> str:
         """Generate unique explanation ID."""
         return f"explanation_{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}"
@@ -391,15 +563,29 @@ class ModelExplainabilityEngine:
 
 # Component classes (to be implemented)
 class FeatureAttributor:
-    """Feature attribution calculator."""
+    """Feature attribution calculator (Shapley settings under ``config["shapley"]``)."""
 
     def __init__(self, config: Dict[str, Any]):
-        self.config = config
+        self.config = config.get("shapley", {})
+        self.shapley = ShapleyAttributor(self.config)
 
     def calculate_attributions(
-        self, model_result: Dict[str, Any], evidence: Dict[str, Any], model_type: str
+        self,
+        model_result: Dict[str, Any],
+        evidence: Dict[str, Any],
+        model_type: str,
+        posterior=None,
     ) -> List[FeatureAttribution]:
-        """Calculate feature attributions."""
+        """
+        Calculate feature attributions.
+
+        With the model's batched posterior, attributions are Shapley values
+        of the observed evidence nodes; otherwise importance is estimated
+        heuristically from the evidence values.
+        """
+
+        if posterior is not None:
+            return self._shapley_attributions(posterior, evidence)
 
         attributions = []
 
@@ -426,17 +612,71 @@ class FeatureAttributor:
 
         return attributions
 
+    def _shapley_attributions(self, posterior, evidence: Dict[str, Any]) -> List[FeatureAttribution]:
+        """Attributions from exact or sampled Shapley values."""
+
+        result = self.shapley.attribute(posterior, evidence)
+        total = sum(abs(value) for value in result.values.values())
+
+        attributions = []
+        for feature_name, value in result.values.items():
+            bound = result.confidence_bounds.get(feature_name, 0.0)
+            direction = "positive" if value > 0 else "negative"
+            explanation = (
+                f"{feature_name} {'raises' if value > 0 else 'lowers'} the risk score by "
+                f"{abs(value):.2%} (Shapley value"
+                + (f", +/- {bound:.2%})" if not result.exact else ")")
+            )
+            attributions.append(
+                FeatureAttribution(
+                    feature_name=feature_name,
+                    importance=abs(value) / total if total > 0 else 0.0,
+                    contribution=value,
+                    confidence=1.0 - min(bound / abs(value), 1.0) if value else (0.0 if bound else 1.0),
+                    direction=direction,
+                    explanation=explanation,
+                )
+            )
+
+        return attributions
+
 
 class CounterfactualGenerator:
-    """Counterfactual scenario generator."""
+    """Counterfactual scenario generator (settings under ``config["counterfactual"]``)."""
 
     def __init__(self, config: Dict[str, Any]):
-        self.config = config
+        self.config = config.get("counterfactual", {})
+        self.search = CounterfactualSearch(self.config)
 
     def generate_scenarios(
-        self, model_result: Dict[str, Any], evidence: Dict[str, Any], model_type: str
+        self,
+        model_result: Dict[str, Any],
+        evidence: Dict[str, Any],
+        model_type: str,
+        posterior=None,
+        alert_threshold: Optional[float] = None,
+    ) -> List[CounterfactualScenario]:
+        """
+        Generate counterfactual scenarios.
+
+        With the model's batched posterior, the minimal evidence changes that
+        bring the score below the alert threshold are searched exhaustively;
+        a score already below the threshold yields a single no-change
+        scenario. Without a posterior, or when no evidence change crosses
+        the threshold, single features are perturbed heuristically.
+        """
+
+        if posterior is not None:
+            scenarios = self._search_scenarios(posterior, evidence, alert_threshold)
+            if scenarios:
+                return scenarios
+
+        return self._heuristic_scenarios(model_result, evidence)
+
+    def _heuristic_scenarios(
+        self, model_result: Dict[str, Any], evidence: Dict[str, Any]
     ) -> List[CounterfactualScenario]:
-        """Generate counterfactual scenarios."""
+        """Single-feature perturbations of the numeric evidence."""
 
         scenarios = []
         original_prediction = model_result.get("risk_scores", {}).get("overall_score", 0.0)
@@ -463,18 +703,118 @@ class CounterfactualGenerator:
 
         return scenarios
 
+    def _search_scenarios(
+        self, posterior, evidence: Dict[str, Any], alert_threshold: Optional[float]
+    ) -> List[CounterfactualScenario]:
+        """Minimal counterfactuals from a batched posterior search."""
+
+        threshold = alert_threshold if alert_threshold is not None else self.config.get("alert_threshold")
+        if threshold is None:
+            threshold = reachable_alert_threshold(posterior, 0.5)
+
+        # Unobserved nodes take their prior mode and are not offered as changes
+        observed = {node: evidence[node] for node in posterior.evidence_nodes if evidence.get(node) is not None}
+        complete_evidence = {**posterior.most_probable_states(), **observed}
+        unobserved = [node for node in posterior.evidence_nodes if node not in observed]
+
+        original_score = float(posterior.posterior(posterior.encode(complete_evidence)[None, :])[0])
+        if original_score < threshold:
+            return [
+                CounterfactualScenario(
+                    scenario_id="below_threshold",
+                    original_prediction=original_score,
+                    counterfactual_prediction=original_score,
+                    changed_features={},
+                    explanation=(
+                        f"The score of {original_score:.2%} is already below the "
+                        f"{threshold:.0%} alert threshold; no evidence change is needed"
+                    ),
+                    plausibility=1.0,
+                )
+            ]
+
+        scenarios = []
+        for i, change_set in enumerate(
+            self.search.search(posterior, complete_evidence, threshold, immutable_nodes=unobserved)
+        ):
+            changed_features = {
+                node: change_set.state_labels.get(node) or state
+                for node, state in change_set.changes.items()
+            }
+            change_text = ", ".join(f"{node} was {label}" for node, label in changed_features.items())
+            scenarios.append(
+                CounterfactualScenario(
+                    scenario_id=f"scenario_{i+1}",
+                    original_prediction=change_set.original_score,
+                    counterfactual_prediction=change_set.counterfactual_score,
+                    changed_features=changed_features,
+                    explanation=(
+                        f"If {change_text}, the score would be "
+                        f"{change_set.counterfactual_score:.2%} (below {threshold:.0%})"
+                    ),
+                    plausibility=change_set.plausibility,
+                )
+            )
+
+        return scenarios
+
 
 class DecisionPathVisualizer:
-    """Decision path visualizer."""
+    """
+    Decision path visualizer.
+
+    Paths are cached per (model type and version, evidence) and their graph
+    layouts are rendered by the cache's background worker.
+    """
 
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        self.cache = DecisionPathCache(config)
 
     def generate_decision_path(
-        self, model_result: Dict[str, Any], evidence: Dict[str, Any], model_type: str
+        self,
+        model_result: Dict[str, Any],
+        evidence: Dict[str, Any],
+        model_type: str,
+        model_version: Optional[str] = None,
     ) -> List[DecisionPathNode]:
-        """Generate decision path."""
+        """Generate decision path (cached per model version and evidence)."""
+
+        entry = self.cache.get_or_build(
+            self._cache_version(model_result, model_type, model_version),
+            evidence,
+            lambda: self._build_decision_path(evidence),
+            graph_builder=self._path_graph,
+        )
+        return list(entry.path)
+
+    def get_rendered_path(
+        self,
+        evidence: Dict[str, Any],
+        model_type: str,
+        model_version: Optional[str] = None,
+        model_result: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Look up the rendered layout of a previously explained decision path.
+
+        Returns:
+            Render status and, once rendered, the serialized JSON layout
+        """
+        entry = self.cache.lookup(
+            self._cache_version(model_result or {}, model_type, model_version), evidence
+        )
+        if entry is None:
+            return {"status": "not_found", "layout": None}
+        return {"status": entry.status, "layout": entry.layout}
 
+    def _cache_version(
+        self, model_result: Dict[str, Any], model_type: str, model_version: Optional[str]
+    ) -> str:
+        version = model_version or model_result.get("model_metadata", {}).get("model_version", "unversioned")
+        return f"{model_type}:{version}"
+
+    def _build_decision_path(self, evidence: Dict[str, Any]) -> List[DecisionPathNode]:
         decision_path = []
 
         # Generate decision path nodes based on evidence
@@ -500,17 +840,43 @@ class DecisionPathVisualizer:
 
         return decision_path
 
+    def _path_graph(self, decision_path: List[DecisionPathNode]) -> Dict[str, Any]:
+        """Evidence nodes feeding a single risk outcome node."""
+        nodes = [{**asdict(node), "id": node.node_name, "label": node.node_name} for node in decision_path]
+        nodes.append({"id": "risk_outcome", "label": "Risk outcome", "node_type": "outcome"})
+        edges = [
+            {"source": node.node_name, "target": "risk_outcome", "weight": node.contribution}
+            for node in decision_path
+        ]
+        return {"nodes": nodes, "edges": edges}
+
 
 class UncertaintyQuantifier:
-    """Uncertainty quantifier."""
+    """Uncertainty quantifier (sampler settings under ``config["uncertainty"]``)."""
 
     def __init__(self, config: Dict[str, Any]):
-        self.config = config
+        self.config = config.get("uncertainty", {})
+        self.sampler = ParameterUncertaintySampler(self.config)
 
     def analyze_uncertainty(
-        self, model_result: Dict[str, Any], evidence: Dict[str, Any], model_type: str
+        self,
+        model_result: Dict[str, Any],
+        evidence: Dict[str, Any],
+        model_type: str,
+        sensitivity_engine=None,
     ) -> UncertaintyAnalysis:
-        """Analyze prediction uncertainty."""
+        """
+        Analyze prediction uncertainty.
+
+        With a sensitivity engine, the interval is a Monte Carlo credible
+        interval of the outcome posterior under CPD parameter uncertainty;
+        otherwise it is derived from evidence coverage.
+        """
+        if sensitivity_engine is not None:
+            try:
+                return self._monte_carlo_uncertainty(model_result, evidence, sensitivity_engine)
+            except Exception as e:
+                logger.warning(f"Monte Carlo uncertainty failed, using evidence coverage: {str(e)}")
 
         # Simple uncertainty analysis
         overall_score = model_result.get("risk_scores", {}).get("overall_score", 0.0)
@@ -540,3 +906,29 @@ class UncertaintyQuantifier:
             aleatoric_uncertainty=aleatoric_uncertainty,
             reliability_score=reliability_score,
         )
+
+    def _monte_carlo_uncertainty(
+        self, model_result: Dict[str, Any], evidence: Dict[str, Any], sensitivity_engine
+    ) -> UncertaintyAnalysis:
+        """Credible interval on the overall score from sampled CPD parameters."""
+        # Score with the evidence the model actually conditioned on (after fallbacks)
+        inference_evidence = model_result.get("model_metadata", {}).get("inference_evidence") or evidence
+        network_evidence = {
+            node: state
+            for node, state in inference_evidence.items()
+            if node in sensitivity_engine.axis
+            and node != sensitivity_engine.target
+            and isinstance(state, (int, str))
+        }
+        interval = self.sampler.credible_interval(sensitivity_engine, network_evidence)
+
+        return UncertaintyAnalysis(
+            prediction_uncertainty=interval.width,
+            confidence_interval=(interval.lower, interval.upper),
+            epistemic_uncertainty=interval.epistemic_variance,
+            aleatoric_uncertainty=interval.aleatoric_variance,
+            reliability_score=max(0.0, 1.0 - interval.width),
+            method="parameter_monte_carlo",
+            credible_level=interval.credible_level,
+            n_samples=interval.n_samples,
+        )
@@ -0,0 +1,157 @@
+"""
+Explanation Cache
+
+Explanation components depend only on the model version and the evidence
+signature, so they are cached per signature in bounded LRU caches, one
+per component, with hit/miss/eviction statistics. Signature frequencies
+are tracked over a sliding window (the last day by default) so the most
+frequent signatures can be precomputed before they are requested again.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from collections import Counter, OrderedDict
+from datetime import datetime
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+COMPONENTS = ("attribution", "counterfactuals", "uncertainty", "explanation")
+
+
+class ExplanationCache:
+    """
+    Per-component LRU caches keyed by evidence signature.
+
+    Config keys:
+        cache_size: Default entries per component (default 1024)
+        component_sizes: Component -> entries, overriding ``cache_size``
+            (0 disables caching of that component)
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        default_size = config.get("cache_size", 1024)
+        sizes = config.get("component_sizes", {})
+        self.sizes = {component: sizes.get(component, default_size) for component in COMPONENTS}
+
+        self._caches: Dict[str, "OrderedDict[Tuple, Any]"] = {component: OrderedDict() for component in COMPONENTS}
+        self._lock = threading.Lock()
+        self.metrics = {component: {"hits": 0, "misses": 0, "evictions": 0} for component in COMPONENTS}
+
+    def get(self, component: str, signature: Tuple) -> Optional[Any]:
+        with self._lock:
+            cache = self._caches[component]
+            if signature in cache:
+                cache.move_to_end(signature)
+                self.metrics[component]["hits"] += 1
+                return cache[signature]
+            self.metrics[component]["misses"] += 1
+            return None
+
+    def put(self, component: str, signature: Tuple, value: Any) -> None:
+        if self.sizes[component] <= 0:
+            return
+        with self._lock:
+            cache = self._caches[component]
+            cache[signature] = value
+            cache.move_to_end(signature)
+            while len(cache) > self.sizes[component]:
+                cache.popitem(last=False)
+                self.metrics[component]["evictions"] += 1
+
+    def get_or_compute(self, component: str, signature: Tuple, compute: Callable[[], Any]) -> Any:
+        value = self.get(component, signature)
+        if value is None:
+            value = compute()
+            self.put(component, signature, value)
+        return value
+
+    def contains(self, component: str, signature: Tuple) -> bool:
+        with self._lock:
+            return signature in self._caches[component]
+
+    def clear(self, component: Optional[str] = None) -> None:
+        with self._lock:
+            for name in [component] if component else COMPONENTS:
+                self._caches[name].clear()
+
+    def statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Hits, misses, evictions, hit rate, size and capacity per component"""
+        with self._lock:
+            statistics = {}
+            for component in COMPONENTS:
+                metrics = dict(self.metrics[component])
+                lookups = metrics["hits"] + metrics["misses"]
+                metrics["hit_rate"] = metrics["hits"] / lookups if lookups else 0.0
+                metrics["size"] = len(self._caches[component])
+                metrics["capacity"] = self.sizes[component]
+                statistics[component] = metrics
+            return statistics
+
+
+class SignatureFrequencyTracker:
+    """
+    Request counts per evidence signature over a sliding window.
+
+    The latest inputs of each tracked signature are kept so it can be
+    recomputed when precomputing.
+
+    Args:
+        window_seconds: Length of the window (default one day)
+        bucket_seconds: Granularity of the window
+        max_signatures: Signatures whose inputs are kept (least recently seen dropped first)
+    """
+
+    def __init__(self, window_seconds: int = 86400, bucket_seconds: int = 3600, max_signatures: int = 10000):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.max_signatures = max_signatures
+
+        self._buckets: "OrderedDict[int, Counter]" = OrderedDict()
+        self._inputs: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, signature: Tuple, inputs: Dict[str, Any], timestamp: Optional[datetime] = None) -> None:
+        bucket = self._bucket(timestamp)
+        with self._lock:
+            if bucket not in self._buckets:
+                self._buckets[bucket] = Counter()
+                self._expire(bucket)
+            self._buckets[bucket][signature] += 1
+
+            self._inputs[signature] = inputs
+            self._inputs.move_to_end(signature)
+            while len(self._inputs) > self.max_signatures:
+                self._inputs.popitem(last=False)
+
+    def most_frequent(
+        self, top_n: int, timestamp: Optional[datetime] = None
+    ) -> List[Tuple[Tuple, int, Dict[str, Any]]]:
+        """(signature, count, inputs) of the most requested signatures in the window"""
+        bucket = self._bucket(timestamp)
+        oldest = bucket - self.window_seconds // self.bucket_seconds
+        with self._lock:
+            totals = Counter()
+            for start, counts in self._buckets.items():
+                if oldest < start <= bucket:
+                    totals.update(counts)
+            return [
+                (signature, count, self._inputs[signature])
+                for signature, count in totals.most_common()
+                if signature in self._inputs
+            ][:top_n]
+
+    @property
+    def tracked_signatures(self) -> int:
+        with self._lock:
+            return len(self._inputs)
+
+    def _bucket(self, timestamp: Optional[datetime]) -> int:
+        timestamp = timestamp or datetime.utcnow()
+        return int(timestamp.timestamp() // self.bucket_seconds)
+
+    def _expire(self, bucket: int) -> None:
+        oldest = bucket - self.window_seconds // self.bucket_seconds
+        for start in [start for start in self._buckets if start <= oldest]:
+            del self._buckets[start]
@@ -2,21 +2,11 @@
 Feature Attribution Module
 
 This module provides feature attribution capabilities for model explainability.
+Attributions are exact Shapley values of the evidence nodes when the model's
+batched posterior is available (see shapley_attribution.py).
 """
 
-from typing import Dict, Any, List
-from .explainability_engine import FeatureAttribution
+from .explainability_engine import FeatureAttribution, FeatureAttributor
+from .shapley_attribution import ShapleyAttributor, ShapleyResult
 
-
-class FeatureAttributor:
-    """Feature attribution calculator - placeholder for now."""
-
-    def __init__(self, config: Dict[str, Any]):
-        self.config = config
-
-    def calculate_attributions(
-        self, model_result: Dict[str, Any], evidence: Dict[str, Any], model_type: str
-    ) -> List[FeatureAttribution]:
-        """Calculate feature attributions."""
-        # Implementation moved to explainability_engine.py
-        return []
+__all__ = ["FeatureAttribution", "FeatureAttributor", "ShapleyAttributor", "ShapleyResult"]
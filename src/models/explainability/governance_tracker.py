@@ -9,6 +9,12 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import logging
 from dataclasses import dataclass, asdict
+import threading
+
+import numpy as np
+
+from .drift_histograms import StreamingHistogram, WindowedHistogram, drift_metrics
+from .metric_store import MetricTimeSeriesStore, from_epoch, STATUS_NAMES
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +115,8 @@ class ModelGovernanceTracker:
                 self._handle_performance_evaluation(model_id, metadata)
             elif event == "drift_detection":
                 self._handle_drift_detection(model_id, metadata)
+            elif event == "risk_calculation":
+                self._handle_risk_calculation(model_id, metadata)
             elif event == "approval_request":
                 self._handle_approval_request(model_id, metadata)
 
@@ -147,6 +155,30 @@ class ModelGovernanceTracker:
         """
         return self.drift_detector.detect_drift(model_id, current_data, reference_data)
 
+    def get_governance_history(
+        self, model_id: str, days: int = 365, resolution: str = "day"
+    ) -> Dict[str, Any]:
+        """
+        Performance history of a model from the rollups.
+
+        Args:
+            model_id: Model identifier
+            days: History length
+            resolution: 'hour', 'day' or 'raw'
+
+        Returns:
+            Downsampled metric series and drift status over the same period
+        """
+        return {
+            "model_id": model_id,
+            "resolution": resolution,
+            "days": days,
+            "performance": self.performance_monitor.get_performance_history(
+                model_id, days=days, resolution=resolution
+            ),
+            "drift_status": self.drift_detector.get_drift_status(model_id, days=days),
+        }
+
     def submit_for_approval(
         self, model_id: str, approval_type: str, criteria: Dict[str, Any]
     ) -> str:
@@ -174,8 +206,8 @@ class ModelGovernanceTracker:
             Governance status report
         """
         try:
-            # Get recent performance metrics
-            recent_performance = self.performance_monitor.get_recent_performance(model_id)
+            # Get recent performance status from the rollups
+            recent_performance = self.performance_monitor.get_performance_status(model_id)
 
             # Get drift status
             drift_status = self.drift_detector.get_drift_status(model_id)
@@ -233,6 +265,18 @@ class ModelGovernanceTracker:
             if high_severity_drifts:
                 logger.warning(f"High severity drift detected for model {model_id}")
 
+    def _handle_risk_calculation(self, model_id: str, metadata: Dict[str, Any]):
+        """Handle risk calculation event: feed the live drift histograms."""
+        evidence = metadata.get("evidence")
+        risk_score = metadata.get("risk_score")
+        if evidence is None and risk_score is None:
+            return
+
+        drift_results = self.drift_detector.observe(model_id, evidence or {}, risk_score)
+        high_severity_drifts = [d for d in drift_results if d.severity == "high"]
+        if high_severity_drifts:
+            logger.warning(f"High severity drift detected on live traffic for model {model_id}")
+
     def _handle_approval_request(self, model_id: str, metadata: Dict[str, Any]):
         """Handle approval request event."""
         approval_type = metadata.get("approval_type", "standard")
@@ -291,19 +335,32 @@ class ModelGovernanceTracker:
 
 
 class ModelPerformanceMonitor:
-    """Model performance monitor."""
+    """
+    Model performance monitor.
+
+    Metrics are written to a time-series store with hourly and daily
+    rollups (persisted under ``config["state_dir"]`` when set), so recent
+    status and long dashboards are read from aggregates.
+    """
 
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.performance_history = []
+        self.store = MetricTimeSeriesStore(
+            state_dir=config.get("state_dir"),
+            raw_retention_days=config.get("raw_retention_days", 90),
+            autosave_every=config.get("autosave_every", 1000),
+        )
         self.thresholds = self._load_performance_thresholds()
 
     def evaluate_performance(
-        self, model_id: str, performance_data: Dict[str, float]
+        self,
+        model_id: str,
+        performance_data: Dict[str, float],
+        timestamp: Optional[datetime] = None,
     ) -> Dict[str, Any]:
         """Evaluate model performance."""
 
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = timestamp or datetime.utcnow()
         performance_metrics = []
 
         for metric_name, value in performance_data.items():
@@ -321,7 +378,7 @@ class ModelPerformanceMonitor:
             metric = PerformanceMetric(
                 metric_name=metric_name,
                 value=value,
-                timestamp=timestamp,
+                timestamp=timestamp.isoformat(),
                 model_id=model_id,
                 baseline_value=baseline,
                 threshold=threshold,
@@ -329,7 +386,7 @@ class ModelPerformanceMonitor:
             )
 
             performance_metrics.append(metric)
-            self.performance_history.append(metric)
+            self.store.record(model_id, metric_name, value, timestamp, status, baseline, threshold)
 
         # Calculate overall performance score
         overall_score = (
@@ -340,35 +397,116 @@ class ModelPerformanceMonitor:
 
         return {
             "model_id": model_id,
-            "timestamp": timestamp,
+            "timestamp": timestamp.isoformat(),
             "overall_score": overall_score,
             "metrics": [asdict(m) for m in performance_metrics],
             "status": self._determine_overall_status(performance_metrics),
         }
 
-    def get_recent_performance(self, model_id: str, days: int = 7) -> Dict[str, Any]:
-        """Get recent performance for a model."""
+    def get_performance_status(self, model_id: str, days: int = 7) -> Dict[str, Any]:
+        """
+        Recent performance status from the metric rollups.
 
-        cutoff_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        Args:
+            model_id: Model identifier
+            days: Window length
 
-        recent_metrics = [
-            m
-            for m in self.performance_history
-            if m.model_id == model_id and m.timestamp >= cutoff_date
-        ]
+        Returns:
+            Overall score, worst status and per-metric summaries over the window
+        """
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+
+        summaries = {
+            metric_name: self.store.aggregate(model_id, metric_name, cutoff_date)
+            for metric_name in self.store.metrics(model_id)
+        }
+        summaries = {name: summary for name, summary in summaries.items() if summary["count"]}
 
-        if not recent_metrics:
-            return {"model_id": model_id, "overall_score": 0.5, "metrics": [], "status": "unknown"}
+        if not summaries:
+            return {"model_id": model_id, "overall_score": 0.5, "metric_summaries": {}, "status": "unknown"}
 
-        overall_score = sum(m.value for m in recent_metrics) / len(recent_metrics)
+        count = sum(summary["count"] for summary in summaries.values())
+        overall_score = sum(summary["sum"] for summary in summaries.values()) / count
+
+        if any(summary["critical"] for summary in summaries.values()):
+            status = "critical"
+        elif any(summary["warning"] for summary in summaries.values()):
+            status = "warning"
+        else:
+            status = "normal"
 
         return {
             "model_id": model_id,
             "overall_score": overall_score,
-            "metrics": [asdict(m) for m in recent_metrics],
-            "status": self._determine_overall_status(recent_metrics),
+            "metric_summaries": summaries,
+            "status": status,
+        }
+
+    def get_recent_performance(self, model_id: str, days: int = 7) -> Dict[str, Any]:
+        """Get recent performance for a model, with every raw metric point in the window."""
+
+        status = self.get_performance_status(model_id, days)
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        return {
+            **status,
+            "metrics": self._recent_metrics(model_id, list(status["metric_summaries"]), cutoff_date),
         }
 
+    def get_performance_history(
+        self,
+        model_id: str,
+        metric_name: Optional[str] = None,
+        days: int = 365,
+        resolution: str = "day",
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Downsampled performance history for dashboards.
+
+        Args:
+            model_id: Model identifier
+            metric_name: Single metric, or every metric of the model when None
+            days: History length
+            resolution: 'hour', 'day' or 'raw'
+
+        Returns:
+            Metric name -> rows with bucket start, count, mean, min, max and status counts
+        """
+        start = datetime.utcnow() - timedelta(days=days)
+        metric_names = [metric_name] if metric_name else self.store.metrics(model_id)
+        return {
+            name: self.store.history(model_id, name, start, resolution=resolution) for name in metric_names
+        }
+
+    def _recent_metrics(
+        self, model_id: str, metric_names: List[str], cutoff_date: datetime
+    ) -> List[Dict[str, Any]]:
+        """Raw metric points since ``cutoff_date``, oldest first."""
+
+        metrics = []
+        for metric_name in metric_names:
+            points = self.store.raw_points(model_id, metric_name, cutoff_date)
+            baselines = np.where(np.isnan(points["baseline"]), None, points["baseline"]).tolist()
+            thresholds = np.where(np.isnan(points["threshold"]), None, points["threshold"]).tolist()
+            metrics.extend(
+                {
+                    "metric_name": metric_name,
+                    "value": value,
+                    "timestamp": from_epoch(time).isoformat(),
+                    "model_id": model_id,
+                    "baseline_value": baseline,
+                    "threshold": threshold,
+                    "status": STATUS_NAMES[status],
+                }
+                for time, value, status, baseline, threshold in zip(
+                    points["time"].tolist(),
+                    points["value"].tolist(),
+                    points["status"].tolist(),
+                    baselines,
+                    thresholds,
+                )
+            )
+        return sorted(metrics, key=lambda m: m["timestamp"])
+
     def _load_performance_thresholds(self) -> Dict[str, float]:
         """Load performance thresholds."""
         return {
@@ -381,25 +519,8 @@ class ModelPerformanceMonitor:
         }
 
     def _get_baseline_value(self, model_id: str, metric_name: str) -> Optional[float]:
-        """Get baseline value for a metric."""
-
-        # Get historical values for this metric
-        historical_values = [
-            m.value
-            for m in self.performance_history
-            if m.model_id == model_id and m.metric_name == metric_name
-        ]
-
-        if not historical_values:
-            return None
-
-        # Return median as baseline
-        sorted_values = sorted(historical_values)
-        n = len(sorted_values)
-        if n % 2 == 0:
-            return (sorted_values[n // 2 - 1] + sorted_values[n // 2]) / 2
-        else:
-            return sorted_values[n // 2]
+        """Get baseline value for a metric (median of the retained history)."""
+        return self.store.median(model_id, metric_name)
 
     def _determine_overall_status(self, metrics: List[PerformanceMetric]) -> str:
         """Determine overall status from metrics."""
@@ -418,55 +539,139 @@ class ModelPerformanceMonitor:
 
 
 class ModelDriftDetector:
-    """Model drift detector."""
+    """
+    Model drift detector.
+
+    Live analyses are recorded with ``observe`` into fixed-bin histograms
+    per evidence node and for the model score, kept in time buckets. Drift
+    is the PSI, KS or Jensen-Shannon distance between the current window
+    and the reference window before it, computed from bin counts only.
+    """
 
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.drift_history = []
         self.drift_thresholds = self._load_drift_thresholds()
 
+        self.drift_metric = config.get("metric", "psi")
+        self.score_bins = config.get("score_bins", 20)
+        self.max_states = config.get("max_states", 10)
+        self.bucket_seconds = config.get("bucket_seconds", 3600)
+        self.current_buckets = config.get("current_buckets", 24)
+        self.reference_buckets = config.get("reference_buckets", 24 * 7)
+        self.min_samples = config.get("min_samples", 100)
+        self.check_interval = config.get("check_interval", 500)
+
+        # model_id -> {"score": WindowedHistogram, "features": {node: WindowedHistogram}}
+        self.streams: Dict[str, Dict[str, Any]] = {}
+        self._observations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        model_id: str,
+        evidence: Dict[str, Any],
+        score: Optional[float] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> List[DriftDetectionResult]:
+        """
+        Record one live analysis in the streaming histograms.
+
+        Args:
+            model_id: Model identifier
+            evidence: Evidence node -> state index (other values are ignored)
+            score: Model risk score in [0, 1]
+            timestamp: Analysis time (defaults to now)
+
+        Returns:
+            Drift results when this observation triggered a periodic check
+        """
+        stream = self._stream(model_id)
+        if score is not None:
+            stream["score"].update(float(score), timestamp)
+
+        for node, state in evidence.items():
+            if isinstance(state, bool) or not isinstance(state, (int, float)):
+                continue
+            histogram = stream["features"].get(node)
+            if histogram is None:
+                with self._lock:
+                    histogram = stream["features"].setdefault(
+                        node, self._windowed(StreamingHistogram.for_states(self.max_states).edges)
+                    )
+            histogram.update(state, timestamp)
+
+        with self._lock:
+            self._observations[model_id] = self._observations.get(model_id, 0) + 1
+            due = self.check_interval and self._observations[model_id] % self.check_interval == 0
+
+        return self.detect_streaming_drift(model_id, timestamp) if due else []
+
+    def get_streaming_metrics(
+        self, model_id: str, timestamp: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        PSI, KS and Jensen-Shannon drift of the current window against the reference window.
+
+        Args:
+            model_id: Model identifier
+            timestamp: End of the current window (defaults to now)
+
+        Returns:
+            Metrics per evidence node, with the model score under ``"score"``
+        """
+        stream = self.streams.get(model_id)
+        if stream is None:
+            return {}
+
+        histograms = dict(stream["features"])
+        histograms["score"] = stream["score"]
+
+        metrics = {}
+        for name, histogram in histograms.items():
+            end = histogram.bucket_index(timestamp)
+            current = histogram.window(end, self.current_buckets)
+            reference = histogram.window(end - self.current_buckets, self.reference_buckets)
+            metrics[name] = drift_metrics(reference, current)
+        return metrics
+
+    def detect_streaming_drift(
+        self, model_id: str, timestamp: Optional[datetime] = None
+    ) -> List[DriftDetectionResult]:
+        """Detect feature and prediction drift on the recorded live traffic."""
+
+        metrics = self.get_streaming_metrics(model_id, timestamp)
+        score_metrics = metrics.pop("score", None)
+
+        feature_scores = {
+            node: self._drift_score(values) for node, values in metrics.items() if self._has_samples(values)
+        }
+        affected = sorted(
+            node for node, score in feature_scores.items() if score > self.drift_thresholds["feature_drift"]
+        )
+        feature_drift = {
+            "drift_score": max((feature_scores[node] for node in affected), default=0.0),
+            "affected_features": affected,
+        }
+
+        prediction_drift = {"drift_score": 0.0}
+        if score_metrics and self._has_samples(score_metrics):
+            prediction_drift["drift_score"] = self._drift_score(score_metrics)
+
+        return self._record_drift(model_id, feature_drift, prediction_drift)
+
     def detect_drift(
         self, model_id: str, current_data: Dict[str, Any], reference_data: Dict[str, Any]
     ) -> List[DriftDetectionResult]:
         """Detect various types of drift."""
 
-        drift_results = []
-        timestamp = datetime.utcnow().isoformat()
-
         # Feature drift detection
         feature_drift = self._detect_feature_drift(current_data, reference_data)
-        if feature_drift["drift_score"] > self.drift_thresholds["feature_drift"]:
-            drift_results.append(
-                DriftDetectionResult(
-                    drift_type="feature_drift",
-                    drift_score=feature_drift["drift_score"],
-                    timestamp=timestamp,
-                    model_id=model_id,
-                    affected_features=feature_drift["affected_features"],
-                    severity=self._determine_severity(feature_drift["drift_score"]),
-                    recommendation="Investigate feature distribution changes",
-                )
-            )
 
         # Prediction drift detection
         pred_drift = self._detect_prediction_drift(current_data, reference_data)
-        if pred_drift["drift_score"] > self.drift_thresholds["prediction_drift"]:
-            drift_results.append(
-                DriftDetectionResult(
-                    drift_type="prediction_drift",
-                    drift_score=pred_drift["drift_score"],
-                    timestamp=timestamp,
-                    model_id=model_id,
-                    affected_features=[],
-                    severity=self._determine_severity(pred_drift["drift_score"]),
-                    recommendation="Review model predictions and consider retraining",
-                )
-            )
-
-        # Store drift results
-        self.drift_history.extend(drift_results)
 
-        return drift_results
+        return self._record_drift(model_id, feature_drift, pred_drift)
 
     def get_drift_status(self, model_id: str, days: int = 7) -> Dict[str, Any]:
         """Get drift status for a model."""
@@ -502,22 +707,72 @@ class ModelDriftDetector:
         """Load drift detection thresholds."""
         return {"feature_drift": 0.3, "prediction_drift": 0.4, "concept_drift": 0.5}
 
+    def _record_drift(
+        self, model_id: str, feature_drift: Dict[str, Any], pred_drift: Dict[str, Any]
+    ) -> List[DriftDetectionResult]:
+        """Turn drift scores over the thresholds into stored drift results."""
+
+        drift_results = []
+        timestamp = datetime.utcnow().isoformat()
+
+        if feature_drift["drift_score"] > self.drift_thresholds["feature_drift"]:
+            drift_results.append(
+                DriftDetectionResult(
+                    drift_type="feature_drift",
+                    drift_score=feature_drift["drift_score"],
+                    timestamp=timestamp,
+                    model_id=model_id,
+                    affected_features=feature_drift["affected_features"],
+                    severity=self._determine_severity(feature_drift["drift_score"]),
+                    recommendation="Investigate feature distribution changes",
+                )
+            )
+
+        if pred_drift["drift_score"] > self.drift_thresholds["prediction_drift"]:
+            drift_results.append(
+                DriftDetectionResult(
+                    drift_type="prediction_drift",
+                    drift_score=pred_drift["drift_score"],
+                    timestamp=timestamp,
+                    model_id=model_id,
+                    affected_features=[],
+                    severity=self._determine_severity(pred_drift["drift_score"]),
+                    recommendation="Review model predictions and consider retraining",
+                )
+            )
+
+        # Store drift results
+        self.drift_history.extend(drift_results)
+
+        return drift_results
+
     def _detect_feature_drift(
         self, current_data: Dict[str, Any], reference_data: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Detect feature drift using statistical methods."""
+        """
+        Detect feature drift.
+
+        Features given as lists of samples (or state indices) are compared
+        as histograms; single values fall back to the relative difference.
+        """
 
-        # Simple implementation - would use proper statistical tests in practice
         drift_score = 0.0
         affected_features = []
 
-        common_features = set(current_data.keys()) & set(reference_data.keys())
+        common_features = (set(current_data.keys()) & set(reference_data.keys())) - {"predictions"}
 
         for feature in common_features:
             current_val = current_data.get(feature, 0)
             reference_val = reference_data.get(feature, 0)
 
-            if isinstance(current_val, (int, float)) and isinstance(reference_val, (int, float)):
+            if isinstance(current_val, (list, tuple)) and isinstance(reference_val, (list, tuple)):
+                if not current_val or not reference_val:
+                    continue
+                feature_score = self._sample_drift_score(current_val, reference_val)
+                if feature_score > self.drift_thresholds["feature_drift"]:
+                    drift_score = max(drift_score, feature_score)
+                    affected_features.append(feature)
+            elif isinstance(current_val, (int, float)) and isinstance(reference_val, (int, float)):
                 # Calculate relative difference
                 if reference_val != 0:
                     relative_diff = abs(current_val - reference_val) / abs(reference_val)
@@ -530,25 +785,64 @@ class ModelDriftDetector:
     def _detect_prediction_drift(
         self, current_data: Dict[str, Any], reference_data: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Detect prediction drift."""
+        """Detect prediction drift between score samples."""
 
-        # Simple implementation - would use proper statistical tests in practice
         current_predictions = current_data.get("predictions", [])
         reference_predictions = reference_data.get("predictions", [])
 
+        if not isinstance(current_predictions, (list, tuple)) or not isinstance(
+            reference_predictions, (list, tuple)
+        ):
+            return {"drift_score": 0.0}
         if not current_predictions or not reference_predictions:
             return {"drift_score": 0.0}
 
-        # Calculate simple drift score based on prediction distributions
-        if isinstance(current_predictions, list) and isinstance(reference_predictions, list):
-            current_avg = sum(current_predictions) / len(current_predictions)
-            reference_avg = sum(reference_predictions) / len(reference_predictions)
-
-            drift_score = abs(current_avg - reference_avg) if reference_avg != 0 else 0.0
+        histogram = StreamingHistogram.for_scores(self.score_bins)
+        current = StreamingHistogram(histogram.edges, histogram.bin_counts(current_predictions))
+        reference = StreamingHistogram(histogram.edges, histogram.bin_counts(reference_predictions))
+        return {"drift_score": self._drift_score(drift_metrics(reference, current))}
+
+    def _sample_drift_score(self, current: List[Any], reference: List[Any]) -> float:
+        """Drift score of two feature samples over shared bins."""
+        current = [float(v) for v in current if isinstance(v, (int, float))]
+        reference = [float(v) for v in reference if isinstance(v, (int, float))]
+        if not current or not reference:
+            return 0.0
+
+        values = current + reference
+        low, high = min(values), max(values)
+        if low >= 0 and all(v.is_integer() for v in values):
+            # State indices: one bin per state
+            histogram = StreamingHistogram.for_states(int(high) + 1)
+        elif high > low:
+            histogram = StreamingHistogram(np.linspace(low, high, self.score_bins + 1))
         else:
-            drift_score = 0.0
-
-        return {"drift_score": min(drift_score, 1.0)}
+            return 0.0
+
+        current_hist = StreamingHistogram(histogram.edges, histogram.bin_counts(current))
+        reference_hist = StreamingHistogram(histogram.edges, histogram.bin_counts(reference))
+        return self._drift_score(drift_metrics(reference_hist, current_hist))
+
+    def _drift_score(self, metrics: Dict[str, Any]) -> float:
+        """Configured drift metric, capped at 1.0 like the severity scale."""
+        return min(metrics[self.drift_metric], 1.0)
+
+    def _has_samples(self, metrics: Dict[str, Any]) -> bool:
+        return min(metrics["reference_count"], metrics["current_count"]) >= self.min_samples
+
+    def _stream(self, model_id: str) -> Dict[str, Any]:
+        with self._lock:
+            if model_id not in self.streams:
+                self.streams[model_id] = {
+                    "score": self._windowed(StreamingHistogram.for_scores(self.score_bins).edges),
+                    "features": {},
+                }
+            return self.streams[model_id]
+
+    def _windowed(self, edges) -> WindowedHistogram:
+        return WindowedHistogram(
+            edges, self.bucket_seconds, retention_buckets=self.current_buckets + self.reference_buckets
+        )
 
     def _determine_severity(self, drift_score: float) -> str:
         """Determine drift severity."""
@@ -0,0 +1,469 @@
+"""
+Metric Time-Series Store
+
+Columnar time series of model performance metrics, one series per model
+and metric. Hourly and daily rollups (count, sum, min, max and status
+counts) are maintained as points are written, so a window aggregate over
+a year of history reads a few hundred rollup rows plus the raw points at
+the window edges instead of filtering the full history. Series are
+persisted to local disk as compressed numpy archives and reloaded on
+restart.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from collections import Counter
+from datetime import datetime, timezone
+import hashlib
+import heapq
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = {"hour": 3600, "day": 86400}
+STATUS_CODES = {"normal": 0, "warning": 1, "critical": 2}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+RAW_COLUMNS = {"time": np.float64, "value": np.float64, "status": np.int8,
+               "baseline": np.float64, "threshold": np.float64}
+ROLLUP_COLUMNS = {"bucket": np.int64, "count": np.int64, "sum": np.float64, "min": np.float64,
+                  "max": np.float64, "warning": np.int64, "critical": np.int64}
+
+
+def to_epoch(timestamp: Optional[datetime] = None) -> float:
+    """Seconds since the epoch of a naive UTC (or aware) datetime"""
+    timestamp = timestamp or datetime.utcnow()
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def from_epoch(seconds: float) -> datetime:
+    """Naive UTC datetime, as used for governance timestamps"""
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+
+
+class ColumnTable:
+    """Named numpy columns of equal length with amortized appends."""
+
+    def __init__(self, columns: Dict[str, Any], data: Optional[Dict[str, np.ndarray]] = None):
+        self.dtypes = columns
+        data = data or {}
+        self.size = len(next(iter(data.values()))) if data else 0
+        capacity = max(16, self.size)
+        self._columns = {}
+        for name, dtype in columns.items():
+            column = np.zeros(capacity, dtype=dtype)
+            if data:
+                column[: self.size] = data[name]
+            self._columns[name] = column
+
+    def __len__(self) -> int:
+        return self.size
+
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name][: self.size]
+
+    def insert(self, index: int, row: Dict[str, Any]) -> None:
+        """Insert a row at ``index`` (appending when ``index == len``)"""
+        if self.size == len(next(iter(self._columns.values()))):
+            for name, column in list(self._columns.items()):
+                grown = np.zeros(len(column) * 2, dtype=column.dtype)
+                grown[: self.size] = column[: self.size]
+                self._columns[name] = grown
+        for name, column in self._columns.items():
+            if index < self.size:
+                column[index + 1: self.size + 1] = column[index: self.size]
+            column[index] = row[name]
+        self.size += 1
+
+    def drop_before(self, index: int) -> None:
+        """Discard the first ``index`` rows"""
+        if index <= 0:
+            return
+        for name, column in self._columns.items():
+            column[: self.size - index] = column[index: self.size]
+        self.size -= index
+
+    def to_dict(self, prefix: str = "") -> Dict[str, np.ndarray]:
+        return {f"{prefix}{name}": self.column(name) for name in self.dtypes}
+
+
+class SlidingMedian:
+    """
+    Exact median of a multiset of values under inserts and removals.
+
+    Two heaps split the values at the median; removals are applied lazily
+    when a removed value reaches the top of its heap, so every update is
+    O(log n) instead of re-sorting the retained values.
+    """
+
+    def __init__(self, values: Iterable[float] = ()):
+        ordered = sorted(float(v) for v in values)
+        middle = (len(ordered) + 1) // 2
+        # Max-heap (negated) of the lower half and min-heap of the upper half
+        self._low = [-v for v in ordered[:middle]]
+        self._high = ordered[middle:]
+        heapq.heapify(self._low)
+        self._low_size = len(self._low)
+        self._high_size = len(self._high)
+        self._removed: Counter = Counter()
+
+    def __len__(self) -> int:
+        return self._low_size + self._high_size
+
+    @property
+    def stale(self) -> int:
+        """Removed values still held in the heaps"""
+        return len(self._low) + len(self._high) - len(self)
+
+    def add(self, value: float) -> None:
+        if not self._low or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+        self._balance()
+
+    def remove(self, value: float) -> None:
+        """Remove one occurrence of a value previously added"""
+        self._removed[value] += 1
+        if self._low and value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune(self._low, -1)
+        else:
+            self._high_size -= 1
+            if self._high and value == self._high[0]:
+                self._prune(self._high, 1)
+        self._balance()
+
+    def median(self) -> Optional[float]:
+        if not len(self):
+            return None
+        if self._low_size > self._high_size:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+    def _balance(self) -> None:
+        if self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, -1)
+        elif self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune(self._high, 1)
+
+    def _prune(self, heap: List[float], sign: int) -> None:
+        while heap and self._removed[sign * heap[0]]:
+            value = sign * heapq.heappop(heap)
+            self._removed[value] -= 1
+            if not self._removed[value]:
+                del self._removed[value]
+
+
+class MetricSeries:
+    """
+    Raw points and rollups of one model metric.
+
+    Raw points are kept for ``raw_retention`` seconds; rollups are kept for
+    the life of the series.
+    """
+
+    def __init__(self, model_id: str, metric_name: str, raw_retention: float,
+                 data: Optional[Dict[str, np.ndarray]] = None):
+        self.model_id = model_id
+        self.metric_name = metric_name
+        self.raw_retention = raw_retention
+        data = data or {}
+        self.raw = ColumnTable(RAW_COLUMNS, {name: data[f"raw_{name}"] for name in RAW_COLUMNS}
+                               if data else None)
+        self.rollups = {
+            resolution: ColumnTable(ROLLUP_COLUMNS, {name: data[f"{resolution}_{name}"] for name in ROLLUP_COLUMNS}
+                                    if data else None)
+            for resolution in RESOLUTIONS
+        }
+        self._median = SlidingMedian(self.raw.column("value"))
+
+    def append(self, time: float, value: float, status: str = "normal",
+               baseline: Optional[float] = None, threshold: Optional[float] = None) -> None:
+        """Write one point and fold it into every rollup"""
+        times = self.raw.column("time")
+        index = len(times) if not len(times) or time >= times[-1] else int(np.searchsorted(times, time, "right"))
+        code = STATUS_CODES.get(status, 0)
+        self.raw.insert(index, {
+            "time": time, "value": value, "status": code,
+            "baseline": np.nan if baseline is None else baseline,
+            "threshold": np.nan if threshold is None else threshold,
+        })
+        self._median.add(value)
+
+        for resolution, seconds in RESOLUTIONS.items():
+            table = self.rollups[resolution]
+            bucket = int(time // seconds)
+            buckets = table.column("bucket")
+            index = int(np.searchsorted(buckets, bucket))
+            if index < len(buckets) and buckets[index] == bucket:
+                table.column("count")[index] += 1
+                table.column("sum")[index] += value
+                table.column("min")[index] = min(table.column("min")[index], value)
+                table.column("max")[index] = max(table.column("max")[index], value)
+                if code:
+                    table.column(STATUS_NAMES[code])[index] += 1
+            else:
+                table.insert(index, {
+                    "bucket": bucket, "count": 1, "sum": value, "min": value, "max": value,
+                    "warning": int(code == 1), "critical": int(code == 2),
+                })
+
+        cutoff = self.raw.column("time")[-1] - self.raw_retention
+        if self.raw.column("time")[0] < cutoff:
+            index = int(np.searchsorted(self.raw.column("time"), cutoff))
+            for expired in self.raw.column("value")[:index].tolist():
+                self._median.remove(expired)
+            self.raw.drop_before(index)
+            if self._median.stale > len(self._median):
+                self._median = SlidingMedian(self.raw.column("value"))
+
+    def aggregate(self, start: float, end: float) -> Dict[str, float]:
+        """
+        Count, sum, min, max and status counts of points in [start, end)
+
+        Whole days come from the daily rollup, whole hours at the edges
+        from the hourly rollup and the rest from raw points.
+        """
+        totals = {"count": 0, "sum": 0.0, "min": np.inf, "max": -np.inf, "warning": 0, "critical": 0}
+        for low, high, resolution in self._plan(start, end, list(RESOLUTIONS)[::-1]):
+            if resolution is None:
+                self._add_raw(totals, low, high)
+            else:
+                self._add_rollup(totals, resolution, low, high)
+        return totals
+
+    def rollup_rows(self, resolution: str, start: float, end: float) -> Dict[str, np.ndarray]:
+        """Rollup rows of the buckets starting in [start, end)"""
+        seconds = RESOLUTIONS[resolution]
+        table = self.rollups[resolution]
+        buckets = table.column("bucket")
+        low = np.searchsorted(buckets, np.ceil(start / seconds))
+        high = np.searchsorted(buckets, np.ceil(end / seconds))
+        return {name: table.column(name)[low:high] for name in ROLLUP_COLUMNS}
+
+    def raw_rows(self, start: float, end: float) -> Dict[str, np.ndarray]:
+        times = self.raw.column("time")
+        low, high = np.searchsorted(times, start), np.searchsorted(times, end)
+        return {name: self.raw.column(name)[low:high] for name in RAW_COLUMNS}
+
+    def values(self) -> np.ndarray:
+        return self.raw.column("value")
+
+    def median(self) -> Optional[float]:
+        """Median of the retained raw values, maintained on write"""
+        return self._median.median()
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        data = {"model_id": np.array(self.model_id), "metric_name": np.array(self.metric_name)}
+        data.update(self.raw.to_dict("raw_"))
+        for resolution, table in self.rollups.items():
+            data.update(table.to_dict(f"{resolution}_"))
+        return data
+
+    def _plan(self, start: float, end: float, resolutions: List[str]) -> List[Tuple[float, float, Optional[str]]]:
+        """Split [start, end) into aligned rollup ranges and raw edges"""
+        if start >= end:
+            return []
+        if not resolutions:
+            return [(start, end, None)]
+        seconds = RESOLUTIONS[resolutions[0]]
+        aligned_start = np.ceil(start / seconds) * seconds
+        aligned_end = np.floor(end / seconds) * seconds
+        if aligned_start >= aligned_end:
+            return self._plan(start, end, resolutions[1:])
+        return (self._plan(start, aligned_start, resolutions[1:])
+                + [(aligned_start, aligned_end, resolutions[0])]
+                + self._plan(aligned_end, end, resolutions[1:]))
+
+    def _add_raw(self, totals: Dict[str, float], start: float, end: float) -> None:
+        rows = self.raw_rows(start, end)
+        if not len(rows["value"]):
+            return
+        totals["count"] += len(rows["value"])
+        totals["sum"] += float(rows["value"].sum())
+        totals["min"] = min(totals["min"], float(rows["value"].min()))
+        totals["max"] = max(totals["max"], float(rows["value"].max()))
+        totals["warning"] += int((rows["status"] == 1).sum())
+        totals["critical"] += int((rows["status"] == 2).sum())
+
+    def _add_rollup(self, totals: Dict[str, float], resolution: str, start: float, end: float) -> None:
+        rows = self.rollup_rows(resolution, start, end)
+        if not len(rows["count"]):
+            return
+        totals["count"] += int(rows["count"].sum())
+        totals["sum"] += float(rows["sum"].sum())
+        totals["min"] = min(totals["min"], float(rows["min"].min()))
+        totals["max"] = max(totals["max"], float(rows["max"].max()))
+        totals["warning"] += int(rows["warning"].sum())
+        totals["critical"] += int(rows["critical"].sum())
+
+
+class MetricTimeSeriesStore:
+    """
+    Per model and metric time series with rollups and local persistence.
+
+    Args:
+        state_dir: Directory for series snapshots (in memory only when None)
+        raw_retention_days: Days of raw points kept; older data remains in the rollups
+        autosave_every: Writes to a series between snapshots
+    """
+
+    def __init__(self, state_dir: Optional[str] = None, raw_retention_days: int = 90,
+                 autosave_every: int = 1000):
+        self.state_dir = state_dir
+        self.raw_retention = raw_retention_days * RESOLUTIONS["day"]
+        self.autosave_every = autosave_every
+
+        self._series: Dict[Tuple[str, str], MetricSeries] = {}
+        self._unsaved: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+            self._load_all()
+
+    def record(self, model_id: str, metric_name: str, value: float, timestamp: Optional[datetime] = None,
+               status: str = "normal", baseline: Optional[float] = None,
+               threshold: Optional[float] = None) -> None:
+        """Write one metric value"""
+        key = (model_id, metric_name)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = MetricSeries(model_id, metric_name, self.raw_retention)
+            series.append(to_epoch(timestamp), float(value), status, baseline, threshold)
+
+            self._unsaved[key] = self._unsaved.get(key, 0) + 1
+            if self.state_dir and self._unsaved[key] >= self.autosave_every:
+                self._save_series(series)
+
+    def metrics(self, model_id: str) -> List[str]:
+        """Metric names recorded for a model"""
+        with self._lock:
+            return sorted(metric for model, metric in self._series if model == model_id)
+
+    def aggregate(self, model_id: str, metric_name: str, start: datetime,
+                  end: Optional[datetime] = None) -> Dict[str, float]:
+        """Count, sum, mean, min, max and status counts over [start, end)"""
+        with self._lock:
+            series = self._series.get((model_id, metric_name))
+            if series is None:
+                return {"count": 0, "sum": 0.0, "mean": None, "min": None, "max": None,
+                        "warning": 0, "critical": 0}
+            totals = series.aggregate(to_epoch(start), to_epoch(end))
+
+        if not totals["count"]:
+            totals.update(min=None, max=None)
+        totals["mean"] = totals["sum"] / totals["count"] if totals["count"] else None
+        return totals
+
+    def history(self, model_id: str, metric_name: str, start: datetime, end: Optional[datetime] = None,
+                resolution: str = "day") -> List[Dict[str, Any]]:
+        """
+        Downsampled series for dashboards
+
+        Args:
+            resolution: 'hour', 'day' or 'raw'
+
+        Returns:
+            One row per bucket (or raw point) with its start time and statistics
+        """
+        if resolution != "raw" and resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution {resolution}; expected 'raw' or one of {list(RESOLUTIONS)}")
+
+        with self._lock:
+            series = self._series.get((model_id, metric_name))
+            if series is None:
+                return []
+            if resolution == "raw":
+                rows = series.raw_rows(to_epoch(start), to_epoch(end))
+                return [
+                    {"timestamp": from_epoch(t).isoformat(), "value": float(v), "status": STATUS_NAMES[int(s)]}
+                    for t, v, s in zip(rows["time"], rows["value"], rows["status"])
+                ]
+            rows = series.rollup_rows(resolution, to_epoch(start), to_epoch(end))
+
+        seconds = RESOLUTIONS[resolution]
+        return [
+            {
+                "timestamp": from_epoch(bucket * seconds).isoformat(),
+                "count": int(count),
+                "mean": float(total / count),
+                "min": float(low),
+                "max": float(high),
+                "warning": int(warning),
+                "critical": int(critical),
+            }
+            for bucket, count, total, low, high, warning, critical in zip(
+                rows["bucket"], rows["count"], rows["sum"], rows["min"], rows["max"],
+                rows["warning"], rows["critical"]
+            )
+        ]
+
+    def raw_points(self, model_id: str, metric_name: str, start: datetime,
+                   end: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """Raw columns (time, value, status, baseline, threshold) in [start, end)"""
+        with self._lock:
+            series = self._series.get((model_id, metric_name))
+            if series is None:
+                return {name: np.zeros(0, dtype=dtype) for name, dtype in RAW_COLUMNS.items()}
+            return {name: column.copy() for name, column in series.raw_rows(to_epoch(start), to_epoch(end)).items()}
+
+    def median(self, model_id: str, metric_name: str) -> Optional[float]:
+        """Median of the retained raw values"""
+        with self._lock:
+            series = self._series.get((model_id, metric_name))
+            return series.median() if series is not None else None
+
+    def flush(self) -> None:
+        """Persist every series with unsaved writes"""
+        if not self.state_dir:
+            return
+        with self._lock:
+            for key, unsaved in list(self._unsaved.items()):
+                if unsaved and key in self._series:
+                    self._save_series(self._series[key])
+
+    def _snapshot_path(self, model_id: str, metric_name: str) -> str:
+        digest = hashlib.sha1(f"{model_id}\x00{metric_name}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.state_dir, f"metric_series_{digest}.npz")
+
+    def _save_series(self, series: MetricSeries) -> None:
+        path = self._snapshot_path(series.model_id, series.metric_name)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez_compressed(f, **series.to_dict())
+            os.replace(tmp_path, path)
+            self._unsaved[(series.model_id, series.metric_name)] = 0
+        except OSError as e:
+            logger.error(f"Error saving metric series {series.model_id}/{series.metric_name}: {str(e)}")
+
+    def _load_all(self) -> None:
+        for filename in sorted(os.listdir(self.state_dir)):
+            if not (filename.startswith("metric_series_") and filename.endswith(".npz")):
+                continue
+            path = os.path.join(self.state_dir, filename)
+            try:
+                with np.load(path) as archive:
+                    data = {name: archive[name] for name in archive.files}
+                series = MetricSeries(str(data.pop("model_id")), str(data.pop("metric_name")),
+                                      self.raw_retention, data)
+                self._series[(series.model_id, series.metric_name)] = series
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Error loading metric series {path}: {str(e)}")
@@ -0,0 +1,239 @@
+"""
+Shapley Attribution Module
+
+Shapley values of observed evidence nodes for a Bayesian model's outcome
+posterior. A coalition's value is the posterior with its members at their
+observed states and every other node averaged over its fallback prior.
+All 2^k coalition values come from one contraction of the compiled
+posterior table (see ``BatchedPosterior``) and are cached per evidence
+pattern; above ``max_exact_nodes`` players, permutation sampling with a
+confidence bound is used instead.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from math import factorial
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Shapley values smaller than this are floating point noise
+ZERO_TOLERANCE = 1e-12
+
+
+@dataclass
+class ShapleyResult:
+    """Shapley attribution of one prediction."""
+
+    values: Dict[str, float]  # node -> Shapley value
+    base_value: float  # posterior with every player at its fallback prior
+    full_value: float  # posterior with every player observed
+    exact: bool
+    confidence_bounds: Dict[str, float] = field(default_factory=dict)  # node -> half-width (sampled only)
+    n_permutations: int = 0
+
+
+def coalition_values(
+    posterior_table: np.ndarray, observed: List[int], priors: List[np.ndarray], players: List[int]
+) -> np.ndarray:
+    """
+    Values of all coalitions of ``players`` in one contraction.
+
+    Args:
+        posterior_table: Outcome posterior over every evidence assignment
+        observed: Observed state index per evidence node
+        priors: Fallback prior per evidence node
+        players: Evidence node indices taking part in the game
+
+    Returns:
+        Array of shape (2,) * len(players); index 1 on an axis means the
+        player is in the coalition
+    """
+    player_set = set(players)
+    values = posterior_table
+    # Each step consumes the leading axis and appends the result axis, so
+    # player axes end up in their original order
+    for axis, (state, prior) in enumerate(zip(observed, priors)):
+        if axis in player_set:
+            basis = np.zeros((2, len(prior)))
+            basis[0] = prior
+            basis[1, state] = 1.0
+            values = np.tensordot(values, basis, axes=([0], [1]))
+        else:
+            values = np.tensordot(values, prior, axes=([0], [0]))
+    return values
+
+
+def coalition_value(
+    posterior_table: np.ndarray, observed: List[int], priors: List[np.ndarray], members: List[int]
+) -> float:
+    """Value of a single coalition (members observed, every other node at its fallback prior)."""
+    member_set = set(members)
+    values = posterior_table
+    for axis, (state, prior) in enumerate(zip(observed, priors)):
+        values = values[state] if axis in member_set else np.tensordot(prior, values, axes=([0], [0]))
+    return float(values)
+
+
+def exact_shapley(values: np.ndarray) -> np.ndarray:
+    """Exact Shapley values from a (2,) * k coalition value array."""
+    k = values.ndim
+    if k == 0:
+        return np.zeros(0)
+    # weights[s] = s! (k - s - 1)! / k! for coalitions of size s not containing the player
+    weights = np.array([factorial(s) * factorial(k - s - 1) / factorial(k) for s in range(k)])
+    sizes = np.indices(values.shape).sum(axis=0)
+
+    shapley = np.empty(k)
+    for player in range(k):
+        with_player = np.take(values, 1, axis=player)
+        without_player = np.take(values, 0, axis=player)
+        coalition_sizes = np.take(sizes, 0, axis=player)
+        shapley[player] = (weights[coalition_sizes] * (with_player - without_player)).sum()
+    return shapley
+
+
+class ShapleyAttributor:
+    """
+    Exact or sampled Shapley attributions over a ``BatchedPosterior``.
+
+    Config keys:
+        max_exact_nodes: Most players attributed exactly (default 16)
+        max_permutations: Sampling budget in permutations (default 2000)
+        min_permutations: Permutations before early stopping (default 100)
+        tolerance: Target confidence half-width for early stopping (default 0.005)
+        z_score: Normal quantile of the confidence bound (default 1.96)
+        cache_size: Evidence patterns whose coalition values are kept (default 1024)
+        random_state: Seed for permutation sampling
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.max_exact_nodes = config.get("max_exact_nodes", 16)
+        self.max_permutations = config.get("max_permutations", 2000)
+        self.min_permutations = config.get("min_permutations", 100)
+        self.tolerance = config.get("tolerance", 0.005)
+        self.z_score = config.get("z_score", 1.96)
+        self.cache_size = config.get("cache_size", 1024)
+        self.rng = np.random.default_rng(config.get("random_state"))
+
+        self._cache: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics = {"cache_hits": 0, "cache_misses": 0, "exact": 0, "sampled": 0}
+
+    def attribute(self, posterior, evidence: Dict[str, Any]) -> ShapleyResult:
+        """
+        Shapley values of the observed evidence nodes.
+
+        Args:
+            posterior: ``BatchedPosterior`` of the model
+            evidence: Evidence dict; nodes that are missing or None are not
+                players and stay at their fallback prior in every coalition
+
+        Returns:
+            Shapley values, which sum to ``full_value - base_value``
+        """
+        nodes = posterior.evidence_nodes
+        players = [i for i, node in enumerate(nodes) if evidence.get(node) is not None]
+        priors = [posterior.fallback_priors[node] for node in nodes]
+        modes = posterior.most_probable_states()
+        observed = [int(row) for row in posterior.encode(
+            {node: evidence[node] if i in players else modes[node] for i, node in enumerate(nodes)}
+        )]
+
+        if len(players) <= self.max_exact_nodes:
+            values = self._cached_coalition_values(posterior, observed, priors, players)
+            shapley = exact_shapley(values)
+            shapley[np.abs(shapley) < ZERO_TOLERANCE] = 0.0
+            self.metrics["exact"] += 1
+            base_value = float(values[(0,) * len(players)])
+            full_value = float(values[(1,) * len(players)])
+            return ShapleyResult(
+                values={nodes[i]: float(v) for i, v in zip(players, shapley)},
+                base_value=base_value,
+                full_value=full_value,
+                exact=True,
+            )
+
+        self.metrics["sampled"] += 1
+        return self._sampled_shapley(posterior, observed, priors, players)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _cached_coalition_values(
+        self, posterior, observed: List[int], priors: List[np.ndarray], players: List[int]
+    ) -> np.ndarray:
+        key = (posterior, tuple(observed), tuple(players))
+        with self._lock:
+            values = self._cache.get(key)
+            if values is not None:
+                self._cache.move_to_end(key)
+                self.metrics["cache_hits"] += 1
+                return values
+
+        self.metrics["cache_misses"] += 1
+        values = coalition_values(posterior.posterior_table, observed, priors, players)
+        with self._lock:
+            self._cache[key] = values
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return values
+
+    def _sampled_shapley(
+        self, posterior, observed: List[int], priors: List[np.ndarray], players: List[int]
+    ) -> ShapleyResult:
+        """Antithetic permutation sampling with memoized coalition values."""
+        nodes = posterior.evidence_nodes
+        k = len(players)
+        memo: Dict[bytes, float] = {}
+
+        def value(mask: np.ndarray) -> float:
+            key = mask.tobytes()
+            if key not in memo:
+                members = [player for player, member in zip(players, mask) if member]
+                memo[key] = coalition_value(posterior.posterior_table, observed, priors, members)
+            return memo[key]
+
+        totals = np.zeros(k)
+        squares = np.zeros(k)
+        n = 0
+        while n < self.max_permutations:
+            permutation = self.rng.permutation(k)
+            # Each permutation is paired with its reverse to reduce variance
+            for order in (permutation, permutation[::-1]):
+                contributions = np.empty(k)
+                mask = np.zeros(k, dtype=bool)
+                previous = value(mask)
+                for player in order:
+                    mask[player] = True
+                    current = value(mask)
+                    contributions[player] = current - previous
+                    previous = current
+                totals += contributions
+                squares += contributions ** 2
+                n += 1
+
+            if n >= self.min_permutations and self._half_width(totals, squares, n).max() <= self.tolerance:
+                break
+
+        shapley = totals / n
+        half_width = self._half_width(totals, squares, n)
+        return ShapleyResult(
+            values={nodes[i]: float(v) for i, v in zip(players, shapley)},
+            base_value=value(np.zeros(k, dtype=bool)),
+            full_value=value(np.ones(k, dtype=bool)),
+            exact=False,
+            confidence_bounds={nodes[i]: float(h) for i, h in zip(players, half_width)},
+            n_permutations=n,
+        )
+
+    def _half_width(self, totals: np.ndarray, squares: np.ndarray, n: int) -> np.ndarray:
+        mean = totals / n
+        variance = np.maximum(squares / n - mean ** 2, 0.0)
+        return self.z_score * np.sqrt(variance / n)
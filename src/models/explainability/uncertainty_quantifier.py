@@ -1,28 +1,17 @@
 """
 Uncertainty Quantifier Module
 
-This module provides uncertainty quantification capabilities.
+This module provides uncertainty quantification capabilities. With a
+model's sensitivity engine, uncertainty is a Monte Carlo credible interval
+under CPD parameter uncertainty (see parameter_uncertainty.py).
 """
 
-from typing import Dict, Any
-from .explainability_engine import UncertaintyAnalysis
+from .explainability_engine import UncertaintyAnalysis, UncertaintyQuantifier
+from .parameter_uncertainty import ParameterUncertaintySampler, PosteriorInterval
 
-
-class UncertaintyQuantifier:
-    """Uncertainty quantifier - placeholder for now."""
-
-    def __init__(self, config: Dict[str, Any]):
-        self.config = config
-
-    def analyze_uncertainty(
-        self, model_result: Dict[str, Any], evidence: Dict[str, Any], model_type: str
-    ) -> UncertaintyAnalysis:
-        """Analyze prediction uncertainty."""
-        # Implementation moved to explainability_engine.py
-        return UncertaintyAnalysis(
-            prediction_uncertainty=0.5,
-            confidence_interval=(0.0, 1.0),
-            epistemic_uncertainty=0.3,
-            aleatoric_uncertainty=0.2,
-            reliability_score=0.5,
-        )
+__all__ = [
+    "UncertaintyAnalysis",
+    "UncertaintyQuantifier",
+    "ParameterUncertaintySampler",
+    "PosteriorInterval",
+]
@@ -5,6 +5,7 @@ Loads YAML configuration files for KDEs, strategies, and DQSI settings.
 Supports both environment-specific and default configurations.
 """
 
+import copy
 import os
 import yaml
 import logging
@@ -265,10 +266,16 @@ class DQConfigLoader:
         return config_file
     
     def _load_yaml_file(self, file_path: str) -> Dict[str, Any]:
-        """Load YAML file and return parsed data"""
+        """Load YAML file and return parsed data (re-parsed only when the file changes)"""
         try:
-            with open(file_path, 'r') as f:
-                return yaml.safe_load(f) or {}
+            stat = os.stat(file_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self.last_loaded.get(file_path) != signature:
+                with open(file_path, 'r') as f:
+                    self.config_cache[file_path] = yaml.safe_load(f) or {}
+                self.last_loaded[file_path] = signature
+            # Callers get their own copy so the cached parse stays pristine
+            return copy.deepcopy(self.config_cache[file_path])
         except Exception as e:
             logger.error(f"Error loading YAML file {file_path}: {e}")
             return {}
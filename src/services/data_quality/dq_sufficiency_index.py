@@ -64,49 +64,82 @@ class DataQualitySufficiencyIndex:
         try:
             # Score individual KDEs using selected strategy
             kde_results = self.strategy.score_kdes(data, metadata)
-            
-            # Calculate overall DQSI score
-            dqsi_score = self.strategy.calculate_dqsi_score(kde_results)
-            
-            # Calculate confidence index
-            confidence_index, confidence_note = self.strategy.calculate_confidence_index(
-                kde_results, dqsi_score
-            )
-            
-            # Calculate dimension sub-scores
-            sub_scores = self.strategy.calculate_dimension_scores(kde_results)
-            
-            # Extract critical KDEs missing
-            critical_kdes_missing = [
-                kde.kde_name for kde in kde_results 
-                if kde.kde_name in self.config.critical_kdes and kde.score == 0.0
-            ]
-            
-            # Build KDE weights dictionary
-            kde_weights = {
-                kde.kde_name: kde.risk_weight for kde in kde_results
-            }
-            
-            # Create output
-            output = DQSIOutput(
-                dqsi_score=dqsi_score,
-                dqsi_confidence_index=confidence_index,
-                dqsi_mode=self.strategy.get_strategy_name(),
-                dqsi_critical_kdes_missing=critical_kdes_missing,
-                dqsi_sub_scores=sub_scores,
-                dqsi_kde_weights=kde_weights,
-                dqsi_confidence_note=confidence_note,
-                kde_results=kde_results
-            )
-            
-            logger.info(f"DQSI calculated: score={dqsi_score:.3f}, confidence={confidence_index:.3f}")
-            
-            return output
+            return self._build_output(kde_results)
             
         except Exception as e:
             logger.error(f"Error calculating DQSI: {e}")
             return self._create_error_output(str(e))
     
+    def calculate_dqsi_multi_role(self, data: Dict[str, Any], roles: List[str],
+                                  metadata: Optional[Dict[str, Any]] = None) -> Dict[str, DQSIOutput]:
+        """
+        Calculate DQSI for several roles (e.g. producer and consumer views) at once
+        
+        The role-aware strategy scores all roles in a single pass over the
+        data; other strategies are called once per role.
+        
+        Args:
+            data: Input data containing KDEs
+            roles: Roles to produce DQSI outputs for
+            metadata: Optional metadata (reference data, etc.); its role is overridden
+            
+        Returns:
+            DQSI output per role
+        """
+        try:
+            if hasattr(self.strategy, 'score_kdes_multi_role'):
+                results_by_role = self.strategy.score_kdes_multi_role(data, roles, metadata)
+            else:
+                results_by_role = {
+                    role: self.strategy.score_kdes(data, {**(metadata or {}), 'role': role})
+                    for role in dict.fromkeys(roles)
+                }
+            return {role: self._build_output(kde_results) for role, kde_results in results_by_role.items()}
+            
+        except Exception as e:
+            logger.error(f"Error calculating multi-role DQSI: {e}")
+            return {role: self._create_error_output(str(e)) for role in roles}
+    
+    def _build_output(self, kde_results: List[KDEResult]) -> DQSIOutput:
+        """Aggregate KDE results into a DQSI output"""
+        # Calculate overall DQSI score
+        dqsi_score = self.strategy.calculate_dqsi_score(kde_results)
+        
+        # Calculate confidence index
+        confidence_index, confidence_note = self.strategy.calculate_confidence_index(
+            kde_results, dqsi_score
+        )
+        
+        # Calculate dimension sub-scores
+        sub_scores = self.strategy.calculate_dimension_scores(kde_results)
+        
+        # Extract critical KDEs missing
+        critical_kdes_missing = [
+            kde.kde_name for kde in kde_results 
+            if kde.kde_name in self.config.critical_kdes and kde.score == 0.0
+        ]
+        
+        # Build KDE weights dictionary
+        kde_weights = {
+            kde.kde_name: kde.risk_weight for kde in kde_results
+        }
+        
+        # Create output
+        output = DQSIOutput(
+            dqsi_score=dqsi_score,
+            dqsi_confidence_index=confidence_index,
+            dqsi_mode=self.strategy.get_strategy_name(),
+            dqsi_critical_kdes_missing=critical_kdes_missing,
+            dqsi_sub_scores=sub_scores,
+            dqsi_kde_weights=kde_weights,
+            dqsi_confidence_note=confidence_note,
+            kde_results=kde_results
+        )
+        
+        logger.info(f"DQSI calculated: score={dqsi_score:.3f}, confidence={confidence_index:.3f}")
+        
+        return output
+    
     def calculate_dqsi_for_alert(self, alert_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Calculate DQSI specifically for alert injection
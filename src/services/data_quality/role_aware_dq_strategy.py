@@ -5,12 +5,41 @@ Full-featured DQSI strategy for banks and regulated institutions.
 Includes KDE scoring by producer/consumer role, reconciliation, and accuracy validation.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
+from dataclasses import replace
 import logging
+
+import numpy as np
+
 from .dq_strategy_base import DQScoringStrategy, KDEResult, DQConfig
 
 logger = logging.getLogger(__name__)
 
+# Score component weights by role (roles without an entry use consumer weights)
+ROLE_COMPONENT_WEIGHTS = {
+    'producer': {
+        'completeness': 0.25,
+        'conformity': 0.20,
+        'accuracy': 0.25,
+        'reconciliation': 0.15,
+        'business_rules': 0.10,
+        'uniqueness': 0.03,
+        'consistency': 0.02
+    },
+    'consumer': {
+        'completeness': 0.40,
+        'conformity': 0.30,
+        'reference_validation': 0.20,
+        'basic_rules': 0.10
+    }
+}
+
+# Column order of the component score matrix
+SCORE_COMPONENTS = (
+    'completeness', 'conformity', 'accuracy', 'reconciliation', 'business_rules',
+    'reference_validation', 'basic_rules', 'uniqueness', 'consistency'
+)
+
 
 class RoleAwareDQScoringStrategy(DQScoringStrategy):
     """
@@ -63,6 +92,142 @@ class RoleAwareDQScoringStrategy(DQScoringStrategy):
         logger.debug(f"Scored {len(kde_results)} KDEs using role-aware strategy for role: {role}")
         return kde_results
     
+    def score_kdes_multi_role(self, data: Dict[str, Any], roles: Iterable[str],
+                              metadata: Optional[Dict[str, Any]] = None) -> Dict[str, List[KDEResult]]:
+        """
+        Score KDEs for several roles in a single pass
+        
+        Completeness, conformity, enhanced tier checks and synthetic KDEs do
+        not depend on role and are computed once per KDE. Producer/consumer
+        checks run once per check family, and the final scores of every
+        role come from one weighted product of the KDE x component score
+        matrix with the role x component weight matrix.
+        
+        Args:
+            data: Input data containing KDEs
+            roles: Roles to score for (e.g. producer, consumer)
+            metadata: Metadata with reference and reconciliation data (its role is ignored)
+            
+        Returns:
+            KDE results per role, identical to score_kdes with that role
+        """
+        roles = list(dict.fromkeys(roles))
+        if not roles:
+            return {}
+        
+        reference_data = metadata.get('reference_data', {}) if metadata else {}
+        reconciliation_data = metadata.get('reconciliation_data', {}) if metadata else {}
+        families = {self._role_check_family(role) for role in roles}
+        
+        # Role-independent checks once per KDE, role-specific checks once per family
+        kde_rows = []
+        for kde_name, kde_value in data.items():
+            if kde_name not in self.config.kde_risk_tiers:
+                continue
+            dimension = self._get_kde_dimension(kde_name)
+            tier = self._get_dimension_tier(dimension)
+            shared = {
+                'completeness': self._check_completeness(kde_value),
+                'conformity': self._check_conformity(kde_name, kde_value)
+            }
+            enhanced = self._enhanced_tier_checks(
+                kde_name, kde_value, reference_data, reconciliation_data
+            ) if tier == 'enhanced' else {}
+            
+            family_components = {}
+            for family in families:
+                components = dict(shared)
+                if family == 'producer':
+                    components.update(self._producer_specific_checks(
+                        kde_name, kde_value, reference_data, reconciliation_data
+                    ))
+                else:
+                    components.update(self._consumer_specific_checks(
+                        kde_name, kde_value, reference_data
+                    ))
+                components.update(enhanced)
+                family_components[family] = components
+            kde_rows.append((kde_name, dimension, tier, family_components))
+        
+        final_scores = self._score_role_matrix(kde_rows, roles)
+        synthetic_kdes = self.create_synthetic_kdes(data, metadata)
+        
+        results = {}
+        for role_index, role in enumerate(roles):
+            family = self._role_check_family(role)
+            kde_results = []
+            for kde_index, (kde_name, dimension, tier, family_components) in enumerate(kde_rows):
+                components = family_components[family]
+                risk_tier = self.config.kde_risk_tiers.get(kde_name, 'low')
+                kde_results.append(KDEResult(
+                    kde_name=kde_name,
+                    score=float(final_scores[kde_index, role_index]),
+                    risk_tier=risk_tier,
+                    risk_weight=self.config.risk_weights.get(risk_tier, 1),
+                    dimension=dimension,
+                    tier=tier,
+                    is_synthetic=False,
+                    imputed=components.get('imputed', False),
+                    details={
+                        'strategy': 'role_aware',
+                        'role': role,
+                        'score_components': components,
+                        'checks_performed': list(components.keys())
+                    }
+                ))
+            kde_results.extend(replace(kde) for kde in synthetic_kdes)
+            results[role] = kde_results
+        
+        logger.debug(f"Scored {len(kde_rows)} KDEs for roles {roles} in a single pass")
+        return results
+    
+    def _role_check_family(self, role: str) -> str:
+        """Check family run for a role ('producer' or 'consumer')"""
+        return 'producer' if role == 'producer' else 'consumer'
+    
+    def _score_role_matrix(self, kde_rows: List[tuple], roles: List[str]) -> np.ndarray:
+        """
+        Final KDE scores for every role as a (KDEs x roles) matrix
+        
+        Each role's score is the weighted average of the components that
+        were computed for its check family, so weights are masked by
+        component presence before normalising.
+        """
+        final_scores = np.zeros((len(kde_rows), len(roles)))
+        if not kde_rows:
+            return final_scores
+        
+        for family in {self._role_check_family(role) for role in roles}:
+            role_indices = [i for i, role in enumerate(roles) if self._role_check_family(role) == family]
+            weights = np.array([
+                [self._role_component_weights(roles[i]).get(component, 0.0) for component in SCORE_COMPONENTS]
+                for i in role_indices
+            ])
+            
+            scores = np.zeros((len(kde_rows), len(SCORE_COMPONENTS)))
+            present = np.zeros_like(scores)
+            imputed = np.zeros(len(kde_rows), dtype=bool)
+            for kde_index, (_, _, _, family_components) in enumerate(kde_rows):
+                components = family_components[family]
+                imputed[kde_index] = bool(components.get('imputed', False))
+                for column, component in enumerate(SCORE_COMPONENTS):
+                    score = components.get(component)
+                    if isinstance(score, (int, float)):
+                        scores[kde_index, column] = score
+                        present[kde_index, column] = 1.0
+            
+            weighted = scores @ weights.T
+            total_weight = present @ weights.T
+            family_scores = np.divide(weighted, total_weight, out=np.zeros_like(weighted),
+                                      where=total_weight > 0)
+            family_scores[imputed] = 0.6  # Imputed values get fixed score
+            final_scores[:, role_indices] = family_scores
+        
+        return final_scores
+    
+    def _role_component_weights(self, role: str) -> Dict[str, float]:
+        return ROLE_COMPONENT_WEIGHTS.get(role, ROLE_COMPONENT_WEIGHTS['consumer'])
+    
     def _score_single_kde_role_aware(self, kde_name: str, kde_value: Any, role: str, 
                                    reference_data: Dict[str, Any], 
                                    reconciliation_data: Dict[str, Any]) -> KDEResult:
@@ -365,24 +530,8 @@ class RoleAwareDQScoringStrategy(DQScoringStrategy):
         if not components:
             return 0.0
         
-        # Define weights for different components based on role
-        if role == 'producer':
-            weights = {
-                'completeness': 0.25,
-                'conformity': 0.20,
-                'accuracy': 0.25,
-                'reconciliation': 0.15,
-                'business_rules': 0.10,
-                'uniqueness': 0.03,
-                'consistency': 0.02
-            }
-        else:  # consumer
-            weights = {
-                'completeness': 0.40,
-                'conformity': 0.30,
-                'reference_validation': 0.20,
-                'basic_rules': 0.10
-            }
+        # Weights for different components based on role
+        weights = self._role_component_weights(role)
         
         # Calculate weighted average
         total_score = 0.0
@@ -355,6 +355,40 @@ class TestDQSIEngine(unittest.TestCase):
         
         self.assertEqual(actual_foundational, expected_foundational)
         self.assertEqual(actual_enhanced, expected_enhanced)
+    
+    def test_multi_role_matches_single_role(self):
+        """Test single-pass multi-role scoring matches per-role scoring"""
+        # Timeliness in the enhanced tier exercises the enhanced tier checks
+        config = DQConfig(dq_strategy='role_aware', dimensions={
+            'foundational': ['completeness', 'conformity', 'coverage'],
+            'enhanced': ['accuracy', 'uniqueness', 'consistency', 'timeliness']
+        })
+        dqsi = DataQualitySufficiencyIndex(config)
+        data = dict(self.sample_data, price=-1.0, client_id='unknown', desk_id='')
+        roles = ['producer', 'consumer', 'regulator']
+        
+        outputs = dqsi.calculate_dqsi_multi_role(data, roles, self.sample_metadata)
+        
+        self.assertEqual(list(outputs), roles)
+        for role in roles:
+            expected = dqsi.calculate_dqsi(data, dict(self.sample_metadata, role=role))
+            actual = outputs[role]
+            self.assertAlmostEqual(actual.dqsi_score, expected.dqsi_score, places=12)
+            self.assertEqual(actual.dqsi_critical_kdes_missing, expected.dqsi_critical_kdes_missing)
+            for actual_kde, expected_kde in zip(actual.kde_results, expected.kde_results):
+                self.assertEqual(actual_kde.kde_name, expected_kde.kde_name)
+                self.assertAlmostEqual(actual_kde.score, expected_kde.score, places=12)
+                self.assertEqual(actual_kde.details, expected_kde.details)
+        
+        self.assertNotAlmostEqual(outputs['producer'].dqsi_score, outputs['consumer'].dqsi_score)
+    
+    def test_multi_role_fallback_strategy(self):
+        """Test multi-role scoring with a strategy scored per role"""
+        dqsi = DataQualitySufficiencyIndex(DQConfig(dq_strategy='fallback'))
+        outputs = dqsi.calculate_dqsi_multi_role(self.sample_data, ['producer', 'consumer'])
+        
+        self.assertEqual(set(outputs), {'producer', 'consumer'})
+        self.assertEqual(outputs['producer'].dqsi_mode, 'fallback')
 
 
 if __name__ == '__main__':
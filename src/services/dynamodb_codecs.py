@@ -0,0 +1,257 @@
+"""
+Kor.ai DynamoDB Item Codecs
+Schema-compiled float/Decimal conversion per entity type
+"""
+
+import numbers
+from decimal import Decimal, Context, ROUND_HALF_EVEN
+from typing import Dict, List, Optional, Any, Tuple
+
+# DynamoDB numbers carry up to 38 significant digits
+DYNAMODB_CONTEXT = Context(prec=38, rounding=ROUND_HALF_EVEN)
+
+_create_decimal = DYNAMODB_CONTEXT.create_decimal
+
+
+def _float_to_decimal(value: float) -> Decimal:
+    # str() keeps the shortest round-tripping form, also for numpy scalars
+    # whose repr() is 'np.float64(...)'
+    return _create_decimal(str(value))
+
+
+def _encode_number(value: numbers.Real) -> Any:
+    """Native form of a non-builtin number such as a numpy scalar"""
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    return _float_to_decimal(value)
+
+
+def encode_document(obj: Any) -> Any:
+    """Convert floats to Decimal in a free-form (schemaless) attribute"""
+    value_type = type(obj)
+    if value_type is float:
+        return _float_to_decimal(obj)
+    if value_type is dict:
+        return {k: encode_document(v) for k, v in obj.items()}
+    if value_type is list:
+        return [encode_document(item) for item in obj]
+    if isinstance(obj, float):
+        return _float_to_decimal(obj)
+    if isinstance(obj, dict):
+        return {k: encode_document(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [encode_document(item) for item in obj]
+    if isinstance(obj, numbers.Real) and value_type is not int and value_type is not bool:
+        return _encode_number(obj)
+    return obj
+
+
+def decode_document(obj: Any) -> Any:
+    """Convert Decimals to float in a free-form (schemaless) attribute"""
+    value_type = type(obj)
+    if value_type is Decimal:
+        return float(obj)
+    if value_type is dict:
+        return {k: decode_document(v) for k, v in obj.items()}
+    if value_type is list:
+        return [decode_document(item) for item in obj]
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, dict):
+        return {k: decode_document(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [decode_document(item) for item in obj]
+    return obj
+
+
+# Declared schemas: which top-level attributes are numbers and which hold
+# free-form maps/lists. Everything else is a string/bool key attribute and is
+# passed through untouched.
+ENTITY_SCHEMAS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    'TRADER_PROFILE': {
+        'numeric': ('TTL',),
+        'document': ('Supervisors', 'RiskProfile', 'TradingMetrics'),
+    },
+    'TRADE': {
+        'numeric': ('Volume', 'Price', 'Value', 'TTL'),
+        'document': ('TraderInfo', 'RiskIndicators', 'RelatedEvents', 'ProcessedMetrics'),
+    },
+    'ALERT': {
+        'numeric': ('RiskScore', 'NewsContext', 'TTL'),
+        'document': ('TraderInfo', 'Evidence', 'ESI', 'Instruments', 'HighNodes', 'CriticalNodes',
+                     'RecommendedActions', 'Investigation'),
+    },
+    'RISK_SCORE': {
+        'numeric': ('OverallScore', 'NewsContext', 'TTL'),
+        'document': ('RiskProbabilities', 'EvidenceFactors', 'BayesianAnalysis', 'ContextualFactors', 'ESI'),
+    },
+    'REGULATORY_RATIONALE': {
+        'numeric': ('TTL',),
+        'document': ('InferencePaths', 'VOIAnalysis', 'SensitivityReport', 'RegulatoryFrameworks',
+                     'AuditTrail', 'ComplianceMetadata'),
+    },
+    'STOR_RECORD': {
+        'numeric': ('RiskScore', 'TTL'),
+        'document': ('SuspiciousIndicators', 'RegulatoryRationale', 'EvidenceDetails'),
+    },
+}
+
+
+class SlotRecord:
+    """Base class for compact decoded records; subclasses declare __slots__"""
+
+    __slots__ = ()
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return getattr(self, name, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {}
+        for name in self.__slots__:
+            try:
+                result[name] = getattr(self, name)
+            except AttributeError:
+                continue
+        return result
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class EntityCodec:
+    """
+    Codec compiled from an entity schema
+
+    Numeric attributes are converted with a single type check; only the
+    declared document attributes are walked recursively.
+    """
+
+    def __init__(self, entity_type: str, numeric_fields: Tuple[str, ...], document_fields: Tuple[str, ...],
+                 record_fields: Optional[List[str]] = None):
+        self.entity_type = entity_type
+        self.numeric_fields = tuple(numeric_fields)
+        self.document_fields = tuple(document_fields)
+        self._known_fields = frozenset(self.numeric_fields + self.document_fields)
+        self.record_class = self._build_record_class(entity_type, record_fields or [])
+
+    @staticmethod
+    def _build_record_class(entity_type: str, record_fields: List[str]) -> type:
+        class_name = ''.join(part.title() for part in entity_type.split('_'))
+        if not class_name.endswith('Record'):
+            class_name += 'Record'
+        return type(class_name, (SlotRecord,), {'__slots__': tuple(record_fields)})
+
+    def encode(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert floats to Decimal in the declared fields"""
+        encoded = dict(item)
+        for name in self.numeric_fields:
+            value = encoded.get(name)
+            if type(value) is float:
+                encoded[name] = _float_to_decimal(value)
+            elif value is not None:
+                encoded[name] = encode_document(value)
+        for name in self.document_fields:
+            if name in encoded:
+                encoded[name] = encode_document(encoded[name])
+        for name, value in item.items():
+            # Undeclared attributes still have to be DynamoDB-safe
+            if name not in self._known_fields and (type(value) in (float, dict, list)
+                                                   or isinstance(value, numbers.Real)):
+                encoded[name] = encode_document(value)
+        return encoded
+
+    def decode(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert Decimals back to float in the declared fields"""
+        decoded = dict(item)
+        for name in self.numeric_fields:
+            value = decoded.get(name)
+            if type(value) is Decimal:
+                decoded[name] = float(value)
+        for name in self.document_fields:
+            if name in decoded:
+                decoded[name] = decode_document(decoded[name])
+        for name, value in item.items():
+            if name not in self._known_fields and type(value) in (Decimal, dict, list):
+                decoded[name] = decode_document(value)
+        return decoded
+
+    def decode_record(self, item: Dict[str, Any]) -> SlotRecord:
+        """Decode straight into a compact __slots__ record"""
+        record = self.record_class()
+        decoded = self.decode(item)
+        for name in self.record_class.__slots__:
+            if name in decoded:
+                setattr(record, name, decoded[name])
+        return record
+
+
+# Attribute layout of each entity as written by KorAiDynamoDBRepository
+_RECORD_FIELDS: Dict[str, List[str]] = {
+    'TRADER_PROFILE': ['PK', 'SK', 'EntityType', 'TraderID', 'Name', 'Role', 'Department', 'AccessLevel',
+                       'StartDate', 'Supervisors', 'Status', 'LastUpdated', 'RiskProfile', 'TradingMetrics', 'TTL'],
+    'TRADE': ['PK', 'SK', 'EntityType', 'TradeID', 'Timestamp', 'Instrument', 'Volume', 'Price', 'Side', 'Value',
+              'TraderInfo', 'RiskIndicators', 'RelatedEvents', 'ProcessedMetrics',
+              'GSI1PK', 'GSI1SK', 'GSI2PK', 'GSI2SK', 'TTL'],
+    'ALERT': ['PK', 'SK', 'EntityType', 'AlertID', 'Type', 'Severity', 'Timestamp', 'Status', 'RiskScore',
+              'TraderInfo', 'Description', 'Evidence', 'ESI', 'Instruments', 'Timeframe', 'NewsContext',
+              'HighNodes', 'CriticalNodes', 'RecommendedActions', 'AssignedTo', 'Investigation',
+              'GSI1PK', 'GSI1SK', 'GSI2PK', 'GSI2SK', 'GSI3PK', 'GSI3SK', 'TTL'],
+    'RISK_SCORE': ['PK', 'SK', 'EntityType', 'RiskID', 'Timestamp', 'TraderID', 'ModelType', 'OverallScore',
+                   'RiskProbabilities', 'EvidenceFactors', 'BayesianAnalysis', 'ContextualFactors', 'ESI',
+                   'NewsContext', 'Explanation', 'GSI1PK', 'GSI1SK', 'GSI2PK', 'GSI2SK', 'TTL'],
+    'REGULATORY_RATIONALE': ['PK', 'SK', 'EntityType', 'AlertID', 'RationaleID', 'Timestamp',
+                             'DeterministicNarrative', 'InferencePaths', 'VOIAnalysis', 'SensitivityReport',
+                             'RegulatoryFrameworks', 'AuditTrail', 'ComplianceMetadata', 'GSI1PK', 'GSI1SK', 'TTL'],
+    'STOR_RECORD': ['PK', 'SK', 'EntityType', 'RecordID', 'AlertID', 'Timestamp', 'TraderID', 'Instrument',
+                    'TransactionType', 'SuspiciousIndicators', 'RiskScore', 'RegulatoryRationale',
+                    'EvidenceDetails', 'ComplianceOfficerNotes', 'ReportingStatus', 'RegulatoryBody',
+                    'SubmissionDate', 'GSI1PK', 'GSI1SK', 'TTL'],
+}
+
+
+def compile_codecs(schemas: Dict[str, Dict[str, Tuple[str, ...]]] = ENTITY_SCHEMAS) -> Dict[str, EntityCodec]:
+    """Compile a codec for every declared entity schema"""
+    return {
+        entity_type: EntityCodec(
+            entity_type,
+            schema.get('numeric', ()),
+            schema.get('document', ()),
+            _RECORD_FIELDS.get(entity_type)
+        )
+        for entity_type, schema in schemas.items()
+    }
+
+
+ENTITY_CODECS: Dict[str, EntityCodec] = compile_codecs()
+
+
+def get_codec(entity_type: Optional[str]) -> Optional[EntityCodec]:
+    """Get the compiled codec for an entity type, or None for unknown types"""
+    return ENTITY_CODECS.get(entity_type)
+
+
+def encode_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Encode an item using its EntityType codec, falling back to a full walk"""
+    codec = ENTITY_CODECS.get(item.get('EntityType'))
+    if codec is None:
+        return encode_document(item)
+    return codec.encode(item)
+
+
+def decode_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode an item using its EntityType codec, falling back to a full walk"""
+    codec = ENTITY_CODECS.get(item.get('EntityType'))
+    if codec is None:
+        return decode_document(item)
+    return codec.decode(item)
+
+
+def decode_records(items: List[Dict[str, Any]]) -> List[Any]:
+    """Bulk-decode items into __slots__ records (plain dicts for unknown types)"""
+    records = []
+    append = records.append
+    codecs = ENTITY_CODECS
+    for item in items:
+        codec = codecs.get(item.get('EntityType'))
+        append(codec.decode_record(item) if codec is not None else decode_document(item))
+    return records
@@ -0,0 +1,249 @@
+"""
+Kor.ai DynamoDB Write-Behind Buffer
+Coalesces single-item writes into 25-item batch writes off the request path
+"""
+
+import random
+import threading
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB hard limit for BatchWriteItem
+MAX_BATCH_SIZE = 25
+
+
+class UnprocessedItemsError(Exception):
+    """Raised when DynamoDB keeps returning UnprocessedItems after all retries"""
+
+    def __init__(self, message: str, items: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.items = items
+
+
+def write_batch_with_retry(dynamodb, table_name: str, items: List[Dict[str, Any]],
+                           max_retries: int = 8, base_backoff: float = 0.05,
+                           max_backoff: float = 5.0,
+                           sleep: Callable[[float], None] = time.sleep) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Write up to 25 items with BatchWriteItem, re-submitting UnprocessedItems
+    with full-jitter exponential backoff.
+
+    Args:
+        dynamodb: boto3 DynamoDB service resource (or client)
+        table_name: Target table name
+        items: Items already converted for DynamoDB (Decimal, not float)
+        max_retries: Retries for unprocessed items before giving up
+        base_backoff: Base backoff in seconds
+        max_backoff: Backoff ceiling in seconds
+        sleep: Sleep function (injectable for tests)
+
+    Returns:
+        Tuple of (items still unprocessed after all retries, retry count)
+    """
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"Batch of {len(items)} items exceeds DynamoDB limit of {MAX_BATCH_SIZE}")
+
+    requests = [{'PutRequest': {'Item': item}} for item in items]
+    retries = 0
+
+    while requests:
+        response = dynamodb.batch_write_item(RequestItems={table_name: requests})
+        requests = (response or {}).get('UnprocessedItems', {}).get(table_name, [])
+
+        if not requests:
+            break
+        if retries >= max_retries:
+            break
+
+        delay = random.uniform(0, min(max_backoff, base_backoff * (2 ** retries)))
+        retries += 1
+        logger.debug(f"Retrying {len(requests)} unprocessed items in {delay:.3f}s (attempt {retries})")
+        sleep(delay)
+
+    unprocessed = [request['PutRequest']['Item'] for request in requests if 'PutRequest' in request]
+    return unprocessed, retries
+
+
+class DynamoDBWriteBehindBuffer:
+    """
+    Write-behind buffer for DynamoDB puts
+
+    Items are queued by primary key (a later write to the same PK/SK replaces
+    the pending one, which BatchWriteItem requires anyway) and drained in
+    25-item batches by a background thread when either the size threshold or
+    the flush interval is reached, and on close().
+    """
+
+    def __init__(self, dynamodb, table_name: str,
+                 batch_size: int = MAX_BATCH_SIZE,
+                 flush_interval: float = 1.0,
+                 max_queue_size: int = 10000,
+                 max_retries: int = 8,
+                 base_backoff: float = 0.05,
+                 max_backoff: float = 5.0,
+                 start_worker: bool = True):
+        if not 1 <= batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+
+        self.dynamodb = dynamodb
+        self.table_name = table_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._pending: "OrderedDict[Tuple[Any, Any], Dict[str, Any]]" = OrderedDict()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._in_flight = 0
+
+        self._metrics = {
+            'items_enqueued': 0,
+            'items_coalesced': 0,
+            'items_written': 0,
+            'items_failed': 0,
+            'batches_written': 0,
+            'unprocessed_retries': 0,
+            'size_triggered_flushes': 0,
+            'time_triggered_flushes': 0,
+            'max_queue_depth': 0,
+            'last_flush': None
+        }
+        self.failed_items: List[Dict[str, Any]] = []
+
+        self._worker: Optional[threading.Thread] = None
+        if start_worker:
+            self._worker = threading.Thread(target=self._run, name='dynamodb-write-behind', daemon=True)
+            self._worker.start()
+
+    def put(self, item: Dict[str, Any]) -> None:
+        """Queue an item for writing; blocks to drain the queue only when it is full"""
+        if self._closed:
+            raise RuntimeError("Write-behind buffer is closed")
+
+        key = (item.get('PK'), item.get('SK'))
+        with self._condition:
+            if key in self._pending:
+                self._metrics['items_coalesced'] += 1
+                del self._pending[key]
+            self._pending[key] = item
+            self._metrics['items_enqueued'] += 1
+
+            depth = len(self._pending)
+            if depth > self._metrics['max_queue_depth']:
+                self._metrics['max_queue_depth'] = depth
+
+            if depth >= self.batch_size:
+                self._condition.notify()
+
+            queue_full = depth >= self.max_queue_size
+
+        if queue_full:
+            # Backpressure: the caller pays for the drain rather than growing memory unbounded
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Synchronously write everything currently queued
+
+        Returns:
+            Number of items written
+        """
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                written += self._write(batch)
+        return written
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the background worker and flush any remaining items"""
+        if self._closed:
+            return
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        if self._worker is not None:
+            self._worker.join(timeout)
+        self.flush()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of items waiting to be written"""
+        with self._condition:
+            return len(self._pending)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue depth and throughput metrics"""
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics['queue_depth'] = len(self._pending)
+            metrics['in_flight'] = self._in_flight
+        metrics['closed'] = self._closed
+        return metrics
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        with self._condition:
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                _, item = self._pending.popitem(last=False)
+                batch.append(item)
+            self._in_flight += len(batch)
+            return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> int:
+        try:
+            unprocessed, retries = write_batch_with_retry(
+                self.dynamodb, self.table_name, batch,
+                max_retries=self.max_retries,
+                base_backoff=self.base_backoff,
+                max_backoff=self.max_backoff
+            )
+        except Exception as e:
+            logger.error(f"Error writing batch of {len(batch)} items: {str(e)}")
+            unprocessed, retries = batch, 0
+
+        written = len(batch) - len(unprocessed)
+        with self._condition:
+            self._in_flight -= len(batch)
+            self._metrics['batches_written'] += 1
+            self._metrics['items_written'] += written
+            self._metrics['unprocessed_retries'] += retries
+            self._metrics['last_flush'] = datetime.utcnow().isoformat()
+            if unprocessed:
+                self._metrics['items_failed'] += len(unprocessed)
+                self.failed_items.extend(unprocessed)
+
+        if unprocessed:
+            logger.error(f"Failed to write {len(unprocessed)} items after {retries} retries")
+        return written
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._closed and len(self._pending) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                if self._closed:
+                    return
+                size_triggered = len(self._pending) >= self.batch_size
+                if not self._pending:
+                    continue
+                key = 'size_triggered_flushes' if size_triggered else 'time_triggered_flushes'
+                self._metrics[key] += 1
+
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error in write-behind worker: {str(e)}")
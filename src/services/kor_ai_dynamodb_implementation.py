@@ -3,15 +3,20 @@ Kor.ai DynamoDB Data Access Layer
 Modern NoSQL implementation with access patterns optimization
 """
 
+import atexit
 import boto3
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
-from decimal import Decimal
 import logging
 from botocore.exceptions import ClientError
 
+from .dynamodb_codecs import encode_document, decode_document, encode_item, decode_item, decode_records
+from .dynamodb_write_buffer import (
+    DynamoDBWriteBehindBuffer, UnprocessedItemsError, write_batch_with_retry, MAX_BATCH_SIZE
+)
+
 logger = logging.getLogger(__name__)
 
 class KorAiDynamoDBRepository:
@@ -20,30 +25,63 @@ class KorAiDynamoDBRepository:
     Implements single-table design with strategic GSI usage
     """
     
-    def __init__(self, table_name: str = 'kor-ai-surveillance', region: str = 'us-east-1'):
+    def __init__(self, table_name: str = 'kor-ai-surveillance', region: str = 'us-east-1',
+                 write_behind: bool = False, flush_interval: float = 1.0,
+                 max_queue_size: int = 10000):
         self.table_name = table_name
         self.dynamodb = boto3.resource('dynamodb', region_name=region)
         self.table = self.dynamodb.Table(table_name)
         
+        # Optional write-behind buffer: save_* calls enqueue and return immediately
+        self.write_buffer: Optional[DynamoDBWriteBehindBuffer] = None
+        if write_behind:
+            self.write_buffer = DynamoDBWriteBehindBuffer(
+                self.dynamodb, table_name,
+                flush_interval=flush_interval,
+                max_queue_size=max_queue_size
+            )
+            atexit.register(self.close)
+    
+    def _put_item(self, item: Dict[str, Any]) -> None:
+        """Convert and write a single item, via the write-behind buffer when enabled"""
+        item = self._encode_item(item)
+        if self.write_buffer is not None:
+            self.write_buffer.put(item)
+        else:
+            self.table.put_item(Item=item)
+    
+    def flush(self) -> int:
+        """Flush pending write-behind items; returns the number written"""
+        if self.write_buffer is None:
+            return 0
+        return self.write_buffer.flush()
+    
+    def close(self) -> None:
+        """Flush and stop the write-behind buffer (registered to run at shutdown)"""
+        if self.write_buffer is not None:
+            self.write_buffer.close()
+    
+    def get_write_metrics(self) -> Dict[str, Any]:
+        """Get write-behind queue depth and throughput metrics"""
+        if self.write_buffer is None:
+            return {'write_behind': False, 'queue_depth': 0}
+        return {'write_behind': True, **self.write_buffer.get_metrics()}
+        
     def _convert_floats_to_decimal(self, obj: Any) -> Any:
         """Convert float values to Decimal for DynamoDB compatibility"""
-        if isinstance(obj, float):
-            return Decimal(str(obj))
-        elif isinstance(obj, dict):
-            return {k: self._convert_floats_to_decimal(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_floats_to_decimal(item) for item in obj]
-        return obj
+        return encode_document(obj)
     
     def _convert_decimals_to_float(self, obj: Any) -> Any:
         """Convert Decimal values back to float for application use"""
-        if isinstance(obj, Decimal):
-            return float(obj)
-        elif isinstance(obj, dict):
-            return {k: self._convert_decimals_to_float(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_decimals_to_float(item) for item in obj]
-        return obj
+        return decode_document(obj)
+    
+    def _encode_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an item for writing using its compiled entity codec"""
+        return encode_item(item)
+    
+    def _decode_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a read item using its compiled entity codec"""
+        return decode_item(item)
 
     # ============ TRADER OPERATIONS ============
     
@@ -73,8 +111,7 @@ class KorAiDynamoDBRepository:
                 'TTL': ttl
             }
             
-            item = self._convert_floats_to_decimal(item)
-            self.table.put_item(Item=item)
+            self._put_item(item)
             logger.info(f"Saved trader profile: {trader_data['trader_id']}")
             
         except Exception as e:
@@ -95,7 +132,7 @@ class KorAiDynamoDBRepository:
             )
             
             if 'Item' in response:
-                return self._convert_decimals_to_float(response['Item'])
+                return self._decode_item(response['Item'])
             return None
             
         except Exception as e:
@@ -176,18 +213,18 @@ class KorAiDynamoDBRepository:
                 'TTL': ttl
             }
             
-            item = self._convert_floats_to_decimal(item)
-            self.table.put_item(Item=item)
+            self._put_item(item)
             logger.info(f"Saved trade: {trade_data['trade_id']}")
             
         except Exception as e:
             logger.error(f"Error saving trade: {str(e)}")
             raise
     
-    def get_trader_recent_trades(self, trader_id: str, days: int = 30) -> List[Dict[str, Any]]:
+    def get_trader_recent_trades(self, trader_id: str, days: int = 30, as_records: bool = False) -> List[Any]:
         """
         Get recent trades for a trader
         Access Pattern: PK query with SK prefix
+        With as_records=True, items are decoded into compact TradeRecord objects
         """
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
@@ -202,7 +239,9 @@ class KorAiDynamoDBRepository:
                 }
             )
             
-            return [self._convert_decimals_to_float(item) for item in response['Items']]
+            if as_records:
+                return decode_records(response['Items'])
+            return [self._decode_item(item) for item in response['Items']]
             
         except Exception as e:
             logger.error(f"Error getting trader trades: {str(e)}")
@@ -224,7 +263,7 @@ class KorAiDynamoDBRepository:
                 }
             )
             
-            return [self._convert_decimals_to_float(item) for item in response['Items']]
+            return [self._decode_item(item) for item in response['Items']]
             
         except Exception as e:
             logger.error(f"Error getting instrument trades: {str(e)}")
@@ -275,8 +314,7 @@ class KorAiDynamoDBRepository:
                 'TTL': ttl
             }
             
-            item = self._convert_floats_to_decimal(item)
-            self.table.put_item(Item=item)
+            self._put_item(item)
             logger.info(f"Saved alert: {alert_id}")
             
         except Exception as e:
@@ -297,7 +335,7 @@ class KorAiDynamoDBRepository:
             )
             
             if 'Item' in response:
-                return self._convert_decimals_to_float(response['Item'])
+                return self._decode_item(response['Item'])
             return None
             
         except Exception as e:
@@ -323,7 +361,7 @@ class KorAiDynamoDBRepository:
                 ExpressionAttributeValues=expression_values
             )
             
-            return [self._convert_decimals_to_float(item) for item in response['Items']]
+            return [self._decode_item(item) for item in response['Items']]
             
         except Exception as e:
             logger.error(f"Error getting trader alerts: {str(e)}")
@@ -343,7 +381,7 @@ class KorAiDynamoDBRepository:
                 ScanIndexForward=False  # Most recent first
             )
             
-            return [self._convert_decimals_to_float(item) for item in response['Items']]
+            return [self._decode_item(item) for item in response['Items']]
             
         except Exception as e:
             logger.error(f"Error getting high severity alerts: {str(e)}")
@@ -363,7 +401,7 @@ class KorAiDynamoDBRepository:
                 ScanIndexForward=False  # Most recent first
             )
             
-            return [self._convert_decimals_to_float(item) for item in response['Items']]
+            return [self._decode_item(item) for item in response['Items']]
             
         except Exception as e:
             logger.error(f"Error getting alerts by type: {str(e)}")
@@ -420,8 +458,7 @@ class KorAiDynamoDBRepository:
                 'TTL': ttl
             }
             
-            item = self._convert_floats_to_decimal(item)
-            self.table.put_item(Item=item)
+            self._put_item(item)
             logger.info(f"Saved risk score: {risk_data['trader_id']}")
             
         except Exception as e:
@@ -445,7 +482,7 @@ class KorAiDynamoDBRepository:
                 }
             )
             
-            return [self._convert_decimals_to_float(item) for item in response['Items']]
+            return [self._decode_item(item) for item in response['Items']]
             
         except Exception as e:
             logger.error(f"Error getting risk scores by date: {str(e)}")
@@ -465,7 +502,7 @@ class KorAiDynamoDBRepository:
                 ScanIndexForward=False  # Most recent first
             )
             
-            return [self._convert_decimals_to_float(item) for item in response['Items']]
+            return [self._decode_item(item) for item in response['Items']]
             
         except Exception as e:
             logger.error(f"Error getting high risk scores: {str(e)}")
@@ -503,8 +540,7 @@ class KorAiDynamoDBRepository:
                 'TTL': ttl
             }
             
-            item = self._convert_floats_to_decimal(item)
-            self.table.put_item(Item=item)
+            self._put_item(item)
             logger.info(f"Saved regulatory rationale: {alert_id}")
             
         except Exception as e:
@@ -525,7 +561,7 @@ class KorAiDynamoDBRepository:
             )
             
             if 'Item' in response:
-                return self._convert_decimals_to_float(response['Item'])
+                return self._decode_item(response['Item'])
             return None
             
         except Exception as e:
@@ -544,7 +580,7 @@ class KorAiDynamoDBRepository:
                 ExpressionAttributeValues={':pk': 'COMPLIANCE#PENDING'}
             )
             
-            return [self._convert_decimals_to_float(item) for item in response['Items']]
+            return [self._decode_item(item) for item in response['Items']]
             
         except Exception as e:
             logger.error(f"Error getting pending compliance reviews: {str(e)}")
@@ -586,8 +622,7 @@ class KorAiDynamoDBRepository:
                 'TTL': ttl
             }
             
-            item = self._convert_floats_to_decimal(item)
-            self.table.put_item(Item=item)
+            self._put_item(item)
             logger.info(f"Saved STOR record: {record_id}")
             
         except Exception as e:
@@ -606,7 +641,7 @@ class KorAiDynamoDBRepository:
                 ExpressionAttributeValues={':pk': f'REGULATORY#{status}'}
             )
             
-            return [self._convert_decimals_to_float(item) for item in response['Items']]
+            return [self._decode_item(item) for item in response['Items']]
             
         except Exception as e:
             logger.error(f"Error getting STOR records by status: {str(e)}")
@@ -629,7 +664,7 @@ class KorAiDynamoDBRepository:
             )
             
             items = response.get('Responses', {}).get(self.table_name, [])
-            return [self._convert_decimals_to_float(item) for item in items]
+            return [self._decode_item(item) for item in items]
             
         except Exception as e:
             logger.error(f"Error in batch get items: {str(e)}")
@@ -639,21 +674,22 @@ class KorAiDynamoDBRepository:
         """
         Batch write multiple items efficiently
         Access Pattern: Optimized multi-item writes
+        Unprocessed items are retried with jittered backoff
         """
         try:
             # Convert items and chunk into batches of 25 (DynamoDB limit)
-            converted_items = [self._convert_floats_to_decimal(item) for item in items]
-            
-            for i in range(0, len(converted_items), 25):
-                batch = converted_items[i:i+25]
-                
-                request_items = {
-                    self.table_name: [
-                        {'PutRequest': {'Item': item}} for item in batch
-                    ]
-                }
-                
-                self.dynamodb.batch_write_item(RequestItems=request_items)
+            converted_items = [self._encode_item(item) for item in items]
+            failed_items = []
+            
+            for i in range(0, len(converted_items), MAX_BATCH_SIZE):
+                batch = converted_items[i:i+MAX_BATCH_SIZE]
+                unprocessed, _ = write_batch_with_retry(self.dynamodb, self.table_name, batch)
+                failed_items.extend(unprocessed)
+            
+            if failed_items:
+                raise UnprocessedItemsError(
+                    f"{len(failed_items)} of {len(items)} items were not processed", failed_items
+                )
                 
             logger.info(f"Batch wrote {len(items)} items")
             
@@ -680,7 +716,7 @@ class KorAiDynamoDBRepository:
                 Limit=10,
                 ScanIndexForward=False
             )
-            critical_alerts = [self._convert_decimals_to_float(item) for item in critical_response['Items']]
+            critical_alerts = [self._decode_item(item) for item in critical_response['Items']]
             
             # Get pending compliance items
             pending_compliance = self.get_pending_compliance_reviews()
@@ -725,7 +761,7 @@ class KorAiDynamoDBRepository:
                 }
             )
             
-            risk_scores = [self._convert_decimals_to_float(item) for item in response['Items']]
+            risk_scores = [self._decode_item(item) for item in response['Items']]
             
             # Calculate trends
             if risk_scores:
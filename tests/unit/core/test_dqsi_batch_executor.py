@@ -0,0 +1,152 @@
+"""
+Unit tests for the DQSI batch executor.
+
+Covers calculator reuse per configuration, ordered results, chunked
+process-pool runs and per-dataset error isolation. A picklable stub
+calculator stands in for DataQualitySufficiencyIndex.
+"""
+
+import os
+
+import pandas as pd
+
+from src.core.dqsi_batch_executor import (
+    DQSIBatchExecutor,
+    DQSICalculatorPool,
+    config_fingerprint,
+    get_calculator_pool,
+    score_dataset
+)
+
+
+class StubMetrics:
+    def __init__(self, overall_score, dimension_scores):
+        self.overall_score = overall_score
+        self.dimension_scores = dimension_scores
+
+
+class StubCalculator:
+    """Scores completeness of a DataFrame, weighted by the request weights."""
+
+    def __init__(self, custom_weights=None, enabled_dimensions=None):
+        self.weight = (custom_weights or {}).get('completeness', 1.0)
+
+    def calculate_dqsi(self, data, dimension_configs):
+        if not isinstance(data, pd.DataFrame) or data.empty:
+            raise ValueError('dataset has no records')
+        completeness = float(data.notna().mean().mean())
+        return StubMetrics(completeness * self.weight, {'completeness': completeness})
+
+    def generate_report(self, metrics):
+        return {'score': metrics.overall_score, 'pid': os.getpid()}
+
+
+class RecordingExecutor:
+    """In-process stand-in for the process pool that records map() calls."""
+
+    def __init__(self):
+        self.chunksizes = []
+
+    def map(self, fn, tasks, chunksize=1):
+        self.chunksizes.append(chunksize)
+        return map(fn, tasks)
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def build_batch(n_datasets):
+    return [
+        {
+            'id': f'dataset_{i}',
+            'dataset': {
+                'format': 'dataframe',
+                'data': {'trader_id': [f'T{j}' for j in range(5)],
+                         'price': [100.0 + i, None, 101.0, None if i % 2 else 99.5, 100.2]}
+            }
+        }
+        for i in range(n_datasets)
+    ]
+
+
+class TestDQSICalculatorPool:
+    """Test calculator pooling by config hash."""
+
+    def test_same_config_reuses_calculator(self):
+        pool = DQSICalculatorPool(calculator_factory=StubCalculator)
+        first = pool.get({'completeness': 0.5, 'accuracy': 0.5})
+        second = pool.get({'accuracy': 0.5, 'completeness': 0.5})
+
+        assert first is second
+        assert isinstance(first, StubCalculator)
+        assert pool.metrics == {'hits': 1, 'builds': 1}
+        assert pool.get({'completeness': 1.0}) is not first
+
+    def test_pool_is_bounded(self):
+        pool = DQSICalculatorPool(max_size=2, calculator_factory=StubCalculator)
+        for weight in (0.1, 0.2, 0.3):
+            pool.get({'completeness': weight})
+        assert len(pool) == 2
+
+    def test_pool_per_factory(self):
+        assert get_calculator_pool(StubCalculator) is get_calculator_pool(StubCalculator)
+        assert get_calculator_pool(StubCalculator) is not get_calculator_pool()
+
+    def test_fingerprint_ignores_key_order(self):
+        assert config_fingerprint({'a': 1, 'b': 2}) == config_fingerprint({'b': 2, 'a': 1})
+        assert config_fingerprint({'a': 1}) != config_fingerprint({'a': 2})
+
+
+class TestDQSIBatchExecutor:
+    """Test batch scoring."""
+
+    def test_sequential_and_parallel_results_match(self):
+        batch = build_batch(12)
+        sequential = DQSIBatchExecutor(max_workers=1, calculator_factory=StubCalculator).run(batch)
+
+        executor = DQSIBatchExecutor(max_workers=2, min_parallel_datasets=2, calculator_factory=StubCalculator)
+        try:
+            parallel = executor.run(batch, custom_weights={})
+        finally:
+            executor.shutdown()
+
+        assert [r['dataset_id'] for r in parallel] == [f'dataset_{i}' for i in range(12)]
+        assert [r['dqsi_score'] for r in parallel] == [r['dqsi_score'] for r in sequential]
+        assert all(r['report']['pid'] != os.getpid() for r in parallel)
+        assert all(r['report']['pid'] == os.getpid() for r in sequential)
+
+    def test_small_batches_stay_in_process(self):
+        executor = DQSIBatchExecutor(max_workers=2, min_parallel_datasets=8, calculator_factory=StubCalculator)
+        results = executor.run(build_batch(3))
+
+        assert executor._executor is None
+        assert all(r['report']['pid'] == os.getpid() for r in results)
+
+    def test_large_batches_are_chunked(self):
+        executor = DQSIBatchExecutor(max_workers=2, min_parallel_datasets=2, calculator_factory=StubCalculator)
+        executor._executor = recorder = RecordingExecutor()
+
+        results = executor.run(build_batch(40), custom_weights={'completeness': 0.5})
+
+        assert recorder.chunksizes == [5]
+        assert [r['dataset_id'] for r in results] == [f'dataset_{i}' for i in range(40)]
+        assert results[0]['dqsi_score'] == 0.5 * results[0]['dimension_scores']['completeness']
+
+    def test_failed_dataset_is_isolated(self):
+        batch = build_batch(6)
+        batch[1]['dataset'] = {'format': 'dataframe', 'data': None}
+        batch[4]['dataset'] = {'format': 'csv', 'csv_data': ''}
+
+        executor = DQSIBatchExecutor(max_workers=2, min_parallel_datasets=2, calculator_factory=StubCalculator)
+        try:
+            results = executor.run(batch)
+        finally:
+            executor.shutdown()
+
+        assert [r['dataset_id'] for r in results] == [f'dataset_{i}' for i in range(6)]
+        assert [i for i, r in enumerate(results) if 'error' in r] == [1, 4]
+        assert results[1]['error'] == 'dataset has no records'
+
+    def test_missing_id_defaults_to_position(self):
+        result = score_dataset((4, {'dataset': build_batch(1)[0]['dataset']}, {}, {}, StubCalculator))
+        assert result['dataset_id'] == 'dataset_4'
@@ -0,0 +1,189 @@
+"""
+Unit tests for batched posteriors and minimal counterfactual search.
+
+Uses a small network with non-uniform CPTs so different evidence
+changes move the outcome posterior by different amounts.
+"""
+
+import itertools
+import os
+import sys
+import unittest
+
+import numpy as np
+from pgmpy.factors.discrete import TabularCPD
+from pgmpy.inference import VariableElimination
+from pgmpy.models import DiscreteBayesianNetwork
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from models.bayesian.insider_dealing.enhanced_model import EnhancedInsiderDealingModel
+from models.bayesian.shared.batched_inference import BatchedPosterior
+from models.explainability.counterfactual_search import CounterfactualSearch, reachable_alert_threshold
+from models.explainability.explainability_engine import CounterfactualGenerator
+
+EVIDENCE_NODES = ['trade_pattern', 'news_timing', 'access']
+
+
+def build_model():
+    model = DiscreteBayesianNetwork([
+        ('trade_pattern', 'risk'), ('news_timing', 'risk'), ('access', 'risk'), ('risk', 'outcome')
+    ])
+    risk_high = []
+    for trade, news, access in itertools.product(range(2), range(3), range(2)):
+        risk_high.append(min(0.05 + 0.3 * trade + 0.2 * news + 0.25 * access, 0.95))
+    model.add_cpds(
+        TabularCPD('trade_pattern', 2, [[0.9], [0.1]]),
+        TabularCPD('news_timing', 3, [[0.7], [0.2], [0.1]]),
+        TabularCPD('access', 2, [[0.8], [0.2]]),
+        TabularCPD('risk', 2, [[1 - p for p in risk_high], risk_high],
+                   evidence=['trade_pattern', 'news_timing', 'access'], evidence_card=[2, 3, 2]),
+        TabularCPD('outcome', 2, [[0.95, 0.1], [0.05, 0.9]], evidence=['risk'], evidence_card=[2])
+    )
+    return model
+
+
+class TestBatchedPosterior(unittest.TestCase):
+    """Test the compiled posterior against variable elimination."""
+
+    def setUp(self):
+        self.model = build_model()
+        self.posterior = BatchedPosterior(self.model, 'outcome', EVIDENCE_NODES,
+                                          state_names={'trade_pattern': ['normal', 'suspicious']})
+
+    def test_matches_variable_elimination(self):
+        inference = VariableElimination(self.model)
+        assignments = np.array(list(itertools.product(range(2), range(3), range(2))))
+        batched = self.posterior.posterior(assignments)
+
+        for row, score in zip(assignments, batched):
+            evidence = dict(zip(EVIDENCE_NODES, (int(v) for v in row)))
+            expected = inference.query(['outcome'], evidence=evidence, show_progress=False).values[1]
+            self.assertAlmostEqual(score, expected, places=12)
+
+    def test_encode_state_names(self):
+        row = self.posterior.encode({'trade_pattern': 'suspicious', 'news_timing': 2, 'access': 0})
+        self.assertEqual(row.tolist(), [1, 2, 0])
+        self.assertEqual(self.posterior.state_name('trade_pattern', 0), 'normal')
+        self.assertEqual(self.posterior.most_probable_states(), {'trade_pattern': 0, 'news_timing': 0, 'access': 0})
+
+
+class TestCounterfactualSearch(unittest.TestCase):
+    """Test minimality and ranking of counterfactual change sets."""
+
+    def setUp(self):
+        self.posterior = BatchedPosterior(build_model(), 'outcome', EVIDENCE_NODES)
+        self.evidence = {'trade_pattern': 1, 'news_timing': 2, 'access': 1}
+        self.threshold = 0.5
+
+    def test_change_sets_cross_threshold_and_are_minimal(self):
+        results = CounterfactualSearch({'top_k': 100}).search(self.posterior, self.evidence, self.threshold)
+        self.assertTrue(results)
+
+        original = self.posterior.encode(self.evidence)
+        for change_set in results:
+            self.assertLess(change_set.counterfactual_score, self.threshold)
+            changed = list(change_set.changes.items())
+            # No proper subset of the changes crosses the threshold on its own
+            for size in range(1, len(changed)):
+                for subset in itertools.combinations(changed, size):
+                    row = original.copy()
+                    for node, state in subset:
+                        row[EVIDENCE_NODES.index(node)] = state
+                    self.assertGreaterEqual(self.posterior.posterior(row[None, :])[0], self.threshold)
+
+        plausibility = [change_set.plausibility for change_set in results]
+        self.assertEqual(plausibility, sorted(plausibility, reverse=True))
+
+    def test_finds_every_minimal_change_set(self):
+        results = CounterfactualSearch({'top_k': 100}).search(self.posterior, self.evidence, self.threshold)
+        found = {tuple(sorted(change_set.changes.items())) for change_set in results}
+
+        # Brute force over all assignments
+        original = self.posterior.encode(self.evidence)
+        crossing = set()
+        for row in itertools.product(range(2), range(3), range(2)):
+            if self.posterior.posterior(np.array([row]))[0] < self.threshold:
+                crossing.add(tuple(sorted(
+                    (node, state) for node, state, old in zip(EVIDENCE_NODES, row, original) if state != old
+                )))
+        minimal = {
+            changes for changes in crossing
+            if not any(set(other) < set(changes) for other in crossing)
+        }
+        self.assertEqual(found, minimal)
+
+    def test_immutable_nodes_and_below_threshold(self):
+        results = CounterfactualSearch({'top_k': 100}).search(
+            self.posterior, self.evidence, self.threshold, immutable_nodes=['access']
+        )
+        self.assertTrue(all('access' not in change_set.changes for change_set in results))
+
+        low_evidence = {'trade_pattern': 0, 'news_timing': 0, 'access': 0}
+        self.assertEqual(CounterfactualSearch().search(self.posterior, low_evidence, self.threshold), [])
+
+    def test_engine_generator_uses_search(self):
+        generator = CounterfactualGenerator({'counterfactual': {'top_k': 3}})
+        scenarios = generator.generate_scenarios(
+            {'risk_scores': {'overall_score': 0.8}}, {'trade_pattern': 1, 'news_timing': 2},
+            'insider_dealing', posterior=self.posterior, alert_threshold=self.threshold
+        )
+        self.assertTrue(scenarios)
+        self.assertLessEqual(len(scenarios), 3)
+        for scenario in scenarios:
+            # Unobserved 'access' keeps its prior mode
+            self.assertNotIn('access', scenario.changed_features)
+            self.assertLess(scenario.counterfactual_prediction, self.threshold)
+
+    def test_engine_generator_reports_score_below_threshold(self):
+        scenarios = CounterfactualGenerator({}).generate_scenarios(
+            {'risk_scores': {'overall_score': 0.1}}, {'trade_pattern': 0, 'news_timing': 0, 'access': 0},
+            'insider_dealing', posterior=self.posterior, alert_threshold=self.threshold
+        )
+        self.assertEqual([scenario.scenario_id for scenario in scenarios], ['below_threshold'])
+        self.assertEqual(scenarios[0].changed_features, {})
+
+    def test_engine_generator_falls_back_to_heuristics(self):
+        # Nothing can fall below a threshold under the lowest reachable score
+        threshold = float(self.posterior.posterior_table.min())
+        scenarios = CounterfactualGenerator({}).generate_scenarios(
+            {'risk_scores': {'overall_score': 0.8}}, self.evidence,
+            'insider_dealing', posterior=self.posterior, alert_threshold=threshold
+        )
+        self.assertTrue(scenarios)
+        self.assertEqual(scenarios[0].scenario_id, 'scenario_1')
+
+    def test_reachable_alert_threshold(self):
+        low = float(self.posterior.posterior_table.min())
+        high = float(self.posterior.posterior_table.max())
+        self.assertEqual(reachable_alert_threshold(self.posterior, 0.5), 0.5)
+        self.assertAlmostEqual(reachable_alert_threshold(self.posterior, 0.99), low + 0.99 * (high - low))
+
+
+class TestEnhancedModelCounterfactuals(unittest.TestCase):
+    """Test counterfactuals of the enhanced insider dealing model."""
+
+    def setUp(self):
+        self.model = EnhancedInsiderDealingModel(config={'explainability_enabled': False})
+        self.posterior = self.model.core_model.get_batched_posterior()
+
+    def test_default_threshold_is_reachable(self):
+        threshold = self.model._get_alert_threshold()
+        self.assertLessEqual(threshold, float(self.posterior.posterior_table.max()))
+
+    def test_counterfactuals_are_never_silently_empty(self):
+        for evidence in ({'trade_pattern': 1, 'comms_intent': 2, 'pnl_drift': 1}, {}):
+            counterfactuals = self.model.generate_counterfactuals(evidence)
+            self.assertTrue(counterfactuals)
+            self.assertIn(counterfactuals[0]['status'],
+                          {'crosses_threshold', 'below_threshold', 'heuristic', 'no_counterfactual'})
+
+    def test_configured_threshold_below_score(self):
+        model = EnhancedInsiderDealingModel(config={'counterfactual': {'alert_threshold': 0.99}})
+        counterfactuals = model.generate_counterfactuals({'trade_pattern': 1})
+        self.assertEqual([c['status'] for c in counterfactuals], ['below_threshold'])
+
+
+if __name__ == '__main__':
+    unittest.main()
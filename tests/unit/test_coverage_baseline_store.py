@@ -0,0 +1,146 @@
+"""
+Unit tests for the coverage baseline store.
+
+Covers rolling window baselines from daily aggregates, late data,
+persistence across restarts and coverage scoring from stored baselines.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.coverage_baseline_store import CoverageBaselineStore, evidence_totals
+from core.kde_first_dq_calculator import KDEFirstDQCalculator
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'dq_config.yaml')
+
+
+class TestCoverageBaselineStore(unittest.TestCase):
+    """Test daily aggregates and window queries."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.today = date(2025, 3, 31)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def fill(self, store, days=40):
+        # Day i has i + 1 records of value 10 * i
+        for i in range(days):
+            day = self.today - timedelta(days=days - i)
+            store.record_batch('feed_a', [{'notional': 10.0 * i, 'trader_id': 'T1'}] * (i + 1), day)
+
+    def expected_window(self, days=40, window=30):
+        rows = [(i + 1, 10.0 * i) for i in range(days - window, days)]
+        records = sum(n for n, _ in rows)
+        return records, sum(n * value for n, value in rows) / records
+
+    def test_window_excludes_as_of_day_and_older_days(self):
+        store = CoverageBaselineStore(baseline_days=30)
+        self.fill(store)
+        store.record('feed_a', {'notional': 1e9, 'trader_id': 'T1'}, self.today)
+
+        baseline = store.get_baseline('feed_a', as_of=self.today)
+        records, value = self.expected_window()
+
+        self.assertEqual(baseline['records'], records)
+        self.assertAlmostEqual(baseline['value'], value)
+        self.assertEqual(baseline['volume'], 2)
+        self.assertEqual(baseline['kde']['trader_id']['presence_rate'], 1.0)
+        self.assertEqual(baseline['window_end'], (self.today - timedelta(days=1)).isoformat())
+
+    def test_late_data_updates_window(self):
+        store = CoverageBaselineStore(baseline_days=30)
+        self.fill(store)
+        before = store.get_baseline('feed_a', as_of=self.today)['records']
+
+        store.record('feed_a', {'notional': 5.0}, self.today - timedelta(days=3))
+        store.record('feed_a', {'notional': 5.0}, self.today - timedelta(days=100))
+
+        self.assertEqual(store.get_baseline('feed_a', as_of=self.today)['records'], before + 1)
+        self.assertEqual(store.get_baseline('feed_a', as_of=self.today, days=120)['records'],
+                         sum(range(1, 41)) + 2)
+
+    def test_days_after_gap_are_queryable(self):
+        store = CoverageBaselineStore(baseline_days=30)
+        for day in (1, 2, 3):
+            store.record('feed_a', {'notional': 1.0}, date(2026, 10, day))
+        store.get_baseline('feed_a', as_of='2026-10-04')
+        store.record('feed_a', {'notional': 1.0}, date(2026, 10, 12))
+
+        self.assertEqual(store.get_baseline('feed_a', as_of='2026-10-13')['records'], 4)
+        self.assertEqual(store.get_baseline('feed_a', as_of='2026-10-12', days=10)['records'], 2)
+
+    def test_unknown_feed_has_no_baseline(self):
+        store = CoverageBaselineStore()
+        self.assertIsNone(store.get_baseline('missing'))
+
+    def test_persists_across_restarts(self):
+        store = CoverageBaselineStore(state_dir=self.temp_dir, autosave_every=10 ** 6)
+        self.fill(store)
+        store.flush()
+
+        restored = CoverageBaselineStore(state_dir=self.temp_dir)
+        self.assertEqual(restored.get_baseline('feed_a', as_of=self.today),
+                         store.get_baseline('feed_a', as_of=self.today))
+
+    def test_missing_values_are_not_counted(self):
+        totals = evidence_totals({'price': float('nan'), 'qty': 3, 'trader_id': None, 'desk': 'EQ'})
+        self.assertEqual(totals['volume'], 4)
+        self.assertEqual(totals['value'], 3.0)
+        self.assertNotIn('kde:price:count', totals)
+        self.assertEqual(totals['kde:desk:count'], 1)
+
+
+class TestStoredCoverageScoring(unittest.TestCase):
+    """Test coverage scoring without caller-supplied baselines."""
+
+    def setUp(self):
+        self.store = CoverageBaselineStore()
+        self.calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH, coverage_baseline_store=self.store)
+        self.alert_time = datetime(2025, 3, 31, 12, 0)
+        history = [{'trader_id': 'T1', 'notional': 1000.0, 'price': 10.0}] * 5
+        for days_back in range(1, 11):
+            self.store.record_batch('feed_a', history, self.alert_time - timedelta(days=days_back))
+
+    def test_stored_baseline_matches_explicit_baseline(self):
+        evidence = {'trader_id': 'T1', 'notional': 500.0, 'price': 10.0}
+        explicit = self.calculator.calculate_dqsi(evidence, baseline_data={'volume': 3, 'value': 1010.0},
+                                                  alert_timestamp=self.alert_time)
+        stored = self.calculator.calculate_dqsi(evidence, alert_timestamp=self.alert_time, feed_id='feed_a')
+
+        self.assertEqual(stored['synthetic_scores']['coverage'], explicit['synthetic_scores']['coverage'])
+        self.assertGreater(stored['synthetic_scores']['coverage'], 0.0)
+
+    def test_scored_records_feed_the_baseline(self):
+        self.calculator.calculate_dqsi({'trader_id': 'T2', 'notional': 10.0}, alert_timestamp=self.alert_time,
+                                       feed_id='feed_a')
+        baseline = self.store.get_baseline('feed_a', as_of=self.alert_time + timedelta(days=1), days=1)
+        self.assertEqual(baseline['records'], 1)
+        self.assertEqual(baseline['value'], 10.0)
+
+    def test_frame_records_same_totals_as_rows(self):
+        data = pd.DataFrame({'trader_id': ['T1', None, 'T3'], 'notional': [10.0, np.nan, 30.0]})
+        frame_store = CoverageBaselineStore()
+        calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH, coverage_baseline_store=frame_store)
+        calculator.calculate_dqsi_frame(data, alert_timestamp=self.alert_time, feed_id='feed_b')
+
+        row_store = CoverageBaselineStore()
+        row_store.record_batch('feed_b', data.to_dict('records'), self.alert_time)
+
+        as_of = self.alert_time + timedelta(days=1)
+        self.assertEqual(frame_store.get_baseline('feed_b', as_of=as_of), row_store.get_baseline('feed_b', as_of=as_of))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Unit tests for the decision path cache.
+
+Covers building once per (model version, evidence), single builds under
+concurrency, background and synchronous layout rendering, and the
+explainability engine's decision path visualizer.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from models.explainability.decision_path_cache import DecisionPathCache, layout_graph
+from models.explainability.explainability_engine import DecisionPathVisualizer
+
+
+def chain_graph(path):
+    nodes = [{'id': name} for name in path]
+    edges = [{'source': a, 'target': b} for a, b in zip(path, path[1:])]
+    return {'nodes': nodes, 'edges': edges}
+
+
+class TestDecisionPathCache(unittest.TestCase):
+    """Test caching and rendering of decision paths."""
+
+    def setUp(self):
+        self.cache = DecisionPathCache({'background_rendering': False, 'cache_size': 2})
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return ['evidence', 'step', 'outcome']
+
+    def test_built_once_per_version_and_evidence(self):
+        first = self.cache.get_or_build('v1', {'a': 1, 'b': [1, 2]}, self.build)
+        second = self.cache.get_or_build('v1', {'b': [1, 2], 'a': 1}, self.build)
+        self.cache.get_or_build('v2', {'a': 1, 'b': [1, 2]}, self.build)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.builds, 2)
+        self.assertEqual(self.cache.metrics['cache_hits'], 1)
+
+    def test_lru_eviction(self):
+        for version in ('v1', 'v2', 'v3'):
+            self.cache.get_or_build(version, {'a': 1}, self.build)
+
+        self.assertIsNone(self.cache.lookup('v1', {'a': 1}))
+        self.assertIsNotNone(self.cache.lookup('v3', {'a': 1}))
+
+    def test_concurrent_requests_share_one_build(self):
+        release = threading.Event()
+
+        def slow_build():
+            release.wait()
+            return self.build()
+
+        threads = [threading.Thread(target=self.cache.get_or_build, args=('v1', {'a': 1}, slow_build))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.builds, 1)
+
+    def test_failed_build_is_not_cached(self):
+        def failing():
+            raise RuntimeError('inference failed')
+
+        with self.assertRaises(RuntimeError):
+            self.cache.get_or_build('v1', {'a': 1}, failing)
+        self.assertIsNone(self.cache.lookup('v1', {'a': 1}))
+        self.assertEqual(self.cache.get_or_build('v1', {'a': 1}, self.build).path[0], 'evidence')
+
+    def test_synchronous_rendering(self):
+        entry = self.cache.get_or_build('v1', {'a': 1}, self.build, graph_builder=chain_graph)
+        self.assertEqual(entry.status, 'pending')
+
+        self.assertEqual(self.cache.render_pending(), 1)
+        layout = json.loads(entry.layout)
+        self.assertEqual(entry.status, 'rendered')
+        self.assertEqual([node['x'] for node in layout['nodes']], [0, 200, 400])
+        self.assertEqual(layout['model_version'], 'v1')
+
+    def test_background_rendering(self):
+        cache = DecisionPathCache()
+        try:
+            entry = cache.get_or_build('v1', {'a': 1}, self.build, graph_builder=chain_graph)
+            deadline = time.time() + 5
+            while entry.status == 'pending' and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(entry.status, 'rendered')
+        finally:
+            cache.close(timeout=1)
+
+    def test_render_failure_is_reported(self):
+        entry = self.cache.get_or_build('v1', {'a': 1}, self.build, graph_builder=lambda path: 1 / 0)
+        self.cache.render_pending()
+        self.assertEqual(entry.status, 'failed')
+        self.assertEqual(self.cache.metrics['render_failures'], 1)
+
+
+class TestLayoutGraph(unittest.TestCase):
+    """Test the layered layout."""
+
+    def test_sources_placed_before_their_first_successor(self):
+        graph = chain_graph(['s1', 's2', 's3'])
+        graph['nodes'].append({'id': 'e3'})
+        graph['edges'].append({'source': 'e3', 'target': 's3'})
+
+        positions = {node['id']: (node['x'], node['y']) for node in layout_graph(graph)['nodes']}
+        self.assertEqual(positions['e3'][0], positions['s2'][0])
+        self.assertNotEqual(positions['e3'], positions['s2'])
+
+
+class TestDecisionPathVisualizer(unittest.TestCase):
+    """Test the engine visualizer on top of the cache."""
+
+    def test_cached_path_and_rendered_lookup(self):
+        visualizer = DecisionPathVisualizer({'background_rendering': False})
+        result = {'model_metadata': {'model_version': '2.0'}}
+        evidence = {'MaterialInfo': 2, 'Timing': 1, 'note': 'text'}
+
+        path = visualizer.generate_decision_path(result, evidence, 'insider_dealing')
+        again = visualizer.generate_decision_path(result, evidence, 'insider_dealing')
+        self.assertEqual([node.node_name for node in path], ['MaterialInfo', 'Timing'])
+        self.assertEqual(path, again)
+        self.assertEqual(visualizer.cache.metrics['cache_hits'], 1)
+
+        self.assertEqual(visualizer.get_rendered_path(evidence, 'insider_dealing', '2.0')['status'], 'pending')
+        visualizer.cache.render_pending()
+        rendered = visualizer.get_rendered_path(evidence, 'insider_dealing', '2.0')
+        self.assertEqual(rendered['status'], 'rendered')
+        self.assertEqual(len(json.loads(rendered['layout'])['edges']), 2)
+        self.assertEqual(visualizer.get_rendered_path(evidence, 'spoofing', '2.0')['status'], 'not_found')
+
+
+if __name__ == '__main__':
+    unittest.main()
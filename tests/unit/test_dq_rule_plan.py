@@ -0,0 +1,158 @@
+"""
+Unit tests for the compiled DQ rule plan.
+
+Covers compiled KDE rules against the dq_config.yaml semantics and hot
+reload of the plan when the config file changes.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import yaml
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.dq_rule_plan import DQRulePlan, DQRulePlanLoader
+from core.kde_first_dq_calculator import KDEFirstDQCalculator
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'dq_config.yaml')
+
+
+def load_config():
+    with open(CONFIG_PATH) as f:
+        return yaml.safe_load(f)
+
+
+class TestDQRulePlan(unittest.TestCase):
+    """Test compilation of KDE rules."""
+
+    def setUp(self):
+        self.config = load_config()
+        self.config['conformity_rules'] = {
+            'trader_id': {'length': {'min': 3, 'max': 6}, 'pattern': r'^T\d+$'},
+            'price': {'range': {'min': 0, 'max': 1000}}
+        }
+        self.config['accuracy_rules'] = {
+            'precision_rules': {'price': 2},
+            'validity_rules': {'currency': {'reference_source': 'currencies'}}
+        }
+        self.config['golden_sources'] = {
+            'currencies': {'source_type': 'static', 'values': ['USD', 'EUR']},
+            'desk_hr_mapping': {'source_type': 'redis', 'key_pattern': 'desk_hr:{trader_id}',
+                                'fields': ['desk_id']}
+        }
+        self.plan = DQRulePlan(self.config)
+
+    def test_conformity_rules(self):
+        trader = self.plan.kde('trader_id')
+        self.assertEqual(trader.score_conformity('T123'), 1.0)
+        self.assertEqual(trader.score_conformity('X123'), 0.0)
+        self.assertEqual(trader.score_conformity('T1234567'), 0.0)
+        self.assertEqual(trader.score_conformity(None), 0.0)
+
+        price = self.plan.kde('price')
+        self.assertEqual(price.score_conformity(10.5), 1.0)
+        self.assertEqual(price.score_conformity(-1), 0.0)
+        self.assertEqual(self.plan.kde('unruled_kde').score_conformity('anything'), 1.0)
+
+    def test_accuracy_rules(self):
+        self.assertEqual(self.plan.kde('price').score_precision(10.25), 1.0)
+        self.assertEqual(self.plan.kde('price').score_precision(10.255), 0.0)
+
+        currency = self.plan.kde('currency')
+        self.assertEqual(currency.reference_values, frozenset({'USD', 'EUR'}))
+        self.assertTrue(currency.check_reference('USD'))
+        self.assertFalse(currency.check_reference('GBP'))
+        self.assertFalse(currency.check_reference(['USD']))
+        self.assertIsNone(self.plan.kde('price').check_reference('USD'))
+
+    def test_weights_and_sources(self):
+        kde_risk = self.config['kde_risk']
+        for kde_name, risk in kde_risk.items():
+            self.assertEqual(self.plan.kde(kde_name).risk_weight, self.config['risk_weights'][risk])
+        self.assertEqual(self.plan.kde('unknown_kde').risk_weight, self.config['risk_weights']['medium'])
+        self.assertEqual(self.plan.kde('desk_id').golden_sources, ('desk_hr_mapping',))
+        self.assertEqual(self.plan.dimension_weights['completeness'],
+                         ('foundational', self.config['tier_weights']['foundational']))
+
+    def test_calculator_scores_with_plan(self):
+        calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH)
+        result = calculator.calculate_dqsi({'trader_id': 'T001', 'price': 100.0, 'notional': None})
+        self.assertIn(result['dqsi_trust_bucket'], ('High', 'Moderate', 'Low'))
+        self.assertEqual(result['kde_scores']['notional']['completeness'], 0.0)
+        self.assertEqual(result['kde_scores']['trader_id']['completeness'], 1.0)
+
+
+class TestDQRulePlanLoader(unittest.TestCase):
+    """Test hot reload of the compiled plan."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, 'dq_config.yaml')
+        shutil.copy(CONFIG_PATH, self.config_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_config(self, config):
+        with open(self.config_path, 'w') as f:
+            yaml.safe_dump(config, f)
+
+    def bump_mtime(self):
+        stat = os.stat(self.config_path)
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_reload_on_change(self):
+        calculator = KDEFirstDQCalculator(config_path=self.config_path, reload_interval=0)
+        first_plan = calculator.rule_plan
+        self.assertIs(calculator.rule_plan, first_plan)
+
+        config = load_config()
+        config['trust_bucket_thresholds'] = {'high': 0.99, 'moderate': 0.98}
+        self.write_config(config)
+        self.bump_mtime()
+
+        self.assertIsNot(calculator.rule_plan, first_plan)
+        self.assertEqual(calculator._plan_loader.reload_count, 1)
+        self.assertEqual(calculator._get_trust_bucket(0.9), 'Low')
+
+    def test_touch_without_change_keeps_plan(self):
+        loader = DQRulePlanLoader(self.config_path, check_interval=0)
+        first_plan = loader.plan
+        self.bump_mtime()
+
+        self.assertIs(loader.plan, first_plan)
+        self.assertEqual(loader.reload_count, 0)
+
+    def test_invalid_config_keeps_current_plan(self):
+        calculator = KDEFirstDQCalculator(config_path=self.config_path, reload_interval=0)
+        first_plan = calculator.rule_plan
+
+        config = load_config()
+        del config['tier_weights']
+        self.write_config(config)
+        self.bump_mtime()
+
+        self.assertIs(calculator.rule_plan, first_plan)
+        self.assertEqual(calculator._plan_loader.reload_count, 0)
+
+    def test_check_interval_throttles_stat(self):
+        loader = DQRulePlanLoader(self.config_path, check_interval=3600)
+        first_plan = loader.plan
+
+        config = load_config()
+        config['synthetic_kde_weight'] = 5
+        self.write_config(config)
+        self.bump_mtime()
+
+        self.assertIs(loader.plan, first_plan)
+        self.assertTrue(loader.reload_if_changed())
+        self.assertEqual(loader.plan.synthetic_weight, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Unit tests for the uniqueness sketches.
+
+Covers Bloom/HyperLogLog accuracy, rolling generations, snapshot/merge
+and duplicate scoring in the KDE-First calculator.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.dq_sketches import (
+    BloomFilter,
+    HyperLogLog,
+    RollingUniquenessSketch,
+    UniquenessTracker,
+    hash_values
+)
+from core.kde_first_dq_calculator import KDEFirstDQCalculator
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'dq_config.yaml')
+
+
+class TestSketches(unittest.TestCase):
+    """Test the underlying sketches."""
+
+    def test_bloom_has_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(capacity=20000, error_rate=0.01)
+        bloom.add_hashes(*hash_values(range(20000)))
+
+        self.assertTrue(bloom.contains_hashes(*hash_values(range(20000))).all())
+        false_positive_rate = bloom.contains_hashes(*hash_values(range(20000, 40000))).mean()
+        self.assertLess(false_positive_rate, 0.02)
+
+    def test_hyperloglog_estimate_and_merge(self):
+        first, second = HyperLogLog(12), HyperLogLog(12)
+        first.add_hashes(hash_values(range(50000))[0])
+        second.add_hashes(hash_values(range(25000, 75000))[0])
+        first.merge(second)
+
+        self.assertAlmostEqual(first.count() / 75000, 1.0, delta=0.05)
+        self.assertAlmostEqual(HyperLogLog(12).count(), 0.0)
+
+    def test_values_are_hashed_by_type(self):
+        self.assertNotEqual(hash_values([1])[0][0], hash_values(['1'])[0][0])
+
+
+class TestRollingUniquenessSketch(unittest.TestCase):
+    """Test rolling duplicate detection."""
+
+    def test_detects_history_and_in_batch_duplicates(self):
+        sketch = RollingUniquenessSketch(generation_size=1000, generations=2)
+        self.assertEqual(list(sketch.observe(['a', 'b', 'a'])), [False, False, True])
+        self.assertEqual(list(sketch.observe(['b', 'c'])), [True, False])
+        self.assertEqual(sketch.duplicates_seen, 2)
+
+    def test_keyed_observations_keep_their_verdict(self):
+        sketch = RollingUniquenessSketch(generation_size=1000, generations=2)
+        self.assertEqual(list(sketch.observe(['a', 'a', 'a'], ['r1', 'r2', 'r1'])), [False, True, False])
+        self.assertEqual(list(sketch.observe(['a', 'a', 'b'], ['r2', 'r1', 'r1'])), [True, False, False])
+        self.assertEqual(sketch.observed, 3)
+        self.assertEqual(sketch.duplicates_seen, 1)
+
+        restored = RollingUniquenessSketch.from_snapshot(sketch.snapshot())
+        self.assertEqual(list(restored.observe(['a', 'a'], ['r2', 'r3'])), [True, True])
+
+    def test_old_generations_roll_off(self):
+        sketch = RollingUniquenessSketch(generation_size=100, generations=2, error_rate=0.0001)
+        sketch.observe(range(100))
+        sketch.observe(range(100, 300))
+
+        self.assertEqual(sketch.observed, 200)
+        self.assertFalse(sketch.observe([5])[0])
+        self.assertTrue(sketch.observe([250])[0])
+
+    def test_snapshot_round_trip_and_merge(self):
+        worker_a = RollingUniquenessSketch(generation_size=5000)
+        worker_b = RollingUniquenessSketch(generation_size=5000)
+        worker_a.observe(range(0, 1000))
+        worker_b.observe(range(1000, 2000))
+
+        merged = RollingUniquenessSketch.from_snapshot(worker_a.snapshot())
+        merged.merge(RollingUniquenessSketch.from_snapshot(worker_b.snapshot()))
+
+        self.assertTrue(merged.observe([10, 1500]).all())
+        self.assertAlmostEqual(merged.distinct_count() / 2002, 1.0, delta=0.05)
+        with self.assertRaises(ValueError):
+            merged.merge(RollingUniquenessSketch(generation_size=10))
+
+
+class TestUniquenessTracker(unittest.TestCase):
+    """Test per-KDE tracking, persistence and calculator scoring."""
+
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+
+    def test_sketches_persist_between_runs(self):
+        tracker = UniquenessTracker(['trade_id'], state_dir=self.state_dir, generation_size=1000)
+        tracker.observe('trade_id', ['T1', 'T2'])
+        tracker.save()
+
+        restored = UniquenessTracker(['trade_id'], state_dir=self.state_dir, generation_size=1000)
+        self.assertEqual(list(restored.observe('trade_id', ['T2', 'T3'])), [True, False])
+
+    def test_merge_snapshot_from_worker(self):
+        tracker = UniquenessTracker(['trade_id'], generation_size=1000)
+        worker = UniquenessTracker(['trade_id'], generation_size=1000)
+        worker.observe('trade_id', ['W1'])
+
+        tracker.merge_snapshot(worker.snapshot())
+        self.assertTrue(tracker.observe('trade_id', ['W1'])[0])
+
+    def test_calculator_scores_duplicates(self):
+        tracker = UniquenessTracker(['trader_id'], generation_size=1000)
+        calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH, uniqueness_tracker=tracker)
+
+        first = calculator.calculate_dqsi({'trader_id': 'TRADER01', 'trade_id': 'A1'})
+        repeat = calculator.calculate_dqsi({'trader_id': 'TRADER01', 'trade_id': 'A2'})
+        self.assertEqual(first['kde_scores']['trader_id']['uniqueness'], 1.0)
+        self.assertEqual(repeat['kde_scores']['trader_id']['uniqueness'], 0.0)
+
+        scored = calculator.calculate_dqsi_frame(pd.DataFrame({
+            'trader_id': pd.Series(['TRADER02', 'TRADER01', 'TRADER02', None], dtype=object),
+            'trade_id': ['B1', 'B2', 'B3', 'B4']
+        }))
+        self.assertEqual(list(scored['trader_id.uniqueness']), [1.0, 0.0, 0.0, 0.0])
+
+        summary = calculator.get_uniqueness_summary()['trader_id']
+        self.assertEqual(summary['observed'], 5)
+        self.assertFalse(summary['within_tolerance'])
+
+    def test_rescoring_a_record_is_idempotent(self):
+        tracker = UniquenessTracker(['trader_id'], generation_size=1000)
+        calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH, uniqueness_tracker=tracker)
+        records = [{'trader_id': 'TRADER01', 'trade_id': 'A1'}, {'trader_id': 'TRADER01', 'trade_id': 'A2'}]
+
+        first = [calculator.calculate_dqsi(record)['kde_scores']['trader_id']['uniqueness'] for record in records]
+        rescored = [calculator.calculate_dqsi(record)['kde_scores']['trader_id']['uniqueness']
+                    for record in reversed(records)]
+        self.assertEqual(first, [1.0, 0.0])
+        self.assertEqual(rescored, [0.0, 1.0])
+
+        frame = pd.DataFrame(records)
+        self.assertEqual(list(calculator.calculate_dqsi_frame(frame)['trader_id.uniqueness']), [1.0, 0.0])
+        self.assertEqual(calculator.get_uniqueness_summary()['trader_id']['observed'], 2)
+
+    def test_frame_record_keys_match_row_keys(self):
+        calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH)
+        frame = pd.DataFrame({
+            'trader_id': pd.Series(['TRADER01', None, 42, float('nan')], dtype=object),
+            'price': [10.0, 10.5, float('nan'), 3.0],
+            'quantity': [1, 2, 3, 4]
+        })
+
+        keys = calculator._record_keys(frame).tolist()
+        self.assertEqual(keys, [calculator._record_key(record) for record in frame.to_dict('records')])
+        self.assertEqual(len(set(keys)), 4)
+
+    def test_record_keys_computed_once_per_frame(self):
+        tracker = UniquenessTracker(['trader_id', 'trade_id'], generation_size=1000)
+        calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH, uniqueness_tracker=tracker)
+        calculator.config['role_kde_scope']['analyst'] = ['trader_id', 'trade_id']
+        record_keys = calculator._record_keys
+        calls = []
+
+        def counted(data):
+            calls.append(len(data))
+            return record_keys(data)
+
+        calculator._record_keys = counted
+        scored = calculator.calculate_dqsi_frame(pd.DataFrame({'trader_id': ['T1', 'T1'], 'trade_id': ['A1', 'A2']}))
+        self.assertEqual(list(scored['trader_id.uniqueness']), [1.0, 0.0])
+        self.assertEqual(list(scored['trade_id.uniqueness']), [1.0, 1.0])
+        self.assertEqual(calls, [2])
+
+    def test_record_key_fields_identify_records(self):
+        tracker = UniquenessTracker(['trader_id'], generation_size=1000)
+        calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH, uniqueness_tracker=tracker)
+        calculator.config['uniqueness_tracking'] = {'record_key_fields': ['message_id']}
+
+        original = calculator.calculate_dqsi({'trader_id': 'TRADER01', 'message_id': 'M1', 'price': 10.0})
+        corrected = calculator.calculate_dqsi({'trader_id': 'TRADER01', 'message_id': 'M1', 'price': 10.5})
+        resent = calculator.calculate_dqsi({'trader_id': 'TRADER01', 'message_id': 'M2', 'price': 10.0})
+
+        self.assertEqual(original['kde_scores']['trader_id']['uniqueness'], 1.0)
+        self.assertEqual(corrected['kde_scores']['trader_id']['uniqueness'], 1.0)
+        self.assertEqual(resent['kde_scores']['trader_id']['uniqueness'], 0.0)
+
+    def test_untracked_calculator_is_unchanged(self):
+        calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH)
+        self.assertIsNone(calculator.uniqueness_tracker)
+        self.assertEqual(calculator.get_uniqueness_summary(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
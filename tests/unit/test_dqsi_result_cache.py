@@ -0,0 +1,107 @@
+"""
+Unit tests for the DQSI result cache.
+
+Covers canonical request keys, the memory and Redis tiers, hit-rate
+metrics and invalidation when the DQ configuration changes.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import fakeredis
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.dqsi_result_cache import ConfigVersion, DQSIResultCache
+
+
+class TestDQSIResultCache(unittest.TestCase):
+    """Test cache keys, tiers and invalidation."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, 'dq_config.yaml')
+        self.write_config('tier_weights: {foundational: 1.0}\n')
+        self.redis = fakeredis.FakeRedis()
+        self.cache = DQSIResultCache(
+            config_version=ConfigVersion([self.config_path], static={'threshold': 0.7}, check_interval=0),
+            redis_client=self.redis
+        )
+        self.dataset = [{'trader_id': 'T1', 'price': 10.0}, {'trader_id': 'T2', 'price': 11.0}]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_config(self, content):
+        with open(self.config_path, 'w') as f:
+            f.write(content)
+        if hasattr(self, 'cache'):
+            stat = os.stat(self.config_path)
+            os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def key(self, dataset=None, **kwargs):
+        return self.cache.result_key('calculate', dataset or self.dataset, role='analyst',
+                                     strategy='enhanced', **kwargs)
+
+    def test_key_ignores_field_order(self):
+        reordered = [{'price': 10.0, 'trader_id': 'T1'}, {'price': 11.0, 'trader_id': 'T2'}]
+        self.assertEqual(self.key(), self.key(reordered))
+        self.assertNotEqual(self.key(), self.key(options={'custom_weights': {'completeness': 2}}))
+        self.assertNotEqual(self.key(), self.cache.result_key('validate', self.dataset, role='analyst',
+                                                              strategy='enhanced'))
+
+    def test_memory_and_redis_hits(self):
+        key = self.key()
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, {'overall_score': 0.9})
+
+        self.assertEqual(self.cache.get(key), {'overall_score': 0.9})
+        self.cache.clear()
+        self.assertEqual(self.cache.get(key), {'overall_score': 0.9})
+
+        metrics = self.cache.get_metrics()
+        self.assertEqual(metrics['memory_hits'], 1)
+        self.assertEqual(metrics['redis_hits'], 1)
+        self.assertEqual(metrics['misses'], 1)
+        self.assertAlmostEqual(metrics['hit_rate'], 2 / 3)
+
+    def test_config_change_invalidates(self):
+        key = self.key()
+        self.cache.put(key, {'overall_score': 0.9})
+
+        self.write_config('tier_weights: {foundational: 2.0}\n')
+
+        self.assertIsNone(self.cache.get(key))
+        new_key = self.key()
+        self.assertNotEqual(new_key, key)
+        self.assertIsNone(self.cache.get(new_key))
+        self.assertEqual(self.cache.get_metrics()['invalidations'], 1)
+
+    def test_unchanged_content_keeps_version(self):
+        version = ConfigVersion([self.config_path], check_interval=0)
+        first = version()
+        self.write_config('tier_weights: {foundational: 1.0}\n')
+        self.assertEqual(version(), first)
+
+    def test_redis_errors_fall_back_to_miss(self):
+        class BrokenRedis:
+            def get(self, key):
+                raise ConnectionError('down')
+
+            def set(self, key, value, ex=None):
+                raise ConnectionError('down')
+
+        cache = DQSIResultCache(redis_client=BrokenRedis())
+        key = cache.result_key('validate', self.dataset)
+        cache.put(key, {'is_valid': True})
+        cache.clear()
+
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.get_metrics()['redis_errors'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,208 @@
+"""
+Unit tests for the incremental DQSI trend monitor.
+
+Rolling statistics must match a from-scratch computation over the same
+window, and repeated polls must only score new points.
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.dqsi_trend_monitor import DQSITrendMonitor, RollingTrendStats
+
+
+def batch_trend(scores, window):
+    recent = scores[-window:]
+    n = len(recent)
+    x = list(range(n))
+    sum_x, sum_y = sum(x), sum(recent)
+    sum_xy = sum(x[i] * recent[i] for i in range(n))
+    sum_x2 = sum(xi ** 2 for xi in x)
+    slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x ** 2)
+    mean = sum_y / n
+    volatility = (sum((y - mean) ** 2 for y in recent) / n) ** 0.5
+    return slope, mean, volatility
+
+
+class CountingScorer:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, dataset):
+        self.calls += 1
+        score = dataset['score']
+        return {'dqsi_score': score, 'dimension_scores': {'completeness': score}, 'status': 'ok'}
+
+
+def build_entries(scores, start=0):
+    return [{'timestamp': f'2024-01-01T00:{start + i:05d}', 'dataset': {'score': s}}
+            for i, s in enumerate(scores)]
+
+
+class TestRollingTrendStats(unittest.TestCase):
+    """Compare incremental statistics with a batch computation."""
+
+    def test_matches_batch_computation(self):
+        rng = random.Random(3)
+        scores = [rng.uniform(0.3, 1.0) for _ in range(500)]
+        stats = RollingTrendStats(window=30)
+        for i, score in enumerate(scores, start=1):
+            stats.add(score)
+            if i >= 2:
+                slope, mean, volatility = batch_trend(scores[:i], 30)
+                trend = stats.trend_analysis()
+                self.assertAlmostEqual(trend['trend_slope'], slope, places=9)
+                self.assertAlmostEqual(trend['recent_average'], mean, places=9)
+                self.assertAlmostEqual(trend['volatility'], volatility, places=6)
+
+    def test_breach_counters(self):
+        stats = RollingTrendStats(window=5)
+        for score in (0.9, 0.5, 0.3, 0.35, 0.9):
+            stats.add(score)
+        trend = stats.trend_analysis()
+        self.assertEqual(trend['breach_counts'], {'critical': 2, 'warning': 1, 'sudden_drop': 2})
+        self.assertEqual(trend['consecutive_breaches'], 0)
+
+    def test_insufficient_data(self):
+        stats = RollingTrendStats()
+        stats.add(0.9)
+        self.assertEqual(stats.trend_analysis(), {'trend_direction': 'insufficient_data'})
+
+
+class TestDQSITrendMonitor(unittest.TestCase):
+    """Test per-feed incremental scoring and persistence."""
+
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp()
+        self.scores = [0.9 - 0.01 * i for i in range(40)]
+
+    def tearDown(self):
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+
+    def test_repeated_polls_only_score_new_points(self):
+        monitor = DQSITrendMonitor()
+        scorer = CountingScorer()
+
+        monitor.observe('feed_a', build_entries(self.scores[:30]), scorer, window=7)
+        result = monitor.observe('feed_a', build_entries(self.scores), scorer, window=7)
+
+        self.assertEqual(scorer.calls, 40)
+        self.assertEqual(len(result['time_series_results']), 40)
+        self.assertAlmostEqual(result['trend_analysis']['trend_slope'], batch_trend(self.scores, 7)[0])
+        self.assertEqual(result['trend_analysis']['trend_direction'], 'stable')
+
+    def test_config_change_rescores(self):
+        monitor = DQSITrendMonitor()
+        scorer = CountingScorer()
+        monitor.observe('feed_a', build_entries(self.scores[:5]), scorer, config_key='a')
+        monitor.observe('feed_a', build_entries(self.scores[:5]), scorer, config_key='b')
+        self.assertEqual(scorer.calls, 10)
+
+    def test_revised_point_is_rescored(self):
+        monitor = DQSITrendMonitor()
+        scorer = CountingScorer()
+        entries = build_entries([0.9, 0.9, 0.9])
+        monitor.observe('feed_a', entries, scorer)
+
+        entries[1]['dataset'] = {'score': 0.2}
+        result = monitor.observe('feed_a', entries, scorer)
+
+        self.assertEqual(scorer.calls, 4)
+        self.assertEqual(result['trend_analysis']['breach_counts']['critical'], 1)
+        self.assertEqual([a['severity'] for a in result['alerts']], ['critical', 'warning'])
+
+    def test_out_of_order_points_follow_timestamp_order(self):
+        in_order = DQSITrendMonitor()
+        expected = in_order.observe('feed_a', build_entries(self.scores[:20]), CountingScorer(), window=7)
+
+        monitor = DQSITrendMonitor(max_points=15)
+        entries = build_entries(self.scores[:20])
+        monitor.observe('feed_a', entries[:5] + entries[10:], CountingScorer(), window=7)
+        result = monitor.observe('feed_a', list(reversed(entries[5:10])), CountingScorer(), window=7)
+
+        self.assertEqual(monitor.metrics['points_out_of_order'], 5)
+        self.assertEqual([r['timestamp'] for r in result['time_series_results']],
+                         [e['timestamp'] for e in reversed(entries[5:10])])
+        trend = result['trend_analysis']
+        self.assertAlmostEqual(trend['trend_slope'], batch_trend(self.scores[:20], 7)[0])
+        self.assertAlmostEqual(trend['recent_average'], expected['trend_analysis']['recent_average'])
+        self.assertEqual(trend['points_observed'], 15)
+        self.assertEqual(list(monitor._feeds['feed_a'].points), [e['timestamp'] for e in entries[5:]])
+        self.assertEqual(result['alerts'], [])
+
+    def test_timestamps_are_ordered_chronologically(self):
+        monitor = DQSITrendMonitor()
+        entries = [
+            {'timestamp': '2024-01-01T10:00:00+02:00', 'dataset': {'score': 0.9}},
+            {'timestamp': '2024-01-01T09:00:00Z', 'dataset': {'score': 0.5}}
+        ]
+        result = monitor.observe('feed_a', entries, CountingScorer())
+
+        self.assertEqual(monitor.metrics['points_out_of_order'], 0)
+        self.assertEqual(result['trend_analysis']['trend_direction'], 'declining')
+        self.assertEqual([a['severity'] for a in result['alerts']], ['warning', 'warning'])
+
+    def test_points_persist_between_monitors(self):
+        scorer = CountingScorer()
+        DQSITrendMonitor(state_dir=self.state_dir).observe('feed_a', build_entries(self.scores[:20]), scorer)
+
+        restored = DQSITrendMonitor(state_dir=self.state_dir)
+        result = restored.observe('feed_a', build_entries(self.scores[:25]), scorer, window=7)
+
+        self.assertEqual(scorer.calls, 25)
+        self.assertEqual(result['trend_analysis']['points_observed'], 25)
+        self.assertAlmostEqual(result['trend_analysis']['recent_average'], batch_trend(self.scores[:25], 7)[1])
+
+    def test_retention_limit(self):
+        monitor = DQSITrendMonitor(state_dir=self.state_dir, max_points=10)
+        monitor.observe('feed_a', build_entries(self.scores), CountingScorer())
+        self.assertEqual(monitor.get_feed_trend('feed_a')['points_observed'], 10)
+
+        restored = DQSITrendMonitor(state_dir=self.state_dir, max_points=10)
+        result = restored.observe('feed_a', [], CountingScorer())
+        self.assertEqual(result['trend_analysis']['points_observed'], 10)
+
+    def test_eviction_matches_rebuilt_statistics(self):
+        scores = [random.Random(i).choice([0.3, 0.5, 0.7, 0.9]) for i in range(60)]
+        monitor = DQSITrendMonitor(max_points=20)
+        for i in range(0, 60, 3):
+            result = monitor.observe('feed_a', build_entries(scores[i:i + 3], start=i), CountingScorer(), window=7)
+
+        rebuilt = DQSITrendMonitor().observe('feed_a', build_entries(scores[40:], start=40), CountingScorer(),
+                                             window=7)['trend_analysis']
+        trend = result['trend_analysis']
+        for key in ('points_observed', 'breach_counts', 'consecutive_breaches', 'trend_direction'):
+            self.assertEqual(trend[key], rebuilt[key], key)
+        self.assertAlmostEqual(trend['trend_slope'], rebuilt['trend_slope'])
+        self.assertAlmostEqual(trend['volatility'], rebuilt['volatility'])
+
+    def test_log_is_compacted_periodically(self):
+        monitor = DQSITrendMonitor(state_dir=self.state_dir, max_points=10)
+        rewrites = []
+        rewrite_log = monitor._rewrite_log
+        monitor._rewrite_log = lambda state: (rewrites.append(len(state.points)), rewrite_log(state))
+
+        for i in range(100):
+            monitor.observe('feed_a', build_entries([0.9], start=i), CountingScorer())
+
+        # Every ~max_points appends, not on every observe past the limit
+        self.assertEqual(len(rewrites), 8)
+        path = monitor._log_path('feed_a')
+        with open(path) as f:
+            self.assertLessEqual(sum(1 for _ in f) - 1, 20)
+
+        restored = DQSITrendMonitor(state_dir=self.state_dir, max_points=10)
+        result = restored.observe('feed_a', [], CountingScorer())
+        self.assertEqual(result['trend_analysis']['points_observed'], 10)
+        self.assertEqual(list(restored._feeds['feed_a'].points), list(monitor._feeds['feed_a'].points))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Unit tests for the schema-compiled DynamoDB item codecs.
+
+The codecs must produce exactly what the original recursive float/Decimal
+walk produced, for every entity type the repository writes.
+"""
+
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from src.services.dynamodb_codecs import (
+    ENTITY_CODECS,
+    SlotRecord,
+    decode_item,
+    decode_records,
+    encode_item,
+    get_codec
+)
+
+
+def legacy_to_decimal(obj):
+    if isinstance(obj, float):
+        return Decimal(str(obj))
+    elif isinstance(obj, dict):
+        return {k: legacy_to_decimal(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_to_decimal(item) for item in obj]
+    return obj
+
+
+def legacy_to_float(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    elif isinstance(obj, dict):
+        return {k: legacy_to_float(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_to_float(item) for item in obj]
+    return obj
+
+
+TRADE_ITEM = {
+    'PK': 'TRADER#trader_001',
+    'SK': 'TRADE#2024-12-15T14:30:22Z#trade_001',
+    'EntityType': 'TRADE',
+    'TradeID': 'trade_001',
+    'Timestamp': '2024-12-15T14:30:22Z',
+    'Instrument': 'ENERGY_CORP',
+    'Volume': 100000,
+    'Price': 50.25,
+    'Side': 'buy',
+    'Value': 5025000.0,
+    'TraderInfo': {'TraderID': 'trader_001', 'AccessLevel': 'high'},
+    'RiskIndicators': {'price_impact': 0.025, 'timing_score': 0.8, 'flags': [0.1, {'x': 1.5}]},
+    'RelatedEvents': [],
+    'ProcessedMetrics': {},
+    'GSI1PK': 'INSTRUMENT#ENERGY_CORP',
+    'TTL': 1900000000
+}
+
+RISK_ITEM = {
+    'PK': 'TRADER#trader_001',
+    'SK': 'RISK_SCORE#2024-12-15T14:30:22Z',
+    'EntityType': 'RISK_SCORE',
+    'OverallScore': 0.73,
+    'RiskProbabilities': {'low': 0.1, 'medium': 0.17, 'high': 0.73},
+    'EvidenceFactors': {'MaterialInfo': 2},
+    'NewsContext': 2,
+    'Explanation': 'text',
+    'Extra': {'undeclared': 0.5},
+    'TTL': 1900000000
+}
+
+
+class TestEntityCodecs(unittest.TestCase):
+    """Test codec equivalence and record decoding."""
+
+    def test_codecs_exist_for_all_entities(self):
+        for entity_type in ('TRADE', 'ALERT', 'RISK_SCORE', 'STOR_RECORD', 'REGULATORY_RATIONALE'):
+            self.assertIsNotNone(get_codec(entity_type))
+
+    def test_encode_matches_legacy_conversion(self):
+        for item in (TRADE_ITEM, RISK_ITEM):
+            self.assertEqual(encode_item(item), legacy_to_decimal(item))
+
+    def test_decode_matches_legacy_conversion(self):
+        for item in (TRADE_ITEM, RISK_ITEM):
+            stored = legacy_to_decimal(item)
+            stored['TTL'] = Decimal(stored['TTL'])
+            self.assertEqual(decode_item(stored), legacy_to_float(stored))
+
+    def test_unknown_entity_falls_back_to_full_walk(self):
+        item = {'PK': 'X', 'EntityType': 'OTHER', 'Nested': {'value': 0.3}}
+        self.assertEqual(encode_item(item), {'PK': 'X', 'EntityType': 'OTHER', 'Nested': {'value': Decimal('0.3')}})
+
+    def test_numpy_scalars_are_encoded(self):
+        item = {
+            'EntityType': 'RISK_SCORE',
+            'OverallScore': np.float64(0.73),
+            'NewsContext': np.int64(2),
+            'ESI': {'a': np.float64(0.2), 'b': [np.float32(0.5), np.int64(3)]},
+            'Extra': np.float64(1.5),
+            'Flag': True
+        }
+        encoded = encode_item(item)
+
+        self.assertEqual(encoded['OverallScore'], Decimal('0.73'))
+        self.assertIs(type(encoded['NewsContext']), int)
+        self.assertEqual(encoded['ESI'], {'a': Decimal('0.2'), 'b': [Decimal('0.5'), 3]})
+        self.assertIs(type(encoded['ESI']['b'][1]), int)
+        self.assertEqual(encoded['Extra'], Decimal('1.5'))
+        self.assertIs(encoded['Flag'], True)
+        self.assertEqual(encode_item({'EntityType': 'OTHER', 'v': np.float64(0.1)}),
+                         {'EntityType': 'OTHER', 'v': Decimal('0.1')})
+
+    def test_encode_does_not_mutate_input(self):
+        item = dict(TRADE_ITEM)
+        encode_item(item)
+        self.assertEqual(item['Price'], 50.25)
+
+    def test_decode_records_returns_slot_objects(self):
+        records = decode_records([legacy_to_decimal(TRADE_ITEM), {'EntityType': 'OTHER', 'v': Decimal('1.5')}])
+
+        trade = records[0]
+        self.assertIsInstance(trade, SlotRecord)
+        self.assertFalse(hasattr(trade, '__dict__'))
+        self.assertEqual(trade.Price, 50.25)
+        self.assertEqual(trade.RiskIndicators['flags'], [0.1, {'x': 1.5}])
+        self.assertIsNone(trade.get('Missing'))
+        self.assertEqual(trade.to_dict()['TradeID'], 'trade_001')
+        self.assertEqual(records[1], {'EntityType': 'OTHER', 'v': 1.5})
+
+    def test_record_classes_are_distinct_per_entity(self):
+        names = {codec.record_class.__name__ for codec in ENTITY_CODECS.values()}
+        self.assertIn('TradeRecord', names)
+        self.assertIn('StorRecord', names)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Unit tests for the DynamoDB write-behind buffer.
+
+Uses an in-memory stand-in for the boto3 resource so batching, coalescing and
+UnprocessedItems retry behaviour can be checked without AWS.
+"""
+
+import time
+import unittest
+from decimal import Decimal
+
+from src.services.dynamodb_write_buffer import (
+    DynamoDBWriteBehindBuffer,
+    write_batch_with_retry
+)
+
+
+class FakeDynamoDB:
+    """Records batch_write_item calls and optionally rejects items on the first attempts."""
+
+    def __init__(self, reject_first=0, reject_always=False):
+        self.calls = []
+        self.stored = {}
+        self.reject_first = reject_first
+        self.reject_always = reject_always
+
+    def batch_write_item(self, RequestItems):
+        table_name, requests = next(iter(RequestItems.items()))
+        self.calls.append(len(requests))
+
+        if self.reject_always:
+            return {'UnprocessedItems': {table_name: requests}}
+
+        rejected = requests[:self.reject_first]
+        self.reject_first = 0
+        for request in requests[len(rejected):]:
+            item = request['PutRequest']['Item']
+            self.stored[(item['PK'], item['SK'])] = item
+
+        return {'UnprocessedItems': {table_name: rejected} if rejected else {}}
+
+
+def make_item(i, value=1.5):
+    return {'PK': f'TRADER#t{i}', 'SK': f'TRADE#{i}', 'Value': Decimal(str(value))}
+
+
+class TestWriteBatchWithRetry(unittest.TestCase):
+    """Test UnprocessedItems handling."""
+
+    def test_unprocessed_items_are_retried(self):
+        dynamodb = FakeDynamoDB(reject_first=3)
+        sleeps = []
+
+        unprocessed, retries = write_batch_with_retry(
+            dynamodb, 'table', [make_item(i) for i in range(10)], sleep=sleeps.append
+        )
+
+        self.assertEqual(unprocessed, [])
+        self.assertEqual(retries, 1)
+        self.assertEqual(dynamodb.calls, [10, 3])
+        self.assertEqual(len(dynamodb.stored), 10)
+        self.assertTrue(0 <= sleeps[0] <= 0.05)
+
+    def test_gives_up_after_max_retries(self):
+        dynamodb = FakeDynamoDB(reject_always=True)
+
+        unprocessed, retries = write_batch_with_retry(
+            dynamodb, 'table', [make_item(0)], max_retries=3, sleep=lambda _: None
+        )
+
+        self.assertEqual(len(unprocessed), 1)
+        self.assertEqual(retries, 3)
+        self.assertEqual(len(dynamodb.calls), 4)
+
+    def test_rejects_oversized_batch(self):
+        with self.assertRaises(ValueError):
+            write_batch_with_retry(FakeDynamoDB(), 'table', [make_item(i) for i in range(26)])
+
+
+class TestDynamoDBWriteBehindBuffer(unittest.TestCase):
+    """Test batching, coalescing, flushing and metrics."""
+
+    def test_flush_writes_in_batches_of_25(self):
+        dynamodb = FakeDynamoDB()
+        buffer = DynamoDBWriteBehindBuffer(dynamodb, 'table', start_worker=False)
+
+        for i in range(60):
+            buffer.put(make_item(i))
+        self.assertEqual(buffer.queue_depth, 60)
+
+        written = buffer.flush()
+
+        self.assertEqual(written, 60)
+        self.assertEqual(dynamodb.calls, [25, 25, 10])
+        self.assertEqual(buffer.queue_depth, 0)
+
+    def test_same_key_is_coalesced(self):
+        dynamodb = FakeDynamoDB()
+        buffer = DynamoDBWriteBehindBuffer(dynamodb, 'table', start_worker=False)
+
+        buffer.put(make_item(1, value=1.0))
+        buffer.put(make_item(1, value=2.0))
+        buffer.flush()
+
+        metrics = buffer.get_metrics()
+        self.assertEqual(metrics['items_coalesced'], 1)
+        self.assertEqual(metrics['items_written'], 1)
+        self.assertEqual(dynamodb.stored[('TRADER#t1', 'TRADE#1')]['Value'], Decimal('2.0'))
+
+    def test_full_queue_applies_backpressure(self):
+        dynamodb = FakeDynamoDB()
+        buffer = DynamoDBWriteBehindBuffer(dynamodb, 'table', max_queue_size=30, start_worker=False)
+
+        for i in range(30):
+            buffer.put(make_item(i))
+
+        self.assertEqual(buffer.queue_depth, 0)
+        self.assertEqual(len(dynamodb.stored), 30)
+
+    def test_close_flushes_remaining_items(self):
+        dynamodb = FakeDynamoDB()
+        buffer = DynamoDBWriteBehindBuffer(dynamodb, 'table', flush_interval=60)
+
+        for i in range(5):
+            buffer.put(make_item(i))
+        buffer.close(timeout=5)
+
+        self.assertEqual(len(dynamodb.stored), 5)
+        self.assertTrue(buffer.get_metrics()['closed'])
+        with self.assertRaises(RuntimeError):
+            buffer.put(make_item(99))
+
+    def test_worker_flushes_on_size_threshold(self):
+        dynamodb = FakeDynamoDB()
+        buffer = DynamoDBWriteBehindBuffer(dynamodb, 'table', flush_interval=60)
+
+        for i in range(25):
+            buffer.put(make_item(i))
+
+        for _ in range(200):
+            if len(dynamodb.stored) == 25:
+                break
+            time.sleep(0.01)
+        buffer.close(timeout=5)
+
+        self.assertEqual(len(dynamodb.stored), 25)
+        self.assertGreaterEqual(buffer.get_metrics()['size_triggered_flushes'], 1)
+
+    def test_failed_items_are_kept_and_counted(self):
+        dynamodb = FakeDynamoDB(reject_always=True)
+        buffer = DynamoDBWriteBehindBuffer(dynamodb, 'table', max_retries=1, start_worker=False)
+
+        buffer.put(make_item(0))
+        buffer.flush()
+
+        metrics = buffer.get_metrics()
+        self.assertEqual(metrics['items_failed'], 1)
+        self.assertEqual(len(buffer.failed_items), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Unit tests for the explanation cache.
+
+Covers per-component LRU sizing and statistics, signature frequency
+tracking, reuse of cached explanations by the explainability engine and
+precomputing the most frequent signatures.
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from models.explainability.explainability_engine import ModelExplainabilityEngine
+from models.explainability.explanation_cache import ExplanationCache, SignatureFrequencyTracker
+
+
+class StubEngine:
+    """Sensitivity engine stand-in that only carries a model version."""
+
+    def __init__(self, model_version):
+        self.model_version = model_version
+
+
+class TestExplanationCache(unittest.TestCase):
+    """Test component caches and statistics."""
+
+    def test_component_sizes_and_statistics(self):
+        cache = ExplanationCache({'cache_size': 2, 'component_sizes': {'uncertainty': 0}})
+        for signature in ('a', 'b', 'c'):
+            cache.get_or_compute('attribution', signature, lambda: [signature])
+        cache.get_or_compute('attribution', 'c', lambda: self.fail('cached value expected'))
+        cache.put('uncertainty', 'a', 1)
+
+        statistics = cache.statistics()
+        self.assertEqual(statistics['attribution']['hits'], 1)
+        self.assertEqual(statistics['attribution']['misses'], 3)
+        self.assertEqual(statistics['attribution']['evictions'], 1)
+        self.assertEqual(statistics['attribution']['size'], 2)
+        self.assertAlmostEqual(statistics['attribution']['hit_rate'], 0.25)
+        self.assertEqual(statistics['uncertainty']['size'], 0)
+        self.assertIsNone(cache.get('attribution', 'a'))
+
+
+class TestSignatureFrequencyTracker(unittest.TestCase):
+    """Test sliding-window frequencies."""
+
+    def test_most_frequent_in_window(self):
+        tracker = SignatureFrequencyTracker(window_seconds=86400, bucket_seconds=3600)
+        now = datetime(2025, 3, 2, 12)
+        for _ in range(5):
+            tracker.record(('old',), {'n': 0}, now - timedelta(days=2))
+        for _ in range(3):
+            tracker.record(('hot',), {'n': 1}, now - timedelta(hours=2))
+        tracker.record(('cold',), {'n': 2}, now)
+
+        top = tracker.most_frequent(5, now)
+        self.assertEqual([(signature, count) for signature, count, _ in top], [(('hot',), 3), (('cold',), 1)])
+        self.assertEqual(top[0][2], {'n': 1})
+
+
+class TestEngineExplanationCache(unittest.TestCase):
+    """Test the explainability engine on top of the cache."""
+
+    def setUp(self):
+        self.engine = ModelExplainabilityEngine({'decision_path': {'background_rendering': False}})
+        self.model_result = {'risk_scores': {'overall_score': 0.6}, 'model_metadata': {'model_version': '1.0'}}
+        self.evidence = {'MaterialInfo': 2, 'Timing': 1}
+
+    def test_repeated_signature_reuses_components(self):
+        first = self.engine.generate_comprehensive_explanation(self.model_result, self.evidence, 'insider_dealing')
+        second = self.engine.generate_comprehensive_explanation(
+            self.model_result, dict(reversed(list(self.evidence.items()))), 'insider_dealing'
+        )
+
+        self.assertNotEqual(first['explanation_id'], second['explanation_id'])
+        self.assertEqual(first['feature_attributions'], second['feature_attributions'])
+        self.assertIsNot(first['feature_attributions'], second['feature_attributions'])
+        statistics = self.engine.get_cache_statistics()['components']
+        self.assertEqual(statistics['explanation']['hits'], 1)
+        self.assertEqual(statistics['attribution']['misses'], 1)
+
+    def test_model_version_is_part_of_signature(self):
+        self.engine.generate_comprehensive_explanation(self.model_result, self.evidence, 'insider_dealing')
+        other_version = {**self.model_result, 'model_metadata': {'model_version': '2.0'}}
+        self.engine.generate_comprehensive_explanation(other_version, self.evidence, 'insider_dealing')
+        self.engine.generate_comprehensive_explanation(self.model_result, {'MaterialInfo': 0}, 'insider_dealing')
+
+        self.assertEqual(self.engine.get_cache_statistics()['components']['explanation']['misses'], 3)
+
+    def test_sensitivity_engine_version_preferred(self):
+        unversioned = {'risk_scores': {'overall_score': 0.6}}
+        signature = self.engine._evidence_signature(unversioned, self.evidence, 'insider_dealing',
+                                                    sensitivity_engine=StubEngine('cpd-hash'))
+        self.assertEqual(signature[1], 'cpd-hash')
+        self.assertIsNone(signature[-1])
+        signature = self.engine._evidence_signature(unversioned, self.evidence, 'insider_dealing')
+        self.assertEqual(signature[1], 'unversioned')
+        self.assertIn(('risk_scores', (('overall_score', 0.6),)), signature[-1])
+
+    def test_result_is_part_of_fallback_signature(self):
+        self.engine.generate_comprehensive_explanation(self.model_result, self.evidence, 'insider_dealing')
+        rescored = {**self.model_result, 'risk_scores': {'overall_score': 0.9}}
+        self.engine.generate_comprehensive_explanation(rescored, self.evidence, 'insider_dealing')
+        self.engine.generate_comprehensive_explanation(rescored, self.evidence, 'insider_dealing')
+
+        statistics = self.engine.get_cache_statistics()['components']['explanation']
+        self.assertEqual((statistics['misses'], statistics['hits']), (2, 1))
+
+    def test_precompute_warms_frequent_signatures(self):
+        for _ in range(3):
+            self.engine.generate_comprehensive_explanation(self.model_result, self.evidence, 'insider_dealing')
+        self.engine.generate_comprehensive_explanation(self.model_result, {'Timing': 2}, 'insider_dealing')
+
+        self.engine.component_cache.clear()
+        self.assertEqual(self.engine.precompute(top_n=1), 1)
+        self.assertEqual(self.engine.precompute(top_n=1), 0)
+
+        self.engine.generate_comprehensive_explanation(self.model_result, self.evidence, 'insider_dealing')
+        self.assertEqual(self.engine.get_cache_statistics()['components']['explanation']['hits'], 3)
+
+    def test_explanation_history_is_bounded(self):
+        engine = ModelExplainabilityEngine({'explanation_cache': {'explanation_history_size': 2}})
+        for _ in range(4):
+            engine.generate_comprehensive_explanation(self.model_result, self.evidence, 'insider_dealing')
+        self.assertEqual(len(engine.explanation_cache), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Unit tests for pipelined, cached golden-source lookups.
+
+Runs against fakeredis; consistency and validity scoring must cost at
+most one Redis round trip per record (or per batch).
+"""
+
+import json
+import os
+import sys
+import unittest
+
+import fakeredis
+import pandas as pd
+import redis
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.golden_source_client import GoldenSourceClient
+from core.kde_first_dq_calculator import KDEFirstDQCalculator
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'dq_config.yaml')
+
+GOLDEN_SOURCES = {
+    'desk_hr_mapping': {
+        'source_type': 'redis',
+        'key_pattern': 'desk_hr:{trader_id}',
+        'fields': ['desk_id', 'department', 'manager_id']
+    },
+    'venue_master': {
+        'source_type': 'redis',
+        'key_pattern': 'venue:{venue_code}',
+        'fields': ['venue_name', 'region']
+    },
+    'currency_set': {
+        'source_type': 'redis',
+        'set_key': 'ref:currencies'
+    }
+}
+
+
+def seed(redis_client):
+    redis_client.set('desk_hr:T1', json.dumps({'desk_id': 'RATES', 'department': 'FICC'}))
+    redis_client.set('desk_hr:T2', json.dumps({'desk_id': 'FX', 'department': 'FICC'}))
+    redis_client.set('venue:XLON', json.dumps({'venue_name': 'LSE', 'region': 'EU'}))
+    redis_client.sadd('ref:currencies', 'USD', 'EUR')
+
+
+class UnreachablePipeline:
+    """Pipeline that queues commands but fails on execute, as with Redis down."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        raise redis.ConnectionError('Error 111 connecting to localhost:6379. Connection refused.')
+
+
+class UnreachableRedis:
+    """Redis client whose pipelines cannot reach the server."""
+
+    def pipeline(self, transaction=True):
+        return UnreachablePipeline()
+
+
+class TestGoldenSourceClient(unittest.TestCase):
+    """Test batching and caching of golden-source lookups."""
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        seed(self.redis)
+        self.client = GoldenSourceClient(self.redis, GOLDEN_SOURCES)
+
+    def test_prefetch_uses_single_round_trip(self):
+        records = [{'trader_id': f'T{i % 3}'} for i in range(50)]
+        self.client.prefetch(records, membership={'currency_set': ['USD', 'GBP'], 'venue_master': ['XLON']})
+
+        self.assertEqual(self.client.metrics['round_trips'], 1)
+        self.assertEqual(self.client.get_record('desk_hr_mapping', {'trader_id': 'T1'})['desk_id'], 'RATES')
+        self.assertIsNone(self.client.get_record('desk_hr_mapping', {'trader_id': 'T0'}))
+        self.assertEqual(self.client.check_membership('currency_set', ['USD', 'GBP']), [True, False])
+        self.assertEqual(self.client.check_membership('venue_master', ['XLON']), [True])
+        self.assertEqual(self.client.metrics['round_trips'], 1)
+
+    def test_missing_key_fields_skip_lookup(self):
+        self.assertIsNone(self.client.get_record('desk_hr_mapping', {'trader_id': None}))
+        self.assertEqual(self.client.metrics['round_trips'], 0)
+
+    def test_unknown_sources_cannot_be_checked(self):
+        self.assertIsNone(self.client.check_membership('product_master', ['X']))
+        self.assertFalse(self.client.supports_membership('product_master'))
+
+    def test_redis_errors_leave_values_unchecked(self):
+        client = GoldenSourceClient(UnreachableRedis(), GOLDEN_SOURCES)
+
+        self.assertIsNone(client.check_membership('currency_set', ['USD']))
+        self.assertEqual(client.metrics['errors'], 1)
+
+
+class TestCalculatorGoldenSources(unittest.TestCase):
+    """Test golden-source backed consistency and validity scoring."""
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        seed(self.redis)
+        self.calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH, redis_client=self.redis)
+        self.calculator.config['role_kde_scope']['analyst'] = ['trader_id', 'desk_id', 'venue']
+
+    def test_consistency_against_golden_record(self):
+        matching = self.calculator.calculate_dqsi({'trader_id': 'T1', 'desk_id': 'RATES', 'venue': 'XLON'})
+        conflicting = self.calculator.calculate_dqsi({'trader_id': 'T2', 'desk_id': 'RATES', 'venue': 'XXXX'})
+
+        self.assertEqual(matching['kde_scores']['desk_id']['consistency'], 1.0)
+        self.assertEqual(conflicting['kde_scores']['desk_id']['consistency'], 0.0)
+        self.assertEqual(matching['kde_scores']['venue']['accuracy'], 1.0)
+        self.assertEqual(conflicting['kde_scores']['venue']['accuracy'], 0.5)
+        self.assertEqual(self.calculator.golden_source_client.metrics['round_trips'], 2)
+
+    def test_frame_scoring_prefetches_batch(self):
+        records = [{'trader_id': f'T{i % 3}', 'desk_id': 'FX', 'venue': ['XLON', 'XPAR'][i % 2]} for i in range(40)]
+        scored = self.calculator.calculate_dqsi_frame(pd.DataFrame(records))
+
+        self.assertEqual(self.calculator.golden_source_client.metrics['round_trips'], 1)
+        for row, record in zip(scored.to_dict('records'), records):
+            expected = self.calculator.calculate_dqsi(record)
+            self.assertEqual(row['desk_id.consistency'], expected['kde_scores']['desk_id']['consistency'])
+            self.assertEqual(row['venue.accuracy'], expected['kde_scores']['venue']['accuracy'])
+        self.assertEqual(self.calculator.golden_source_client.metrics['round_trips'], 1)
+
+    def test_without_redis_scores_are_unchanged(self):
+        calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH)
+        result = calculator.calculate_dqsi({'trader_id': 'T1', 'venue': 'XLON'}, user_role='trader_role')
+        self.assertEqual(result['kde_scores']['venue']['accuracy'], 0.75)
+
+
+if __name__ == '__main__':
+    unittest.main()
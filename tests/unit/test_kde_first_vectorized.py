@@ -0,0 +1,127 @@
+"""
+Unit tests for column-wise KDE-First DQSI scoring.
+
+Scoring a DataFrame must give every row exactly the scores that
+calculate_dqsi gives the same record.
+"""
+
+import os
+import random
+import sys
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.dq_rule_plan import DQRulePlan
+from core.kde_first_dq_calculator import KDEFirstDQCalculator
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'dq_config.yaml')
+
+
+def build_frame(rng, n_rows):
+    trader_ids = ['TRADER01', 'trader_x', 'T1', 'ABCDEFGHIJKLMN', None, '', 'N/A', 'TR99']
+    currencies = ['USD', 'EUR', 'XXX', None, 'unknown']
+    dates = ['2024-01-15T09:00:00', '2024-01-14T10:30:00', '2024-01-01T00:00:00', None, 'not-a-date']
+    return pd.DataFrame({
+        'trader_id': [rng.choice(trader_ids) for _ in range(n_rows)],
+        'notional': [rng.choice([1500000.0, 12.5, -5.0, 2e12, None, 250000.125]) for _ in range(n_rows)],
+        'price': [round(rng.uniform(0, 500), rng.choice([2, 4, 6])) for _ in range(n_rows)],
+        'quantity': [rng.choice([100, 5000, 0, None]) for _ in range(n_rows)],
+        'currency': [rng.choice(currencies) for _ in range(n_rows)],
+        'product_code': [rng.choice(['EQ_SWAP', 'fx-fwd', None, 'BOND1']) for _ in range(n_rows)],
+        'desk_code': [rng.choice(['DESK1', 'null', None]) for _ in range(n_rows)],
+        'trade_date': [rng.choice(dates) for _ in range(n_rows)],
+        'venue': [rng.choice(['XLON', 42, None]) for _ in range(n_rows)]
+    })
+
+
+class TestKDEFirstFrameScoring(unittest.TestCase):
+    """Compare calculate_dqsi_frame with per-record calculate_dqsi."""
+
+    def setUp(self):
+        self.calculator = KDEFirstDQCalculator(config_path=CONFIG_PATH)
+        self.alert_timestamp = datetime(2024, 1, 15, 12, 0, 0)
+        self.frame = build_frame(random.Random(7), 200)
+
+    def assert_matches_row_scoring(self, frame, baseline_data, user_role):
+        scored = self.calculator.calculate_dqsi_frame(frame, baseline_data, user_role, self.alert_timestamp)
+
+        self.assertEqual(list(scored.index), list(frame.index))
+        for (_, row), record in zip(scored.iterrows(), frame.to_dict('records')):
+            expected = self.calculator.calculate_dqsi(record, baseline_data, user_role, self.alert_timestamp)
+            self.assertEqual(row['dqsi_score'], expected['dqsi_score'])
+            self.assertEqual(row['dqsi_trust_bucket'], expected['dqsi_trust_bucket'])
+            self.assertEqual(row['legacy_dq_score'], expected['legacy_dq_score'])
+            self.assertAlmostEqual(row['foundational_score'], expected['quality_metadata']['foundational_score'])
+            self.assertAlmostEqual(row['enhanced_score'], expected['quality_metadata']['enhanced_score'])
+            for kde_name, dimension_scores in expected['kde_scores'].items():
+                for dimension, score in dimension_scores.items():
+                    self.assertEqual(row[f"{kde_name}.{dimension}"], score, f"{kde_name}.{dimension}")
+            for name, score in expected['synthetic_scores'].items():
+                self.assertEqual(row[f"synthetic.{name}"], score, name)
+
+    def test_mixed_object_columns_match_row_scoring(self):
+        for user_role in ('analyst', 'trader_role', 'compliance'):
+            with self.subTest(user_role=user_role):
+                self.assert_matches_row_scoring(self.frame, {'volume': 12, 'value': 1000000}, user_role)
+
+    def test_typed_columns_match_row_scoring(self):
+        frame = self.frame.dropna().reset_index(drop=True)
+        frame['quantity'] = frame['quantity'].astype(int)
+        frame['trade_date'] = '2024-01-15T11:00:00'
+        self.assert_matches_row_scoring(frame, None, 'trader_role')
+
+    def test_reload_mid_frame_keeps_one_plan(self):
+        expected = self.calculator.calculate_dqsi_frame(self.frame, {'volume': 12, 'value': 1000000},
+                                                        'analyst', self.alert_timestamp)
+        reloaded = DQRulePlan({**self.calculator.config,
+                               'timeliness_buckets': [{'max_hours': 1e9, 'score': 0.0}],
+                               'coverage_scoring': [{'max_drop_percent': 100, 'score': 0.0}],
+                               'trust_bucket_thresholds': {'high': 0.0, 'moderate': 0.0}})
+        score_kde_column = self.calculator.score_kde_column
+
+        def reload_then_score(*args, **kwargs):
+            self.calculator._plan_loader._plan = reloaded
+            return score_kde_column(*args, **kwargs)
+
+        self.calculator.score_kde_column = reload_then_score
+        scored = self.calculator.calculate_dqsi_frame(self.frame, {'volume': 12, 'value': 1000000},
+                                                      'analyst', self.alert_timestamp)
+        for column in ('synthetic.timeliness', 'synthetic.coverage', 'dqsi_score', 'dqsi_trust_bucket'):
+            self.assertEqual(list(scored[column]), list(expected[column]), column)
+
+    def test_reload_mid_record_keeps_one_plan(self):
+        record = self.frame.to_dict('records')[0]
+        expected = self.calculator.calculate_dqsi(record, None, 'analyst', self.alert_timestamp)
+        reloaded = DQRulePlan({**self.calculator.config, 'legacy_support': {'enabled': False},
+                               'trust_bucket_thresholds': {'high': 0.0, 'moderate': 0.0}})
+        calculate_kde_scores = self.calculator._calculate_kde_scores
+
+        def reload_then_score(*args, **kwargs):
+            self.calculator._plan_loader._plan = reloaded
+            return calculate_kde_scores(*args, **kwargs)
+
+        self.calculator._calculate_kde_scores = reload_then_score
+        result = self.calculator.calculate_dqsi(record, None, 'analyst', self.alert_timestamp)
+        self.assertEqual(result['legacy_dq_score'], expected['legacy_dq_score'])
+        self.assertEqual(result['dqsi_trust_bucket'], expected['dqsi_trust_bucket'])
+
+    def test_score_kde_column_accepts_lists(self):
+        scores = self.calculator.score_kde_column('currency', ['USD', 'XXX', None])
+
+        np.testing.assert_array_equal(scores['completeness'], [1.0, 1.0, 0.0])
+        np.testing.assert_array_equal(scores['accuracy'], [1.0, 0.5, 0.0])
+
+    def test_empty_frame(self):
+        scored = self.calculator.calculate_dqsi_frame(self.frame.iloc[:0], None, 'analyst', self.alert_timestamp)
+        self.assertEqual(len(scored), 0)
+        self.assertIn('dqsi_score', scored.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
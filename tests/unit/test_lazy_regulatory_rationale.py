@@ -0,0 +1,141 @@
+"""
+Unit tests for lazy, template-cached regulatory rationales.
+
+Covers deferred generation, sharing of evidence-dependent parts between
+alerts with the same evidence profile, and per-alert fields.
+"""
+
+import os
+import sys
+import unittest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.alert_generator import AlertGenerator
+from core.evidence_mapper import map_insider_dealing_evidence
+from core.regulatory_explainability import RegulatoryExplainability
+
+
+class StubEngine:
+    """Sensitivity engine stand-in that only carries a model version."""
+
+    axis = {}
+    target = 'outcome'
+
+    def __init__(self, model_version):
+        self.model_version = model_version
+
+
+class RecordingEngine(StubEngine):
+    """Sensitivity engine stand-in that records the evidence it analyzes."""
+
+    axis = {'comms_intent': 0, 'news_timing': 1, 'state_information_access': 2, 'trade_pattern': 3}
+
+    def __init__(self):
+        super().__init__('v1')
+        self.analyzed = []
+
+    def analyze(self, evidence):
+        self.analyzed.append(evidence)
+        raise RuntimeError('report not needed')
+
+
+class TestLazyRegulatoryRationale(unittest.TestCase):
+    """Test rationale handles and template sharing."""
+
+    def setUp(self):
+        self.explainability = RegulatoryExplainability()
+        self.evidence = {'MaterialInfo': 2, 'TradingActivity': 1, 'trades': [{'id': 1}]}
+
+    def test_generated_on_first_access_only(self):
+        handle = self.explainability.lazy_rationale('A1', {'overall_score': 0.8, 'risk_level': 'high'},
+                                                    self.evidence)
+        self.assertFalse(handle.resolved)
+        self.assertEqual(self.explainability.template_metrics['misses'], 0)
+
+        self.assertEqual(handle.alert_id, 'A1')
+        self.assertTrue(handle.resolved)
+        self.assertIs(handle.get(), handle.get())
+
+    def test_same_evidence_profile_shares_template(self):
+        first = self.explainability.generate_regulatory_rationale(
+            'A1', {'overall_score': 0.8, 'risk_level': 'high'}, self.evidence)
+        second = self.explainability.generate_regulatory_rationale(
+            'A2', {'overall_score': 0.6, 'risk_level': 'medium'}, dict(self.evidence, trades=[]))
+
+        self.assertIs(first.inference_paths, second.inference_paths)
+        self.assertEqual(first.deterministic_narrative, second.deterministic_narrative)
+        self.assertEqual((second.alert_id, second.overall_score, second.risk_level), ('A2', 0.6, 'medium'))
+        self.assertIn('Overall risk score: 0.600', second.audit_trail)
+        self.assertEqual(self.explainability.template_metrics, {'hits': 1, 'misses': 1})
+
+    def test_template_keyed_by_model_type_and_version(self):
+        risk = {'overall_score': 0.8}
+        self.explainability.generate_regulatory_rationale('A1', risk, self.evidence)
+        self.explainability.generate_regulatory_rationale('A2', risk, self.evidence, model_type='spoofing')
+        self.explainability.register_sensitivity_engine('insider_dealing', StubEngine('v2'))
+        self.explainability.generate_regulatory_rationale('A3', risk, self.evidence)
+        self.explainability.generate_regulatory_rationale('A4', risk, {'MaterialInfo': 1})
+
+        self.assertEqual(self.explainability.template_metrics, {'hits': 0, 'misses': 4})
+
+    def test_score_dependent_narrative_filled_per_alert(self):
+        high = self.explainability.generate_regulatory_rationale(
+            'A1', {'overall_score': 0.9}, self.evidence, model_type='market_manipulation')
+        low = self.explainability.generate_regulatory_rationale(
+            'A2', {'overall_score': 0.1}, self.evidence, model_type='market_manipulation')
+
+        self.assertIn('High probability', high.deterministic_narrative)
+        self.assertIn('No significant', low.deterministic_narrative)
+        self.assertIs(high.key_evidence, low.key_evidence)
+
+    def test_alert_generator_handle_uses_alert_type(self):
+        generator = AlertGenerator()
+        handle = generator.regulatory_rationale_handle(
+            {'id': 'spoofing_1', 'type': 'SPOOFING'}, {'overall_score': 0.9}, {'OrderPattern': 2}
+        )
+        self.assertEqual(handle.alert_id, 'spoofing_1')
+        self.assertEqual(handle.regulatory_basis, 'MiFID II Article 48 - Market manipulation')
+        self.assertIn('manipulative order patterns', handle.deterministic_narrative)
+
+
+class TestSensitivityEngineWiring(unittest.TestCase):
+    """Processed trading data must reach the sensitivity engine as node states."""
+
+    def test_processed_data_is_mapped_to_node_states(self):
+        engine = RecordingEngine()
+        explainability = RegulatoryExplainability()
+        explainability.register_sensitivity_engine('insider_dealing', engine,
+                                                   evidence_mapper=map_insider_dealing_evidence)
+        processed_data = {'comms': {'intent': 'malicious'}, 'hr': {'role': 'ceo'}, 'trade': {'trades': []}}
+
+        explainability.generate_regulatory_rationale('A1', {'overall_score': 0.8}, processed_data)
+
+        self.assertEqual(engine.analyzed, [{
+            'comms_intent': 2, 'news_timing': 0, 'state_information_access': 2, 'trade_pattern': 0
+        }])
+
+    def test_explicit_states_override_mapped_states(self):
+        engine = RecordingEngine()
+        explainability = RegulatoryExplainability(sensitivity_engines={'insider_dealing': engine},
+                                                  evidence_mappers={'insider_dealing': map_insider_dealing_evidence})
+
+        explainability.generate_regulatory_rationale('A1', {'overall_score': 0.8}, {'trade_pattern': 1})
+
+        self.assertEqual(engine.analyzed[0]['trade_pattern'], 1)
+
+    def test_alert_generator_uses_insider_dealing_network(self):
+        generator = AlertGenerator()
+        self.assertIn('insider_dealing', generator.regulatory_explainability.sensitivity_engines)
+
+        rationale = generator.generate_regulatory_rationale(
+            {'id': 'insider_1', 'type': 'INSIDER_DEALING'}, {'overall_score': 0.8},
+            {'comms': {'intent': 'suspicious'}, 'hr': {'access_level': 'senior'}}
+        )
+        self.assertEqual(rationale.voi_analysis['method'], 'expected_entropy_reduction')
+        self.assertEqual(rationale.sensitivity_report['method'], 'cpd_derivative')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Unit tests for the metric time-series store.
+
+Covers rollups maintained on write, window aggregates against the raw
+points, persistence and the performance monitor and governance wiring.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from models.explainability.governance_tracker import ModelGovernanceTracker, ModelPerformanceMonitor
+from models.explainability.metric_store import MetricTimeSeriesStore, SlidingMedian
+
+
+class TestMetricTimeSeriesStore(unittest.TestCase):
+    """Test writes, rollups and aggregates."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = MetricTimeSeriesStore(self.temp_dir, raw_retention_days=400)
+        self.start = datetime(2025, 1, 1)
+        rng = np.random.default_rng(0)
+        self.times = [self.start + timedelta(minutes=int(m)) for m in np.sort(rng.integers(0, 60 * 24 * 40, 2000))]
+        self.values = rng.uniform(0.5, 1.0, len(self.times))
+        for time, value in zip(self.times, self.values):
+            self.store.record('m1', 'accuracy', value, time, status='critical' if value < 0.55 else 'normal')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def expected(self, start, end):
+        selected = [v for t, v in zip(self.times, self.values) if start <= t < end]
+        return len(selected), sum(selected), min(selected), max(selected), sum(v < 0.55 for v in selected)
+
+    def test_aggregate_matches_raw_points(self):
+        for start, end in [
+            (self.start + timedelta(days=2, hours=5, minutes=17), self.start + timedelta(days=31, hours=1, minutes=3)),
+            (self.start + timedelta(hours=1), self.start + timedelta(hours=3)),
+            (self.start + timedelta(minutes=10), self.start + timedelta(minutes=50)),
+        ]:
+            totals = self.store.aggregate('m1', 'accuracy', start, end)
+            count, total, low, high, critical = self.expected(start, end)
+            self.assertEqual(totals['count'], count)
+            self.assertAlmostEqual(totals['sum'], total)
+            self.assertAlmostEqual(totals['mean'], total / count)
+            self.assertEqual((totals['min'], totals['max'], totals['critical']), (low, high, critical))
+
+    def test_late_points_update_rollups(self):
+        late = self.start + timedelta(days=3, minutes=30)
+        self.store.record('m1', 'accuracy', 0.1, late, status='critical')
+        rows = self.store.history('m1', 'accuracy', self.start + timedelta(days=3), self.start + timedelta(days=4))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['min'], 0.1)
+        count, _, _, _, _ = self.expected(self.start + timedelta(days=3), self.start + timedelta(days=4))
+        self.assertEqual(rows[0]['count'], count + 1)
+
+    def test_history_resolutions(self):
+        days = self.store.history('m1', 'accuracy', self.start, self.start + timedelta(days=10))
+        hours = self.store.history('m1', 'accuracy', self.start, self.start + timedelta(days=1), resolution='hour')
+
+        self.assertEqual(days[0]['timestamp'], '2025-01-01T00:00:00')
+        self.assertEqual(sum(row['count'] for row in days), self.expected(self.start, self.start + timedelta(days=10))[0])
+        self.assertTrue(all(row['timestamp'] < '2025-01-02' for row in hours))
+        with self.assertRaises(ValueError):
+            self.store.history('m1', 'accuracy', self.start, resolution='week')
+
+    def test_raw_points_expire_into_rollups(self):
+        store = MetricTimeSeriesStore(raw_retention_days=7)
+        for time, value in zip(self.times, self.values):
+            store.record('m1', 'accuracy', value, time)
+
+        self.assertLess(len(store.raw_points('m1', 'accuracy', self.start)['value']), 600)
+        totals = store.aggregate('m1', 'accuracy', self.start, self.start + timedelta(days=20))
+        self.assertEqual(totals['count'], self.expected(self.start, self.start + timedelta(days=20))[0])
+
+    def test_median_follows_retention(self):
+        store = MetricTimeSeriesStore(raw_retention_days=7)
+        for time, value in zip(self.times, self.values):
+            store.record('m1', 'accuracy', value, time)
+            retained = store.raw_points('m1', 'accuracy', self.start)['value']
+            self.assertEqual(store.median('m1', 'accuracy'), float(np.median(retained)))
+
+    def test_persisted_and_reloaded(self):
+        self.store.flush()
+        reloaded = MetricTimeSeriesStore(self.temp_dir, raw_retention_days=400)
+
+        end = self.start + timedelta(days=41)
+        self.assertEqual(reloaded.metrics('m1'), ['accuracy'])
+        self.assertEqual(reloaded.aggregate('m1', 'accuracy', self.start, end),
+                         self.store.aggregate('m1', 'accuracy', self.start, end))
+        self.assertEqual(reloaded.median('m1', 'accuracy'), float(np.median(self.values)))
+
+
+class TestSlidingMedian(unittest.TestCase):
+    """Test the incremental median against numpy."""
+
+    def test_matches_numpy_under_inserts_and_removals(self):
+        rng = np.random.default_rng(1)
+        values = list(rng.integers(0, 20, 50).astype(float))
+        median = SlidingMedian(values)
+        for _ in range(2000):
+            if values and rng.random() < 0.45:
+                value = values.pop(int(rng.integers(0, len(values))))
+                median.remove(value)
+            else:
+                value = float(rng.integers(0, 20))
+                values.append(value)
+                median.add(value)
+            self.assertEqual(median.median(), float(np.median(values)) if values else None)
+            self.assertEqual(len(median), len(values))
+
+
+class TestPerformanceMonitorStore(unittest.TestCase):
+    """Test the monitor and governance tracker on top of the store."""
+
+    def test_recent_performance_and_baseline(self):
+        monitor = ModelPerformanceMonitor({})
+        now = datetime.utcnow()
+        monitor.evaluate_performance('m1', {'accuracy': 0.9}, now - timedelta(days=30))
+        monitor.evaluate_performance('m1', {'accuracy': 0.7, 'recall': 0.8}, now - timedelta(days=2))
+        result = monitor.evaluate_performance('m1', {'accuracy': 0.95}, now - timedelta(hours=1))
+
+        self.assertEqual(result['metrics'][0]['baseline_value'], 0.8)
+        recent = monitor.get_recent_performance('m1')
+        self.assertAlmostEqual(recent['overall_score'], (0.7 + 0.8 + 0.95) / 3)
+        self.assertEqual(recent['status'], 'warning')
+        self.assertEqual([m['metric_name'] for m in recent['metrics']], ['accuracy', 'recall', 'accuracy'])
+        self.assertEqual(recent['metric_summaries']['accuracy']['count'], 2)
+
+    def test_governance_history(self):
+        tracker = ModelGovernanceTracker()
+        start = datetime.utcnow() - timedelta(days=300)
+        for day in range(300):
+            tracker.performance_monitor.evaluate_performance('m1', {'accuracy': 0.8}, start + timedelta(days=day))
+
+        history = tracker.get_governance_history('m1')
+        self.assertEqual(sum(row['count'] for row in history['performance']['accuracy']), 300)
+        self.assertGreater(tracker.get_governance_status('m1')['governance_score'], 0.0)
+
+    def test_governance_status_reads_rollups_only(self):
+        tracker = ModelGovernanceTracker()
+        monitor = tracker.performance_monitor
+        now = datetime.utcnow()
+        for hour in range(48):
+            monitor.evaluate_performance('m1', {'accuracy': 0.9, 'recall': 0.6}, now - timedelta(hours=hour))
+
+        def fail(*args, **kwargs):
+            raise AssertionError('raw points read')
+
+        monitor.store.raw_points = fail
+        status = tracker.get_governance_status('m1')['performance_status']
+        self.assertEqual(status['status'], 'warning')
+        self.assertAlmostEqual(status['overall_score'], 0.75)
+        self.assertEqual(status['metric_summaries']['recall']['count'], 48)
+        self.assertNotIn('metrics', status)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Unit tests for Monte Carlo parameter uncertainty.
+
+Checks batched posterior sampling against per-sample inference, credible
+interval behaviour and early stopping, and the explainability wiring.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from pgmpy.factors.discrete import TabularCPD
+from pgmpy.inference import VariableElimination
+from pgmpy.models import DiscreteBayesianNetwork
+
+from models.bayesian.shared.sensitivity_analysis import EvidenceSensitivityEngine
+from models.explainability.explainability_engine import UncertaintyQuantifier
+from models.explainability.parameter_uncertainty import ParameterUncertaintySampler
+
+
+def build_network(values=None):
+    values = values or {
+        'A': np.array([[0.7], [0.3]]),
+        'B': np.array([[0.6], [0.3], [0.1]]),
+        'Y': np.array([[0.95, 0.8, 0.5, 0.7, 0.4, 0.1],
+                       [0.05, 0.2, 0.5, 0.3, 0.6, 0.9]]),
+        'C': np.array([[0.8, 0.3], [0.2, 0.7]]),
+    }
+    model = DiscreteBayesianNetwork([('A', 'Y'), ('B', 'Y'), ('Y', 'C')])
+    model.add_cpds(
+        TabularCPD('A', 2, values['A']),
+        TabularCPD('B', 3, values['B']),
+        TabularCPD('Y', 2, values['Y'], evidence=['A', 'B'], evidence_card=[2, 3]),
+        TabularCPD('C', 2, values['C'], evidence=['Y'], evidence_card=[2]),
+    )
+    return model
+
+
+class TestParameterUncertaintySampler(unittest.TestCase):
+    """Test batched sampling and credible intervals."""
+
+    def setUp(self):
+        self.engine = EvidenceSensitivityEngine(build_network(), 'Y')
+        self.evidence = {'A': 1, 'C': 1}
+
+    def test_batched_posteriors_match_per_sample_inference(self):
+        sampler = ParameterUncertaintySampler({'random_state': 0})
+        samples = sampler._sample_cpds(self.engine, 5)
+        posteriors = self.engine.sample_posteriors(self.evidence, samples)
+
+        for i in range(5):
+            model = build_network({node: values[i].reshape(values[i].shape[0], -1)
+                                   for node, values in samples.items()})
+            expected = VariableElimination(model).query(['Y'], evidence=self.evidence, show_progress=False).values[1]
+            self.assertAlmostEqual(posteriors[i], expected, places=12)
+
+    def test_samples_preserve_normalization_and_structural_zeros(self):
+        values = {
+            'A': np.array([[1.0], [0.0]]),
+            'B': np.array([[0.6], [0.3], [0.1]]),
+            'Y': np.full((2, 6), 0.5),
+            'C': np.array([[0.8, 0.3], [0.2, 0.7]]),
+        }
+        engine = EvidenceSensitivityEngine(build_network(values), 'Y')
+        samples = ParameterUncertaintySampler({'random_state': 0})._sample_cpds(engine, 50)
+
+        np.testing.assert_allclose(samples['B'].sum(axis=1), 1.0)
+        self.assertTrue(np.all(samples['A'][:, 1] == 0.0))
+
+    def test_interval_contains_point_estimate_and_narrows_with_concentration(self):
+        loose = ParameterUncertaintySampler({'concentration': 10, 'random_state': 0})
+        tight = ParameterUncertaintySampler({'concentration': 1000, 'random_state': 0})
+        loose_interval = loose.credible_interval(self.engine, self.evidence)
+        tight_interval = tight.credible_interval(self.engine, self.evidence)
+
+        for interval in (loose_interval, tight_interval):
+            self.assertLessEqual(interval.lower, interval.point_estimate)
+            self.assertGreaterEqual(interval.upper, interval.point_estimate)
+        self.assertLess(tight_interval.width, loose_interval.width / 3)
+
+    def test_early_stopping_and_budget(self):
+        stable = ParameterUncertaintySampler({'random_state': 0, 'tolerance': 0.05})
+        interval = stable.credible_interval(self.engine, self.evidence)
+        self.assertTrue(interval.converged)
+        self.assertEqual(interval.n_samples, stable.min_samples)
+
+        capped = ParameterUncertaintySampler({'random_state': 0, 'tolerance': 0.0, 'max_samples': 600})
+        interval = capped.credible_interval(self.engine, self.evidence)
+        self.assertFalse(interval.converged)
+        self.assertEqual(interval.n_samples, 600)
+
+
+class TestMonteCarloUncertaintyAnalysis(unittest.TestCase):
+    """Test the quantifier with and without a sensitivity engine."""
+
+    def test_monte_carlo_interval_on_overall_score(self):
+        engine = EvidenceSensitivityEngine(build_network(), 'Y')
+        quantifier = UncertaintyQuantifier({'uncertainty': {'random_state': 0}})
+        model_result = {
+            'risk_scores': {'overall_score': 0.9},
+            'model_metadata': {'inference_evidence': {'A': 1, 'B': 2, 'C': None}}
+        }
+        analysis = quantifier.analyze_uncertainty(model_result, {'A': 1}, 'test', sensitivity_engine=engine)
+
+        self.assertEqual(analysis.method, 'parameter_monte_carlo')
+        self.assertGreaterEqual(analysis.n_samples, quantifier.sampler.min_samples)
+        # P(Y = 1 | A = 1, B = 2) = 0.9 at the point estimate
+        lower, upper = analysis.confidence_interval
+        self.assertLess(lower, 0.9)
+        self.assertGreater(upper, 0.9)
+
+    def test_evidence_coverage_without_engine(self):
+        analysis = UncertaintyQuantifier({}).analyze_uncertainty(
+            {'risk_scores': {'overall_score': 0.5}}, {'A': 1, 'B': None}, 'test'
+        )
+        self.assertEqual(analysis.method, 'evidence_coverage')
+        self.assertEqual(analysis.confidence_interval, (0.0, 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
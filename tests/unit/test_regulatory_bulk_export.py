@@ -0,0 +1,132 @@
+"""
+Unit tests for the regulatory bulk export.
+
+Covers date range and filter selection, ordered CSV/STOR streams in a
+single gzip output, progress reporting and resuming interrupted exports.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.alert_generator import AlertGenerator
+from core.regulatory_bulk_export import RegulatoryBulkExporter, STOR_FIELDS
+
+
+def make_alerts(count, start=datetime(2025, 3, 1)):
+    alerts = []
+    for i in range(count):
+        alert_type = 'INSIDER_DEALING' if i % 3 else 'SPOOFING'
+        alerts.append({
+            'id': f"alert_{i:05d}",
+            'type': alert_type,
+            'severity': 'HIGH' if i % 2 else 'MEDIUM',
+            'timestamp': (start + timedelta(hours=i)).isoformat(),
+            'risk_score': 0.5 + (i % 5) / 10,
+            'trader_id': f"T{i % 7}",
+            'evidence': {'MaterialInfo': i % 3, 'OrderPattern': 2, 'risk_scores': {'overall_score': 0.9}},
+        })
+    return alerts
+
+
+class TestRegulatoryBulkExporter(unittest.TestCase):
+    """Test streaming exports of stored alerts."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.generator = AlertGenerator()
+        # Stored out of order on purpose
+        self.generator.alert_history = list(reversed(make_alerts(60)))
+        self.exporter = RegulatoryBulkExporter(self.generator, max_workers=4, batch_size=8)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read_csv(self, payload):
+        return list(csv.DictReader(io.StringIO(gzip.decompress(payload).decode('utf-8'))))
+
+    def test_select_alerts_by_date_range_and_filter(self):
+        alerts = self.exporter.select_alerts(
+            start=datetime(2025, 3, 1, 10), end=datetime(2025, 3, 2), filters={'type': ['SPOOFING']}
+        )
+        self.assertEqual([alert['id'] for alert in alerts],
+                         [f"alert_{i:05d}" for i in range(12, 24, 3)])
+
+    def test_csv_stream_is_one_gzip_in_alert_order(self):
+        alerts = self.exporter.select_alerts()
+        progress = []
+        chunks = list(self.exporter.iter_gzip(alerts, progress=lambda done, total: progress.append((done, total))))
+
+        rows = self.read_csv(b''.join(chunks))
+        self.assertEqual(len(chunks), 8)
+        self.assertEqual(list(rows[0]), STOR_FIELDS)
+        self.assertEqual([row['record_id'] for row in rows], [alert['id'] for alert in alerts])
+        self.assertEqual(rows[1]['entity_id'], 'T1')
+        self.assertIn('manipulative order patterns', rows[0]['narrative'])
+        self.assertEqual(progress[-1], (60, 60))
+
+    def test_stor_json_lines(self):
+        payload = b''.join(self.exporter.iter_gzip(self.exporter.select_alerts(), export_format='stor'))
+        records = [json.loads(line) for line in gzip.decompress(payload).decode('utf-8').splitlines()]
+        self.assertEqual(len(records), 60)
+        self.assertEqual(set(records[0]), set(STOR_FIELDS))
+
+    def test_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            list(self.exporter.iter_gzip([], export_format='xml'))
+
+    def test_interrupted_export_resumes_from_checkpoint(self):
+        path = os.path.join(self.temp_dir, 'pack.csv.gz')
+        alerts = self.exporter.select_alerts()
+
+        def interrupt(done, total):
+            if done >= 24:
+                raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.exporter.export(path, alerts, progress=interrupt, job={'month': '2025-03'})
+        self.assertTrue(os.path.exists(f"{path}.checkpoint"))
+
+        # A partially written batch after the checkpoint is discarded on resume
+        with open(path, 'ab') as f:
+            f.write(b'partial')
+
+        summary = self.exporter.export(path, alerts, job={'month': '2025-03'})
+        self.assertEqual(summary['resumed_from'], 16)
+        self.assertEqual(summary['records'], 60)
+        self.assertFalse(os.path.exists(f"{path}.checkpoint"))
+
+        with open(path, 'rb') as f:
+            rows = self.read_csv(f.read())
+        self.assertEqual([row['record_id'] for row in rows], [alert['id'] for alert in alerts])
+
+    def test_checkpoint_of_other_job_is_ignored(self):
+        path = os.path.join(self.temp_dir, 'pack.csv.gz')
+        with open(f"{path}.checkpoint", 'w') as f:
+            json.dump({'job': {'format': 'csv', 'job': {'month': '2025-02'}}, 'records': 5, 'offset': 0}, f)
+        open(path, 'wb').close()
+
+        summary = self.exporter.export(path, self.exporter.select_alerts(), job={'month': '2025-03'})
+        self.assertEqual(summary['resumed_from'], 0)
+        self.assertEqual(summary['records'], 60)
+
+    def test_alert_generator_pack(self):
+        path = os.path.join(self.temp_dir, 'march.jsonl.gz')
+        summary = self.generator.export_regulatory_pack(
+            path, start=datetime(2025, 3, 2), filters={'severity': 'HIGH'}, export_format='stor'
+        )
+        self.assertEqual(summary['records'], 18)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Unit tests for Shapley attributions of evidence nodes.
+
+Exact values are checked against the Shapley formula evaluated coalition
+by coalition; sampled values against the exact ones.
+"""
+
+import itertools
+import os
+import sys
+import unittest
+from math import factorial
+
+import numpy as np
+from pgmpy.factors.discrete import TabularCPD
+from pgmpy.models import DiscreteBayesianNetwork
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from models.bayesian.shared.batched_inference import BatchedPosterior
+from models.explainability.explainability_engine import FeatureAttributor, ModelExplainabilityEngine
+from models.explainability.shapley_attribution import ShapleyAttributor
+
+EVIDENCE_NODES = ['trade_pattern', 'news_timing', 'access', 'comms']
+CARDINALITIES = [2, 3, 2, 2]
+FALLBACK_PRIORS = {'trade_pattern': [0.95, 0.05], 'news_timing': [0.85, 0.12, 0.03]}
+
+
+def build_model():
+    model = DiscreteBayesianNetwork([(node, 'risk') for node in EVIDENCE_NODES] + [('risk', 'outcome')])
+    risk_high = []
+    for trade, news, access, comms in itertools.product(*(range(c) for c in CARDINALITIES)):
+        # Interaction between access and news timing
+        risk_high.append(min(0.05 + 0.2 * trade + 0.1 * news + 0.1 * access + 0.15 * access * news + 0.1 * comms,
+                             0.95))
+    model.add_cpds(
+        TabularCPD('trade_pattern', 2, [[0.9], [0.1]]),
+        TabularCPD('news_timing', 3, [[0.7], [0.2], [0.1]]),
+        TabularCPD('access', 2, [[0.8], [0.2]]),
+        TabularCPD('comms', 2, [[0.6], [0.4]]),
+        TabularCPD('risk', 2, [[1 - p for p in risk_high], risk_high],
+                   evidence=EVIDENCE_NODES, evidence_card=CARDINALITIES),
+        TabularCPD('outcome', 2, [[0.95, 0.1], [0.05, 0.9]], evidence=['risk'], evidence_card=[2])
+    )
+    return model
+
+
+def brute_force_shapley(posterior, evidence):
+    """Shapley formula with each coalition value summed over the fallback priors."""
+    players = [node for node in EVIDENCE_NODES if evidence.get(node) is not None]
+    priors = [posterior.fallback_priors[node] for node in EVIDENCE_NODES]
+
+    def value(coalition):
+        total = 0.0
+        for row in itertools.product(*(range(c) for c in CARDINALITIES)):
+            weight = 1.0
+            for i, node in enumerate(EVIDENCE_NODES):
+                if node in coalition:
+                    weight *= 1.0 if row[i] == evidence[node] else 0.0
+                else:
+                    weight *= priors[i][row[i]]
+            if weight:
+                total += weight * posterior.posterior(np.array([row]))[0]
+        return total
+
+    k = len(players)
+    shapley = {}
+    for player in players:
+        others = [node for node in players if node != player]
+        shapley[player] = sum(
+            factorial(size) * factorial(k - size - 1) / factorial(k)
+            * (value(set(coalition) | {player}) - value(set(coalition)))
+            for size in range(k) for coalition in itertools.combinations(others, size)
+        )
+    return shapley
+
+
+class TestShapleyAttribution(unittest.TestCase):
+    """Test exact and sampled Shapley values."""
+
+    def setUp(self):
+        self.posterior = BatchedPosterior(build_model(), 'outcome', EVIDENCE_NODES,
+                                          fallback_priors=FALLBACK_PRIORS)
+        self.evidence = {'trade_pattern': 1, 'news_timing': 2, 'access': 1, 'comms': 0}
+
+    def test_exact_matches_shapley_formula(self):
+        result = ShapleyAttributor().attribute(self.posterior, self.evidence)
+        expected = brute_force_shapley(self.posterior, self.evidence)
+
+        self.assertTrue(result.exact)
+        for node, value in expected.items():
+            self.assertAlmostEqual(result.values[node], value, places=12)
+
+    def test_efficiency(self):
+        result = ShapleyAttributor().attribute(self.posterior, self.evidence)
+        observed = self.posterior.posterior(self.posterior.encode(self.evidence)[None, :])[0]
+
+        self.assertAlmostEqual(result.full_value, observed, places=12)
+        self.assertAlmostEqual(sum(result.values.values()), result.full_value - result.base_value, places=12)
+
+    def test_unobserved_nodes_are_not_players(self):
+        evidence = dict(self.evidence, comms=None)
+        result = ShapleyAttributor().attribute(self.posterior, evidence)
+        expected = brute_force_shapley(self.posterior, evidence)
+
+        self.assertNotIn('comms', result.values)
+        for node, value in expected.items():
+            self.assertAlmostEqual(result.values[node], value, places=12)
+
+    def test_sampled_within_confidence_bound(self):
+        exact = ShapleyAttributor().attribute(self.posterior, self.evidence)
+        sampled = ShapleyAttributor({'max_exact_nodes': 0, 'random_state': 3, 'tolerance': 0.002,
+                                     'max_permutations': 4000}).attribute(self.posterior, self.evidence)
+
+        self.assertFalse(sampled.exact)
+        self.assertGreater(sampled.n_permutations, 0)
+        for node, value in exact.values.items():
+            self.assertLessEqual(abs(sampled.values[node] - value), 2 * sampled.confidence_bounds[node] + 1e-9)
+
+    def test_coalition_values_cached(self):
+        attributor = ShapleyAttributor()
+        first = attributor.attribute(self.posterior, self.evidence)
+        second = attributor.attribute(self.posterior, dict(self.evidence))
+
+        self.assertEqual(first.values, second.values)
+        self.assertEqual(attributor.metrics['cache_hits'], 1)
+        self.assertEqual(attributor.metrics['cache_misses'], 1)
+
+    def test_feature_attributor_uses_shapley(self):
+        attributions = FeatureAttributor({}).calculate_attributions(
+            {'risk_scores': {}}, self.evidence, 'insider_dealing', posterior=self.posterior
+        )
+        by_name = {attribution.feature_name: attribution for attribution in attributions}
+
+        self.assertEqual(set(by_name), set(EVIDENCE_NODES))
+        self.assertAlmostEqual(sum(a.importance for a in attributions), 1.0)
+        self.assertEqual(by_name['trade_pattern'].direction, 'positive')
+        self.assertEqual(by_name['comms'].direction, 'negative')
+
+
+    def test_engine_components_read_their_own_sections(self):
+        engine = ModelExplainabilityEngine({
+            'shapley': {'tolerance': 0.001, 'random_state': 1},
+            'counterfactual': {'top_k': 2},
+            'uncertainty': {'tolerance': 0.02, 'random_state': 2}
+        })
+
+        self.assertEqual(engine.feature_attributor.shapley.tolerance, 0.001)
+        self.assertEqual(engine.uncertainty_quantifier.sampler.tolerance, 0.02)
+        self.assertEqual(engine.counterfactual_generator.search.top_k, 2)
+        self.assertNotEqual(engine.feature_attributor.shapley.rng.random(),
+                            engine.uncertainty_quantifier.sampler.rng.random())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Unit tests for chunked scoring in the standalone KDE scorer.
+
+Scoring a dataset in chunks (sequentially, across processes or streamed
+from CSV) must give exactly the scores of scoring it as one DataFrame.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Add scripts to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from standalone_kde_scorer import (
+    DISTINCT_EXACT_LIMIT,
+    KDEColumnAggregate,
+    StandaloneKDEScorer,
+    create_sample_kde_config
+)
+
+
+def build_trades(n_rows=1500, seed=7):
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    return pd.DataFrame({
+        'trader_id': [None if rng.random() < 0.05 else f"{'ABC' if rng.random() < 0.9 else 'ab'}{rng.integers(0, 2000):04d}"
+                      for _ in range(n_rows)],
+        'trade_time': [(now - timedelta(hours=float(rng.exponential(40)))).strftime('%Y-%m-%d %H:%M:%S')
+                       for _ in range(n_rows)],
+        'notional': np.where(rng.random(n_rows) < 0.1, np.nan, rng.normal(1e5, 5e5, n_rows).round(2)),
+        'quantity': rng.integers(-5, 1000, n_rows),
+        'price': np.where(rng.random(n_rows) < 0.02, np.nan, rng.random(n_rows) * 1e5),
+        'instrument': rng.choice(['AAPL', 'MSFT', 'X1'], n_rows),
+        'desk_id': rng.choice(['EQ', 'FX', 'rates'], n_rows)
+    })
+
+
+class TestChunkedScoring(unittest.TestCase):
+    """Test chunked scoring against whole-frame scoring."""
+
+    def setUp(self):
+        config = create_sample_kde_config()
+        config['instrument']['valid_values'] = ['AAPL', 'MSFT']
+        config['quantity']['business_rules'] = {'positive': {'type': 'not_negative'}}
+        config['trader_id']['unique_required'] = True
+        self.scorer = StandaloneKDEScorer()
+        self.scorer.load_config_from_dict(config)
+        self.df = build_trades()
+
+    def score(self, method, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return method(*args, **kwargs)
+
+    def chunks(self, size=400):
+        return (self.df.iloc[i:i + size] for i in range(0, len(self.df), size))
+
+    def assert_same_result(self, expected, actual):
+        self.assertEqual(actual['record_count'], expected['record_count'])
+        self.assertEqual(actual['kde_scores'], expected['kde_scores'])
+        self.assertEqual(actual['overall_dqsi_score'], expected['overall_dqsi_score'])
+        for kde_name, details in expected['kde_details'].items():
+            for key, value in details.items():
+                if key == 'avg_age_hours':
+                    # Reference time differs between runs
+                    self.assertAlmostEqual(actual['kde_details'][kde_name][key], value, places=2)
+                else:
+                    self.assertEqual(actual['kde_details'][kde_name][key], value, f"{kde_name}.{key}")
+
+    def test_sequential_chunks_match_dataframe(self):
+        expected = self.score(self.scorer.score_dataframe, self.df)
+        actual = self.score(self.scorer.score_chunks, self.chunks())
+        self.assert_same_result(expected, actual)
+
+    def test_parallel_chunks_match_dataframe(self):
+        expected = self.score(self.scorer.score_dataframe, self.df)
+        actual = self.score(self.scorer.score_chunks, self.chunks(), max_workers=2)
+        self.assert_same_result(expected, actual)
+
+    def test_score_csv_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'trades.csv')
+            self.df.to_csv(file_path, index=False)
+
+            expected = self.score(self.scorer.score_dataframe, pd.read_csv(file_path))
+            actual = self.score(self.scorer.score_file, file_path, chunk_size=500)
+
+        self.assert_same_result(expected, actual)
+
+    def test_missing_kde_is_skipped(self):
+        result = self.score(self.scorer.score_chunks, (chunk.drop(columns=['price']) for chunk in self.chunks()))
+        self.assertNotIn('price', result['kde_scores'])
+        self.assertEqual(result['record_count'], len(self.df))
+
+
+class TestKDEColumnAggregate(unittest.TestCase):
+    """Test merging of partial aggregates."""
+
+    def test_merge_counts_distinct_values_once(self):
+        config = {'data_type': 'numeric', 'valid_range': {'min': 0, 'max': 10}}
+        now = datetime.now()
+        first = KDEColumnAggregate(config).update(pd.Series([1, 2, 2, 50]), now)
+        second = KDEColumnAggregate(config).update(pd.Series([2.0, 3.5, np.nan]), now)
+
+        merged = first.merge(second)
+
+        self.assertEqual(merged.total_count, 7)
+        self.assertEqual(merged.null_count, 1)
+        self.assertEqual(merged.distinct_count, 4)
+        self.assertEqual(merged.range_violations, 1)
+        self.assertEqual(merged.range_valid, 5)
+
+    def test_approximate_distinct_switches_to_sketch_past_limit(self):
+        config = {'data_type': 'numeric'}
+        now = datetime.now()
+        values = pd.Series(np.arange(20000, dtype=np.float64))
+
+        whole = KDEColumnAggregate(config, approximate_distinct=True, distinct_limit=1000).update(values, now)
+        merged = KDEColumnAggregate(config, approximate_distinct=True, distinct_limit=1000)
+        for start in range(0, len(values), 3000):
+            part = KDEColumnAggregate(config, approximate_distinct=True, distinct_limit=1000)
+            merged.merge(part.update(values[start:start + 3000], now))
+
+        self.assertTrue(merged.distinct_estimated)
+        self.assertEqual(len(merged._distinct), 0)
+        self.assertEqual(merged.distinct_count, whole.distinct_count)
+        self.assertAlmostEqual(merged.distinct_count / 20000, 1.0, delta=0.05)
+
+        exact = KDEColumnAggregate(config, distinct_limit=1000).update(values, now)
+        self.assertFalse(exact.distinct_estimated)
+        self.assertEqual(exact.distinct_count, 20000)
+
+    def test_unique_column_above_limit_is_counted_exactly(self):
+        n_rows = DISTINCT_EXACT_LIMIT + 1000
+        config = {'trade_id': {'data_type': 'string', 'unique_required': True, 'risk_level': 'high'}}
+        frame = pd.DataFrame({'trade_id': [f'TRD{i:07d}' for i in range(n_rows)]})
+        scorer = StandaloneKDEScorer()
+        scorer.load_config_from_dict(config)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            whole = scorer.score_dataframe(frame)
+            chunked = scorer.score_chunks(frame.iloc[i:i + 10000] for i in range(0, n_rows, 10000))
+
+        for result in (whole, chunked):
+            details = result['kde_details']['trade_id']
+            self.assertEqual(details['unique_count'], n_rows)
+            self.assertFalse(details['unique_count_estimated'])
+            self.assertEqual(details['duplicate_count'], 0)
+        self.assertEqual(chunked['kde_scores'], whole['kde_scores'])
+
+
+if __name__ == '__main__':
+    unittest.main()
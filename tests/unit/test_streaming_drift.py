@@ -0,0 +1,126 @@
+"""
+Unit tests for streaming drift detection.
+
+Covers mergeable histograms, bin-based PSI/KS/Jensen-Shannon metrics,
+sliding time windows and drift detection on observed live traffic.
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from models.explainability.drift_histograms import (
+    StreamingHistogram, WindowedHistogram, jensen_shannon_divergence, ks_statistic,
+    population_stability_index
+)
+from models.explainability.governance_tracker import ModelDriftDetector, ModelGovernanceTracker
+
+
+class TestStreamingHistogram(unittest.TestCase):
+    """Test histogram updates, merging and drift metrics."""
+
+    def test_incremental_updates_and_merge(self):
+        first = StreamingHistogram.for_scores(10)
+        second = StreamingHistogram.for_scores(10)
+        first.update([0.05, 0.15, 1.0, 1.5])
+        second.update(0.15)
+
+        merged = first.merge(second)
+        self.assertEqual(merged.total, 5)
+        self.assertEqual(merged.counts[1], 2)
+        # Upper edge and out-of-range values fall into the last bin
+        self.assertEqual(merged.counts[-1], 2)
+
+        with self.assertRaises(ValueError):
+            first.merge(StreamingHistogram.for_scores(5))
+
+    def test_metrics_match_closed_forms(self):
+        reference = np.array([50.0, 30.0, 20.0])
+        current = np.array([20.0, 30.0, 50.0])
+        r, c = reference / 100, current / 100
+
+        self.assertAlmostEqual(population_stability_index(reference, current, smoothing=0.0),
+                               float(((c - r) * np.log(c / r)).sum()))
+        self.assertAlmostEqual(ks_statistic(reference, current), 0.3)
+        self.assertAlmostEqual(jensen_shannon_divergence(reference, reference), 0.0)
+        self.assertAlmostEqual(jensen_shannon_divergence([10, 0], [0, 10], smoothing=0.0), 1.0)
+
+    def test_windows_sum_time_buckets(self):
+        histogram = WindowedHistogram(StreamingHistogram.for_states(3).edges, bucket_seconds=60,
+                                      retention_buckets=3)
+        start = datetime(2025, 3, 1)
+        for minute, state in enumerate([0, 1, 2, 2]):
+            histogram.update(state, start + timedelta(minutes=minute))
+
+        end = histogram.bucket_index(start + timedelta(minutes=3))
+        np.testing.assert_array_equal(histogram.window(end, 2).counts, [0, 0, 2])
+        # The first bucket has expired
+        np.testing.assert_array_equal(histogram.window(end, 4).counts, [0, 1, 2])
+
+
+class TestStreamingDriftDetection(unittest.TestCase):
+    """Test drift detection over observed analyses."""
+
+    def setUp(self):
+        self.detector = ModelDriftDetector({
+            'bucket_seconds': 60, 'current_buckets': 1, 'reference_buckets': 2,
+            'min_samples': 50, 'check_interval': 0
+        })
+        self.start = datetime(2025, 3, 1)
+        rng = np.random.default_rng(0)
+        for i in range(200):
+            self.detector.observe('m1', {'MaterialInfo': int(rng.integers(0, 2)), 'News': int(rng.integers(0, 3)),
+                                         'Missing': None},
+                                  score=rng.uniform(0.0, 0.3),
+                                  timestamp=self.start + timedelta(seconds=60 + i * 0.6))
+        self.now = self.start + timedelta(minutes=3)
+        for i in range(100):
+            self.detector.observe('m1', {'MaterialInfo': 2, 'News': int(rng.integers(0, 3))},
+                                  score=rng.uniform(0.7, 1.0), timestamp=self.now + timedelta(seconds=i * 0.5))
+
+    def test_metrics_per_node_and_score(self):
+        metrics = self.detector.get_streaming_metrics('m1', self.now)
+
+        self.assertEqual(set(metrics), {'MaterialInfo', 'News', 'score'})
+        self.assertEqual(metrics['score']['current_count'], 100)
+        self.assertEqual(metrics['score']['reference_count'], 200)
+        self.assertGreater(metrics['MaterialInfo']['ks'], 0.9)
+        self.assertLess(metrics['News']['psi'], 0.1)
+
+    def test_detects_feature_and_prediction_drift(self):
+        results = {r.drift_type: r for r in self.detector.detect_streaming_drift('m1', self.now)}
+
+        self.assertEqual(results['feature_drift'].affected_features, ['MaterialInfo'])
+        self.assertEqual(results['prediction_drift'].severity, 'high')
+        self.assertEqual(self.detector.get_drift_status('m1')['drift_count'], 2)
+
+    def test_no_drift_without_enough_samples(self):
+        self.assertEqual(self.detector.detect_streaming_drift('m1', self.now + timedelta(minutes=10)), [])
+
+    def test_dict_detection_uses_histograms(self):
+        stable = self.detector.detect_drift('m2', {'predictions': [0.1, 0.2] * 50, 'News': [0, 1] * 50},
+                                            {'predictions': [0.2, 0.1] * 50, 'News': [1, 0] * 50})
+        shifted = self.detector.detect_drift('m2', {'predictions': [0.9] * 100, 'News': [2] * 100},
+                                             {'predictions': [0.1] * 100, 'News': [0] * 100})
+
+        self.assertEqual(stable, [])
+        self.assertEqual({r.drift_type for r in shifted}, {'feature_drift', 'prediction_drift'})
+
+    def test_governance_tracker_records_risk_calculations(self):
+        tracker = ModelGovernanceTracker({'drift_detection': {'check_interval': 0}})
+        tracker.track_model_lifecycle('m3', 'risk_calculation',
+                                      {'risk_level': 'low', 'evidence': {'MaterialInfo': 1}, 'risk_score': 0.2})
+
+        metrics = tracker.drift_detector.get_streaming_metrics('m3')
+        self.assertEqual(metrics['MaterialInfo']['current_count'], 1)
+        self.assertEqual(metrics['score']['current_count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Unit tests for the memory-bounded raw trading data cache.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.trading_data_cache import BoundedRecordCache, estimate_size
+from core.trading_data_service import TradingDataService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def records(n, tag='x'):
+    return [{'id': f'{tag}_{i}', 'payload': 'p' * 100} for i in range(n)]
+
+
+class TestBoundedRecordCache(unittest.TestCase):
+    """Test eviction, expiry, spilling and metrics."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp(prefix="kor_ai_test_")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_size_accounting_tracks_entries(self):
+        cache = BoundedRecordCache(max_bytes=10 ** 9)
+        cache['a'] = records(10)
+        cache['b'] = records(20)
+
+        self.assertEqual(cache.entry_size('a'), estimate_size(records(10)))
+        self.assertEqual(cache.current_bytes, cache.entry_size('a') + cache.entry_size('b'))
+
+        cache['a'] = records(1)
+        self.assertEqual(cache.current_bytes, cache.entry_size('a') + cache.entry_size('b'))
+
+        del cache['b']
+        self.assertEqual(cache.current_bytes, cache.entry_size('a'))
+
+    def test_lru_eviction_respects_budget(self):
+        entry_size = estimate_size(records(10))
+        evicted = []
+        cache = BoundedRecordCache(max_bytes=entry_size * 2, on_evict=lambda k, v: evicted.append(k))
+
+        cache['a'] = records(10)
+        cache['b'] = records(10)
+        cache.get('a')
+        cache['c'] = records(10)
+
+        self.assertEqual(evicted, ['b'])
+        self.assertEqual(set(cache.keys()), {'a', 'c'})
+        self.assertLessEqual(cache.current_bytes, cache.max_bytes)
+        self.assertEqual(cache.get_metrics()['evictions'], 1)
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = BoundedRecordCache(ttl_seconds=60, clock=clock)
+        cache['a'] = records(1)
+
+        clock.now = 30
+        self.assertIsNotNone(cache.get('a'))
+        clock.now = 61
+        self.assertIsNone(cache.get('a'))
+        self.assertNotIn('a', cache)
+
+        metrics = cache.get_metrics()
+        self.assertEqual(metrics['expirations'], 1)
+        self.assertEqual(metrics['hits'], 1)
+        self.assertEqual(metrics['misses'], 1)
+
+    def test_evicted_entries_spill_and_reload(self):
+        entry_size = estimate_size(records(10))
+        loaded = []
+        cache = BoundedRecordCache(max_bytes=entry_size, spill_dir=self.temp_dir,
+                                   on_load=lambda k, v: loaded.append(k))
+
+        cache['a'] = records(10, 'a')
+        cache['b'] = records(10, 'b')
+        self.assertIn('a', cache)
+        self.assertEqual(cache.keys(), ['b'])
+
+        self.assertEqual(cache['a'][0]['id'], 'a_0')
+        self.assertEqual(loaded, ['a'])
+
+        metrics = cache.get_metrics()
+        self.assertEqual(metrics['spills'], 2)
+        self.assertEqual(metrics['disk_hits'], 1)
+        self.assertEqual(metrics['hit_rate'], 1.0)
+
+    def test_expired_spills_are_deleted(self):
+        clock = FakeClock()
+        entry_size = estimate_size(records(10))
+        cache = BoundedRecordCache(max_bytes=entry_size, ttl_seconds=60, spill_dir=self.temp_dir, clock=clock)
+
+        cache['a'] = records(10, 'a')
+        clock.now = 30
+        cache['b'] = records(10, 'b')
+        self.assertEqual(len(os.listdir(self.temp_dir)), 1)
+
+        # 'a' expires on disk 60s after it was written, not after it was spilled
+        clock.now = 61
+        self.assertEqual(cache.purge_expired(), 1)
+        self.assertEqual(os.listdir(self.temp_dir), [])
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_metrics()['spilled_entries'], 0)
+
+    def test_clear_deletes_spills(self):
+        entry_size = estimate_size(records(10))
+        cache = BoundedRecordCache(max_bytes=entry_size, spill_dir=self.temp_dir)
+        cache['a'] = records(10, 'a')
+        cache['b'] = records(10, 'b')
+
+        cache.clear()
+        self.assertEqual(os.listdir(self.temp_dir), [])
+        self.assertNotIn('a', cache)
+
+    def test_source_mismatch_is_a_miss(self):
+        cache = BoundedRecordCache()
+        cache.put('a', records(1), source='v1')
+
+        self.assertIsNotNone(cache.get('a', source='v1'))
+        self.assertIsNone(cache.get('a', source='v2'))
+        self.assertEqual(cache.get_metrics()['misses'], 1)
+
+
+def build_trades(n=20, trader_id='trader_001'):
+    return [{'id': f't{i}', 'timestamp': '2024-01-02T10:00:00Z', 'instrument': 'ENERGY_CORP',
+             'volume': 1000, 'price': 50.0, 'side': 'buy', 'trader_id': trader_id}
+            for i in range(n)]
+
+
+class TestTradingDataServiceCache(unittest.TestCase):
+    """Evicted alerts must drop out of the search indexes; spilled alerts must not."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp(prefix="kor_ai_test_")
+        service = TradingDataService()
+        service.extract_raw_trades_for_alert('alert_1', {'trades': build_trades()})
+        self.budget = service.raw_trades_cache.entry_size('alert_1') * 2
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_eviction_removes_alert_from_index(self):
+        trades = build_trades()
+        service = TradingDataService(cache_max_bytes=self.budget)
+        for n in range(5):
+            service.extract_raw_trades_for_alert(f'alert_{n}', {'trades': trades})
+
+        self.assertEqual(len(service.raw_trades_cache), 1)
+        results = service.search_raw_trading_data({'trader_id': 'trader_001'})
+        self.assertEqual(len(results['trades']), 20)
+        self.assertEqual(service.get_cache_metrics()['raw_trades']['evictions'], 4)
+
+    def test_spilled_alerts_stay_searchable(self):
+        service = TradingDataService(cache_max_bytes=self.budget, spill_dir=self.temp_dir)
+        for n in range(5):
+            service.extract_raw_trades_for_alert(f'alert_{n}', {'trades': build_trades(trader_id=f'trader_{n}')})
+
+        self.assertEqual(len(service.raw_trades_cache), 1)
+        results = service.search_raw_trading_data({'trader_id': 'trader_0'})
+        self.assertEqual(len(results['trades']), 20)
+        self.assertEqual(len(service.search_raw_trading_data({'instrument': 'ENERGY_CORP'})['trades']), 100)
+
+    def test_extract_reloads_spilled_alert(self):
+        service = TradingDataService(cache_max_bytes=self.budget, spill_dir=self.temp_dir)
+        first = service.extract_raw_trades_for_alert('alert_0', {'trades': build_trades(trader_id='trader_0')})
+        for n in range(1, 3):
+            service.extract_raw_trades_for_alert(f'alert_{n}', {'trades': build_trades(trader_id=f'trader_{n}')})
+        self.assertNotIn('alert_0', service.raw_trades_cache.keys())
+
+        again = service.extract_raw_trades_for_alert('alert_0', {'trades': build_trades(trader_id='trader_0')})
+
+        self.assertEqual([t.trade_id for t in again], [t.trade_id for t in first])
+        self.assertIn('alert_0', service.raw_trades_cache.keys())
+        self.assertEqual(len(service.trade_index.query({'trader_id': 'trader_0'}, lambda r, c: True)), 20)
+        metrics = service.get_cache_metrics()['raw_trades']
+        self.assertEqual(metrics['disk_hits'], 1)
+        self.assertEqual(metrics['misses'], 3)
+
+    def test_changed_source_data_is_re_extracted(self):
+        service = TradingDataService()
+        service.extract_raw_trades_for_alert('alert_0', {'trades': build_trades(5)})
+        cached = service.extract_raw_trades_for_alert('alert_0', {'trades': build_trades(5)})
+        changed = service.extract_raw_trades_for_alert('alert_0', {'trades': build_trades(7)})
+
+        self.assertEqual(len(cached), 5)
+        self.assertEqual(len(changed), 7)
+        self.assertEqual(service.get_cache_metrics()['raw_trades']['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Unit tests for the raw trading data secondary indexes.
+
+Indexed searches must return exactly what a full scan of the cache returns.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.trading_data_index import RecordIndex, SortedColumn
+from core.trading_data_service import TradingDataService
+
+
+def build_processed_data(rng, trader_id, n_trades, n_orders):
+    instruments = ['ENERGY_CORP', 'OIL_FUTURE_X', 'NYSE_ABC', 'LSE_XYZ']
+    trades = [
+        {
+            'id': f'{trader_id}_t{i}',
+            'timestamp': f"2024-01-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+            'instrument': rng.choice(instruments),
+            'volume': rng.randint(1, 20) * 500,
+            'price': round(rng.uniform(10, 100), 2),
+            'side': rng.choice(['buy', 'sell']),
+            'trader_id': trader_id
+        }
+        for i in range(n_trades)
+    ]
+    orders = [
+        {
+            'id': f'{trader_id}_o{i}',
+            'timestamp': f"2024-01-{rng.randint(1, 28):02d}T10:00:00Z",
+            'instrument': rng.choice(instruments),
+            'size': rng.randint(1, 30) * 500,
+            'price': 50.0,
+            'side': rng.choice(['buy', 'sell']),
+            'status': rng.choice(['filled', 'cancelled', 'pending']),
+            'trader_id': trader_id
+        }
+        for i in range(n_orders)
+    ]
+    return {'trades': trades, 'orders': orders, 'trader_info': {'id': trader_id}, 'market_data': {}}
+
+
+class TestSortedColumn(unittest.TestCase):
+    """Test run-based sorted column."""
+
+    def test_range_across_runs_and_compaction(self):
+        column = SortedColumn(max_runs=2)
+        column.add_batch([(5, 0), (1, 1)])
+        column.add_batch([(3, 2), (None, 3)])
+        column.add_batch([(4, 4), (9, 5)])
+
+        self.assertEqual(len(column), 5)
+        self.assertEqual(sorted(column.range_ids(3, 5)), [0, 2, 4])
+        self.assertEqual(column.count_range(None, 3), 2)
+
+        column.compact(dead_ids={2})
+        self.assertEqual(sorted(column.range_ids(3, 5)), [0, 4])
+
+
+class TestTradingDataServiceIndexes(unittest.TestCase):
+    """Compare indexed searches against a brute-force scan."""
+
+    def setUp(self):
+        rng = random.Random(42)
+        self.service = TradingDataService()
+        for n in range(12):
+            trader_id = f'trader_{n % 4}'
+            data = build_processed_data(rng, trader_id, 40, 30)
+            self.service.extract_raw_trades_for_alert(f'alert_{n}', data)
+            self.service.extract_raw_orders_for_alert(f'alert_{n}', data)
+
+    def scan(self, criteria):
+        trades = [t for ts in self.service.raw_trades_cache.values() for t in ts
+                  if TradingDataService._matches_trade_criteria(t, criteria)]
+        orders = [o for os_ in self.service.raw_orders_cache.values() for o in os_
+                  if TradingDataService._matches_order_criteria(o, criteria)]
+        return trades, orders
+
+    def assert_same_results(self, criteria):
+        results = self.service.search_raw_trading_data(criteria)
+        expected_trades, expected_orders = self.scan(criteria)
+        self.assertEqual([t.trade_id for t in results['trades']], [t.trade_id for t in expected_trades])
+        self.assertEqual([o.order_id for o in results['orders']], [o.order_id for o in expected_orders])
+
+    def test_search_matches_full_scan(self):
+        for criteria in [
+            {'trader_id': 'trader_1'},
+            {'instrument': 'OIL_FUTURE_X', 'direction': 'buy'},
+            {'start_date': '2024-01-10', 'end_date': '2024-01-12'},
+            {'min_quantity': 8000, 'max_quantity': 9000},
+            {'min_price': 20, 'max_price': 25, 'trader_id': 'trader_2'},
+            {'min_quantity': 0, 'instrument': 'UNKNOWN'},
+            {'direction': 'sell'},
+        ]:
+            with self.subTest(criteria=criteria):
+                self.assert_same_results(criteria)
+
+    def test_planner_picks_most_selective_index(self):
+        index_name, estimate = self.service.trade_index.plan({
+            'trader_id': 'trader_1', 'min_price': 99.5
+        })
+        self.assertEqual(index_name, 'price')
+        self.assertLess(estimate, len(self.service.trade_index))
+
+        self.assertEqual(self.service.trade_index.plan({'direction': 'buy'})[0], 'scan')
+
+    def test_recaching_alert_replaces_indexed_records(self):
+        rng = random.Random(7)
+        self.service.extract_raw_trades_for_alert('alert_0', build_processed_data(rng, 'trader_9', 3, 0))
+
+        self.assertEqual(len(self.service.search_raw_trading_data({'trader_id': 'trader_9'})['trades']), 3)
+        self.assert_same_results({'trader_id': 'trader_0'})
+
+    def test_trader_date_range_lookup(self):
+        data = self.service.get_raw_trading_data_for_trader('trader_3', '2024-01-05', '2024-01-20')
+        expected_trades, _ = self.scan({'trader_id': 'trader_3', 'start_date': '2024-01-05',
+                                        'end_date': '2024-01-20'})
+        self.assertEqual(len(data['raw_trades']), len(expected_trades))
+
+    def test_index_handles_group_removal(self):
+        index = RecordIndex(hash_fields={'trader_id': 'trader_id'}, range_fields={})
+        index.replace_group('a', self.service.raw_trades_cache['alert_1'])
+        index.remove_group('a')
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.query({'trader_id': 'trader_1'}, lambda r, c: True), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
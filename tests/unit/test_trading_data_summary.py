@@ -0,0 +1,105 @@
+"""
+Unit tests for TradingDataService summary aggregates.
+
+The hash-join execution time computation must match the original nested
+order x trade loop.
+"""
+
+import os
+import random
+import sys
+import unittest
+from datetime import datetime
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.trading_data_service import TradingDataService
+from models.trading_data import OrderStatus, RawOrderData, RawTradeData, TradeDirection
+
+
+def nested_loop_execution_times(orders, trades):
+    execution_times = []
+    for order in orders:
+        if order.status == OrderStatus.FILLED:
+            for trade in trades:
+                if trade.order_id == order.order_id:
+                    try:
+                        order_time = datetime.fromisoformat(order.order_timestamp.replace('Z', '+00:00'))
+                        trade_time = datetime.fromisoformat(trade.execution_timestamp.replace('Z', '+00:00'))
+                        execution_times.append((trade_time - order_time).total_seconds())
+                    except Exception:
+                        continue
+    return execution_times
+
+
+def make_order(i, status, timestamp):
+    return RawOrderData(
+        order_id=f'o{i}', order_timestamp=timestamp, status=status, instrument='ENERGY_CORP',
+        instrument_type='equity', symbol='ENERGY_CORP', exchange='EXCHANGE', side=TradeDirection.BUY,
+        order_type='limit', quantity=1000.0, filled_quantity=1000.0, remaining_quantity=0.0,
+        trader_id='trader_001'
+    )
+
+
+def make_trade(i, order_id, timestamp, direction, session, deviation):
+    return RawTradeData(
+        trade_id=f't{i}', execution_timestamp=timestamp, instrument='ENERGY_CORP', instrument_type='equity',
+        symbol='ENERGY_CORP', exchange='EXCHANGE', direction=direction, quantity=float(100 + i),
+        executed_price=50.0, notional_value=50.0 * (100 + i), trader_id='trader_001', order_id=order_id,
+        market_session=session, price_deviation=deviation
+    )
+
+
+class TestTradingDataSummary(unittest.TestCase):
+    """Test summary aggregates."""
+
+    def setUp(self):
+        rng = random.Random(3)
+        self.service = TradingDataService()
+        statuses = [OrderStatus.FILLED, OrderStatus.FILLED, OrderStatus.CANCELLED, OrderStatus.PARTIAL]
+        timestamps = ['2024-01-02T10:00:00Z', '2024-01-02T10:00:05', 'not-a-timestamp',
+                      '2024-01-02T10:01:30+00:00']
+
+        self.orders = [make_order(i, rng.choice(statuses), rng.choice(timestamps)) for i in range(200)]
+        self.trades = [
+            make_trade(i, rng.choice([f'o{rng.randint(0, 220)}', None]),
+                       f"2024-01-02T10:{rng.randint(0, 59):02d}:00{rng.choice(['Z', ''])}",
+                       rng.choice([TradeDirection.BUY, TradeDirection.SELL, TradeDirection.UNKNOWN]),
+                       rng.choice(['regular', 'pre-market', None]),
+                       rng.choice([None, 0.0, 1.5, -2.25]))
+            for i in range(600)
+        ]
+
+    def test_execution_times_match_nested_loop(self):
+        expected = nested_loop_execution_times(self.orders, self.trades)
+        actual = self.service._calculate_execution_times(self.orders, self.trades)
+
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(actual, expected)
+
+    def test_execution_times_empty_inputs(self):
+        self.assertEqual(self.service._calculate_execution_times([], self.trades), [])
+        self.assertEqual(self.service._calculate_execution_times(self.orders, []), [])
+
+    def test_summary_aggregates(self):
+        summary = self.service.generate_trading_data_summary('alert_1', self.trades, self.orders)
+
+        buys = [t for t in self.trades if t.direction == TradeDirection.BUY]
+        self.assertEqual(summary.total_trades, 600)
+        self.assertEqual(summary.buy_trades, len(buys))
+        self.assertAlmostEqual(summary.buy_volume, sum(t.quantity for t in buys))
+        self.assertAlmostEqual(summary.total_volume, sum(t.quantity for t in self.trades))
+        self.assertEqual(summary.largest_trade, 699.0)
+        self.assertAlmostEqual(summary.price_impact,
+                               sum(abs(t.price_deviation) for t in self.trades if t.price_deviation) / 600)
+        self.assertEqual(sum(summary.trades_by_session.values()), 600)
+        self.assertEqual(summary.trades_by_session['unknown'],
+                         len([t for t in self.trades if t.market_session is None]))
+
+        expected_times = nested_loop_execution_times(self.orders, self.trades)
+        self.assertAlmostEqual(summary.avg_execution_time, sum(expected_times) / len(expected_times))
+
+
+if __name__ == '__main__':
+    unittest.main()